@@ -4,6 +4,15 @@ from PyInstaller.utils.hooks import collect_submodules
 import sys, os
 sys.path.append(os.path.abspath("."))
 
+# Compile the PMD script grammar once at build time so the bundled app loads
+# serialized LALR tables instead of analysing the grammar on first parse.
+from parser.pmd_script_parser import build_prebuilt_parser
+build_prebuilt_parser()
+
+# Record which module defines each rule so runs import only the rules they use.
+from parser.rule_manifest import build_rule_manifest
+build_rule_manifest()
+
 hidden_imports = (
     collect_submodules("parser.rules")
     + collect_submodules("typer")
@@ -23,6 +32,8 @@ a = Analysis(
     ("parser/rules/script", "parser/rules/script"),
     ("parser/rules/structure", "parser/rules/structure"),
     ("parser/pmd_script_grammar.lark", "parser"),
+    ("parser/pmd_script_parser.lalr", "parser"),  # Prebuilt LALR tables
+    ("parser/rule_manifest.json", "parser"),  # Prebuilt rule manifest
     ("assets/icons", "assets"),  # Application icon
     ("pyproject.toml", "."),     # Version metadata for __version__
     ],
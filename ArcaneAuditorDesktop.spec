@@ -5,6 +5,15 @@ import sys, os
 from pathlib import Path
 sys.path.append(os.path.abspath("."))
 
+# Compile the PMD script grammar once at build time so the bundled app loads
+# serialized LALR tables instead of analysing the grammar on first parse.
+from parser.pmd_script_parser import build_prebuilt_parser
+build_prebuilt_parser()
+
+# Record which module defines each rule so runs import only the rules they use.
+from parser.rule_manifest import build_rule_manifest
+build_rule_manifest()
+
 # ---------------------------------------------------------------------------
 # Hidden imports (modules PyInstaller must bundle explicitly)
 # ---------------------------------------------------------------------------
@@ -45,6 +54,8 @@ datas = [
 
         # --- Grammar for PMD parsing ---
         ("parser/pmd_script_grammar.lark", "parser"),
+        ("parser/pmd_script_parser.lalr", "parser"),  # Prebuilt LALR tables
+        ("parser/rule_manifest.json", "parser"),  # Prebuilt rule manifest
     ]
 
 # ---------------------------------------------------------------------------
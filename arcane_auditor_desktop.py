@@ -8,6 +8,7 @@ in a native desktop window using pywebview.
 # MINIMAL imports first - only what we need for splash
 # This prevents heavy imports from slowing down the splash screen
 import webview
+import multiprocessing
 import threading
 import time
 import sys
@@ -265,7 +266,7 @@ def main():
     def initialize_app():
         # Heavy imports happen here (after splash is visible)
         from utils.arcane_paths import is_frozen
-        from web.server import app, load_web_config, ensure_sample_rule_config
+        from web.server import app, load_web_config, apply_web_config, ensure_sample_rule_config
         import uvicorn
 
         app.state.allow_directory_analysis = True
@@ -277,6 +278,7 @@ def main():
  
         # Load config
         cfg = load_web_config(cli_args=None)
+        apply_web_config(cfg)
         host = cfg.get("host", DEFAULT_HOST)
         port = dynamic_port
         log_level = "info"
@@ -531,4 +533,7 @@ def _handle_first_run_and_updates(window, api):
 
 
 if __name__ == '__main__':
+    # Analysis workers in process mode start by re-running this executable;
+    # let them run as workers rather than opening another window.
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
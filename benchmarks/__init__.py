@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for Arcane Auditor.
+
+Each module is runnable on its own from the project root, e.g.
+``python -m benchmarks.bench_pmd_preprocessor``. ``benchmarks.suite`` times the
+whole pipeline on an app from ``benchmarks.app_generator`` and can compare the
+results against a stored baseline; ``main.py bench`` runs it from the CLI.
+"""
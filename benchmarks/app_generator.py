@@ -0,0 +1,272 @@
+"""
+Synthetic Workday Extend applications for benchmarks.
+
+generate_app() builds a deterministic application with the requested number of
+pages, pods, standalone scripts and orchestrations, plus the SMD and AMD. The
+shapes follow the fixtures in tests/: pages carry a page script, onLoad,
+inbound/outbound endpoints with onSend/onReceive handlers and nested widgets
+with script-valued properties; pods have endpoints and a widget template;
+orchestrations are FlowSync flows with nested nodes and error handlers.
+
+Script density is roughly what real templated apps have: most widgets hold an
+expression, and a share of the snippets repeat across files.
+
+Usage:
+    python -m benchmarks.app_generator --pages 100 --out ./bench_app
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from file_processing.models import SourceFile
+
+APP_ID = "benchApp_abcdef"
+
+_PAGE_SCRIPTS = [
+    """<%
+  var total = 0;
+  for (let i = 0; i < items.length; i++) {
+    total = total + items[i].amount;
+  }
+  console.log('total ' + total);
+  const label = total > {n} ? 'high' : 'low';
+%>""",
+    """<%
+  const formatName = function(worker) {
+    if (worker.preferredName != null) {
+      return worker.preferredName;
+    }
+    return worker.firstName + ' ' + worker.lastName;
+  };
+  const isManager{n} = function(worker) {
+    return worker.directReports.size() > 0;
+  };
+%>""",
+    """<%
+  var rows = [];
+  let count = 0;
+  getWorkers.data.forEach(row => {
+    if (row.status == 'Active' && row.location != null) {
+      const entry = {'id': row.id, 'name': row.name, 'index': count};
+      rows.add(entry);
+      count = count + 1;
+    }
+  });
+  pageVariables.rows = rows.filter(r => r.index < {n});
+%>""",
+]
+
+_WIDGET_EXPRESSIONS = [
+    "<% 'Hello ' + pageVariables.workerName %>",
+    "<% pageVariables.rows.size() > 0 %>",
+    "<% getWorkers.data.map(w => w.name).join(', ') %>",
+    "<% pageVariables.count == 1 ? 'One item' : pageVariables.count + ' items' %>",
+    "Total: <% pageVariables.total %> of <% pageVariables.limit %>",
+]
+
+_HANDLERS = [
+    "<% pageVariables.selected = self.value; %>",
+    "<%\n  if (pageVariables.rows.size() > 10) {\n    pageVariables.page = pageVariables.page + 1;\n  }\n%>",
+    "<% getWorkers.invoke(); %>",
+]
+
+_SCRIPT = """var format{n} = function(value) {
+  if (value == true) {
+    return 'Value: ' + value;
+  }
+  return util.helper(value);
+};
+var unused{n} = function(a, b, c, d, e, f) {
+  var result = a + b;
+  return result;
+};
+const total{n} = function(items) {
+  let sum = 0;
+  items.forEach(item => {
+    sum = sum + item.amount * 1.5;
+  });
+  return sum;
+};
+{ "format{n}": format{n}, "total{n}": total{n} }"""
+
+
+def _source(path: str, content: str) -> SourceFile:
+    return SourceFile(path=Path(path), content=content, size=len(content))
+
+
+def _widget(rng: random.Random, n: int, depth: int) -> dict:
+    widget = {
+        "type": rng.choice(["text", "richText", "button", "checkbox", "number"]),
+        "id": f"widget{n}",
+        "label": f"Widget {n}",
+        "value": rng.choice(_WIDGET_EXPRESSIONS),
+    }
+    if widget["type"] == "button":
+        widget["onClick"] = rng.choice(_HANDLERS)
+    if rng.random() < 0.3:
+        widget["render"] = "<% pageVariables.visible %>"
+    if depth > 0 and rng.random() < 0.4:
+        widget = {
+            "type": "section",
+            "id": f"section{n}",
+            "children": [_widget(rng, n * 10 + i, depth - 1) for i in range(rng.randint(2, 4))],
+        }
+    return widget
+
+
+def page_content(n: int, rng: random.Random, widgets: int = 8) -> str:
+    """A page with a page script, onLoad, endpoints and `widgets` top-level widgets."""
+    return json.dumps({
+        "id": f"page{n}",
+        "securityDomains": ["domain1"],
+        "include": ["util.script"],
+        "script": rng.choice(_PAGE_SCRIPTS).replace("{n}", str(n)),
+        "onLoad": "<% pageVariables.count = 1; pageVariables.total = 0; %>",
+        "endPoints": [
+            {
+                "name": f"getWorkers{n}",
+                "baseUrlType": "workday-common",
+                "url": "/workers?limit=<% pageVariables.limit %>",
+                "authType": "sso",
+                "onReceive": "<% self.data.filter(w => w.active) %>",
+            },
+        ],
+        "outboundData": {"outboundEndPoints": [
+            {
+                "name": f"submit{n}",
+                "baseUrlType": "workday-app",
+                "url": "/submit",
+                "httpMethod": "POST",
+                "onSend": "<%\n  var payload = {'id': pageVariables.selected};\n  return payload;\n%>",
+            },
+        ]},
+        "presentation": {
+            "title": {"type": "title", "label": APP_ID},
+            "body": {"type": "section", "id": "body", "children": [
+                _widget(rng, n * 100 + i, depth=2) for i in range(widgets)
+            ]},
+            "footer": {"type": "footer", "children": [{"type": "pod", "podId": "footer"}]},
+        },
+    }, indent=2)
+
+
+def pod_content(n: int, rng: random.Random) -> str:
+    """A pod with one endpoint and a small widget template."""
+    return json.dumps({
+        "podId": f"pod{n}",
+        "seed": {
+            "parameters": ["workerId"],
+            "endPoints": [{
+                "name": f"getDetails{n}",
+                "url": "/workers/<% workerId %>",
+                "onReceive": "<% self.data.details %>",
+            }],
+            "template": {"type": "section", "id": f"podSection{n}", "children": [
+                _widget(rng, n * 100 + i, depth=1) for i in range(3)
+            ]},
+        },
+    }, indent=2)
+
+
+def script_content(n: int) -> str:
+    return _SCRIPT.replace("{n}", str(n))
+
+
+def _node(name: str, with_handler: bool) -> dict:
+    handler = None
+    if with_handler:
+        handler = {"_type": "ErrorHandler", "_value": {
+            "name": {"_type": "Identifier", "_value": f"_err_{name}"},
+            "nodes": {"_type": ["List", "Node"], "_value": []},
+        }}
+    return {"_type": "Api", "_value": {
+        "name": {"_type": "Identifier", "_value": name},
+        "isDisabled": {"_type": "Boolean", "_value": False},
+        "errorHandler": {"_type": ["Opt", "ErrorHandler"], "_value": handler},
+        "condition": {"_type": ["Expr", "Boolean"], "_value": {
+            "type": {"_type": "Type", "_value": "Boolean"},
+            "source": {"_type": "String", "_value": "value == true"},
+            "isAuto": {"_type": "Boolean", "_value": False},
+        }},
+    }}
+
+
+def orchestration_content(n: int, rng: random.Random, nodes: int = 12) -> str:
+    """A FlowSync orchestration with `nodes` API steps, some with error handlers."""
+    return json.dumps({
+        "flowVersion": "3.3.0",
+        "_type": "Flow",
+        "_value": {
+            "id": {"_type": "String", "_value": f"flow-id-{n}"},
+            "name": {"_type": "Identifier", "_value": f"benchFlow{n}"},
+            "type": {"_type": "FlowType", "_value": ".maya.FlowSync"},
+            "start": {},
+            "end": {},
+            "nodes": {"_type": ["List", "Node"], "_value": [
+                _node(f"step{n}_{i}", rng.random() < 0.5) for i in range(nodes)
+            ]},
+            "securityDomains": {"_type": ["Opt", ["List", "String"]], "_value": ["domain1"]},
+        },
+    }, indent=2)
+
+
+def generate_app(pages: int = 50, pods: int = 10, scripts: int = 10, orchestrations: int = 5,
+                 seed: int = 0) -> Dict[str, SourceFile]:
+    """
+    Source files map (as FileProcessor returns it) for a synthetic application.
+
+    The same arguments always produce the same files.
+    """
+    rng = random.Random(seed)
+    files = {
+        "app.smd": _source("app.smd", json.dumps({
+            "id": "site1", "applicationId": APP_ID, "siteId": "site1", "errorPageConfigurations": [],
+        })),
+        "app.amd": _source("app.amd", json.dumps({
+            "applicationId": APP_ID, "dataProviders": [],
+            "routes": {f"page{n}": {"pageId": f"page{n}"} for n in range(pages)},
+        })),
+        "util.script": _source("util.script", script_content(0)),
+    }
+    for n in range(pages):
+        files[f"page{n}.pmd"] = _source(f"page{n}.pmd", page_content(n, rng))
+    for n in range(pods):
+        files[f"pod{n}.pod"] = _source(f"pod{n}.pod", pod_content(n, rng))
+    for n in range(1, scripts + 1):
+        files[f"script{n}.script"] = _source(f"script{n}.script", script_content(n))
+    for n in range(orchestrations):
+        files[f"flow{n}.orchestration"] = _source(f"flow{n}.orchestration", orchestration_content(n, rng))
+    return files
+
+
+def write_app(files: Dict[str, SourceFile], directory: Path) -> None:
+    """Write a generated application to disk."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, source_file in files.items():
+        (directory / name).write_text(source_file.content, encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--pods", type=int, default=10)
+    parser.add_argument("--scripts", type=int, default=10)
+    parser.add_argument("--orchestrations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, required=True, help="Directory to write the application to")
+    args = parser.parse_args()
+
+    files = generate_app(args.pages, args.pods, args.scripts, args.orchestrations, args.seed)
+    write_app(files, args.out)
+    print(f"Wrote {len(files)} files to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark incremental re-analysis against a full run on a generated app.
+
+Generates an application of --files source files (pages, pods and scripts plus
+an SMD and AMD), then times:
+
+- full:        ModelParser.parse_files + RulesEngine.run (what review-app does)
+- cold:        first IncrementalAnalyzer run (no state yet)
+- unchanged:   IncrementalAnalyzer run with nothing edited
+- one page:    IncrementalAnalyzer run after editing one page
+- smd:         IncrementalAnalyzer run after editing the SMD
+
+Each incremental result is checked against a full run of the same files.
+
+Usage:
+    python -m benchmarks.bench_incremental [--files 500] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from file_processing.models import SourceFile
+from parser.app_parser import ModelParser
+from parser.ast_cache import configure_ast_cache
+from parser.config import ArcaneAuditorConfig
+from parser.incremental import IncrementalAnalyzer
+from parser.rules_engine import RulesEngine
+from utils.console import set_quiet
+
+_PAGE_SCRIPT = """<%
+  var total = 0;
+  for (let i = 0; i < items.length; i++) {
+    total = total + items[i].amount;
+  }
+  console.log('total ' + total);
+  const label = total > 100 ? true : false;
+%>"""
+
+_SCRIPT = """var format{n} = function(value) {
+  if (value == true) {
+    return 'Value: ' + value;
+  }
+  return util.helper(value);
+};
+{ "format{n}": format{n} }"""
+
+
+def _source(path: str, content: str) -> SourceFile:
+    return SourceFile(path=Path(path), content=content, size=len(content))
+
+
+def _page(n: int, marker: int = 0) -> str:
+    return json.dumps({
+        "id": f"page{n}",
+        "securityDomains": ["domain1"],
+        "include": ["util.script"],
+        "script": _PAGE_SCRIPT.replace("total > 100", f"total > {100 + marker}"),
+        "onLoad": "<% pageVariables.count = 1; %>",
+        "presentation": {
+            "title": {"type": "title", "label": "benchApp_abcdef"},
+            "body": {"type": "section", "children": [
+                {"type": "text", "id": f"text{n}", "value": "<% 'Page ' + pageVariables.count %>"},
+                {"type": "richText", "id": "Bad_Id", "value": "hello"},
+            ]},
+        },
+    }, indent=2)
+
+
+def _pod(n: int) -> str:
+    return json.dumps({
+        "podId": f"pod{n}",
+        "seed": {
+            "parameters": [],
+            "template": {"type": "text", "id": f"podText{n}", "value": "<% var x = 1; x %>"},
+        },
+    }, indent=2)
+
+
+def _smd(app_id: str) -> str:
+    return json.dumps({"id": "site1", "applicationId": app_id, "siteId": "site1", "errorPageConfigurations": []})
+
+
+def generate_app(file_count: int) -> dict:
+    """Source files for a synthetic app: ~70% pages, ~15% pods, ~15% scripts."""
+    files = {
+        "app.smd": _source("app.smd", _smd("benchApp_abcdef")),
+        "app.amd": _source("app.amd", '{"applicationId": "benchApp_abcdef", "dataProviders": []}'),
+    }
+    for n in range(max(0, file_count - 2)):
+        if n % 7 == 5:
+            files[f"pod{n}.pod"] = _source(f"pod{n}.pod", _pod(n))
+        elif n % 7 == 6:
+            files[f"script{n}.script"] = _source(f"script{n}.script", _SCRIPT.replace("{n}", str(n)))
+        else:
+            files[f"page{n}.pmd"] = _source(f"page{n}.pmd", _page(n))
+    return files
+
+
+def full_run(files: dict, config: ArcaneAuditorConfig) -> list:
+    context = ModelParser().parse_files(files)
+    return RulesEngine(config).run(context)
+
+
+def incremental_run(files: dict, config: ArcaneAuditorConfig, state_path: Path) -> list:
+    return IncrementalAnalyzer(RulesEngine(config), state_path).analyze(files)[1]
+
+
+def _key(findings: list) -> list:
+    return [(f.file_path, f.line, f.rule_id, f.message, f.path, f.snippet) for f in findings]
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=500, help="Source files in the generated app")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (best time is reported)")
+    args = parser.parse_args()
+
+    set_quiet(True)
+    # Measure parsing, not the on-disk AST cache.
+    configure_ast_cache(enabled=False)
+    config = ArcaneAuditorConfig()
+    files = generate_app(args.files)
+    edited_page = next(path for path in files if path.endswith(".pmd"))
+
+    scenarios = [
+        ("unchanged", lambda f: f),
+        ("one page", lambda f: {**f, edited_page: _source(edited_page, _page(0, marker=1))}),
+        ("smd", lambda f: {**f, "app.smd": _source("app.smd", _smd("otherApp_123456"))}),
+    ]
+
+    full_time = min(_timed(full_run, files, config)[0] for _ in range(args.repeat))
+    print(f"{len(files)} files, {len(RulesEngine(config).rules)} rules")
+    print(f"{'full':>10}: {full_time:.3f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cold_times, results = [], {}
+        for name, _ in scenarios:
+            results[name] = []
+        for attempt in range(args.repeat):
+            state_path = Path(tmp) / f"state{attempt}"
+            cold_times.append(_timed(incremental_run, files, config, state_path)[0])
+            for name, edit in scenarios:
+                # Every scenario starts from the state of the unedited app.
+                incremental_run(files, config, state_path)
+                edited = edit(files)
+                seconds, findings = _timed(incremental_run, edited, config, state_path)
+                results[name].append(seconds)
+                if attempt == 0 and _key(findings) != _key(full_run(edited, config)):
+                    raise SystemExit(f"incremental '{name}' differs from a full run")
+
+        print(f"{'cold':>10}: {min(cold_times):.3f}s")
+        for name, _ in scenarios:
+            best = min(results[name])
+            print(f"{name:>10}: {best:.3f}s  ({full_time / best:.1f}x faster than full)")
+
+
+if __name__ == "__main__":
+    main()
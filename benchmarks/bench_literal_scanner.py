@@ -0,0 +1,114 @@
+"""
+Benchmark the combined literal prefilter of the hardcoded-value rules.
+
+Parses a generated app of --pages pages (and proportional pods) and times,
+over every string value of every page, pod and AMD:
+
+- per kind:  each prefilter pattern searched on its own, one pass per kind
+             (what the rules cost when each scans every string itself)
+- grouped:   all prefilters in one alternation with a named group per kind
+- scanner:   LiteralScanner.kinds_in (literal alternation plus hex-run
+             search, then per-kind classification of the survivors)
+- rules:     the six hardcoded-value rules through RulesEngine.run, with the
+             models' string index and literal scan dropped before each run
+
+The share of strings rejected by the first search is shown alongside.
+
+Usage:
+    python -m benchmarks.bench_literal_scanner [--pages 400] [--repeat 5]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.app_generator import APP_ID, generate_app
+from parser.app_parser import ModelParser
+from parser.ast_cache import configure_ast_cache
+from parser.literal_scanner import LITERAL_PATTERNS, WID_PATTERN, literal_scanner
+from parser.rules_engine import RulesEngine
+from utils.console import set_quiet
+
+RULE_IDS = [
+    "HardcodedWidRule", "HardcodedApplicationIdRule", "EmbeddedImagesRule",
+    "HardcodedWorkdayAPIRule", "StringBooleanRule", "MultipleStringInterpolatorsRule",
+]
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _models(context) -> list:
+    return [*context.pmds.values(), *context.pods.values(), *([context.amd] if context.amd else [])]
+
+
+def _reset(models) -> None:
+    for model in models:
+        model._string_values = None
+        model._literal_scan = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    set_quiet(True)
+    configure_ast_cache(enabled=False)
+    files = generate_app(pages=args.pages, pods=max(1, args.pages // 5), scripts=10, orchestrations=0)
+    context = ModelParser().parse_files(files)
+    models = _models(context)
+    values = [entry.value for model in models for entry in model.get_string_values()]
+
+    scanner = literal_scanner(APP_ID)
+    sources = {"wid": WID_PATTERN, **LITERAL_PATTERNS, "application_id": re.escape(APP_ID)}
+    patterns = [re.compile(p, re.IGNORECASE) for p in sources.values()]
+    grouped_pattern = re.compile("|".join(f"(?P<{kind}>{p})" for kind, p in sources.items()), re.IGNORECASE)
+
+    def per_kind():
+        for pattern in patterns:
+            for value in values:
+                pattern.search(value)
+
+    def grouped():
+        for value in values:
+            grouped_pattern.search(value)
+
+    def scanned():
+        for value in values:
+            scanner.kinds_in(value)
+
+    engine = RulesEngine(rule_ids=RULE_IDS)
+
+    def rules():
+        _reset(models)
+        engine.run(context)
+
+    rejected = sum(1 for value in values if not scanner.kinds_in(value))
+    print(f"{len(models)} models, {len(values)} string values, "
+          f"{rejected / max(1, len(values)):.1%} rejected by the first search")
+    results = {
+        "per kind": _best(per_kind, args.repeat),
+        "grouped": _best(grouped, args.repeat),
+        "scanner": _best(scanned, args.repeat),
+        "rules": _best(rules, args.repeat),
+    }
+    for name, seconds in results.items():
+        print(f"{name:>10} {seconds * 1000:>10.1f} ms")
+    print(f"scanner speedup over per-kind scans: {results['per kind'] / results['scanner']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark PMD script parser startup: grammar compile vs prebuilt LALR tables.
+
+Each measurement runs in a fresh interpreter so module-level parser caches do
+not leak between runs. "compile" builds Lark from the .lark grammar text (the
+old startup path); "prebuilt" loads the serialized tables written by
+build_prebuilt_parser(). Both include the first parse of a small script.
+
+Usage:
+    python -m benchmarks.bench_parser_startup [--repeat 5]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from parser.pmd_script_parser import build_prebuilt_parser
+
+_COMPILE = '''
+import time
+start = time.perf_counter()
+from lark import Lark
+from parser.pmd_script_parser import load_grammar, LALR_OPTIONS
+Lark(load_grammar(), **LALR_OPTIONS).parse("var x = {:};")
+print(time.perf_counter() - start)
+'''
+
+_PREBUILT = '''
+import sys, time
+start = time.perf_counter()
+from parser.pmd_script_parser import load_grammar, load_prebuilt_parser, parser_fingerprint
+parser = load_prebuilt_parser(sys.argv[1], parser_fingerprint(load_grammar()))
+assert parser is not None, "prebuilt parser is stale or missing"
+parser.parse("var x = {:};")
+print(time.perf_counter() - start)
+'''
+
+
+def time_in_subprocess(snippet: str, *args: str) -> float:
+    """Run `snippet` in a fresh interpreter and return the seconds it reports."""
+    output = subprocess.run(
+        [sys.executable, "-c", snippet, *args],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode (best time is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prebuilt_path = str(build_prebuilt_parser(Path(tmp) / "pmd_script_parser.lalr"))
+        compile_time = min(time_in_subprocess(_COMPILE) for _ in range(args.repeat))
+        prebuilt_time = min(time_in_subprocess(_PREBUILT, prebuilt_path) for _ in range(args.repeat))
+
+    print(f"{'mode':>10} {'time (ms)':>10}")
+    print(f"{'compile':>10} {compile_time * 1000:>10.1f}")
+    print(f"{'prebuilt':>10} {prebuilt_time * 1000:>10.1f}")
+    print(f"speedup: {compile_time / prebuilt_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
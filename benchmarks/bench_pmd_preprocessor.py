@@ -0,0 +1,75 @@
+"""
+Benchmark PMDPreprocessor.preprocess() scaling on synthetic scripts.
+
+Builds scripts of doubling size from a realistic PMD Script chunk (strings with
+braces, template literals, comments, object/set literals and blocks) and reports
+time per KB. Linear preprocessing keeps the per-KB cost flat as size grows.
+
+Usage:
+    python -m benchmarks.bench_pmd_preprocessor [--max-copies 256] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from parser.pmd_preprocessor import PMDPreprocessor
+
+SCRIPT_CHUNK = '''
+// Build the request payload for {workerId}
+var payload{n} = {"worker": workerId, "options": {:}, "tags": {}};
+const label{n} = `Worker ${workerId} has {count} items`;
+/* Filter the items: { braces in comments are ignored } */
+let selected{n} = items.filter(item => {
+    if (item.status == 'Active' && item.name != "{unknown}") {
+        return true;
+    }
+    return false;
+});
+function summarize{n}(rows) {
+    let totals = {};
+    for (let i = 0; i < rows.length; i++) {
+        totals = totals.add(rows[i].id);
+    }
+    return {"count": rows.length, "ids": totals};
+}
+'''
+
+
+def build_script(copies: int) -> str:
+    """Return a synthetic script made of `copies` numbered chunks."""
+    return ''.join(SCRIPT_CHUNK.replace('{n}', str(n)) for n in range(copies))
+
+
+def time_preprocess(code: str, repeat: int) -> float:
+    """Return the best-of-`repeat` wall time (seconds) for one preprocess() call."""
+    best = float('inf')
+    for _ in range(repeat):
+        preprocessor = PMDPreprocessor(warn_ambiguous=False)
+        start = time.perf_counter()
+        preprocessor.preprocess(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-copies", type=int, default=256, help="Largest script size, in chunks")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best time is reported)")
+    args = parser.parse_args()
+
+    print(f"{'chunks':>8} {'size (KB)':>10} {'time (ms)':>10} {'ms/KB':>8}")
+    copies = 1
+    while copies <= args.max_copies:
+        code = build_script(copies)
+        size_kb = len(code) / 1024
+        elapsed = time_preprocess(code, args.repeat)
+        print(f"{copies:>8} {size_kb:>10.1f} {elapsed * 1000:>10.2f} {elapsed * 1000 / size_kb:>8.3f}")
+        copies *= 2
+
+
+if __name__ == "__main__":
+    main()
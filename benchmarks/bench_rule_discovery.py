@@ -0,0 +1,81 @@
+"""
+Benchmark RulesEngine startup: walking parser.rules vs the rule manifest.
+
+Each measurement runs in a fresh interpreter. "import" is importing
+parser.rules_engine (the same for every mode: lark, pydantic, the models);
+"discover" is constructing the RulesEngine. "walk" imports every module
+under parser.rules (the behaviour without a manifest); "manifest" imports the
+modules of all enabled rules; "single" is a --rules run selecting one rule,
+which imports only that rule's module. The number of parser.rules modules
+each mode imports is shown alongside.
+
+Usage:
+    python -m benchmarks.bench_rule_discovery [--repeat 5] [--rule ScriptVarUsageRule]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from parser.rule_manifest import build_rule_manifest
+
+_SNIPPET = '''
+import sys, time
+from pathlib import Path
+mode, manifest_path, rule_id = sys.argv[1:4]
+start = time.perf_counter()
+from utils.console import set_quiet
+set_quiet(True)
+from parser import rule_manifest, rules_engine
+imported = time.perf_counter()
+if mode == "walk":
+    rules_engine.load_rule_manifest = lambda: None
+    rules_engine.save_user_rule_manifest = lambda entries: None
+else:
+    # Reading and validating the manifest is part of discovery, as in load_rule_manifest().
+    rules_engine.load_rule_manifest = lambda: rule_manifest.read_rule_manifest(
+        Path(manifest_path), rule_manifest.rules_fingerprint())
+discover_start = time.perf_counter()
+engine = rules_engine.RulesEngine(rule_ids=[rule_id] if mode == "single" else None)
+discovered = time.perf_counter()
+modules = sum(1 for name in sys.modules if name.startswith("parser.rules."))
+print(imported - start, discovered - discover_start, modules, len(engine.rules))
+'''
+
+
+def time_in_subprocess(*args: str) -> tuple:
+    """Run the snippet in a fresh interpreter; returns (discover s, import s, rule modules, rules)."""
+    output = subprocess.run(
+        [sys.executable, "-c", _SNIPPET, *args],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    import_seconds, discover_seconds, modules, rule_count = output.strip().splitlines()[-1].split()
+    return float(discover_seconds), float(import_seconds), int(modules), int(rule_count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode (best time is reported)")
+    parser.add_argument("--rule", default="ScriptVarUsageRule", help="Rule selected in the single-rule mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_path = str(build_rule_manifest(Path(tmp) / "rule_manifest.json"))
+        results = {}
+        for mode in ("walk", "manifest", "single"):
+            runs = [time_in_subprocess(mode, manifest_path, args.rule) for _ in range(args.repeat)]
+            results[mode] = min(runs)
+
+    print(f"{'mode':>10} {'import (ms)':>12} {'discover (ms)':>14} {'modules':>8} {'rules':>6}")
+    for mode, (discover_seconds, import_seconds, modules, rule_count) in results.items():
+        print(f"{mode:>10} {import_seconds * 1000:>12.1f} {discover_seconds * 1000:>14.1f} {modules:>8} {rule_count:>6}")
+    print(f"single-rule discovery speedup over walk: {results['walk'][0] / results['single'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark reading an application ZIP: extract-to-temp-dir vs streaming members.
+
+"extract" is the previous FileProcessor.process_zip_file path: testzip() (a CRC
+pass over every member), extractall() into a TemporaryDirectory, rglob('*') and
+a read_text() per relevant file. "stream" is the current process_zip_file, which
+decompresses only the relevant members straight from the archive. The archive
+holds a generated app plus irrelevant members (images, docs) like real exports.
+
+Usage:
+    python -m benchmarks.bench_zip_reader [--files 500] [--repeat 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.bench_incremental import generate_app
+from file_processing import FileProcessor
+
+
+def extract_and_read(processor: FileProcessor, zip_path: Path) -> dict:
+    """
+    The pre-streaming implementation, kept here as the baseline.
+
+    The extracted files are read and decoded the way process_directory reads
+    files today (_load_source_files: bulk byte reads, then _decode_bytes), so
+    only the extraction differs between the two modes.
+    """
+    with zipfile.ZipFile(zip_path) as zip_ref:
+        zip_ref.testzip()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        with zipfile.ZipFile(zip_path) as zip_ref:
+            zip_ref.extractall(temp_path)
+        candidates = [
+            (str(file_path.relative_to(temp_path)), file_path)
+            for file_path in temp_path.rglob('*')
+            if file_path.is_file() and file_path.suffix in processor.relevant_extensions
+        ]
+        return {key: source.content for key, source in processor._load_source_files(candidates).items()}
+
+
+def build_archive(zip_path: Path, file_count: int, filler_count: int) -> None:
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        for name, source_file in generate_app(file_count).items():
+            zip_ref.writestr(f"myApp/{name}", source_file.content)
+        for i in range(filler_count):
+            # Incompressible-ish payloads standing in for images and attachments.
+            zip_ref.writestr(f"myApp/assets/image{i}.png", bytes((i * 7 + j) % 251 for j in range(64 * 1024)))
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=500, help="Source files in the generated app")
+    parser.add_argument("--assets", type=int, default=50, help="Irrelevant 64KB members in the archive")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode (best time is reported)")
+    args = parser.parse_args()
+
+    processor = FileProcessor()
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = Path(tmp) / "app.zip"
+        build_archive(zip_path, args.files, args.assets)
+
+        streamed = {key: source.content for key, source in processor.process_zip_file(zip_path).items()}
+        if streamed != extract_and_read(processor, zip_path):
+            raise SystemExit("streaming reader differs from extract-and-read")
+
+        extract_time = best_of(args.repeat, extract_and_read, processor, zip_path)
+        stream_time = best_of(args.repeat, processor.process_zip_file, zip_path)
+        print(f"archive: {zip_path.stat().st_size / 1024:.0f} KB, {len(streamed)} source files, {args.assets} assets")
+        print(f"  extract: {extract_time * 1000:.1f} ms")
+        print(f"   stream: {stream_time * 1000:.1f} ms  ({extract_time / stream_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+End-to-end pipeline benchmark on a generated application.
+
+Times each stage of a review-app run on an app from benchmarks.app_generator:
+
+- file_processing: FileProcessor.process_directory on the app written to disk
+- preprocess:      preprocess_pmd_content on every page/pod plus
+                   PMDPreprocessor.preprocess on every script block (measured
+                   on its own; parse_files does the same work internally)
+- parse_files:     ModelParser.parse_files (includes precompute_asts)
+- precompute_asts: the ModelParser._precompute_asts part of parse_files
+- rules:           RulesEngine.run, plus each rule on its own (with the ASTs
+                   already parsed) under "rules"
+- output:          OutputFormatter JSON formatting of the findings
+
+Every stage is run --repeat times and the best time is kept. Results are JSON
+so runs can be stored and compared: compare_results() flags the stages and
+rules that got slower than a baseline by more than a threshold.
+
+Usage:
+    python -m benchmarks.suite [--pages 50] [--repeat 3] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.15]
+
+`main.py bench` runs the same suite from the CLI.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.app_generator import generate_app, write_app
+from file_processing import FileProcessor
+from output.formatter import OutputFormat, OutputFormatter
+from parser.app_parser import ModelParser
+from parser.ast_cache import configure_ast_cache, get_ast_cache_settings
+from parser.config import ArcaneAuditorConfig
+from parser.pmd_preprocessor import PMDPreprocessor, preprocess_pmd_content
+from parser.rules_engine import RulesEngine
+from utils.console import get_quiet, set_quiet
+
+# Bump when the results layout changes.
+RESULTS_FORMAT = 1
+
+STAGES = ('file_processing', 'preprocess', 'parse_files', 'precompute_asts', 'rules', 'output')
+
+DEFAULT_THRESHOLD = 0.15
+
+# Differences below this are timer noise, whatever the ratio.
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def _timed(fn: Callable, *args) -> tuple:
+    start = time.perf_counter()
+    value = fn(*args)
+    return time.perf_counter() - start, value
+
+
+def _preprocess_all(files: Dict[str, Any], script_blocks: List[str]) -> None:
+    for name, source_file in files.items():
+        if name.endswith(('.pmd', '.pod')):
+            preprocess_pmd_content(source_file.content.strip())
+    preprocessor = PMDPreprocessor()
+    for script in script_blocks:
+        preprocessor.preprocess(script)
+
+
+def _script_blocks(context) -> List[str]:
+    """Every script the parser sees: stripped script fields and .script sources."""
+    from parser.rules.base import Rule
+
+    class _Stripper(Rule):
+        def analyze(self, context):
+            yield from []
+
+    stripper = _Stripper()
+    blocks = []
+    for pmd_id in context.pmds:
+        blocks.extend(field[1] for field in context.get_cached_pmd_script_fields(pmd_id) or ())
+    for pod_id in context.pods:
+        blocks.extend(field[1] for field in context.get_cached_pod_script_fields(pod_id) or ())
+    blocks = [stripper._strip_pmd_wrappers(block) for block in blocks]
+    blocks.extend(script.source for script in context.scripts.values())
+    return [block for block in blocks if block and block.strip()]
+
+
+def _run_once(files: Dict[str, Any], app_dir: Path, engine: RulesEngine) -> Dict[str, Any]:
+    """One pass over every stage; returns the stage and per-rule timings."""
+    stages: Dict[str, float] = {}
+    stages['file_processing'], loaded = _timed(FileProcessor().process_directory, app_dir)
+
+    parser = ModelParser()
+    precompute_asts = parser._precompute_asts
+
+    def timed_precompute(context):
+        stages['precompute_asts'], _ = _timed(precompute_asts, context)
+
+    parser._precompute_asts = timed_precompute
+    stages['parse_files'], context = _timed(parser.parse_files, loaded)
+
+    stages['preprocess'], _ = _timed(_preprocess_all, loaded, _script_blocks(context))
+    stages['rules'], findings = _timed(engine.run, context)
+
+    formatter = OutputFormatter(OutputFormat.JSON)
+    stages['output'], _ = _timed(formatter.format_results, findings, len(loaded), len(engine.rules), context)
+
+    rules = {}
+    for rule in engine.rules:
+        rules[rule.__class__.__name__], _ = _timed(engine.run, context, [rule])
+    return {'stages': stages, 'rules': rules, 'findings': len(findings), 'files': len(loaded)}
+
+
+def run_benchmark(pages: int = 50, pods: int = 10, scripts: int = 10, orchestrations: int = 5,
+                  repeat: int = 3, config: Optional[ArcaneAuditorConfig] = None) -> Dict[str, Any]:
+    """
+    Generate an app, run every stage `repeat` times and return the results.
+
+    The on-disk AST cache is turned off for the run so parsing is measured,
+    and restored afterwards.
+    """
+    cache_settings = get_ast_cache_settings()
+    previous_quiet = get_quiet()
+    configure_ast_cache(enabled=False)
+    set_quiet(True)
+    try:
+        files = generate_app(pages, pods, scripts, orchestrations)
+        engine = RulesEngine(config or ArcaneAuditorConfig())
+        with tempfile.TemporaryDirectory() as tmp:
+            app_dir = Path(tmp) / "app"
+            write_app(files, app_dir)
+            runs = [_run_once(files, app_dir, engine) for _ in range(max(1, repeat))]
+    finally:
+        set_quiet(previous_quiet)
+        if cache_settings:
+            configure_ast_cache(cache_settings['cache_dir'], max_bytes=cache_settings['max_bytes'])
+
+    from __version__ import __version__
+    stages = {stage: min(run['stages'][stage] for run in runs) for stage in STAGES}
+    # preprocess and precompute_asts are parts of parse_files, so they are not added again.
+    stages['total'] = sum(stages[stage] for stage in ('file_processing', 'parse_files', 'rules', 'output'))
+    return {
+        'format': RESULTS_FORMAT,
+        'version': __version__,
+        'python': platform.python_version(),
+        'app': {
+            'pages': pages, 'pods': pods, 'scripts': scripts, 'orchestrations': orchestrations,
+            'files': runs[0]['files'], 'bytes': sum(len(f.content.encode('utf-8')) for f in files.values()),
+        },
+        'repeat': len(runs),
+        'findings': runs[0]['findings'],
+        'stages': stages,
+        'rules': {name: min(run['rules'][name] for run in runs) for name in sorted(runs[0]['rules'])},
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Stages and rules that are more than `threshold` (a fraction) slower than the baseline.
+
+    Each regression is {'metric', 'baseline', 'current', 'change'}, metric being
+    e.g. "stages.parse_files" or "rules.ScriptVarUsageRule". Metrics missing from
+    either side are skipped.
+    """
+    regressions = []
+    for section in ('stages', 'rules'):
+        for name, seconds in current.get(section, {}).items():
+            before = baseline.get(section, {}).get(name)
+            if before is None:
+                continue
+            if seconds - before > MIN_REGRESSION_SECONDS and seconds > before * (1 + threshold):
+                regressions.append({
+                    'metric': f"{section}.{name}", 'baseline': before, 'current': seconds,
+                    'change': (seconds - before) / before if before else float('inf'),
+                })
+    return regressions
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('format') != RESULTS_FORMAT:
+        raise ValueError(f"{path} is not a benchmark results file (format {RESULTS_FORMAT})")
+    return results
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+
+
+def format_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None,
+                  slowest_rules: int = 10) -> str:
+    """Human-readable summary, with the change against `baseline` when given."""
+    def row(label: str, seconds: float, before: Optional[float]) -> str:
+        line = f"  {label:<42} {seconds * 1000:9.1f} ms"
+        if before:
+            line += f"  ({(seconds - before) / before:+.0%})"
+        return line
+
+    app = results['app']
+    lines = [
+        f"{app['files']} files ({app['pages']} pages, {app['pods']} pods, {app['scripts']} scripts, "
+        f"{app['orchestrations']} orchestrations), {len(results['rules'])} rules, "
+        f"{results['findings']} findings, best of {results['repeat']}",
+        "Stages:",
+    ]
+    for stage, seconds in results['stages'].items():
+        lines.append(row(stage, seconds, (baseline or {}).get('stages', {}).get(stage)))
+    lines.append("Slowest rules (run alone):")
+    ranked = sorted(results['rules'].items(), key=lambda item: (-item[1], item[0]))[:slowest_rules]
+    for name, seconds in ranked:
+        lines.append(row(name, seconds, (baseline or {}).get('rules', {}).get(name)))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--pods", type=int, default=10)
+    parser.add_argument("--scripts", type=int, default=10)
+    parser.add_argument("--orchestrations", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best time is kept)")
+    parser.add_argument("--output", type=Path, help="Write the results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown (fraction) that counts as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.pages, args.pods, args.scripts, args.orchestrations, args.repeat)
+    baseline = load_results(args.baseline) if args.baseline else None
+    print(format_report(results, baseline))
+    if args.output:
+        save_results(results, args.output)
+    if baseline:
+        regressions = compare_results(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['metric']}: {regression['baseline'] * 1000:.1f} ms -> "
+                  f"{regression['current'] * 1000:.1f} ms ({regression['change']:+.0%})")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,14 @@
 Core file processing functionality for Workday Extend source files.
 """
 
+import os
 import zipfile
 import logging
 from pathlib import Path
-import tempfile
-from typing import Dict, Set, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Optional, Tuple
 
-from .config import FileProcessorConfig, DEFAULT_RELEVANT_EXTENSIONS
+from .config import FileProcessorConfig, DEFAULT_RELEVANT_EXTENSIONS, MAX_CONCURRENT_FILES
 from .models import SourceFile
 
 # Configure logging
@@ -30,6 +31,18 @@ class FileReadError(FileProcessingError):
 DEFAULT_MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 DEFAULT_MAX_ZIP_SIZE = 500 * 1024 * 1024  # 500MB
 
+# Below this many files per thread, bulk reads stay on the calling thread
+_MIN_FILES_PER_READER = 16
+
+# Byte order marks, longest first (the UTF-32 LE mark starts with the UTF-16 LE one)
+_BOMS = (
+    (b'\xff\xfe\x00\x00', 'utf-32-le'),
+    (b'\x00\x00\xfe\xff', 'utf-32-be'),
+    (b'\xef\xbb\xbf', 'utf-8'),
+    (b'\xff\xfe', 'utf-16-le'),
+    (b'\xfe\xff', 'utf-16-be'),
+)
+
 class FileProcessor:
     """Handles file processing operations with practical resource management."""
     
@@ -47,12 +60,14 @@ class FileProcessor:
             self.max_zip_size = config.max_zip_size
             self.relevant_extensions = config.relevant_extensions
             self.encoding = config.encoding
+            self.max_concurrent_files = config.max_concurrent_files
         else:
             self.config = None
             self.max_file_size = max_file_size
             self.max_zip_size = max_zip_size
             self.relevant_extensions = relevant_extensions or DEFAULT_RELEVANT_EXTENSIONS
             self.encoding = encoding
+            self.max_concurrent_files = MAX_CONCURRENT_FILES
         
         # Validate configuration
         if self.max_file_size <= 0 or self.max_zip_size <= 0:
@@ -75,28 +90,20 @@ class FileProcessor:
                 f"Zip file too large: {file_size} bytes (max: {self.max_zip_size} bytes)"
             )
         
-        # Basic zip file integrity check
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Simple check that it's a valid zip file
-                zip_ref.testzip()
-        except zipfile.BadZipFile:
+        # Cheap signature check; member CRCs are verified as members are read
+        if not zipfile.is_zipfile(zip_path):
             raise ZipProcessingError(f"Invalid zip file: {zip_path}")
     
-    def _read_file_safely(self, file_path: Path) -> Optional[str]:
-        """Read a file safely with size checks."""
+    def _read_bytes_safely(self, file_path: Path) -> Optional[bytes]:
+        """Read a file's raw bytes once, or None if it is too large or unreadable."""
         try:
-            # Check file size (practical limit)
-            file_size = file_path.stat().st_size
-            if file_size > self.max_file_size:
-                logger.warning(f"File {file_path.name} too large ({file_size} bytes), skipping")
-                return None
-            
-            # Read file content with fallback encodings
-            content = self._read_with_fallback_encodings(file_path)
-            if content:
-                logger.debug(f"Successfully read file: {file_path.name} ({len(content)} characters)")
-            return content
+            with open(file_path, 'rb') as f:
+                # Check file size (practical limit) on the open handle
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size > self.max_file_size:
+                    logger.warning(f"File {file_path.name} too large ({file_size} bytes), skipping")
+                    return None
+                return f.read()
             
         except PermissionError as e:
             logger.warning(f"Permission denied reading {file_path.name}: {e}")
@@ -105,8 +112,41 @@ class FileProcessor:
             logger.warning(f"Unexpected error reading {file_path.name}: {e}")
             return None
     
-    def _read_with_fallback_encodings(self, file_path: Path) -> Optional[str]:
-        """Read file with fallback encodings if the primary encoding fails."""
+    def _read_files_bulk(self, file_paths: List[Path]) -> List[Optional[bytes]]:
+        """
+        Read the raw bytes of many files on up to max_concurrent_files threads.
+        
+        File reads release the GIL, so slow storage (network shares, cold
+        caches) overlaps; each thread reads a contiguous batch so a warm cache
+        does not pay a task hand-off per file. Results are in input order.
+        """
+        workers = min(self.max_concurrent_files, len(file_paths) // _MIN_FILES_PER_READER)
+        if workers <= 1:
+            return [self._read_bytes_safely(file_path) for file_path in file_paths]
+        batch_size = -(-len(file_paths) // workers)
+        batches = [file_paths[i:i + batch_size] for i in range(0, len(file_paths), batch_size)]
+        with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+            results = executor.map(lambda batch: [self._read_bytes_safely(path) for path in batch], batches)
+            return [data for batch in results for data in batch]
+    
+    def _load_source_files(self, candidates: List[Tuple[str, Path]]) -> Dict[str, SourceFile]:
+        """Bulk-read (key, path) candidates into SourceFiles, keeping candidate order."""
+        source_files = {}
+        raw_contents = self._read_files_bulk([file_path for _, file_path in candidates])
+        for (key, file_path), data in zip(candidates, raw_contents):
+            if data is None:
+                continue
+            content = self._decode_bytes(data, file_path.name)
+            if content is None:
+                continue
+            try:
+                source_files[key] = SourceFile(path=file_path, content=content, size=len(data))
+            except ValueError as e:
+                logger.warning(f"Invalid source file data for {file_path.name}: {e}")
+        return source_files
+    
+    def _encodings_to_try(self) -> list:
+        """The configured encoding followed by the fallback encodings."""
         encodings_to_try = [self.encoding]
         
         # Add fallback encodings if config is available
@@ -115,24 +155,59 @@ class FileProcessor:
         else:
             # Default fallback encodings
             encodings_to_try.extend(["latin-1", "cp1252"])
+        return encodings_to_try
+    
+    def _decode_bytes(self, data: bytes, name: str) -> Optional[str]:
+        """
+        Decode a file's bytes, detecting the encoding once.
         
-        for encoding in encodings_to_try:
-            try:
-                content = file_path.read_text(encoding=encoding)
-                return content
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                logger.debug(f"Failed to read {file_path.name} with encoding {encoding}: {e}")
-                continue
+        A byte order mark decides the encoding outright (and is dropped). Pure
+        ASCII and valid UTF-8 take the fast path when the configured encoding is
+        UTF-8; otherwise the configured and fallback encodings are tried in
+        order. Newlines are translated as text-mode reads do.
+        """
+        content = None
+        for bom, encoding in _BOMS:
+            if data.startswith(bom):
+                try:
+                    content = data[len(bom):].decode(encoding)
+                except UnicodeDecodeError:
+                    pass
+                break
         
-        logger.warning(f"Failed to read {file_path.name} with any encoding")
-        return None
+        if content is None and self.encoding.lower().replace('_', '-') in ('utf-8', 'utf8'):
+            if data.isascii():
+                content = data.decode('ascii')
+            else:
+                try:
+                    content = data.decode('utf-8')
+                except UnicodeDecodeError:
+                    pass
+        
+        if content is None:
+            for encoding in self._encodings_to_try():
+                try:
+                    content = data.decode(encoding)
+                    break
+                except (UnicodeDecodeError, LookupError):
+                    continue
+            else:
+                logger.warning(f"Failed to read {name} with any encoding")
+                return None
+        
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
     
     def process_zip_file(self, zip_path: Path) -> Dict[str, SourceFile]:
         """
-        Extracts a zip file to a temporary directory and discovers all
-        relevant Workday Extend source files.
+        Reads all relevant Workday Extend source files straight out of a zip
+        file, without extracting it to disk.
+
+        Members are selected by extension from the central directory, so
+        irrelevant members are never decompressed. Each relevant member is read
+        with a size cap (max_file_size) and the total decompressed size is capped
+        at max_zip_size, which bounds what a zip bomb can make us inflate.
 
         Args:
             zip_path: The path to the input .zip file.
@@ -155,55 +230,81 @@ class FileProcessor:
         self._validate_zip_file(zip_path)
         
         source_files = {}
+        total_bytes = 0
         
-        # Using a temporary directory is a best practice. It's automatically
-        # cleaned up when the 'with' block is exited, even if errors occur.
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            logger.debug(f"Created temporary directory: {temp_dir}")
-
-            # 1. --- Unzip the Archive ---
-            try:
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_path)
-                logger.info(f"Successfully extracted '{zip_path.name}' to temporary location")
-            except zipfile.BadZipFile as e:
-                raise ZipProcessingError(f"Invalid zip file '{zip_path.name}': {e}")
-            except Exception as e:
-                raise FileProcessingError(f"Failed to extract zip file '{zip_path.name}': {e}")
-
-            # 2. --- Discover and Read Files ---
-            logger.info("Searching for relevant source files...")
-            
-            # Path.rglob('*') is a powerful way to recursively search a directory.
-            for file_path in temp_path.rglob('*'):
-                # Check if the file has one of our target extensions.
-                if file_path.is_file() and file_path.suffix in self.relevant_extensions:
-                    logger.debug(f"Found relevant file: {file_path.name}")
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                logger.info("Searching for relevant source files...")
+                for member in zip_ref.infolist():
+                    relative_path_str = self._zip_member_path(member)
+                    if relative_path_str is None or Path(relative_path_str).suffix not in self.relevant_extensions:
+                        continue
+                    logger.debug(f"Found relevant file: {relative_path_str}")
                     
-                    # Read the file content safely
-                    content = self._read_file_safely(file_path)
-                    if content is not None:
-                        # We use a relative path as the key to keep it clean.
-                        relative_path_str = str(file_path.relative_to(temp_path))
-                        
-                        try:
-                            source_file = SourceFile(
-                                path=file_path,
-                                content=content,
-                                size=len(content.encode(self.encoding))
-                            )
-                            source_files[relative_path_str] = source_file
-                        except ValueError as e:
-                            logger.warning(f"Invalid source file data for {file_path.name}: {e}")
+                    data = self._read_zip_member(zip_ref, member)
+                    if data is None:
+                        continue
+                    total_bytes += len(data)
+                    if total_bytes > self.max_zip_size:
+                        raise ZipProcessingError(
+                            f"Zip file '{zip_path.name}' expands to more than {self.max_zip_size} bytes of source files"
+                        )
+                    
+                    content = self._decode_bytes(data, relative_path_str)
+                    if content is None:
+                        continue
+                    try:
+                        source_file = SourceFile(
+                            path=zip_path / relative_path_str,
+                            content=content,
+                            size=len(data)
+                        )
+                        # Same key an extracted copy would get: the path inside the archive.
+                        source_files[relative_path_str] = source_file
+                    except ValueError as e:
+                        logger.warning(f"Invalid source file data for {relative_path_str}: {e}")
+        except zipfile.BadZipFile as e:
+            raise ZipProcessingError(f"Invalid zip file '{zip_path.name}': {e}")
+        except (FileProcessingError, FileNotFoundError):
+            raise
+        except Exception as e:
+            raise FileProcessingError(f"Failed to read zip file '{zip_path.name}': {e}")
 
-            found_count = len(source_files)
-            logger.info(f"Found {found_count} source file(s) to analyze")
-            
-            if found_count == 0:
-                logger.warning("No relevant source files found in zip archive")
-            
-            return source_files
+        found_count = len(source_files)
+        logger.info(f"Found {found_count} source file(s) to analyze")
+        
+        if found_count == 0:
+            logger.warning("No relevant source files found in zip archive")
+        
+        return source_files
+    
+    @staticmethod
+    def _zip_member_path(member: zipfile.ZipInfo) -> Optional[str]:
+        """
+        Relative path of a zip member, sanitized the way ZipFile.extract() does
+        (no drive, no absolute root, no '.' or '..' parts). None for directories.
+        """
+        if member.is_dir():
+            return None
+        arcname = member.filename.replace('/', os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        parts = [part for part in arcname.split(os.path.sep) if part not in ('', os.path.curdir, os.path.pardir)]
+        return os.path.sep.join(parts) or None
+    
+    def _read_zip_member(self, zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo) -> Optional[bytes]:
+        """Decompress one member, or None if it is larger than max_file_size."""
+        if member.file_size > self.max_file_size:
+            logger.warning(f"File {member.filename} too large ({member.file_size} bytes), skipping")
+            return None
+        with zip_ref.open(member) as member_file:
+            # Never trust the declared size: read at most one byte past the limit.
+            data = member_file.read(self.max_file_size + 1)
+        if len(data) > self.max_file_size:
+            logger.warning(f"File {member.filename} expands past {self.max_file_size} bytes, skipping")
+            return None
+        return data
     
     def process_individual_files(self, file_paths: list[Path]) -> Dict[str, SourceFile]:
         """
@@ -218,7 +319,7 @@ class FileProcessor:
         Raises:
             FileProcessingError: If file processing fails
         """
-        source_files = {}
+        candidates = []
         
         for file_path in file_paths:
             # Validate file exists
@@ -235,21 +336,13 @@ class FileProcessor:
                 logger.warning(f"File {file_path.name} has unsupported extension {file_path.suffix}, skipping")
                 continue
             
-            # Read the file content safely
-            content = self._read_file_safely(file_path)
-            if content is not None:
-                try:
-                    source_file = SourceFile(
-                        path=file_path,
-                        content=content,
-                        size=len(content.encode(self.encoding))
-                    )
-                    # Use the supplied path as the key so files with the same
-                    # basename in different directories don't collide.
-                    source_files[str(file_path)] = source_file
-                    logger.info(f"Successfully processed: {file_path.name}")
-                except ValueError as e:
-                    logger.warning(f"Invalid source file data for {file_path.name}: {e}")
+            # Use the supplied path as the key so files with the same
+            # basename in different directories don't collide.
+            candidates.append((str(file_path), file_path))
+        
+        source_files = self._load_source_files(candidates)
+        for source_file in source_files.values():
+            logger.info(f"Successfully processed: {source_file.path.name}")
         
         logger.info(f"Processed {len(source_files)} file(s)")
         return source_files
@@ -273,29 +366,17 @@ class FileProcessor:
         if not dir_path.is_dir():
             raise FileProcessingError(f"Path is not a directory: {dir_path}")
         
-        source_files = {}
         logger.info(f"Scanning directory: {dir_path}")
         
-        # Recursively find all relevant files
+        # Recursively find all relevant files, then read them in one batch
+        candidates = []
         for file_path in dir_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix in self.relevant_extensions:
+            if file_path.suffix in self.relevant_extensions and file_path.is_file():
                 logger.debug(f"Found relevant file: {file_path.name}")
-                
-                # Read the file content safely
-                content = self._read_file_safely(file_path)
-                if content is not None:
-                    # Use relative path from the base directory
-                    relative_path_str = str(file_path.relative_to(dir_path))
-                    
-                    try:
-                        source_file = SourceFile(
-                            path=file_path,
-                            content=content,
-                            size=len(content.encode(self.encoding))
-                        )
-                        source_files[relative_path_str] = source_file
-                    except ValueError as e:
-                        logger.warning(f"Invalid source file data for {file_path.name}: {e}")
+                # Use relative path from the base directory
+                candidates.append((str(file_path.relative_to(dir_path)), file_path))
+        
+        source_files = self._load_source_files(candidates)
         
         found_count = len(source_files)
         logger.info(f"Found {found_count} source file(s) in directory")
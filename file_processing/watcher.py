@@ -0,0 +1,113 @@
+"""
+Directory watching for review-app --watch.
+
+DirectoryWatcher blocks until relevant source files under a directory change,
+then waits for the burst of saves to settle (editors often write a file several
+times, and "save all" touches many files) and reports the whole batch at once.
+
+The native backend uses the optional `watchfiles` package (inotify on Linux,
+FSEvents on macOS, ReadDirectoryChangesW on Windows), which is installed with
+uvicorn[standard]. Without it, or with use_native=False, the directory is
+polled and compared by modification time and size.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .config import DEFAULT_RELEVANT_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 0.5
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def snapshot_directory(dir_path: Path, extensions: Iterable[str]) -> Snapshot:
+    """Map each relevant file under `dir_path` to its (mtime_ns, size)."""
+    extensions = tuple(extensions)
+    entries: Snapshot = {}
+    for root, _dirs, files in os.walk(dir_path):
+        for name in files:
+            if not name.endswith(extensions):
+                continue
+            full_path = os.path.join(root, name)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue  # Removed between listing and stat
+            entries[full_path] = (stat.st_mtime_ns, stat.st_size)
+    return entries
+
+
+def diff_snapshots(before: Snapshot, after: Snapshot) -> Set[str]:
+    """Paths added, removed or modified between two snapshots."""
+    changed = {path for path, signature in after.items() if before.get(path) != signature}
+    changed.update(path for path in before if path not in after)
+    return changed
+
+
+class DirectoryWatcher:
+    """Waits for debounced batches of changes to relevant files in a directory."""
+
+    def __init__(
+        self,
+        dir_path: Path,
+        extensions: Optional[Iterable[str]] = None,
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_native: bool = True,
+    ):
+        self.dir_path = Path(dir_path)
+        self.extensions = tuple(extensions or DEFAULT_RELEVANT_EXTENSIONS)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._native_changes = None
+        self._snapshot: Optional[Snapshot] = None
+        self.backend = 'polling'
+        if use_native:
+            try:
+                import watchfiles
+            except ImportError:
+                logger.info("watchfiles is not installed; polling for changes")
+            else:
+                self._native_changes = watchfiles.watch(
+                    self.dir_path,
+                    watch_filter=lambda _change, path: path.endswith(self.extensions),
+                    debounce=int(self.debounce * 1000),
+                    raise_interrupt=False,
+                )
+                self.backend = 'native'
+        if self._native_changes is None:
+            self._snapshot = snapshot_directory(self.dir_path, self.extensions)
+
+    def wait(self) -> Set[str]:
+        """
+        Block until relevant files change, and return the changed paths.
+
+        Changes arriving within `debounce` seconds of each other are returned as
+        one batch. Returns an empty set when the native watcher stops (e.g. on
+        Ctrl+C).
+        """
+        if self._native_changes is not None:
+            batch = next(self._native_changes, None)
+            return {path for _change, path in batch} if batch else set()
+        return self._wait_polling()
+
+    def _wait_polling(self) -> Set[str]:
+        changed: Set[str] = set()
+        last_change = None
+        while True:
+            time.sleep(self.poll_interval if last_change is None else min(self.poll_interval, self.debounce))
+            current = snapshot_directory(self.dir_path, self.extensions)
+            difference = diff_snapshots(self._snapshot, current)
+            self._snapshot = current
+            if difference:
+                changed.update(difference)
+                last_change = time.monotonic()
+            elif last_change is not None and time.monotonic() - last_change >= self.debounce:
+                return changed
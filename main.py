@@ -1,17 +1,23 @@
 import typer
 from typing import Optional
 import json
+import multiprocessing
 import os
 import time
 from pathlib import Path
 from file_processing import FileProcessor
 from parser.rules_engine import RulesEngine
 from parser.app_parser import ModelParser
+from parser.profiling import AnalysisProfiler
+from parser.parallel_analysis import ProcessPoolAnalyzer, resolve_jobs
+from parser.incremental import IncrementalAnalyzer, state_path_for
+from parser.ast_cache import configure_ast_cache
+from parser.pmd_script_parser import ParseTierStats, get_parse_stats
 from parser.config import ArcaneAuditorConfig
 from parser.config_manager import load_configuration, get_config_manager
 from output.formatter import OutputFormatter, OutputFormat
 from utils.arcane_paths import ensure_sample_rule_config
-from utils.console import set_quiet, info, success, warn, error, result
+from utils.console import set_quiet, get_quiet, info, success, warn, error, result
 from __version__ import __version__
 
 app = typer.Typer(add_completion=False, help="Arcane Auditor CLI: A mystical code review tool for Workday Extend applications - part of Developers and Dragons")
@@ -40,7 +46,8 @@ def review_app(
     config_file: Path = typer.Option(None, "--config", "-c", help="Path to configuration file (JSON)"),
     output_format: Optional[str] = typer.Option(None, "--format", "-f", help="Output format: console (default), JSON (default with --ci), summary, or excel."),
     output_file: Path = typer.Option(None, "--output", "-o", help="Output file path (optional)"),
-    show_timing: bool = typer.Option(False, "--timing", "-t", help="Show detailed timing information"),
+    show_timing: bool = typer.Option(False, "--timing", "-t", help="Show detailed timing information (and add a timing block to JSON output)"),
+    profile_dir: Optional[Path] = typer.Option(None, "--profile-dir", help="Run each rule under cProfile and write <RuleName>.pstats files here (implies --timing; rules run serially)"),
     fail_on_advice: bool = typer.Option(False, "--fail-on-advice", help="Exit with error code when ADVICE issues are found (CI mode)"),
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Minimal output mode (CI-friendly)"),
     ci: bool = typer.Option(False, "--ci", help="CI preset: quiet, JSON format, default output file (overridable by explicit --format/--output)"),
@@ -50,7 +57,12 @@ def review_app(
     severity_filter: Optional[str] = typer.Option(None, "--severity", help="Filter findings by severity (ACTION or ADVICE)."),
     fix_strategy_filter: Optional[str] = typer.Option(None, "--fix-strategy", help="Filter findings by fix_strategy (comma-separated: actionable, human_review)."),
     files_glob: Optional[str] = typer.Option(None, "--files", help="Comma-separated glob patterns (fnmatch) limiting which input files are parsed (e.g. '*.pmd', '*.pod,*.script'). A file is kept if ANY pattern matches."),
-    single_tab: bool = typer.Option(False, "--single-tab", help="Export all findings to a single Excel tab with File column (Excel format only)")
+    single_tab: bool = typer.Option(False, "--single-tab", help="Export all findings to a single Excel tab with File column (Excel format only)"),
+    jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Worker processes for parsing and analysis (0 = one per CPU). Defaults to execution.jobs from the configuration (1)."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the persistent on-disk AST cache"),
+    cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", help="Directory for the persistent AST cache (default: per-user cache directory). Entries are unpickled when read, so use a directory only you can write to and never share it"),
+    incremental: bool = typer.Option(False, "--incremental", help="Re-parse and re-check only files changed since the previous --incremental run of this path"),
+    watch: bool = typer.Option(False, "--watch", "-w", help="Keep running and re-analyze the directory whenever its files change, printing new and resolved findings")
 ):
     """
     Analyze a Workday Extend application.
@@ -89,6 +101,8 @@ def review_app(
     else:
         effective_output_file = output_file if output_file is not None else (Path("arcane-auditor-results.json") if ci else None)
     set_quiet(effective_quiet)
+    show_timing = show_timing or profile_dir is not None
+    profiler = AnalysisProfiler(str(profile_dir) if profile_dir else None) if show_timing else None
 
     # Start overall timing
     overall_start_time = time.time()
@@ -152,17 +166,13 @@ def review_app(
         error(f"File Processing Error: {e}")
         raise typer.Exit(2)  # Exit code 2 for usage errors
 
+    if watch and not path.is_dir():
+        error("--watch requires a directory")
+        raise typer.Exit(2)  # Exit code 2 for usage errors
+
     if files_glob:
-        import fnmatch
-        patterns = [p.strip() for p in files_glob.split(",") if p.strip()]
         before = len(source_files_map)
-        source_files_map = {
-            k: v for k, v in source_files_map.items()
-            if any(
-                fnmatch.fnmatch(k, p) or fnmatch.fnmatch(os.path.basename(k), p)
-                for p in patterns
-            )
-        }
+        source_files_map = _filter_files_glob(source_files_map, files_glob)
         info(f"--files '{files_glob}' kept {len(source_files_map)}/{before} files")
 
     file_processing_time = time.time() - file_processing_start_time
@@ -179,45 +189,67 @@ def review_app(
     for path_key, source_file in source_files_map.items():
         info(f"  - Ready to parse: {path_key}")
 
-    info("Parsing files into App File models...")
-    parsing_start_time = time.time()
-    try:
-        pmd_parser = ModelParser()
-        context = pmd_parser.parse_files(source_files_map)
-        parsing_time = time.time() - parsing_start_time
+    effective_jobs = resolve_jobs(jobs if jobs is not None else config.execution.jobs)
+    ast_cache = configure_ast_cache(str(cache_dir) if cache_dir else None, enabled=not no_cache)
+
+    use_incremental = incremental or config.execution.incremental
+    if use_incremental and effective_jobs > 1:
+        warn("--incremental runs in-process; ignoring --jobs")
+        effective_jobs = 1
+
+    context = None
+    parsing_time = 0.0  # Parsing happens inside the analyzers in the modes below
+    if watch:
+        info("Watch mode parses and analyzes in a long-lived session")
+    elif use_incremental:
+        # Incremental mode decides what to re-parse once it has loaded its state.
+        info("Parsing and analysis will reuse results for unchanged files")
+    elif effective_jobs > 1:
+        # Process-pool mode parses inside the workers, alongside rule execution.
+        info(f"Parsing and analysis will run in {effective_jobs} worker processes")
+    else:
+        info("Parsing files into App File models...")
+        parsing_start_time = time.time()
+        try:
+            pmd_parser = ModelParser()
+            context = pmd_parser.parse_files(source_files_map, profiler)
+            parsing_time = time.time() - parsing_start_time
         
-        # Better summary of what was parsed
-        parsed_summary = []
-        if context.pmds: parsed_summary.append(f"{len(context.pmds)} PMD files")
-        if context.scripts: parsed_summary.append(f"{len(context.scripts)} script files")
-        if context.pods: parsed_summary.append(f"{len(context.pods)} Pod files")
-        if context.smd: parsed_summary.append("SMD file")
-        if context.amd: parsed_summary.append("AMD file")
+            # Better summary of what was parsed
+            parsed_summary = []
+            if context.pmds: parsed_summary.append(f"{len(context.pmds)} PMD files")
+            if context.scripts: parsed_summary.append(f"{len(context.scripts)} script files")
+            if context.pods: parsed_summary.append(f"{len(context.pods)} Pod files")
+            if context.smd: parsed_summary.append("SMD file")
+            if context.amd: parsed_summary.append("AMD file")
         
-        if parsed_summary:
-            info(f"Parsed: {', '.join(parsed_summary)}")
-        else:
-            info("No files were successfully parsed")
+            if parsed_summary:
+                info(f"Parsed: {', '.join(parsed_summary)}")
+            else:
+                info("No files were successfully parsed")
 
-        if show_timing:
-            info(f"File parsing: {parsing_time:.2f}s")
+            if show_timing:
+                info(f"File parsing: {parsing_time:.2f}s")
 
-    except Exception as e:
-        error(f"Parsing Error: {e}")
-        error("Check that your files are valid Workday Extend format")
-        raise typer.Exit(3)  # Exit code 3 for runtime errors
+        except Exception as e:
+            error(f"Parsing Error: {e}")
+            error("Check that your files are valid Workday Extend format")
+            raise typer.Exit(3)  # Exit code 3 for runtime errors
 
     info("Initializing rules engine...")
     findings = []  # Initialize findings before try block
+    timing_report = None  # Set by --timing; added to JSON output
     try:
         rules_init_start_time = time.time()
-        rules_engine = RulesEngine(config)
+        include_set = {x.strip() for x in rules_filter.split(",")} if rules_filter else None
+        exclude_set = {x.strip() for x in exclude_rules.split(",")} if exclude_rules else set()
+        # With only --rules, just the selected rules' modules are imported; --exclude-rules
+        # names are validated against every rule, so it needs them all.
+        rules_engine = RulesEngine(config, rule_ids=include_set if not exclude_set else None)
         rules_init_time = time.time() - rules_init_start_time
 
         if rules_filter or exclude_rules:
             available_ids = {r.__class__.__name__ for r in rules_engine.rules}
-            include_set = {x.strip() for x in rules_filter.split(",")} if rules_filter else None
-            exclude_set = {x.strip() for x in exclude_rules.split(",")} if exclude_rules else set()
             unknown = ((include_set or set()) | exclude_set) - available_ids
             if unknown:
                 error(f"Unknown rule(s): {', '.join(sorted(unknown))}")
@@ -232,9 +264,30 @@ def review_app(
         if show_timing:
             info(f"Rules engine initialization: {rules_init_time:.2f}s")
 
+        if watch:
+            _watch_directory(path, processor, rules_engine, files_glob)
+            return
+
         info("Invoking analysis...")
         analysis_start_time = time.time()
-        findings = rules_engine.run(context)
+        if use_incremental:
+            from utils.arcane_paths import get_cache_dir
+            analyzer = IncrementalAnalyzer(rules_engine, state_path_for(path, Path(get_cache_dir())))
+            try:
+                context, findings = analyzer.analyze(source_files_map, profiler)
+            except Exception as e:
+                error(f"Parsing Error: {e}")
+                error("Check that your files are valid Workday Extend format")
+                raise typer.Exit(3)  # Exit code 3 for runtime errors
+        elif effective_jobs > 1:
+            try:
+                context, findings = ProcessPoolAnalyzer(rules_engine, effective_jobs).analyze(source_files_map)
+            except Exception as e:
+                error(f"Parsing Error: {e}")
+                error("Check that your files are valid Workday Extend format")
+                raise typer.Exit(3)  # Exit code 3 for runtime errors
+        else:
+            findings = rules_engine.run(context, profiler=profiler)
         analysis_time = time.time() - analysis_start_time
 
         if severity_filter:
@@ -264,6 +317,43 @@ def review_app(
 
         if show_timing:
             info(f"Analysis execution: {analysis_time:.2f}s")
+            if ast_cache is not None and effective_jobs <= 1:
+                cache_stats = ast_cache.stats()
+                info(f"AST cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses ({ast_cache.cache_dir})")
+            if effective_jobs <= 1:
+                intern_stats = context.get_ast_cache_stats()
+                info(f"Interned ASTs: {intern_stats['scripts']} unique scripts, "
+                     f"{intern_stats['hits']} hits, {intern_stats['misses']} misses")
+                for kind, kind_stats in context.get_ast_kind_stats().items():
+                    info(f"  {kind}: {kind_stats['scripts']} unique, {kind_stats['hits']} hits, "
+                         f"{kind_stats['misses']} misses, {kind_stats['seconds']:.2f}s parsing")
+            tier_stats = get_parse_stats().snapshot()
+            info("Script parser tiers: " + ", ".join(
+                f"{tier} {tier_stats['counts'][tier]} ({tier_stats['seconds'][tier]:.2f}s)"
+                for tier in ParseTierStats.TIERS
+            ) + f", known-fallback hits {tier_stats['negative_cache_hits']}")
+            top_reasons = sorted(tier_stats['lalr_failure_reasons'].items(), key=lambda item: (-item[1], item[0]))[:5]
+            for reason, count in top_reasons:
+                info(f"  LALR failure x{count}: {reason}")
+            for stage, seconds in (('config', config_time), ('file_processing', file_processing_time),
+                                   ('parsing', parsing_time), ('rules_init', rules_init_time),
+                                   ('analysis', analysis_time)):
+                profiler.record_stage(stage, seconds)
+            timing_report = profiler.timing_report(context if effective_jobs <= 1 else None, findings)
+            if timing_report['multiplexed']:
+                multiplexed = timing_report['multiplexed']
+                info(f"Multiplexed script rules ({len(multiplexed['rules'])}): "
+                     f"{multiplexed['wall']:.3f}s wall, {multiplexed['cpu']:.3f}s CPU")
+            if timing_report['rules']:
+                info("Slowest rules (wall / CPU / findings):")
+                for name, rule_timing in list(timing_report['rules'].items())[:10]:
+                    info(f"  {name}: {rule_timing['wall']:.3f}s / {rule_timing['cpu']:.3f}s / {rule_timing['findings']}")
+            if timing_report['files']:
+                info("Slowest files to parse:")
+                for file_path, seconds in list(timing_report['files'].items())[:5]:
+                    info(f"  {file_path}: {seconds:.3f}s")
+            if profile_dir is not None:
+                info(f"Per-rule cProfile stats written to {profile_dir}")
 
         # Auto-detect format based on effective output file extension if not explicitly specified
         working_format = effective_output_format
@@ -295,7 +385,10 @@ def review_app(
         if format_type == OutputFormat.EXCEL:
             formatted_output = formatter.format_results(findings, total_files, total_rules, context, None, None, single_tab)
         else:
-            formatted_output = formatter.format_results(findings, total_files, total_rules, context)
+            formatted_output = formatter.format_results(
+                findings, total_files, total_rules, context,
+                timing=timing_report,
+            )
         formatting_time = time.time() - formatting_start_time
 
         if show_timing:
@@ -404,6 +497,102 @@ def review_app(
         raise typer.Exit(0)
 
 
+def _filter_files_glob(source_files_map: dict, files_glob: str) -> dict:
+    """Keep the files whose path or base name matches any --files pattern."""
+    import fnmatch
+    patterns = [p.strip() for p in files_glob.split(",") if p.strip()]
+    return {
+        k: v for k, v in source_files_map.items()
+        if any(
+            fnmatch.fnmatch(k, p) or fnmatch.fnmatch(os.path.basename(k), p)
+            for p in patterns
+        )
+    }
+
+
+def _watch_directory(path: Path, processor: FileProcessor, rules_engine: RulesEngine, files_glob: Optional[str]) -> None:
+    """Run review-app --watch until interrupted."""
+    from file_processing.watcher import DirectoryWatcher
+    from parser.watch import WatchSession
+
+    def load_sources():
+        source_files_map = processor.process_directory(path)
+        return _filter_files_glob(source_files_map, files_glob) if files_glob else source_files_map
+
+    def report(iteration):
+        # The per-iteration chatter from parsing and rules would bury the diff.
+        for finding in iteration.resolved:
+            result(f"- {finding!r}")
+        for finding in iteration.new:
+            result(f"+ {finding!r}")
+        result(
+            f"[{time.strftime('%H:%M:%S')}] {len(iteration.findings)} issue(s): "
+            f"{len(iteration.new)} new, {len(iteration.resolved)} resolved ({iteration.seconds:.2f}s)"
+        )
+
+    watcher = DirectoryWatcher(path, processor.relevant_extensions)
+    session = WatchSession(rules_engine, load_sources)
+    result(f"Watching {path} for changes ({watcher.backend} watcher). Press Ctrl+C to stop.")
+    previous_quiet = get_quiet()
+    set_quiet(True)
+    try:
+        session.run(watcher, report, on_error=lambda e: error(f"Analysis Error: {e}"))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        set_quiet(previous_quiet)
+    info("Stopped watching.")
+
+
+@app.command()
+def bench(
+    pages: int = typer.Option(50, "--pages", help="Pages (.pmd) in the generated application"),
+    pods: int = typer.Option(10, "--pods", help="Pods (.pod) in the generated application"),
+    scripts: int = typer.Option(10, "--scripts", help="Standalone scripts (.script) in the generated application"),
+    orchestrations: int = typer.Option(5, "--orchestrations", help="Orchestrations in the generated application"),
+    repeat: int = typer.Option(3, "--repeat", "-r", help="Runs per stage (the best time is kept)"),
+    config_file: Path = typer.Option(None, "--config", "-c", help="Path to configuration file (JSON)"),
+    output_file: Path = typer.Option(None, "--output", "-o", help="Write the results JSON to this file"),
+    baseline: Optional[Path] = typer.Option(None, "--baseline", "-b", exists=True, help="Results JSON from an earlier run to compare against"),
+    threshold: float = typer.Option(0.15, "--threshold", help="Slowdown (fraction) that counts as a regression against --baseline"),
+):
+    """
+    Benchmark the analysis pipeline on a generated application.
+
+    Times file processing, preprocessing, parsing, AST precomputation, every rule
+    and output formatting. Exits with code 1 if --baseline is given and a stage or
+    rule is slower than it by more than --threshold.
+    """
+    try:
+        from benchmarks.suite import compare_results, format_report, load_results, run_benchmark, save_results
+    except ImportError:
+        error("The benchmark suite is only available in a source installation (benchmarks/ is missing)")
+        raise typer.Exit(2)
+
+    try:
+        config = load_configuration(str(config_file) if config_file else None)
+        baseline_results = load_results(baseline) if baseline else None
+    except Exception as e:
+        error(f"Configuration Error: {e}")
+        raise typer.Exit(2)
+
+    info(f"Benchmarking a generated app ({pages} pages, {pods} pods, {scripts} scripts, {orchestrations} orchestrations)...")
+    results = run_benchmark(pages, pods, scripts, orchestrations, repeat, config)
+    result(format_report(results, baseline_results))
+    if output_file:
+        save_results(results, output_file)
+        info(f"Results written to {output_file}")
+
+    if baseline_results is not None:
+        regressions = compare_results(results, baseline_results, threshold)
+        for regression in regressions:
+            warn(f"Regression in {regression['metric']}: {regression['baseline'] * 1000:.1f} ms -> "
+                 f"{regression['current'] * 1000:.1f} ms ({regression['change']:+.0%})")
+        if regressions:
+            raise typer.Exit(1)
+        success(f"No regressions against {baseline} (threshold {threshold:.0%})")
+
+
 @app.command()
 def generate_config(
     output_file: Path = typer.Option("arcane-auditor-config.json", "--output", "-o", help="Output file path for the configuration")
@@ -570,7 +759,7 @@ def describe_rule(
     """Print full machine-readable metadata for a single rule (JSON)."""
     set_quiet(True)
     config = ArcaneAuditorConfig()
-    rules_engine = RulesEngine(config)
+    rules_engine = RulesEngine(config, rule_ids=[rule_id])
     rule = next((r for r in rules_engine.rules if r.__class__.__name__ == rule_id), None)
     if rule is None:
         error(f"Unknown rule: {rule_id}")
@@ -642,4 +831,7 @@ def list_configs():
 
 
 if __name__ == "__main__":
+    # In frozen (PyInstaller) builds, --jobs workers re-run this executable;
+    # freeze_support() makes those runs execute the worker and exit.
+    multiprocessing.freeze_support()
     app()
\ No newline at end of file
@@ -45,10 +45,14 @@ class OutputFormatter:
     
     def format_results(self, findings: List[Finding], total_files: int = 0, total_rules: int = 0,
                       context: Optional['ProjectContext'] = None, config_name: Optional[str] = None,
-                      config_source: Optional[str] = None, single_tab: bool = False) -> str:
-        """Format analysis results based on the selected format."""
+                      config_source: Optional[str] = None, single_tab: bool = False,
+                      timing: Optional[Dict] = None) -> str:
+        """Format analysis results based on the selected format.
+
+        `timing` (an AnalysisProfiler.timing_report()) is included in JSON output only.
+        """
         if self.format_type == OutputFormat.JSON:
-            return self._format_json(findings, total_files, total_rules, context)
+            return self._format_json(findings, total_files, total_rules, context, timing)
         elif self.format_type == OutputFormat.SUMMARY:
             return self._format_summary(findings, total_files, total_rules)
         elif self.format_type == OutputFormat.EXCEL:
@@ -140,7 +144,7 @@ class OutputFormatter:
         return "\n".join(output)
     
     def _format_json(self, findings: List[Finding], total_files: int, total_rules: int,
-                    context: Optional['ProjectContext'] = None) -> str:
+                    context: Optional['ProjectContext'] = None, timing: Optional[Dict] = None) -> str:
         """Format results as v2 agent-mode JSON.
 
         Schema is documented in `.claude/agent-mode.md`. Each finding nests
@@ -194,6 +198,9 @@ class OutputFormatter:
         if context and context.analysis_context:
             result["context"] = context.analysis_context.to_dict()
 
+        if timing is not None:
+            result["timing"] = timing
+
         return json.dumps(result, indent=2)
 
     def _build_source_content_lookup(self, context: Optional['ProjectContext']) -> Dict[str, str]:
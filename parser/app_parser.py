@@ -3,6 +3,7 @@ Parser to convert source files into PMD models for analysis.
 """
 import json
 import os
+import time
 from pathlib import Path
 from typing import Dict, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -16,6 +17,19 @@ class ModelParser:
     
     def __init__(self):
         self.supported_extensions = {'.pmd', '.script', '.amd', '.pod', '.smd', '.wqlquery', '.orchestration', '.suborchestration'}
+        self._script_field_extractor = None
+    
+    def _get_script_field_extractor(self):
+        """A concrete Rule whose script field walkers are reused while loading files."""
+        if self._script_field_extractor is None:
+            from .rules.base import Rule
+            
+            class ScriptFieldExtractor(Rule):
+                def analyze(self, context):
+                    yield from []
+            
+            self._script_field_extractor = ScriptFieldExtractor()
+        return self._script_field_extractor
     
     def _filter_commented_keys(self, data):
         """
@@ -39,17 +53,37 @@ class ModelParser:
         else:
             return data
     
-    def parse_files(self, source_files_map: Dict[str, Any]) -> ProjectContext:
+    def parse_files(self, source_files_map: Dict[str, Any], profiler=None) -> ProjectContext:
         """
         Parse source files into a ProjectContext with populated models.
         Uses parallel processing for improved performance with large applications.
         
         Args:
             source_files_map: Dictionary mapping file paths to SourceFile objects
+            profiler: Optional AnalysisProfiler recording each file's parse time
             
         Returns:
             ProjectContext with all parsed models
         """
+        context = self.parse_models(source_files_map, profiler)
+        self.finalize_context(context, source_files_map, profiler)
+        return context
+    
+    def parse_models(self, source_files_map: Dict[str, Any], profiler=None) -> ProjectContext:
+        """
+        Parse source files into models without the derived caches.
+        
+        This is the per-file half of parse_files(); finalize_context() does the
+        rest. Incremental analysis uses the two halves separately so it can mix
+        freshly parsed models with ones restored from a previous run.
+        
+        Args:
+            source_files_map: Dictionary mapping file paths to SourceFile objects
+            profiler: Optional AnalysisProfiler recording each file's parse time
+            
+        Returns:
+            ProjectContext holding the parsed models and any parsing errors
+        """
         context = ProjectContext()
         
         # For small numbers of files, use serial processing to avoid overhead
@@ -57,7 +91,7 @@ class ModelParser:
             info("Using serial file parsing (small file count)")
             for file_path, source_file in source_files_map.items():
                 try:
-                    self._parse_single_file(file_path, source_file, context)
+                    self._parse_single_file_timed(file_path, source_file, context, profiler)
                 except Exception as e:
                     error(f"Failed to parse {file_path}: {e}")
                     context.parsing_errors.append(f"{file_path}: {e}")
@@ -68,7 +102,7 @@ class ModelParser:
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # Submit all parsing tasks
                 future_to_file = {
-                    executor.submit(self._parse_single_file_safe, file_path, source_file): file_path
+                    executor.submit(self._parse_single_file_safe, file_path, source_file, profiler): file_path
                     for file_path, source_file in source_files_map.items()
                 }
                 
@@ -86,22 +120,37 @@ class ModelParser:
                         error(f"Failed to parse {file_path}: {e}")
                         context.parsing_errors.append(f"{file_path}: {e}")
         
+        return context
+    
+    def finalize_context(self, context: ProjectContext, source_files_map: Dict[str, Any], profiler=None) -> None:
+        """
+        Build the derived per-model caches and the analysis context.
+        
+        Args:
+            context: ProjectContext holding every model of the application
+            source_files_map: Dictionary mapping file paths to SourceFile objects
+            profiler: Optional AnalysisProfiler recording the AST precompute time
+        """
+        # Index line starts of every model's source once; line lookups in rules use it
+        self._build_source_indexes(context)
+        
         # Pre-compute script fields for all PMD and POD models to improve rule performance
         self._precompute_script_fields(context)
         
         # Pre-compute ASTs for all script fields to avoid repeated parsing
+        precompute_start = time.perf_counter()
         self._precompute_asts(context)
+        if profiler is not None:
+            profiler.record_stage('precompute_asts', time.perf_counter() - precompute_start)
         
         # Initialize analysis context for tracking missing cross-file dependencies
         self._initialize_analysis_context(context, source_files_map)
-        
-        return context
     
-    def _parse_single_file_safe(self, file_path: str, source_file: Any):
+    def _parse_single_file_safe(self, file_path: str, source_file: Any, profiler=None):
         """Thread-safe version of _parse_single_file that returns a new context."""
         try:
             temp_context = ProjectContext()
-            self._parse_single_file(file_path, source_file, temp_context)
+            self._parse_single_file_timed(file_path, source_file, temp_context, profiler)
             return temp_context, None
         except Exception as e:
             return None, str(e)
@@ -131,6 +180,16 @@ class ModelParser:
         if temp_context.amd:
             main_context.amd = temp_context.amd
     
+    def _parse_single_file_timed(self, file_path: str, source_file: Any, context: ProjectContext, profiler=None):
+        """_parse_single_file, recording its time with `profiler` when given."""
+        if profiler is None:
+            return self._parse_single_file(file_path, source_file, context)
+        start = time.perf_counter()
+        try:
+            self._parse_single_file(file_path, source_file, context)
+        finally:
+            profiler.record_file(file_path, time.perf_counter() - start)
+
     def _parse_single_file(self, file_path: str, source_file: Any, context: ProjectContext):
         """Parse a single source file based on its extension."""
         path_obj = Path(file_path)
@@ -297,6 +356,10 @@ class ModelParser:
                 # Set line mappings for proper error reporting
                 pmd_model.set_line_mappings(line_mappings)
                 pmd_model.set_hash_to_lines_mapping(hash_to_lines)
+                # Collect the script field table while the line mappings are fresh
+                pmd_model.set_cached_script_fields(
+                    self._get_script_field_extractor()._extract_script_fields(pmd_model)
+                )
                 
                 context.pmds[file_path] = pmd_model
                 # Show cleaned filename for consistency with "Parsed Script" messages
@@ -390,6 +453,9 @@ class ModelParser:
                 
                 # Set hash-based line mappings for POD files too
                 pod_model.set_hash_to_lines_mapping(hash_to_lines)
+                pod_model.set_cached_script_fields(
+                    self._get_script_field_extractor()._extract_pod_script_fields(pod_model)
+                )
                 
                 context.pods[file_path] = pod_model
                 info(f"Parsed Pod: {pod_model.podId}")
@@ -440,97 +506,58 @@ class ModelParser:
             error(f"Failed to parse SMD file {file_path}: {e}")
             raise
     
+    def _build_source_indexes(self, context: ProjectContext):
+        """Build the SourceIndex of every model that keeps its source content."""
+        models = [
+            *context.pmds.values(), *context.pods.values(),
+            *context.wqlqueries.values(), *context.orchestrations.values(),
+            context.amd, context.smd,
+        ]
+        for model in models:
+            if model is not None:
+                model.get_source_index()
+    
     def _precompute_script_fields(self, context: ProjectContext):
-        """Pre-compute script fields for all PMD and POD models to improve rule performance."""
-        from .rules.base import Rule
-        
-        # Create a concrete rule instance to use its script field extraction methods
-        class TempRule(Rule):
-            def analyze(self, context):
-                yield from []
+        """Publish the script field tables collected at load time in the context caches."""
+        extractor = self._get_script_field_extractor()
         
-        temp_rule = TempRule()
-        
-        # Pre-compute PMD script fields
         for pmd_id, pmd_model in context.pmds.items():
-            script_fields = temp_rule._extract_script_fields(pmd_model)
-            context.set_cached_pmd_script_fields(pmd_id, script_fields)
+            context.set_cached_pmd_script_fields(pmd_id, extractor.find_script_fields(pmd_model))
         
-        # Pre-compute POD script fields
         for pod_id, pod_model in context.pods.items():
-            script_fields = temp_rule.find_pod_script_fields(pod_model)
-            context.set_cached_pod_script_fields(pod_id, script_fields)
+            context.set_cached_pod_script_fields(pod_id, extractor.find_pod_script_fields(pod_model))
         
         info(f"Pre-computed script fields for {len(context.pmds)} PMD files and {len(context.pods)} POD files")
     
     def _precompute_asts(self, context: ProjectContext):
-        """Pre-compute ASTs for all script fields to avoid repeated parsing."""
-        from .rules.base import Rule
-        from .pmd_script_parser import parse_with_preprocessor
+        """
+        Pre-compute ASTs for all script fields to avoid repeated parsing.
         
-        # Create a concrete rule instance to use its script field extraction methods
-        class TempRule(Rule):
-            def analyze(self, context):
-                yield from []
+        Trees are interned in the context by script digest, so a snippet shared
+        by many fields or files is parsed once and every rule reuses the tree.
+        """
+        temp_rule = self._get_script_field_extractor()
         
-        temp_rule = TempRule()
+        scripts = []
+        for pmd_id in context.pmds:
+            scripts.extend(field[1] for field in context.get_cached_pmd_script_fields(pmd_id) or ())
+        for pod_id in context.pods:
+            scripts.extend(field[1] for field in context.get_cached_pod_script_fields(pod_id) or ())
+        scripts.extend(script_model.source for script_model in context.scripts.values())
         
-        ast_count = 0
+        misses_before = context.get_ast_cache_stats()['misses']
         error_count = 0
-        
-        # Pre-compute ASTs for PMD script fields
-        for pmd_id, pmd_model in context.pmds.items():
-            cached_fields = context.get_cached_pmd_script_fields(pmd_id)
-            if cached_fields:
-                for field_path, field_value, field_name, line_offset in cached_fields:
-                    if field_value and len(field_value.strip()) > 0:
-                        try:
-                            parsed_script = temp_rule._strip_pmd_wrappers(field_value)
-                            if parsed_script:
-                                # Check if AST is already cached
-                                cache_key = hash(parsed_script)
-                                if context.get_cached_ast(cache_key) is None:
-                                    # Use _parse_script_content to handle string extraction properly
-                                    ast = temp_rule._parse_script_content(field_value, context)
-                                    context.set_cached_ast(cache_key, ast)
-                                    ast_count += 1
-                        except Exception as e:
-                            error_count += 1
-        
-        # Pre-compute ASTs for POD script fields
-        for pod_id, pod_model in context.pods.items():
-            cached_fields = context.get_cached_pod_script_fields(pod_id)
-            if cached_fields:
-                for field_path, field_value, field_name, line_offset in cached_fields:
-                    if field_value and len(field_value.strip()) > 0:
-                        try:
-                            parsed_script = temp_rule._strip_pmd_wrappers(field_value)
-                            if parsed_script:
-                                # Check if AST is already cached
-                                cache_key = hash(parsed_script)
-                                if context.get_cached_ast(cache_key) is None:
-                                    # Use _parse_script_content to handle string extraction properly
-                                    ast = temp_rule._parse_script_content(field_value, context)
-                                    context.set_cached_ast(cache_key, ast)
-                                    ast_count += 1
-                        except Exception as e:
-                            error_count += 1
-        
-        # Pre-compute ASTs for standalone script files
-        for script_name, script_model in context.scripts.items():
-            if script_model.source and len(script_model.source.strip()) > 0:
+        for script_content in scripts:
+            if script_content and script_content.strip():
                 try:
-                    # Check if AST is already cached
-                    cache_key = hash(script_model.source)
-                    if context.get_cached_ast(cache_key) is None:
-                        # Use _parse_script_content to handle any preprocessing needed
-                        ast = temp_rule._parse_script_content(script_model.source, context)
-                        context.set_cached_ast(cache_key, ast)
-                        ast_count += 1
-                except Exception as e:
+                    # Use _parse_script_content to handle string extraction properly
+                    temp_rule._parse_script_content(script_content, context)
+                except Exception:
                     error_count += 1
         
-        info(f"Pre-computed {ast_count} ASTs (errors: {error_count})")
+        ast_stats = context.get_ast_cache_stats()
+        ast_count = ast_stats['misses'] - misses_before
+        info(f"Pre-computed {ast_count} ASTs for {len(scripts)} script blocks (errors: {error_count})")
     
     def _initialize_analysis_context(self, context: ProjectContext, source_files_map: Dict[str, Any]):
         """
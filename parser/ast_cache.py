@@ -0,0 +1,415 @@
+"""
+Persistent, content-addressed cache of parsed PMD script ASTs.
+
+The in-memory AST caches on ProjectContext and Rule only live for one process,
+so every CLI run re-parses every script block even when almost nothing changed.
+DiskASTCache stores pickled Lark trees on disk, keyed by the SHA-256 of the
+preprocessed script together with a digest of the grammar, the package version
+and the Lark version, so a grammar or release change never serves a stale tree.
+
+The cache is off unless configure_ast_cache() enables it (review_app does so by
+default; --no-cache turns it off). parse_with_preprocessor consults it, which
+covers both ModelParser._precompute_asts and Rule.get_cached_ast.
+
+The directory is bounded by size: hits refresh an entry's mtime and, when a write
+pushes the total over the limit, the least recently used entries are removed.
+
+ASTInternTable is the in-memory side: one per ProjectContext, it maps a SHA-256
+digest of each script to its tree so that a snippet repeated across many pages,
+pods and widgets is parsed once per run. Every script parse of a run goes
+through it (Rule.get_cached_ast, Rule._parse_script_content, the <% %> blocks
+of template expressions, PMDModel's onLoad/script trees), and it keeps hit,
+miss and parse-time counters per source kind so a timing report shows where
+parsing time goes.
+"""
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from utils.console import warn
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Pruning removes entries until the cache is back under this fraction of the
+# limit, so a full cache does not rescan the directory on every write.
+_PRUNE_TARGET = 0.9
+
+_ENTRY_SUFFIX = '.ast'
+
+# Bump when the on-disk entry layout changes.
+_CACHE_FORMAT = 1
+
+_MISSING = object()
+
+
+def _rebuild_token(type_, value, start_pos, line, column, end_line, end_column, end_pos):
+    from lark import Token
+    return Token(type_, value, start_pos, line, column, end_line, end_column, end_pos)
+
+
+class _TreePickler(pickle.Pickler):
+    """Pickler that keeps the end positions Lark's own Token.__reduce__ drops."""
+
+    def reducer_override(self, obj):
+        from lark import Token
+        if isinstance(obj, Token):
+            return _rebuild_token, (
+                obj.type, str(obj), obj.start_pos, obj.line, obj.column,
+                obj.end_line, obj.end_column, obj.end_pos,
+            )
+        return NotImplemented
+
+
+def dumps_tree(tree: Any) -> bytes:
+    """Serialize a Lark tree without losing token end positions."""
+    buffer = io.BytesIO()
+    _TreePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(tree)
+    return buffer.getvalue()
+
+
+def grammar_fingerprint() -> str:
+    """Digest of everything that determines the shape of a parsed tree."""
+    import lark
+    from __version__ import __version__
+    from .pmd_script_parser import load_grammar
+
+    digest = hashlib.sha256()
+    digest.update(load_grammar().encode('utf-8'))
+    digest.update(f"\0{__version__}\0{lark.__version__}\0{_CACHE_FORMAT}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ASTInternTable:
+    """
+    Parsed script trees of one analysis run, keyed by a digest of the script.
+
+    The key is the SHA-256 of the script text handed to the parser (wrappers
+    already stripped). Preprocessing is a pure function of that text, so equal
+    keys always mean equal preprocessed source. Unlike hash(), the digest is the
+    same in every process and cannot collide in practice. A stored None records
+    a script that failed to parse, so it is not retried. `kind` keeps trees of
+    different shapes for the same text apart and names the source they came from:
+
+    - 'script': script fields of pages and pods, .script files, onLoad/script
+    - 'template': template expressions ("text <% expr %> text"), as a whole
+    - 'template_block': one <% %> block of a template expression
+
+    A template miss parses its blocks through the table too, so its time
+    includes theirs.
+    """
+
+    def __init__(self):
+        self._trees: Dict[str, Any] = {}
+        self._kinds: Dict[str, str] = {}
+        # Trees of a previous run, promoted into this table on first lookup (see seed_from)
+        self._seed: Dict[str, Any] = {}
+        self._seed_kinds: Dict[str, str] = {}
+        # Keys being parsed by intern(), mapped to an event set when the parse ends
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._kind_stats: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def key_for(script_content: str, kind: str = 'script') -> str:
+        """Interning key for a script."""
+        digest = hashlib.sha256(kind.encode('ascii') + b'\0')
+        digest.update(script_content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _counters(self, kind: str) -> Dict[str, Any]:
+        counters = self._kind_stats.get(kind)
+        if counters is None:
+            counters = self._kind_stats[kind] = {'hits': 0, 'misses': 0, 'seconds': 0.0}
+        return counters
+
+    def _get(self, key: str, kind: str) -> Any:
+        """The tree for `key`, promoting a seeded one into this table; _MISSING if absent."""
+        tree = self._trees.get(key, _MISSING)
+        if tree is _MISSING:
+            tree = self._seed.get(key, _MISSING)
+            if tree is not _MISSING:
+                self._trees[key] = tree
+                self._kinds[key] = self._seed_kinds.get(key, kind)
+        return tree
+
+    def _count(self, kind: str, hit: bool) -> None:
+        with self._lock:
+            counters = self._counters(kind)
+            if hit:
+                self.hits += 1
+                counters['hits'] += 1
+            else:
+                self.misses += 1
+                counters['misses'] += 1
+
+    def lookup(self, script_content: str, kind: str = 'script') -> Any:
+        """Return the interned tree (possibly None), or the module sentinel _MISSING."""
+        tree = self._get(self.key_for(script_content, kind), kind)
+        self._count(kind, hit=tree is not _MISSING)
+        return tree
+
+    def store(self, script_content: str, tree: Any, kind: str = 'script') -> None:
+        """Intern the tree (or None for an unparseable script)."""
+        key = self.key_for(script_content, kind)
+        self._trees[key] = tree
+        self._kinds[key] = kind
+
+    def intern(self, script_content: str, parse: Callable[[str], Any], kind: str = 'script') -> Any:
+        """
+        Return the interned tree for a script, calling `parse` only on a miss.
+
+        Threads of the rules engine that ask for a script another thread is
+        already parsing wait for that parse instead of repeating it, so every
+        script is parsed (and counted as a miss) once.
+        """
+        key = self.key_for(script_content, kind)
+        while True:
+            tree = self._get(key, kind)
+            if tree is not _MISSING:
+                self._count(kind, hit=True)
+                return tree
+            with self._lock:
+                pending = self._in_flight.get(key)
+                if pending is None and key not in self._trees:
+                    self._in_flight[key] = threading.Event()
+                    break
+            if pending is not None:
+                # If that parse raised, nothing was stored and the loop parses here.
+                pending.wait()
+
+        self._count(kind, hit=False)
+        start = time.perf_counter()
+        try:
+            tree = parse(script_content)
+            self.store(script_content, tree, kind)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._counters(kind)['seconds'] += elapsed
+                self._in_flight.pop(key).set()
+        return tree
+
+    def __contains__(self, script_content: str) -> bool:
+        return self.key_for(script_content) in self._trees
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def update(self, other: 'ASTInternTable') -> None:
+        """Add another table's trees, keeping entries this table already has."""
+        for key, tree in other._trees.items():
+            if key not in self._trees:
+                self._trees[key] = tree
+                self._kinds[key] = other._kinds.get(key, 'script')
+
+    def seed_from(self, other: 'ASTInternTable') -> None:
+        """
+        Serve another run's trees to this one without copying them.
+
+        A seeded tree moves into this table the first time it is looked up, so
+        the table only ever holds the scripts of its own run. Trees of scripts
+        that were edited or deleted are left behind with the previous run's
+        table instead of being carried from run to run.
+        """
+        self._seed = other._trees
+        self._seed_kinds = other._kinds
+
+    def stats(self) -> Dict[str, int]:
+        """Interned script count and hit/miss counters."""
+        return {'scripts': len(self._trees), 'hits': self.hits, 'misses': self.misses}
+
+    def kind_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per source kind: interned scripts, hits, misses and seconds spent parsing misses."""
+        scripts: Dict[str, int] = {}
+        for kind in self._kinds.values():
+            scripts[kind] = scripts.get(kind, 0) + 1
+        with self._lock:
+            kinds = set(scripts) | set(self._kind_stats)
+            return {
+                kind: {'scripts': scripts.get(kind, 0), **self._counters(kind)}
+                for kind in sorted(kinds)
+            }
+
+
+class DiskASTCache:
+    """Size-bounded on-disk LRU cache of parsed script trees."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._fingerprint = grammar_fingerprint()
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def key_for(self, preprocessed_code: str) -> str:
+        """Cache key for a preprocessed script under the current grammar."""
+        digest = hashlib.sha256(self._fingerprint.encode('ascii'))
+        digest.update(preprocessed_code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Any:
+        """
+        Return the cached tree for `key`, or the module sentinel _MISSING.
+
+        A cached None is a valid entry (the script is known not to parse).
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                tree = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return _MISSING
+        except Exception:
+            # Truncated or incompatible entry: drop it and re-parse.
+            self.misses += 1
+            self._discard(path)
+            return _MISSING
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return tree
+
+    def put(self, key: str, tree: Any) -> None:
+        """Store a parsed tree (or None for an unparseable script)."""
+        path = self._entry_path(key)
+        try:
+            payload = dumps_tree(tree)
+        except Exception as e:
+            warn(f"AST cache: could not serialize tree: {e}")
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so concurrent readers (e.g. --jobs
+            # workers) never see a partial entry.
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            warn(f"AST cache: could not write {path}: {e}")
+            return
+        self.writes += 1
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(payload)
+            if self._total_bytes > self.max_bytes:
+                self._prune()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/write counters for this process."""
+        return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes}
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        with self._lock:
+            for entry in self._entries():
+                self._discard(entry)
+            self._total_bytes = 0
+
+    def _entries(self):
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob(f"*/*{_ENTRY_SUFFIX}"))
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _prune(self) -> None:
+        """Evict least recently used entries until under the prune target."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort(key=lambda item: (item[0], str(item[2])))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * _PRUNE_TARGET)
+        for _, size, entry in entries:
+            if total <= target:
+                break
+            self._discard(entry)
+            total -= size
+        self._total_bytes = total
+
+    @staticmethod
+    def _discard(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+_active_cache: Optional[DiskASTCache] = None
+_active_settings: Optional[Dict[str, Any]] = None
+
+
+def configure_ast_cache(cache_dir: Optional[str] = None, enabled: bool = True,
+                        max_bytes: int = DEFAULT_MAX_BYTES) -> Optional[DiskASTCache]:
+    """
+    Enable (or disable) the process-wide on-disk AST cache.
+
+    Args:
+        cache_dir: Cache directory; defaults to utils.arcane_paths.get_cache_dir()/ast
+        enabled: False turns the cache off
+        max_bytes: Size limit before least recently used entries are evicted
+
+    Returns:
+        The active cache, or None when disabled or the directory is unusable
+    """
+    global _active_cache, _active_settings
+    if not enabled:
+        _active_cache = None
+        _active_settings = None
+        return None
+
+    if cache_dir is None:
+        from utils.arcane_paths import get_cache_dir
+        cache_dir = os.path.join(get_cache_dir(), 'ast')
+    try:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        _active_cache = DiskASTCache(Path(cache_dir), max_bytes=max_bytes)
+    except Exception as e:
+        warn(f"AST cache disabled: {e}")
+        _active_cache = None
+        _active_settings = None
+        return None
+    _active_settings = {'cache_dir': str(cache_dir), 'enabled': True, 'max_bytes': max_bytes}
+    return _active_cache
+
+
+def get_ast_cache() -> Optional[DiskASTCache]:
+    """Return the active on-disk AST cache, if any."""
+    return _active_cache
+
+
+def get_ast_cache_settings() -> Optional[Dict[str, Any]]:
+    """Settings the active cache was configured with (for worker processes)."""
+    return dict(_active_settings) if _active_settings else None
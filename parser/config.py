@@ -117,11 +117,19 @@ class OutputConfig(BaseModel):
     max_findings_per_rule: Optional[int] = Field(default=None, description="Maximum findings per rule (None = unlimited)")
 
 
+class ExecutionConfig(BaseModel):
+    """Configuration for how analysis work is scheduled."""
+    jobs: int = Field(default=1, description="Worker processes for parsing and rule execution (1 = in-process, 0 = one per CPU)")
+    multiplex_script_rules: bool = Field(default=True, description="Run eligible script rules over a single shared AST walk per script field")
+    incremental: bool = Field(default=False, description="Reuse parsed models and findings for files unchanged since the previous incremental run")
+
+
 class ArcaneAuditorConfig(BaseModel):
     """Main configuration model for the Arcane Auditor tool."""
     rules: RulesConfig = Field(default_factory=RulesConfig, description="Rule configuration")
     file_processing: FileProcessingConfig = Field(default_factory=FileProcessingConfig, description="File processing settings")
     output: OutputConfig = Field(default_factory=OutputConfig, description="Output formatting settings")
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig, description="Execution settings")
     
     # Global settings
     fail_on_severe: bool = Field(default=False, description="Exit with error code if any SEVERE severity findings are found")
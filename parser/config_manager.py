@@ -12,7 +12,7 @@ Structure (config/):
 This ensures user customizations survive application updates.
 """
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from .config import ArcaneAuditorConfig
 from utils.arcane_paths import get_config_dirs
 
@@ -53,28 +53,13 @@ class ConfigurationManager:
         # if self._last_loaded and self._last_loaded[0] == config_name:
         #     return self._last_loaded[1]
         
-        # Handle explicit file paths
-        if config_name and ('/' in config_name or '\\' in config_name or config_name.endswith('.json')):
-            config_path = Path(config_name)
-            if config_path.exists():
-                # Use .as_posix() to normalize path separators for cross-platform compatibility
-                return ArcaneAuditorConfig.from_file(config_path.as_posix())
-            else:
-                raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        
-        # Use default if no name provided
+        config_files = self.config_files_for(config_name)
         config_name = config_name or "production-ready"
         
-        # Find all applicable configuration files in priority order
-        config_files = []
-        for config_dir in self.config_paths:
-            config_file = config_dir / f"{config_name}.json"
-            if config_file.exists():
-                config_files.append(config_file)
-        
-        if not config_files:
-            # No fallback - raise error for non-existent config names
-            raise FileNotFoundError(f"Configuration '{config_name}' not found in any config directory (personal, teams, presets)")
+        # Explicit file paths load as is
+        if self._is_config_path(config_name):
+            # Use .as_posix() to normalize path separators for cross-platform compatibility
+            return ArcaneAuditorConfig.from_file(config_files[0].as_posix())
         
         # For specific config names, use only the highest priority config (no merging)
         # For "production-ready" config, merge all layers
@@ -109,6 +94,45 @@ class ConfigurationManager:
         
         return result
     
+    @staticmethod
+    def _is_config_path(config_name: Optional[str]) -> bool:
+        return bool(config_name) and ('/' in config_name or '\\' in config_name or config_name.endswith('.json'))
+    
+    def config_files_for(self, config_name: Optional[str] = None) -> List[Path]:
+        """Files load_config() reads for a configuration, highest priority first.
+        
+        Args:
+            config_name: Configuration name or file path, as for load_config().
+        
+        Returns:
+            The explicit file, every layer of "production-ready", or the highest
+            priority file of any other named configuration.
+        
+        Raises:
+            FileNotFoundError: If the configuration does not exist.
+        """
+        if self._is_config_path(config_name):
+            config_path = Path(config_name)
+            if not config_path.exists():
+                raise FileNotFoundError(f"Configuration file not found: {config_path}")
+            return [config_path]
+        
+        config_name = config_name or "production-ready"
+        
+        # Find all applicable configuration files in priority order
+        config_files = []
+        for config_dir in self.config_paths:
+            config_file = config_dir / f"{config_name}.json"
+            if config_file.exists():
+                config_files.append(config_file)
+        
+        if not config_files:
+            # No fallback - raise error for non-existent config names
+            raise FileNotFoundError(f"Configuration '{config_name}' not found in any config directory (personal, teams, presets)")
+        
+        # Only "production-ready" merges its layers
+        return config_files if config_name == "production-ready" else config_files[:1]
+    
     def get_config_source_info(self, config_name: Optional[str] = None) -> dict:
         """Get information about where a configuration would be loaded from.
         
@@ -0,0 +1,332 @@
+"""
+Incremental re-analysis driven by content hashes.
+
+A typical review loop edits one or two files and re-runs the whole audit, which
+re-parses every file and re-runs every rule over the whole application.
+IncrementalAnalyzer keeps a state file between runs holding, per source file,
+the SHA-256 of its content, a snapshot of the models parsed from it and its
+parsing errors, and, per rule, the serialized findings it reported for each
+file. On the next run:
+
+- only files whose hash changed (or that are new) are parsed again; the models
+  of unchanged files are restored from their snapshots;
+- a rule whose DEPENDS_ON extensions match a changed or removed file (or that
+  has no previous results, or REQUIRES_FULL_CONTEXT) runs over the whole app;
+- every other rule runs only over the changed files (plus the shared SMD/AMD)
+  and reuses its previous findings for the unchanged ones.
+
+Findings are merged and sorted exactly like RulesEngine.run, so the output is
+the same as a full run. The state is discarded when the package version, the
+configuration or the set of rules changes.
+
+An analyzer also keeps its last state and parsed scripts in memory, so a
+long-lived instance (review-app --watch) neither re-reads the state file nor
+re-parses unchanged script blocks between runs.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .app_parser import ModelParser
+from .ast_cache import dumps_tree
+from .models import ProjectContext
+from .parallel_analysis import _FINDING_FIELDS, _serialize_finding
+from .rules.base import Finding, Rule
+from .rules_engine import RulesEngine
+from utils.console import info, warn
+
+# Bump when the layout of the state file changes.
+_STATE_FORMAT = 1
+
+# ProjectContext collections holding per-file models.
+_MODEL_COLLECTIONS = ('pmds', 'scripts', 'pods', 'wqlqueries', 'orchestrations')
+
+
+def content_hash(source_file: Any) -> str:
+    """SHA-256 of a SourceFile's content."""
+    content = getattr(source_file, 'content', '') or ''
+    return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def state_path_for(app_path: Path, cache_dir: Path) -> Path:
+    """Location of the incremental state for the application at `app_path`."""
+    key = hashlib.sha256(str(Path(app_path).resolve()).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir) / 'incremental' / f"{key}.state"
+
+
+def _split_models(context: ProjectContext) -> Dict[str, Dict[str, Any]]:
+    """Group the models of a freshly parsed context by the file they came from."""
+    per_file: Dict[str, Dict[str, Any]] = {}
+    for collection in _MODEL_COLLECTIONS:
+        for key, model in getattr(context, collection).items():
+            per_file.setdefault(model.file_path, {}).setdefault(collection, {})[key] = model
+    for attr in ('smd', 'amd'):
+        model = getattr(context, attr)
+        if model is not None:
+            per_file.setdefault(model.file_path, {})[attr] = model
+    return per_file
+
+
+class IncrementalAnalyzer:
+    """Parses and analyzes only what changed since the previous run."""
+
+    def __init__(self, rules_engine: RulesEngine, state_path: Optional[Path] = None):
+        """
+        Args:
+            rules_engine: Engine whose rules (and configuration) are run
+            state_path: File the state is persisted to between processes; None
+                keeps it in memory only
+        """
+        self.rules_engine = rules_engine
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.parser = ModelParser()
+        self._state: Optional[Dict[str, Any]] = None
+        self._previous_context: Optional[ProjectContext] = None
+        # Filled in by analyze(); useful for reporting and tests.
+        self.changed_files: Set[str] = set()
+        self.removed_files: Set[str] = set()
+        self.full_rules: List[str] = []
+        self.partial_rules: List[str] = []
+
+    def fingerprint(self) -> str:
+        """Digest of everything that invalidates previous results wholesale."""
+        from __version__ import __version__
+
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}\0{_STATE_FORMAT}\0".encode('utf-8'))
+        digest.update(self.rules_engine.config.model_dump_json().encode('utf-8'))
+        for rule in self.rules_engine.rules:
+            digest.update(f"\0{rule.__class__.__module__}.{rule.__class__.__name__}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def analyze(self, source_files_map: Dict[str, Any], profiler=None) -> Tuple[ProjectContext, List[Finding]]:
+        """
+        Parse and analyze the given files, reusing the previous run where possible.
+
+        Args:
+            source_files_map: Dictionary mapping file paths to SourceFile objects
+            profiler: Optional AnalysisProfiler for the files parsed and rules run
+
+        Returns:
+            Tuple of (ProjectContext for the whole app, deterministically sorted findings)
+        """
+        previous = self._load_state()
+        previous_files = previous['files']
+        previous_rules = previous['rules']
+
+        hashes = {file_path: content_hash(source_file) for file_path, source_file in source_files_map.items()}
+        changed = {
+            file_path for file_path, digest in hashes.items()
+            if file_path not in previous_files or previous_files[file_path]['hash'] != digest
+        }
+        removed = set(previous_files) - set(source_files_map)
+        self.changed_files, self.removed_files = changed, removed
+
+        files = self._parse_changed(source_files_map, hashes, changed, previous_files, profiler)
+        context = self._assemble_context(source_files_map, files, profiler)
+
+        full_rules, partial_rules = self._plan_rules(previous_rules, changed | removed)
+        self.full_rules = [rule.__class__.__name__ for rule in full_rules]
+        self.partial_rules = [rule.__class__.__name__ for rule in partial_rules]
+        info(
+            f"Incremental analysis: {len(changed)} changed, {len(removed)} removed, "
+            f"{len(source_files_map) - len(changed)} reused file(s); "
+            f"{len(full_rules)} full and {len(partial_rules)} partial rule run(s)"
+        )
+
+        rule_state: Dict[str, Dict[str, Any]] = {}
+        if full_rules:
+            self._run_rules(context, source_files_map, full_rules, rule_state, profiler=profiler)
+        if partial_rules and changed:
+            self._run_rules(context, source_files_map, partial_rules, rule_state, changed, profiler)
+        for rule in self.rules_engine.rules:
+            name = rule.__class__.__name__
+            previous_state = previous_rules.get(name)
+            carried = self._carry_over(previous_state, changed | removed) if previous_state else None
+            if name not in rule_state:
+                rule_state[name] = carried
+            elif name in self.partial_rules:
+                # Fresh findings for the changed files on top of the reused ones.
+                fresh = rule_state[name]
+                carried['findings'].update(fresh['findings'])
+                carried['skipped'].extend(check for check in fresh['skipped'] if check not in carried['skipped'])
+                carried['objects'] = fresh['objects']
+                rule_state[name] = carried
+
+        findings = self._collect_findings(rule_state)
+        for rule in self.rules_engine.rules:
+            for rule_name, check_name, reason in rule_state[rule.__class__.__name__]['skipped']:
+                context.register_skipped_check(rule_name, check_name, reason)
+
+        self._save_state({'format': _STATE_FORMAT, 'fingerprint': self.fingerprint(), 'files': files, 'rules': rule_state})
+        self._previous_context = context
+        return context, findings
+
+    # -- parsing ---------------------------------------------------------------
+
+    def _parse_changed(self, source_files_map: Dict[str, Any], hashes: Dict[str, str],
+                       changed: Set[str], previous_files: Dict[str, Any], profiler=None) -> Dict[str, Dict[str, Any]]:
+        """Parse the changed files and return the per-file state for every file."""
+        files: Dict[str, Dict[str, Any]] = {}
+        parsed_models: Dict[str, Dict[str, Any]] = {}
+        parsing_errors: List[str] = []
+        if changed:
+            changed_map = {file_path: source_files_map[file_path] for file_path in source_files_map if file_path in changed}
+            parsed = self.parser.parse_models(changed_map, profiler)
+            parsed_models = _split_models(parsed)
+            parsing_errors = parsed.parsing_errors
+
+        for file_path in source_files_map:
+            if file_path not in changed:
+                files[file_path] = previous_files[file_path]
+                continue
+            # Snapshot before finalize_context: extracting script fields consumes
+            # per-model line mappings, so a restored model must be a pristine one.
+            files[file_path] = {
+                'hash': hashes[file_path],
+                'models': dumps_tree(parsed_models.get(file_path, {})),
+                'errors': [message for message in parsing_errors if message.startswith(f"{file_path}: ")],
+            }
+        return files
+
+    def _assemble_context(self, source_files_map: Dict[str, Any], files: Dict[str, Dict[str, Any]],
+                          profiler=None) -> ProjectContext:
+        """Build and finalize a context from the per-file model snapshots."""
+        context = ProjectContext()
+        for file_path in source_files_map:
+            entry = files[file_path]
+            models = pickle.loads(entry['models'])
+            for collection in _MODEL_COLLECTIONS:
+                getattr(context, collection).update(models.get(collection, {}))
+            for attr in ('smd', 'amd'):
+                if models.get(attr) is not None:
+                    setattr(context, attr, models[attr])
+            context.parsing_errors.extend(entry['errors'])
+        if self._previous_context is not None:
+            context.reuse_cached_asts(self._previous_context)
+        self.parser.finalize_context(context, source_files_map, profiler)
+        return context
+
+    # -- rules -------------------------------------------------------------------
+
+    def _plan_rules(self, previous_rules: Dict[str, Any], touched: Set[str]) -> Tuple[List[Rule], List[Rule]]:
+        """Split the rules that need to run into full and partial runs."""
+        full_rules: List[Rule] = []
+        partial_rules: List[Rule] = []
+        touched_lower = [file_path.lower() for file_path in touched]
+        for rule in self.rules_engine.rules:
+            depends_on = tuple(extension.lower() for extension in rule.DEPENDS_ON)
+            if (
+                rule.__class__.__name__ not in previous_rules
+                or rule.REQUIRES_FULL_CONTEXT
+                or (depends_on and any(file_path.endswith(depends_on) for file_path in touched_lower))
+            ):
+                full_rules.append(rule)
+            elif touched:
+                partial_rules.append(rule)
+        return full_rules, partial_rules
+
+    def _run_rules(self, context: ProjectContext, source_files_map: Dict[str, Any], rules: List[Rule],
+                   rule_state: Dict[str, Dict[str, Any]], changed: Optional[Set[str]] = None,
+                   profiler=None) -> None:
+        """
+        Run `rules` over the whole app (changed=None) or over the changed files only.
+
+        Each run gets its own analysis context so skipped checks can be kept per rule.
+        """
+        view = context.view(changed)
+        self.parser._initialize_analysis_context(view, source_files_map)
+        findings = self.rules_engine.run(view, rules, profiler)
+
+        names = [rule.__class__.__name__ for rule in rules]
+        by_rule: Dict[str, Dict[str, Any]] = {name: {'findings': {}, 'skipped': [], 'objects': []} for name in names}
+        for finding in findings:
+            entry = by_rule.get(finding.rule_id)
+            if entry is None:
+                continue
+            if changed is not None and finding.file_path not in changed:
+                # Shared SMD/AMD in the view; their findings come from the previous run.
+                continue
+            entry['findings'].setdefault(finding.file_path, []).append(_serialize_finding(finding)[1])
+            entry['objects'].append(finding)
+
+        for check in view.analysis_context.skipped_checks:
+            # Checks are registered under the rule's class name; anything else is
+            # kept with the first rule of this run so it is not lost.
+            name = check.rule_name if check.rule_name in by_rule else names[0]
+            values = (check.rule_name, check.check_name, check.reason)
+            if values not in by_rule[name]['skipped']:
+                by_rule[name]['skipped'].append(values)
+
+        rule_state.update(by_rule)
+
+    @staticmethod
+    def _carry_over(previous: Dict[str, Any], touched: Set[str]) -> Dict[str, Any]:
+        """A rule's previous results minus the findings for changed or removed files."""
+        return {
+            'findings': {
+                file_path: values for file_path, values in previous['findings'].items()
+                if file_path not in touched
+            },
+            'skipped': list(previous['skipped']),
+        }
+
+    def _collect_findings(self, rule_state: Dict[str, Dict[str, Any]]) -> List[Finding]:
+        """Rebuild Finding objects for reused results and merge them with fresh ones."""
+        rules_by_name = {rule.__class__.__name__: rule for rule in self.rules_engine.rules}
+        findings: List[Finding] = []
+        for name, rule in rules_by_name.items():
+            entry = rule_state[name]
+            fresh = entry.pop('objects', None)
+            fresh_files = {finding.file_path for finding in fresh} if fresh else set()
+            if fresh:
+                findings.extend(fresh)
+            for file_path, values_list in entry['findings'].items():
+                if file_path in fresh_files:
+                    continue
+                for values in values_list:
+                    findings.append(Finding(rule, **dict(zip(_FINDING_FIELDS, values))))
+        # Same ordering as RulesEngine.run so output matches a full run byte-for-byte.
+        findings.sort(key=lambda f: (f.file_path, f.line, f.rule_id, f.message))
+        return findings
+
+    # -- state file --------------------------------------------------------------
+
+    def _empty_state(self) -> Dict[str, Any]:
+        return {'format': _STATE_FORMAT, 'fingerprint': None, 'files': {}, 'rules': {}}
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self._state is not None:
+            if self._state['fingerprint'] == self.fingerprint():
+                return self._state
+            return self._empty_state()
+        if self.state_path is None:
+            return self._empty_state()
+        try:
+            with open(self.state_path, 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return self._empty_state()
+        except Exception as e:
+            warn(f"Ignoring unreadable incremental state {self.state_path}: {e}")
+            return self._empty_state()
+        if not isinstance(state, dict) or state.get('format') != _STATE_FORMAT or state.get('fingerprint') != self.fingerprint():
+            info("Incremental state is from a different version or configuration; running a full analysis")
+            return self._empty_state()
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        self._state = state
+        if self.state_path is None:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            warn(f"Could not save incremental state to {self.state_path}: {e}")
@@ -0,0 +1,134 @@
+"""
+One-pass literal scan shared by the hardcoded-value rules.
+
+HardcodedWidRule, HardcodedApplicationIdRule, EmbeddedImagesRule,
+HardcodedWorkdayAPIRule, StringBooleanRule and MultipleStringInterpolatorsRule
+each looked for their own literal (a 32-character hex WID, the application
+ID, data:image URIs, *.workday.com hosts, "true"/"false", several <% %>
+interpolators) in the same strings. Almost no string contains any of them.
+
+LiteralScanner holds a cheap prefilter pattern per kind. scan_model() runs
+it over every string value of a model (see parser.string_index): one search
+with the literal-led kinds compiled into a single alternation, plus one
+search for a 32-character hex run, rejects a string that matches no kind.
+Both run on the lowercased string, which for ASCII text is equivalent to a
+case-insensitive match and cheaper; strings with other characters skip the
+reject pass. The few strings that survive are classified kind by kind. Rules then ask
+the scan for the entries of their kind and run their exact checks only on
+those.
+
+The alternation has no groups and every branch starts with a literal, which
+lets the regex engine skip ahead to the positions where one of the literals
+begins (much like an Aho-Corasick prefilter); named groups, or the hex-run
+branch, would make it try every branch at every position instead (see
+benchmarks/bench_literal_scanner.py).
+
+Each prefilter matches a superset of what its rule reports (e.g. any 32 hex
+characters for WIDs, without the word boundaries), so skipping unflagged
+strings never drops a finding.
+
+Rules that work on the raw file text (string booleans, multiple
+interpolators, the application ID in pages) use LiteralScan.source_has(),
+which tests the model's source_content for one kind, once.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple
+
+# Prefilter per kind, each led by a literal; each matches wherever the rule's own check could.
+LITERAL_PATTERNS: Dict[str, str] = {
+    'embedded_image': r'data:image/',
+    'workday_url': r'\.workday\.com',
+    'string_boolean': r'"(?:true|false)"',
+    'multiple_interpolators': r'%>[^"\']*<%',
+}
+
+# Prefilter for WIDs: any 32 hex characters, without the rule's word boundaries.
+WID = 'wid'
+WID_PATTERN = r'[a-f0-9]{32}'
+
+# Kind for the project's application ID, added when the project has one.
+APPLICATION_ID = 'application_id'
+
+
+class LiteralScanner:
+    """Prefilter over the literal kinds the hardcoded-value rules look for."""
+
+    def __init__(self, application_id: Optional[str] = None):
+        patterns = dict(LITERAL_PATTERNS)
+        if application_id:
+            patterns[APPLICATION_ID] = re.escape(application_id)
+        self.kinds: Tuple[str, ...] = (WID, *patterns)
+        self._patterns = {kind: re.compile(pattern, re.IGNORECASE) for kind, pattern in patterns.items()}
+        self._patterns[WID] = re.compile(WID_PATTERN, re.IGNORECASE)
+        # The reject pass runs on lowercased ASCII text, where that is the same
+        # as IGNORECASE; other strings are classified directly.
+        self._prefilter = all(pattern.isascii() for pattern in patterns.values())
+        self._literals = re.compile('|'.join(pattern.lower() for pattern in patterns.values()))
+        self._hex_run = re.compile(WID_PATTERN)
+
+    def kinds_in(self, text: str) -> FrozenSet[str]:
+        """The kinds whose prefilter matches somewhere in `text`."""
+        if self._prefilter and text.isascii():
+            lowered = text.lower()
+            if self._literals.search(lowered) is None and self._hex_run.search(lowered) is None:
+                return frozenset()
+        return frozenset(kind for kind, pattern in self._patterns.items() if pattern.search(text))
+
+    def has(self, kind: str, text: str) -> bool:
+        """Whether the prefilter of `kind` matches somewhere in `text`."""
+        return self._patterns[kind].search(text) is not None
+
+
+@lru_cache(maxsize=16)
+def literal_scanner(application_id: Optional[str] = None) -> LiteralScanner:
+    """The scanner for a project: the static kinds plus its application ID, if any."""
+    return LiteralScanner(application_id)
+
+
+def scanner_for(context) -> LiteralScanner:
+    """The scanner for a ProjectContext (rules of one run all get the same one)."""
+    return literal_scanner(getattr(context, 'application_id', None) or None)
+
+
+class LiteralScan:
+    """The string values of one model that survived the scanner's prefilter, by kind."""
+
+    def __init__(self, scanner: LiteralScanner, model):
+        self.scanner = scanner
+        self._model = model
+        self._entries: Optional[Dict[str, tuple]] = None
+        self._source_kinds: Dict[str, bool] = {}
+
+    def _scan_values(self) -> Dict[str, tuple]:
+        entries = self._entries
+        if entries is None:
+            by_kind: Dict[str, list] = {kind: [] for kind in self.scanner.kinds}
+            for entry in self._model.get_string_values():
+                for kind in self.scanner.kinds_in(entry.value):
+                    by_kind[kind].append(entry)
+            entries = self._entries = {kind: tuple(values) for kind, values in by_kind.items()}
+        return entries
+
+    def entries(self, kind: str) -> tuple:
+        """String values (parser.string_index.StringValue) flagged for `kind`, in document order."""
+        return self._scan_values().get(kind, ())
+
+    def has(self, kind: str) -> bool:
+        """Whether any string value of the model was flagged for `kind`."""
+        return bool(self._scan_values().get(kind))
+
+    def source_has(self, kind: str) -> bool:
+        """Whether the model's source_content matches the prefilter of `kind` (cached per kind)."""
+        found = self._source_kinds.get(kind)
+        if found is None:
+            source = getattr(self._model, 'source_content', None) or ''
+            found = kind in self.scanner.kinds and self.scanner.has(kind, source)
+            self._source_kinds[kind] = found
+        return found
+
+
+def scan_model(model, context) -> LiteralScan:
+    """The literal scan of a model for the context's scanner, built once per model."""
+    return model.get_literal_scan(scanner_for(context))
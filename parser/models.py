@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field, PrivateAttr
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Callable, Tuple, TYPE_CHECKING
 from lark import Tree
 
+from .ast_cache import ASTInternTable, _MISSING
+
 if TYPE_CHECKING:
     from file_processing.context_tracker import AnalysisContext
 
@@ -21,13 +23,59 @@ def get_pmd_script_parser():
 # 📄 Models for Individual File Types
 # -----------------------------------------------------------------------------
 
+class SourceIndexedModel(BaseModel):
+    """Base for models that keep their original file text in `source_content`."""
+
+    # Line-start / marker index over source_content (see parser.source_index)
+    _source_index: Optional[Any] = PrivateAttr(default=None)
+    # Flattened string values shared by the rules that scan them (see parser.string_index)
+    _string_values: Optional[tuple] = PrivateAttr(default=None)
+    # Literal prefilter results over those values (see parser.literal_scanner)
+    _literal_scan: Optional[Any] = PrivateAttr(default=None)
+
+    def get_source_index(self):
+        """Return the SourceIndex for source_content, building it on first use."""
+        from .source_index import SourceIndex
+        index = self._source_index
+        if index is None or index.text is not self.source_content:
+            index = SourceIndex(self.source_content)
+            self._source_index = index
+        return index
+
+    def line_for_offset(self, offset: int) -> int:
+        """1-based line of character `offset` in source_content."""
+        return self.get_source_index().line_for_offset(offset)
+
+    def lines_for_substring(self, needle: str, case_sensitive: bool = True) -> Tuple[int, ...]:
+        """1-based lines of source_content that contain `needle`, in order."""
+        return self.get_source_index().lines_for_substring(needle, case_sensitive)
+
+    def get_string_values(self):
+        """Return every string value of the model (see parser.string_index), built on first use."""
+        values = self._string_values
+        if values is None:
+            from .string_index import build_string_index
+            values = build_string_index(self)
+            self._string_values = values
+        return values
+
+    def get_literal_scan(self, scanner):
+        """Return the LiteralScan of the string values for `scanner`, built on first use."""
+        scan = self._literal_scan
+        if scan is None or scan.scanner is not scanner:
+            from .literal_scanner import LiteralScan
+            scan = LiteralScan(scanner, self)
+            self._literal_scan = scan
+        return scan
+
+
 class ScriptModel(BaseModel):
     """Represents the structure of a .script file."""
     source: str
     file_path: str = Field(..., exclude=True) # Exclude from exported model data
 
 
-class OrchestrationModel(BaseModel):
+class OrchestrationModel(SourceIndexedModel):
     """Represents the structure of a .orchestration file (Orchestrate flow)."""
     flow_type: str  # e.g. FlowSync, FlowAsync, FlowBusinessProcessTriggered, IntegrationFrameworkTrigger
     id: str
@@ -37,8 +85,20 @@ class OrchestrationModel(BaseModel):
     file_path: str = Field(..., exclude=True)
     source_content: str = Field(default="", exclude=True)
 
+    # Steps, script sources and UI locations of raw_value (see rules.structure.shared.orchestration_index)
+    _walk_index: Optional[Any] = PrivateAttr(default=None)
 
-class WQLQueryModel(BaseModel):
+    def get_walk_index(self):
+        """Return the OrchestrationIndex of raw_value, built on first use."""
+        index = self._walk_index
+        if index is None or index.raw_value is not self.raw_value:
+            from .rules.structure.shared.orchestration_index import OrchestrationIndex
+            index = OrchestrationIndex(self.raw_value)
+            self._walk_index = index
+        return index
+
+
+class WQLQueryModel(SourceIndexedModel):
     """Represents the structure of a .wqlquery file."""
     id: str
     parameters: Optional[List[str]] = Field(default_factory=list)
@@ -83,7 +143,7 @@ class PMDPresentation(BaseModel):
     footer: Dict[str, Any] = Field(default_factory=dict)
     tabs: Optional[List[Dict[str, Any]]] = None
 
-class PMDModel(BaseModel):
+class PMDModel(SourceIndexedModel):
     """Represents the structure of a .pmd page file."""
     pageId: str
     securityDomains: Optional[List[str]] = Field(default_factory=list)
@@ -113,6 +173,8 @@ class PMDModel(BaseModel):
             return None
         try:
             parser = get_pmd_script_parser()
+            if context is not None:
+                return context.intern_ast(script_content, parser)
             return parser(script_content)
         except Exception as e:
             # Failed to parse, log the error if context is available
@@ -278,7 +340,7 @@ class PodSeed(BaseModel):
     # - Any widget that can have children arrays with nested widgets
     # Additional seed properties can be added as needed
 
-class PodModel(BaseModel):
+class PodModel(SourceIndexedModel):
     """Represents the structure of a .pod file."""
     podId: str
     seed: PodSeed
@@ -287,11 +349,21 @@ class PodModel(BaseModel):
     
     # Private attribute to store hash-based line mappings (same as PMDModel)
     _hash_to_lines: Optional[Dict[str, List[List[int]]]] = PrivateAttr(default=None)
+    # Private attribute to cache extracted script fields (same as PMDModel)
+    _cached_script_fields: Optional[List[tuple]] = PrivateAttr(default=None)
     
     def set_hash_to_lines_mapping(self, hash_to_lines: Dict[str, List[List[int]]]):
         """Set the hash-based line mappings for precise line number tracking (same as PMDModel)."""
         self._hash_to_lines = hash_to_lines or {}
     
+    def get_cached_script_fields(self) -> Optional[List[tuple]]:
+        """Get the cached script fields if available."""
+        return self._cached_script_fields
+    
+    def set_cached_script_fields(self, script_fields: List[tuple]):
+        """Set the cached script fields."""
+        self._cached_script_fields = script_fields
+    
     def get_script_start_line(self, script_value: str) -> Optional[int]:
         """
         Get the starting line number for a script value using hash-based mapping.
@@ -445,7 +517,7 @@ class AMDRoute(BaseModel):
     pageId: str
     parameters: Optional[List[str]] = Field(default_factory=list)
 
-class AMDModel(BaseModel):
+class AMDModel(SourceIndexedModel):
     """Represents the structure of an .amd application definition file."""
     routes: Dict[str, AMDRoute]
     baseUrls: Optional[Dict[str, str]] = Field(default_factory=dict)
@@ -454,7 +526,7 @@ class AMDModel(BaseModel):
     file_path: str = Field(..., exclude=True)
     source_content: str = Field(default="", exclude=True)
     
-class SMDModel(BaseModel):
+class SMDModel(SourceIndexedModel):
     """Model representing an SMD (Site Model Definition) file."""
     id: str
     applicationId: str
@@ -511,7 +583,7 @@ class ProjectContext:
         self._cached_pod_script_fields: Dict[str, List[tuple]] = {}
         
         # Performance optimization: Cache ASTs to avoid repeated parsing
-        self._cached_asts: Dict[str, Tree] = {}  # Maps script content hash to AST
+        self._cached_asts = ASTInternTable()  # Maps script content digest to AST
 
     def get_script_by_name(self, name: str) -> Optional[ScriptModel]:
         """Retrieves a script model by its file name (e.g., 'utils.script')."""
@@ -557,11 +629,61 @@ class ProjectContext:
         self._cached_pod_script_fields[pod_id] = script_fields
     
     def get_cached_ast(self, script_content: str) -> Optional[Tree]:
-        """Get cached AST for script content."""
-        content_hash = hash(script_content)
-        return self._cached_asts.get(content_hash)
-    
-    def set_cached_ast(self, script_content: str, ast: Tree):
-        """Cache AST for script content."""
-        content_hash = hash(script_content)
-        self._cached_asts[content_hash] = ast
\ No newline at end of file
+        """Get cached AST for script content (None if not cached or unparseable)."""
+        ast = self._cached_asts.lookup(script_content)
+        return None if ast is _MISSING else ast
+    
+    def set_cached_ast(self, script_content: str, ast: Optional[Tree]):
+        """Cache AST for script content (None records a script that failed to parse)."""
+        self._cached_asts.store(script_content, ast)
+    
+    def has_cached_ast(self, script_content: str) -> bool:
+        """True if the script was parsed already, successfully or not."""
+        return script_content in self._cached_asts
+    
+    def intern_ast(self, script_content: str, parse: Callable[[str], Optional[Tree]],
+                   kind: str = 'script') -> Optional[Tree]:
+        """Return the cached AST for script content, calling `parse` only the first time."""
+        return self._cached_asts.intern(script_content, parse, kind)
+    
+    def get_ast_cache_stats(self) -> Dict[str, int]:
+        """Interned script count and hit/miss counters for this context."""
+        return self._cached_asts.stats()
+
+    def get_ast_kind_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Interned scripts, hits, misses and parse seconds per source kind (see ASTInternTable)."""
+        return self._cached_asts.kind_stats()
+    
+    def reuse_cached_asts(self, other: 'ProjectContext') -> None:
+        """
+        Seed the AST cache with another context's entries (keyed by content, so
+        still valid). Only the entries this context looks up are kept, so a
+        watch session does not accumulate trees of edited or deleted scripts.
+        """
+        self._cached_asts.seed_from(other._cached_asts)
+
+    def view(self, file_paths: Optional[set] = None) -> 'ProjectContext':
+        """
+        Return a context holding only the models of `file_paths` (plus the SMD/AMD).
+
+        The view shares this context's script field and AST caches and its
+        parsing errors, so rules run against it see exactly what they would see
+        on the full context for those files. It gets no analysis context of its
+        own; callers that want skipped checks attach one.
+        """
+        def keep(model) -> bool:
+            return file_paths is None or model.file_path in file_paths
+
+        view = ProjectContext()
+        view.pmds = {key: model for key, model in self.pmds.items() if keep(model)}
+        view.scripts = {key: model for key, model in self.scripts.items() if keep(model)}
+        view.pods = {key: model for key, model in self.pods.items() if keep(model)}
+        view.wqlqueries = {key: model for key, model in self.wqlqueries.items() if keep(model)}
+        view.orchestrations = {key: model for key, model in self.orchestrations.items() if keep(model)}
+        view.smd = self.smd
+        view.amd = self.amd
+        view.parsing_errors = self.parsing_errors
+        view._cached_pmd_script_fields = self._cached_pmd_script_fields
+        view._cached_pod_script_fields = self._cached_pod_script_fields
+        view._cached_asts = self._cached_asts
+        return view
@@ -0,0 +1,268 @@
+"""
+Multiprocess execution mode for parsing and rule analysis.
+
+Parsing (JSON decoding, Lark LALR parsing) and rule execution (AST walks) are
+pure-Python and CPU-bound, so the thread pools in ModelParser and RulesEngine
+serialize on the GIL. ProcessPoolAnalyzer shards the source files across worker
+processes instead. Each worker parses its shard, runs the file-local rules on it
+and sends back compact serialized findings plus the parsed models. The parent
+rebuilds Finding objects against its own rule instances, runs any rules that
+need the whole application, and applies the same deterministic sort as
+RulesEngine.run so the output is byte-identical to serial mode. A shard whose
+worker fails is re-run in the parent, so a crashed worker never drops files or
+findings from the result.
+
+App-level metadata files (.smd / .amd) are copied into every shard because rules
+read them as shared context (e.g. applicationId, error pages). Findings are only
+kept from the shard that owns the file they point at, so copied files are never
+reported twice.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from .app_parser import ModelParser
+from .ast_cache import configure_ast_cache, get_ast_cache_settings
+from .config import ArcaneAuditorConfig
+from .models import ProjectContext
+from .pmd_script_parser import get_parse_stats
+from .rules.base import Finding, Rule
+from .rules_engine import RulesEngine
+from utils.console import info, set_quiet, warn
+
+# Extensions copied into every shard as shared, read-only context.
+SHARED_CONTEXT_EXTENSIONS = ('.smd', '.amd')
+
+# Finding attributes sent back from workers (the rule is sent as its class name).
+_FINDING_FIELDS = (
+    'message', 'line', 'file_path', 'snippet', 'suggested_replacement',
+    'path', 'target_text', 'replacement_context',
+)
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """
+    Normalize a --jobs / execution.jobs value into a worker count.
+
+    0 means "one worker per CPU"; None and negative values fall back to 1 (serial).
+    """
+    if jobs is None or jobs < 0:
+        return 1
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def shard_files(source_files_map: Dict[str, Any], jobs: int) -> List[Dict[str, Any]]:
+    """
+    Split the per-file sources into at most `jobs` shards of similar total size.
+
+    Files are assigned largest-first to the currently lightest shard, with ties
+    broken by path, so sharding is deterministic for a given input. Shared
+    context files (.smd / .amd) are not sharded; see SHARED_CONTEXT_EXTENSIONS.
+    """
+    shardable = [
+        (file_path, source_file) for file_path, source_file in source_files_map.items()
+        if not file_path.lower().endswith(SHARED_CONTEXT_EXTENSIONS)
+    ]
+    shard_count = max(1, min(jobs, len(shardable)))
+    shards: List[Dict[str, Any]] = [{} for _ in range(shard_count)]
+    loads = [0] * shard_count
+
+    shardable.sort(key=lambda item: (-_source_size(item[1]), item[0]))
+    for file_path, source_file in shardable:
+        target = min(range(shard_count), key=lambda i: (loads[i], i))
+        shards[target][file_path] = source_file
+        loads[target] += _source_size(source_file)
+    return shards
+
+
+def _source_size(source_file: Any) -> int:
+    size = getattr(source_file, 'size', None)
+    if size:
+        return size
+    return len(getattr(source_file, 'content', '') or '')
+
+
+def _serialize_finding(finding: Finding) -> Tuple[str, Tuple]:
+    return finding.rule_id, tuple(getattr(finding, name) for name in _FINDING_FIELDS)
+
+
+def _analyze_shard(
+    shard: Dict[str, Any],
+    shared: Dict[str, Any],
+    owns_shared: bool,
+    config: ArcaneAuditorConfig,
+    rule_names: List[str],
+    ast_cache_settings: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Worker entry point: parse one shard and run the file-local rules on it.
+
+    Returns a picklable payload: serialized findings, the models this shard owns,
+    parsing errors, skipped checks and this shard's parser tier statistics.
+    """
+    # Worker chatter would interleave with the parent's output; warnings and
+    # errors still go to stderr.
+    set_quiet(True)
+    # Forked workers inherit the parent's counters; report only this shard's.
+    get_parse_stats().reset()
+    if ast_cache_settings:
+        configure_ast_cache(**ast_cache_settings)
+    else:
+        configure_ast_cache(enabled=False)
+
+    payload = _run_shard(shard, shared, owns_shared, config, rule_names)
+    payload['parse_stats'] = get_parse_stats().snapshot()
+    return payload
+
+
+def _run_shard(
+    shard: Dict[str, Any],
+    shared: Dict[str, Any],
+    owns_shared: bool,
+    config: ArcaneAuditorConfig,
+    rule_names: List[str],
+) -> Dict[str, Any]:
+    """Parse one shard and run the file-local rules on it, in the calling process."""
+    parser = ModelParser()
+    context = parser.parse_files({**shared, **shard})
+
+    engine = RulesEngine(config, rule_ids=rule_names)
+    engine.rules = [rule for rule in engine.rules if not rule.REQUIRES_FULL_CONTEXT]
+
+    owned = set(shard)
+    if owns_shared:
+        owned.update(shared)
+
+    findings = [
+        _serialize_finding(finding)
+        for finding in engine.run(context)
+        if finding.file_path in owned or (owns_shared and finding.file_path not in shard and finding.file_path not in shared)
+    ]
+
+    skipped_checks = []
+    if context.analysis_context:
+        skipped_checks = [
+            (check.rule_name, check.check_name, check.reason)
+            for check in context.analysis_context.skipped_checks
+        ]
+
+    return {
+        'findings': findings,
+        'pmds': {k: v for k, v in context.pmds.items() if v.file_path in owned},
+        'pods': {k: v for k, v in context.pods.items() if v.file_path in owned},
+        'scripts': {k: v for k, v in context.scripts.items() if v.file_path in owned},
+        'wqlqueries': {k: v for k, v in context.wqlqueries.items() if v.file_path in owned},
+        'orchestrations': {k: v for k, v in context.orchestrations.items() if v.file_path in owned},
+        'smd': context.smd if owns_shared else None,
+        'amd': context.amd if owns_shared else None,
+        'parsing_errors': list(context.parsing_errors),
+        'skipped_checks': skipped_checks,
+        # Parses in the calling process are already counted in its own statistics.
+        'parse_stats': {},
+    }
+
+
+class ProcessPoolAnalyzer:
+    """Runs parsing and rule analysis across worker processes."""
+
+    def __init__(self, rules_engine: RulesEngine, jobs: int):
+        self.rules_engine = rules_engine
+        self.jobs = resolve_jobs(jobs)
+
+    def analyze(self, source_files_map: Dict[str, Any]) -> Tuple[ProjectContext, List[Finding]]:
+        """
+        Parse and analyze the given files in worker processes.
+
+        Args:
+            source_files_map: Dictionary mapping file paths to SourceFile objects
+
+        Returns:
+            Tuple of (merged ProjectContext, deterministically sorted findings)
+        """
+        shared = {
+            file_path: source_file for file_path, source_file in source_files_map.items()
+            if file_path.lower().endswith(SHARED_CONTEXT_EXTENSIONS)
+        }
+        shards = shard_files(source_files_map, self.jobs)
+        rules_by_name = {rule.__class__.__name__: rule for rule in self.rules_engine.rules}
+        rule_names = list(rules_by_name)
+        ast_cache_settings = get_ast_cache_settings()
+
+        info(f"Using process-pool analysis ({len(shards)} workers for {len(source_files_map)} files)")
+
+        payloads: List[Optional[Dict[str, Any]]] = [None] * len(shards)
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            future_to_index = {
+                executor.submit(
+                    _analyze_shard, shard, shared, index == 0, self.rules_engine.config, rule_names,
+                    ast_cache_settings,
+                ): index
+                for index, shard in enumerate(shards)
+            }
+            for future in as_completed(future_to_index):
+                index = future_to_index[future]
+                try:
+                    payloads[index] = future.result()
+                except Exception as e:
+                    warn(f"Worker for shard {index} failed ({e}); analyzing its files in this process")
+
+        # A lost shard would silently drop its files and findings (and the
+        # SMD/AMD for shard 0), so re-run it here exactly as a worker would.
+        # If that fails as well, the error propagates instead of a partial result.
+        for index, shard in enumerate(shards):
+            if payloads[index] is None:
+                payloads[index] = _run_shard(shard, shared, index == 0, self.rules_engine.config, rule_names)
+
+        context = self._merge_payloads(payloads, source_files_map)
+
+        findings: List[Finding] = []
+        for payload in payloads:
+            if not payload:
+                continue
+            for rule_id, values in payload['findings']:
+                rule = rules_by_name.get(rule_id)
+                if rule is None:
+                    continue
+                findings.append(Finding(rule, **dict(zip(_FINDING_FIELDS, values))))
+
+        full_context_rules = [rule for rule in self.rules_engine.rules if rule.REQUIRES_FULL_CONTEXT]
+        if full_context_rules:
+            for rule in full_context_rules:
+                findings.extend(self.rules_engine._run_rule_safe(rule, context))
+
+        # Same ordering as RulesEngine.run so output matches serial mode byte-for-byte.
+        findings.sort(key=lambda f: (f.file_path, f.line, f.rule_id, f.message))
+        return context, findings
+
+    def _merge_payloads(self, payloads: List[Optional[Dict[str, Any]]], source_files_map: Dict[str, Any]) -> ProjectContext:
+        """Rebuild a ProjectContext from the models returned by each worker."""
+        context = ProjectContext()
+        skipped_checks = []
+        for payload in payloads:
+            if not payload:
+                continue
+            context.pmds.update(payload['pmds'])
+            context.pods.update(payload['pods'])
+            context.scripts.update(payload['scripts'])
+            context.wqlqueries.update(payload['wqlqueries'])
+            context.orchestrations.update(payload['orchestrations'])
+            if payload['smd']:
+                context.smd = payload['smd']
+            if payload['amd']:
+                context.amd = payload['amd']
+            for parse_error in payload['parsing_errors']:
+                if parse_error not in context.parsing_errors:
+                    context.parsing_errors.append(parse_error)
+            # Every shard runs each rule once, so a check skipped for lack of
+            # context (e.g. no SMD) is reported by every shard; keep one copy.
+            for check in payload['skipped_checks']:
+                if check not in skipped_checks:
+                    skipped_checks.append(check)
+            get_parse_stats().merge(payload['parse_stats'])
+
+        ModelParser()._initialize_analysis_context(context, source_files_map)
+        for rule_name, check_name, reason in skipped_checks:
+            context.register_skipped_check(rule_name, check_name, reason)
+        return context
@@ -6,7 +6,19 @@ Key insight:
 
 import re
 import hashlib
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Iterator, Optional
+
+# Tokens that change lexer state (or are braces) while scanning code
+_CODE_TOKEN_PATTERN = re.compile(r"[{\n\"'`]|//|/\*")
+
+# Characters that end or escape inside a string literal, per delimiter.
+# Mirrors STRING_LITERAL / TEMPLATE_LITERAL in pmd_script_grammar.lark,
+# where template literals are a single token (including any ${...}).
+_STRING_END_PATTERNS = {
+    '"': re.compile(r'[\\"]'),
+    "'": re.compile(r"[\\']"),
+    '`': re.compile(r'[\\`]'),
+}
 
 class PMDPreprocessor:
     def __init__(self, warn_ambiguous=True):
@@ -26,42 +38,30 @@ class PMDPreprocessor:
             return code
             
         result = []
-        i = 0
-        
-        while i < len(code):
-            if code[i] == '{':
-                # Classify this brace
-                brace_type, context = self._classify_brace(code, i)
-                
-                if brace_type == 'EXPR':
-                    # Replace { with #{} for set literals in expression context
-                    result.append('#{')
-                elif brace_type == 'OBJECT':
-                    # Keep { as-is for object literals
-                    result.append('{')
-                elif brace_type == 'BLOCK':
-                    # Keep { as-is for blocks
-                    result.append('{')
-                elif brace_type == 'STRING':
-                    # Keep { as-is for braces inside string literals
-                    result.append('{')
-                elif brace_type == 'COMMENT':
-                    # Keep { as-is for braces inside comments
-                    result.append('{')
-                else:  # UNKNOWN
-                    if self.warn_ambiguous:
-                        line_num = code[:i].count('\n') + 1
-                        self.warnings.append(
-                            f"Line {line_num}: Ambiguous brace, defaulting to BLOCK. "
-                            f"Context: {context}"
-                        )
-                    result.append('{')
-                
-                i += 1  # Skip the original {
-            else:
-                result.append(code[i])
-                i += 1
+        last = 0
         
+        for pos, lexical_type, line_num in self._scan_braces(code):
+            if lexical_type is not None:
+                # Keep { as-is for braces inside string literals and comments
+                continue
+            
+            # Classify this brace
+            brace_type, context = self._classify_brace(code, pos)
+            
+            if brace_type == 'EXPR':
+                # Replace { with #{} for set literals in expression context
+                result.append(code[last:pos])
+                result.append('#{')
+                last = pos + 1
+            elif brace_type == 'UNKNOWN' and self.warn_ambiguous:
+                # Ambiguous braces are kept as-is (BLOCK)
+                self.warnings.append(
+                    f"Line {line_num}: Ambiguous brace, defaulting to BLOCK. "
+                    f"Context: {context}"
+                )
+            # OBJECT and BLOCK braces are kept as-is
+        
+        result.append(code[last:])
         return ''.join(result)
     
     def preprocess_with_line_tracking(self, code: str) -> Tuple[str, Dict[str, List[List[int]]]]:
@@ -139,17 +139,12 @@ class PMDPreprocessor:
     
     def _classify_brace(self, code: str, pos: int) -> Tuple[str, str]:
         """
-        Classify { at position pos.
+        Classify a code-context { at position pos.
         Returns: (type, context_snippet)
-        type: 'EXPR', 'OBJECT', 'BLOCK', 'STRING', 'COMMENT', or 'UNKNOWN'
+        type: 'EXPR', 'OBJECT', 'BLOCK', or 'UNKNOWN'
         """
-        # First check if we're inside a string literal (quoted string or template literal)
-        if self._is_inside_string_literal(code, pos):
-            return ('STRING', 'inside string literal')
-        
-        # Check if we're inside a comment
-        if self._is_inside_comment(code, pos):
-            return ('COMMENT', 'inside comment')
+        # Braces inside strings and comments are filtered out by _scan_braces()
+        # before we get here, so only code-context braces are classified.
         
         # Get context before the brace (up to 200 chars to handle long conditions)
         start = max(0, pos - 200)
@@ -234,96 +229,78 @@ class PMDPreprocessor:
         # If we can't determine, return UNKNOWN
         return ('UNKNOWN', context_snippet)
     
-    def _is_inside_string_literal(self, code: str, pos: int) -> bool:
+    def _scan_braces(self, code: str) -> Iterator[Tuple[int, Optional[str], int]]:
         """
-        Check if the position is inside a string literal (quoted string or template literal).
+        Walk the code once, tracking string, template-literal and comment state,
+        and yield every { together with the lexical context it sits in.
+        
+        This replaces per-brace backward scans, keeping preprocessing linear in
+        the size of the script.
+        
+        Yields:
+            (position, lexical_type, line_number) where lexical_type is 'STRING'
+            or 'COMMENT' for braces that must be kept as-is, or None for braces
+            in code that still need classification.
         """
-        # Look backwards from the position to find the start of the current string
-        i = pos - 1
-        in_string = False
-        string_start_char = None
-        escape_next = False
-        
-        while i >= 0:
-            char = code[i]
+        i = 0
+        line_num = 1
+        length = len(code)
+        
+        while i < length:
+            match = _CODE_TOKEN_PATTERN.search(code, i)
+            if match is None:
+                break
             
-            if escape_next:
-                escape_next = False
-                i -= 1
+            token = match.group()
+            start = match.start()
+            
+            if token == '{':
+                yield start, None, line_num
+                i = start + 1
                 continue
             
-            if char == '\\':
-                escape_next = True
-                i -= 1
+            if token == '\n':
+                line_num += 1
+                i = start + 1
                 continue
             
-            # Check for string delimiters
-            if char in ['"', "'", '`']:
-                if not in_string:
-                    # Starting a new string
-                    in_string = True
-                    string_start_char = char
-                elif char == string_start_char:
-                    # Ending the current string
-                    in_string = False
-                    string_start_char = None
+            # Find where the string literal or comment ends
+            if token == '//':
+                end = code.find('\n', start)
+                end = length if end == -1 else end  # Leave the newline for the main loop
+                lexical_type = 'COMMENT'
+            elif token == '/*':
+                end = code.find('*/', start + 2)
+                end = length if end == -1 else end + 2
+                lexical_type = 'COMMENT'
+            else:
+                end = self._find_string_end(code, start + 1, token)
+                lexical_type = 'STRING'
             
-            i -= 1
-        
-        return in_string
+            # Report braces inside the literal/comment without re-scanning it later
+            brace = code.find('{', start, end)
+            while brace != -1:
+                yield brace, lexical_type, line_num + code.count('\n', start, brace)
+                brace = code.find('{', brace + 1, end)
+            
+            line_num += code.count('\n', start, end)
+            i = end
     
-    def _is_inside_comment(self, code: str, pos: int) -> bool:
+    def _find_string_end(self, code: str, pos: int, quote: str) -> int:
         """
-        Check if the position is inside a comment (line comment // or block comment /* */).
+        Return the index just past the closing quote of a string literal whose
+        body starts at pos, honouring backslash escapes. Unterminated strings
+        run to the end of the code.
         """
-        # Find the start of the current line for line comment detection
-        line_start = code.rfind('\n', 0, pos) + 1
-        
-        # Check if we're in a line comment
-        line_content = code[line_start:pos]
-        if '//' in line_content:
-            # Find the position of the last // before our position
-            last_comment = line_content.rfind('//')
-            # Check if there are any string delimiters between // and our position
-            content_after_comment = line_content[last_comment + 2:pos - line_start]
-            if not self._has_unclosed_string_delimiters(content_after_comment):
-                return True
-        
-        # Check if we're in a block comment
-        # Look for /* before our position and */ after it
-        block_start = code.rfind('/*', 0, pos)
-        if block_start != -1:
-            # Check if there's a matching */ after our position
-            block_end = code.find('*/', pos)
-            if block_end != -1:
-                return True
-        
-        return False
-    
-    def _has_unclosed_string_delimiters(self, content: str) -> bool:
-        """Check if content has unclosed string delimiters."""
-        in_string = False
-        string_char = None
-        escape_next = False
-        
-        for char in content:
-            if escape_next:
-                escape_next = False
-                continue
-            
-            if char == '\\':
-                escape_next = True
-                continue
-            
-            if char in ['"', "'", '`']:
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
-                    string_char = None
-        
-        return in_string
+        end_pattern = _STRING_END_PATTERNS[quote]
+        while True:
+            match = end_pattern.search(code, pos)
+            if match is None:
+                return len(code)
+            if match.group() == quote:
+                return match.end()
+            # Backslash: skip the escaped character
+            pos = match.end() + 1
     
     def _is_json_content(self, code: str) -> bool:
         """
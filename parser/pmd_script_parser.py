@@ -1,10 +1,17 @@
 # In pmd_script_parser.py
 from lark import Lark
 from pathlib import Path
+from collections import Counter, OrderedDict
+import hashlib
 import sys
+import threading
+import time
 from importlib import resources
 from .pmd_preprocessor import PMDPreprocessor
 
+# Last-resort grammar used when the PMD script grammar cannot parse a script
+MINIMAL_GRAMMAR = "?program: source_elements?\n?source_elements: statement+\n?statement: IDENTIFIER"
+
 # Cache for grammar content and warning flags
 _cached_grammar = None
 _grammar_warned = False
@@ -36,6 +43,90 @@ def load_grammar() -> str:
         _cached_grammar = _read_grammar_from_disk()
     return _cached_grammar
 
+# Options for the main LALR parser; part of the prebuilt parser fingerprint.
+LALR_OPTIONS = {'start': 'program', 'parser': 'lalr', 'propagate_positions': True}
+
+# Serialized LALR tables, generated at build time next to the grammar and
+# otherwise written to the per-user cache on first use.
+PREBUILT_PARSER_NAME = "pmd_script_parser.lalr"
+
+def parser_fingerprint(grammar: str) -> str:
+    """Digest identifying a prebuilt parser: grammar text, options, Lark and Python version."""
+    import lark
+    digest = hashlib.sha256(grammar.encode("utf-8"))
+    digest.update(repr(sorted(LALR_OPTIONS.items())).encode("utf-8"))
+    digest.update(f"{lark.__version__}|{sys.version_info[0]}.{sys.version_info[1]}".encode("utf-8"))
+    return digest.hexdigest()
+
+def _bundled_parser_path() -> Path:
+    """Location of the build-time prebuilt parser (source tree or PyInstaller bundle)."""
+    if hasattr(sys, "_MEIPASS"):
+        return Path(sys._MEIPASS) / "parser" / PREBUILT_PARSER_NAME
+    return Path(__file__).with_name(PREBUILT_PARSER_NAME)
+
+def _user_parser_path():
+    """Location of the per-user prebuilt parser, or None if there is no writable cache dir."""
+    try:
+        from utils.arcane_paths import get_cache_dir
+        return Path(get_cache_dir()) / PREBUILT_PARSER_NAME
+    except Exception:
+        return None
+
+def load_prebuilt_parser(path: Path, fingerprint: str):
+    """Load serialized LALR tables from `path`; None if missing, stale or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            if f.readline().rstrip(b'\n') != fingerprint.encode('ascii'):
+                return None
+            return Lark.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or written by an incompatible Lark; rebuilt by the caller.
+        return None
+
+def save_prebuilt_parser(parser: Lark, path: Path, fingerprint: str) -> None:
+    """Write serialized LALR tables to `path` atomically."""
+    import os
+    import tempfile
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(fingerprint.encode('ascii') + b'\n')
+            parser.save(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def build_prebuilt_parser(path=None) -> Path:
+    """Compile the grammar and write the prebuilt parser (used by the build specs)."""
+    grammar = load_grammar()
+    target = Path(path) if path else Path(__file__).with_name(PREBUILT_PARSER_NAME)
+    save_prebuilt_parser(Lark(grammar, **LALR_OPTIONS), target, parser_fingerprint(grammar))
+    return target
+
+def _load_or_build_lalr_parser(grammar: str) -> Lark:
+    """Load the LALR parser from a prebuilt file, compiling (and caching) it if needed."""
+    fingerprint = parser_fingerprint(grammar)
+    user_path = _user_parser_path()
+    for path in (_bundled_parser_path(), user_path):
+        if path is not None:
+            parser = load_prebuilt_parser(path, fingerprint)
+            if parser is not None:
+                return parser
+
+    parser = Lark(grammar, **LALR_OPTIONS)
+    if user_path is not None:
+        try:
+            save_prebuilt_parser(parser, user_path, fingerprint)
+        except Exception:
+            pass  # Caching is best effort; the compiled parser is still usable.
+    return parser
+
 # Global parser and preprocessor instances
 pmd_script_parser = None
 preprocessor = None
@@ -46,7 +137,7 @@ def get_pmd_script_parser():
     if pmd_script_parser is None:
         try:
             pmd_script_grammar = load_grammar()
-            pmd_script_parser = Lark(pmd_script_grammar, start='program', parser='lalr', propagate_positions=True)
+            pmd_script_parser = _load_or_build_lalr_parser(pmd_script_grammar)
             preprocessor = PMDPreprocessor()
         except Exception as e:
             if not _grammar_warned:
@@ -65,7 +156,7 @@ def get_pmd_script_parser():
                     print(f"Warning: Failed to load grammar with Earley: {e2}")
                     _grammar_warned = True
                 # Final fallback to minimal grammar
-                pmd_script_parser = Lark("?program: source_elements?\n?source_elements: statement+\n?statement: IDENTIFIER", start='program', parser='earley')
+                pmd_script_parser = Lark(MINIMAL_GRAMMAR, start='program', parser='earley')
                 preprocessor = None
     
     return pmd_script_parser
@@ -93,26 +184,187 @@ def parse_with_preprocessor(code: str):
         for warning in preprocessor.warnings:
             print(f"Preprocessor warning: {warning}")
     
-    # Try parsing with LALR first
-    try:
-        return get_pmd_script_parser().parse(preprocessed_code)
-    except Exception as e:
-        # If LALR fails (e.g., due to newline issues), fall back to Earley
+    from .ast_cache import get_ast_cache, _MISSING
+    disk_cache = get_ast_cache()
+    if disk_cache is None:
+        return _parse_preprocessed(code, preprocessed_code)
+
+    cache_key = disk_cache.key_for(preprocessed_code)
+    tree = disk_cache.get(cache_key)
+    if tree is _MISSING:
+        tree = _parse_preprocessed(code, preprocessed_code)
+        disk_cache.put(cache_key, tree)
+    return tree
+
+class ParseTierStats:
+    """
+    Counts and wall time for each parser tier that produced a result.
+
+    Tiers: 'lalr', 'earley' (LALR failed), 'minimal' (Earley failed too) and
+    'failed'. Time spent on attempts that failed is charged to the tier that
+    finally answered, so the Earley/minimal totals show what grammar gaps cost.
+    LALR failure reasons are tallied to point at the constructs to fix.
+    """
+
+    TIERS = ('lalr', 'earley', 'minimal', 'failed')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = {tier: 0 for tier in self.TIERS}
+            self.seconds = {tier: 0.0 for tier in self.TIERS}
+            self.negative_cache_hits = 0
+            self.lalr_failure_reasons = Counter()
+
+    def record(self, tier: str, seconds: float) -> None:
+        with self._lock:
+            self.counts[tier] += 1
+            self.seconds[tier] += seconds
+
+    def record_lalr_failure(self, exc: Exception) -> None:
+        with self._lock:
+            self.lalr_failure_reasons[_lalr_failure_reason(exc)] += 1
+
+    def record_negative_cache_hit(self) -> None:
+        with self._lock:
+            self.negative_cache_hits += 1
+
+    def snapshot(self) -> dict:
+        """Plain-dict copy (picklable, JSON-friendly)."""
+        with self._lock:
+            return {
+                'counts': dict(self.counts),
+                'seconds': dict(self.seconds),
+                'negative_cache_hits': self.negative_cache_hits,
+                'lalr_failure_reasons': dict(self.lalr_failure_reasons),
+            }
+
+    def merge(self, snapshot: dict) -> None:
+        """Add a snapshot from another process (e.g. a --jobs worker)."""
+        with self._lock:
+            for tier, count in snapshot.get('counts', {}).items():
+                self.counts[tier] = self.counts.get(tier, 0) + count
+            for tier, seconds in snapshot.get('seconds', {}).items():
+                self.seconds[tier] = self.seconds.get(tier, 0.0) + seconds
+            self.negative_cache_hits += snapshot.get('negative_cache_hits', 0)
+            self.lalr_failure_reasons.update(snapshot.get('lalr_failure_reasons', {}))
+
+
+def _lalr_failure_reason(exc: Exception) -> str:
+    """Position-independent description of a LALR failure, for tallying."""
+    token = getattr(exc, 'token', None)
+    if token is not None and hasattr(token, 'type'):
+        return f"{type(exc).__name__}: unexpected {token.type}"
+    char = getattr(exc, 'char', None)
+    if char is not None:
+        return f"{type(exc).__name__}: unexpected character {char!r}"
+    return type(exc).__name__
+
+
+parse_stats = ParseTierStats()
+
+def get_parse_stats() -> ParseTierStats:
+    """Process-wide parser tier statistics."""
+    return parse_stats
+
+# Scripts known to fail LALR, mapped to the tier that handled them, so repeat
+# parses of the same content skip the doomed attempts. Keyed by a digest of the
+# preprocessed code rather than the code itself to keep memory flat, and kept
+# as an LRU of at most KNOWN_FALLBACK_LIMIT entries so a long-lived process
+# (web server, watch mode) does not grow it without bound.
+KNOWN_FALLBACK_LIMIT = 4096
+_known_fallback_tier = OrderedDict()
+_known_fallback_lock = threading.Lock()
+
+_earley_parser = None
+_minimal_parser = None
+
+def _content_digest(preprocessed_code: str) -> bytes:
+    return hashlib.blake2b(preprocessed_code.encode('utf-8'), digest_size=16).digest()
+
+def get_earley_parser() -> Lark:
+    """Get the Earley fallback parser, creating it once on first use."""
+    global _earley_parser
+    if _earley_parser is None:
+        _earley_parser = Lark(load_grammar(), start='program', parser='earley', propagate_positions=True)
+    return _earley_parser
+
+def get_minimal_parser():
+    """
+    Get the last-resort minimal parser, creating it once on first use.
+
+    Returns None if the minimal grammar itself cannot be built; that outcome is
+    remembered too, so the build is not retried for every failing script.
+    """
+    global _minimal_parser
+    if _minimal_parser is None:
         try:
-            from lark import Lark
-            grammar = load_grammar()  # Uses cached grammar
-            earley_parser = Lark(grammar, start='program', parser='earley', propagate_positions=True)
-            return earley_parser.parse(preprocessed_code)  # Use preprocessed code
+            _minimal_parser = Lark(MINIMAL_GRAMMAR, start='program', parser='earley')
+        except Exception:
+            _minimal_parser = False
+    return _minimal_parser or None
+
+def _parse_preprocessed(code: str, preprocessed_code: str):
+    """Parse already-preprocessed code: LALR, then Earley, then the minimal grammar."""
+    global _grammar_warned
+
+    start = time.perf_counter()
+    digest = _content_digest(preprocessed_code)
+    with _known_fallback_lock:
+        known_tier = _known_fallback_tier.get(digest)
+        if known_tier is not None:
+            _known_fallback_tier.move_to_end(digest)
+
+    if known_tier is None:
+        # Try parsing with LALR first
+        try:
+            tree = get_pmd_script_parser().parse(preprocessed_code)
+            parse_stats.record('lalr', time.perf_counter() - start)
+            return tree
+        except Exception as e:
+            # If LALR fails (e.g., due to newline issues), fall back to Earley
+            parse_stats.record_lalr_failure(e)
+    else:
+        parse_stats.record_negative_cache_hit()
+
+    if known_tier in (None, 'earley'):
+        try:
+            tree = get_earley_parser().parse(preprocessed_code)  # Use preprocessed code
+            _remember_fallback_tier(digest, 'earley')
+            parse_stats.record('earley', time.perf_counter() - start)
+            return tree
         except Exception as e2:
             if not _grammar_warned:
                 print(f"Warning: Both LALR and Earley parsing failed: {e2}")
                 _grammar_warned = True
-            # Final fallback - try minimal parsing
-            try:
-                minimal_parser = Lark("?program: source_elements?\n?source_elements: statement+\n?statement: IDENTIFIER", start='program', parser='earley')
-                return minimal_parser.parse(code)
-            except Exception as e3:
-                if not _grammar_warned:
-                    print(f"Warning: All parsing attempts failed: {e3}")
-                    _grammar_warned = True
-                return None
\ No newline at end of file
+
+    if known_tier == 'failed':
+        parse_stats.record('failed', time.perf_counter() - start)
+        return None
+
+    # Final fallback - try minimal parsing
+    try:
+        minimal_parser = get_minimal_parser()
+        if minimal_parser is None:
+            raise RuntimeError("minimal grammar unavailable")
+        tree = minimal_parser.parse(code)
+        _remember_fallback_tier(digest, 'minimal')
+        parse_stats.record('minimal', time.perf_counter() - start)
+        return tree
+    except Exception as e3:
+        if not _grammar_warned:
+            print(f"Warning: All parsing attempts failed: {e3}")
+            _grammar_warned = True
+        _remember_fallback_tier(digest, 'failed')
+        parse_stats.record('failed', time.perf_counter() - start)
+        return None
+
+def _remember_fallback_tier(digest: bytes, tier: str) -> None:
+    with _known_fallback_lock:
+        _known_fallback_tier[digest] = tier
+        _known_fallback_tier.move_to_end(digest)
+        while len(_known_fallback_tier) > KNOWN_FALLBACK_LIMIT:
+            _known_fallback_tier.popitem(last=False)
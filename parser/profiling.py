@@ -0,0 +1,164 @@
+"""
+Opt-in instrumentation for one analysis run.
+
+An AnalysisProfiler passed to RulesEngine.run() and ModelParser.parse_files()
+(or IncrementalAnalyzer.analyze()) records:
+
+- wall and CPU time of every rule RulesEngine runs on its own, and of the
+  multiplexed script-rule unit as a whole (its rules share one walk, so their
+  time cannot be split per rule; set execution.multiplex_script_rules to false
+  to time them individually),
+- parse time of every file ModelParser loads,
+- stage totals its owner records (file processing, parsing, analysis, ...).
+
+timing_report() adds findings per rule, the parser tier statistics and the AST
+cache hit ratios (for the in-run table also per source kind, with the time
+spent parsing each kind), giving the JSON-friendly "timing" block of the v2 JSON
+output and of web job results. Parser tier and disk cache counts are the
+increase since the profiler was created, so create one per run.
+
+With `profile_dir` set, every rule also runs under cProfile and its stats are
+dumped to <profile_dir>/<RuleName>.pstats (read them with pstats or snakeviz).
+cProfile can only profile one thread at a time, so the engine then runs rules
+one by one and without multiplexing.
+"""
+import cProfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .ast_cache import get_ast_cache
+from .pmd_script_parser import get_parse_stats
+
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+class AnalysisProfiler:
+    """Thread-safe collector of rule and file timings for one run."""
+
+    def __init__(self, profile_dir: Optional[str] = None):
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self._lock = threading.Lock()
+        self.rules: Dict[str, Dict[str, float]] = {}
+        self.multiplexed: Optional[Dict[str, Any]] = None
+        self.files: Dict[str, float] = {}
+        self.stages: Dict[str, float] = {}
+        # Parser tier and disk cache counters are process-wide; report what this run added.
+        self._tiers_at_start = get_parse_stats().snapshot()
+        self._disk_cache = get_ast_cache()
+        self._disk_cache_at_start = self._disk_cache.stats() if self._disk_cache is not None else None
+
+    def run_rule(self, rule_name: str, run: Callable[[], List[Any]]) -> List[Any]:
+        """Run one rule through `run`, recording its wall and CPU time (and cProfile stats)."""
+        profile = cProfile.Profile() if self.profile_dir else None
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            return run()
+        finally:
+            if profile is not None:
+                profile.disable()
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            with self._lock:
+                self.rules[rule_name] = {'wall': wall, 'cpu': cpu}
+            if profile is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(str(self.profile_dir / f"{rule_name}.pstats"))
+
+    def run_multiplexed(self, rule_names: Iterable[str], run: Callable[[], List[Any]]) -> List[Any]:
+        """Run the multiplexed script-rule unit, recording its time as one entry."""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            return run()
+        finally:
+            entry = {
+                'rules': sorted(rule_names),
+                'wall': time.perf_counter() - wall_start,
+                'cpu': time.thread_time() - cpu_start,
+            }
+            with self._lock:
+                self.multiplexed = entry
+
+    def record_file(self, file_path: str, seconds: float) -> None:
+        with self._lock:
+            self.files[file_path] = seconds
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = seconds
+
+    def timing_report(self, context: Any = None, findings: Iterable[Any] = ()) -> Dict[str, Any]:
+        """
+        The "timing" block: stages, rules, files, findings per rule, parser tiers
+        and cache hit ratios.
+
+        Rules and files are listed slowest first. `findings` are the run's
+        findings, counted per rule; `context` supplies the in-run AST intern
+        table statistics.
+        """
+        findings_by_rule = Counter(finding.rule_id for finding in findings)
+        with self._lock:
+            rules = {
+                name: {'wall': round(t['wall'], 6), 'cpu': round(t['cpu'], 6),
+                       'findings': findings_by_rule.get(name, 0)}
+                for name, t in sorted(self.rules.items(), key=lambda item: (-item[1]['wall'], item[0]))
+            }
+            multiplexed = None
+            if self.multiplexed is not None:
+                multiplexed = {
+                    'rules': self.multiplexed['rules'],
+                    'wall': round(self.multiplexed['wall'], 6),
+                    'cpu': round(self.multiplexed['cpu'], 6),
+                    'findings': sum(findings_by_rule.get(name, 0) for name in self.multiplexed['rules']),
+                }
+            files = {
+                path: round(seconds, 6)
+                for path, seconds in sorted(self.files.items(), key=lambda item: (-item[1], item[0]))
+            }
+            report = {
+                'stages': {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+                'rules': rules,
+                'multiplexed': multiplexed,
+                'files': files,
+                'findings_by_rule': dict(sorted(findings_by_rule.items())),
+            }
+
+        tiers, start = get_parse_stats().snapshot(), self._tiers_at_start
+        report['parser_tiers'] = {
+            tier: {
+                'count': count - start['counts'].get(tier, 0),
+                'seconds': round(tiers['seconds'][tier] - start['seconds'].get(tier, 0.0), 6),
+            }
+            for tier, count in tiers['counts'].items()
+        }
+        report['parser_tiers']['known_fallback_hits'] = tiers['negative_cache_hits'] - start['negative_cache_hits']
+
+        caches = {}
+        disk_cache = get_ast_cache()
+        if disk_cache is not None:
+            stats = disk_cache.stats()
+            if disk_cache is self._disk_cache:
+                stats = {key: value - self._disk_cache_at_start.get(key, 0) for key, value in stats.items()}
+            caches['ast_disk'] = {**stats, 'hit_ratio': _ratio(stats['hits'], stats['misses'])}
+        if context is not None and hasattr(context, 'get_ast_cache_stats'):
+            stats = context.get_ast_cache_stats()
+            caches['ast_intern'] = {**stats, 'hit_ratio': _ratio(stats['hits'], stats['misses'])}
+            if hasattr(context, 'get_ast_kind_stats'):
+                caches['ast_intern']['kinds'] = {
+                    kind: {**kind_stats, 'seconds': round(kind_stats['seconds'], 6),
+                           'hit_ratio': _ratio(kind_stats['hits'], kind_stats['misses'])}
+                    for kind, kind_stats in context.get_ast_kind_stats().items()
+                }
+        report['caches'] = caches
+        if self.profile_dir:
+            report['profile_dir'] = str(self.profile_dir)
+        return report
@@ -0,0 +1,169 @@
+"""
+Prebuilt manifest of the built-in rules.
+
+Discovering rules by walking parser.rules imports every module in the package
+(shared helpers, detectors, examples) and inspects every class. The manifest
+records, for each concrete rule, its ID (class name), the module that defines
+it, its category and its configuration keys, so RulesEngine can import only
+the modules of the rules it will run.
+
+The manifest is generated at build time next to this file (the PyInstaller
+specs call build_rule_manifest()) and otherwise written to the per-user cache
+after the first full discovery. It carries a fingerprint of every source file
+in parser.rules; a manifest whose fingerprint does not match the sources is
+ignored. Frozen builds cannot change after the build, so their bundled
+manifest is trusted as is.
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import rules
+from .rules.base import Rule
+
+MANIFEST_NAME = "rule_manifest.json"
+
+# Bump when the manifest layout changes.
+MANIFEST_FORMAT = 1
+
+
+def is_concrete_rule(member: Any) -> bool:
+    """True for Rule subclasses that discovery instantiates (not abstract, not examples)."""
+    if not (inspect.isclass(member) and issubclass(member, Rule) and member is not Rule):
+        return False
+    if getattr(member, '__abstractmethods__', None):
+        return False
+    return not getattr(member, 'IS_EXAMPLE', False)
+
+
+def manifest_entry(rule_class: type, module_name: str) -> Dict[str, Any]:
+    category = getattr(rule_class, 'CATEGORY', None)
+    return {
+        'rule_id': rule_class.__name__,
+        'module': module_name,
+        'category': category.value if hasattr(category, 'value') else str(category),
+        'config_keys': sorted(getattr(rule_class, 'AVAILABLE_SETTINGS', {}) or {}),
+    }
+
+
+def rules_fingerprint() -> str:
+    """Digest of every .py file under parser.rules (paths and contents)."""
+    digest = hashlib.sha256(f"format {MANIFEST_FORMAT}".encode('utf-8'))
+    for package_dir in rules.__path__:
+        for root, dirs, files in os.walk(package_dir):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, package_dir).replace(os.sep, '/').encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def collect_rule_manifest(on_error=None) -> List[Dict[str, Any]]:
+    """
+    Walk parser.rules, importing every module, and list the concrete rules.
+
+    Entries are in discovery order: package walk order, then class name within
+    a module. `on_error(module_name, exc)` is called for modules that fail to
+    import; they are skipped.
+    """
+    entries = []
+    for _, name, _ in pkgutil.walk_packages(rules.__path__, f"{rules.__name__}."):
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:
+            if on_error is not None:
+                on_error(name, e)
+            continue
+        for _, member in inspect.getmembers(module, is_concrete_rule):
+            entries.append(manifest_entry(member, name))
+    return entries
+
+
+def _bundled_manifest_path() -> Path:
+    """Location of the build-time manifest (source tree or PyInstaller bundle)."""
+    if hasattr(sys, "_MEIPASS"):
+        return Path(sys._MEIPASS) / "parser" / MANIFEST_NAME
+    return Path(__file__).with_name(MANIFEST_NAME)
+
+
+def _user_manifest_path() -> Optional[Path]:
+    """Location of the per-user manifest, or None if there is no writable cache dir."""
+    try:
+        from utils.arcane_paths import get_cache_dir
+        return Path(get_cache_dir()) / MANIFEST_NAME
+    except Exception:
+        return None
+
+
+def read_rule_manifest(path: Path, fingerprint: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Entries from the manifest at `path`; None if missing, unreadable or (unless `fingerprint` is None) stale."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('format') != MANIFEST_FORMAT:
+        return None
+    if fingerprint is not None and manifest.get('fingerprint') != fingerprint:
+        return None
+    entries = manifest.get('rules')
+    return entries if isinstance(entries, list) else None
+
+
+def write_rule_manifest(entries: List[Dict[str, Any]], path: Path, fingerprint: str) -> None:
+    """Write the manifest to `path` atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'format': MANIFEST_FORMAT, 'fingerprint': fingerprint, 'rules': entries}, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_rule_manifest() -> Optional[List[Dict[str, Any]]]:
+    """The bundled manifest, else the per-user one; None if neither matches the sources."""
+    if getattr(sys, 'frozen', False):
+        entries = read_rule_manifest(_bundled_manifest_path(), None)
+        if entries is not None:
+            return entries
+    fingerprint = rules_fingerprint()
+    for path in (_bundled_manifest_path(), _user_manifest_path()):
+        if path is not None:
+            entries = read_rule_manifest(path, fingerprint)
+            if entries is not None:
+                return entries
+    return None
+
+
+def save_user_rule_manifest(entries: List[Dict[str, Any]]) -> None:
+    """Cache a freshly collected manifest for later runs (best effort)."""
+    path = _user_manifest_path()
+    if path is None:
+        return
+    try:
+        write_rule_manifest(entries, path, rules_fingerprint())
+    except Exception:
+        pass  # Caching is best effort; discovery already has the rules.
+
+
+def build_rule_manifest(path=None) -> Path:
+    """Collect the rules and write the manifest (used by the build specs)."""
+    target = Path(path) if path else _bundled_manifest_path()
+    write_rule_manifest(collect_rule_manifest(), target, rules_fingerprint())
+    return target
@@ -1,10 +1,39 @@
+import copy
+import threading
 from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Generator, Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass
+from functools import partial
 from ..models import ProjectContext, PMDModel, PodModel
+from ..source_index import source_index_for
 from lark import Tree
-import re
+from pydantic import BaseModel
+
+# Guards the lazy creation of per-rule AST tables; rule instances are shared
+# by concurrent runs.
+_rule_ast_table_lock = threading.Lock()
+
+
+def contains_script_tag(value: str) -> bool:
+    """True if `value` holds a <% ... %> block (same test as re.search(r'<%.*?%>', value, re.DOTALL))."""
+    start = value.find('<%')
+    return start != -1 and value.find('%>', start + 2) != -1
+
+
+def _model_fields(model: BaseModel) -> Dict[str, Any]:
+    """
+    A model's exported fields, in declaration order, as a shallow dict.
+
+    Stands in for model_dump() when walking a model: values are the model's own
+    objects rather than deep copies, and fields declared with exclude=True
+    (file_path, source_content) are left out just as model_dump() leaves them out.
+    """
+    return {
+        name: getattr(model, name)
+        for name, field in type(model).model_fields.items()
+        if not field.exclude
+    }
 
 
 class FixStrategy(str, Enum):
@@ -80,6 +109,16 @@ class Rule(ABC):
     # Default HUMAN_REVIEW (safest — agents should surface, not act).
     FIX_STRATEGY: FixStrategy = FixStrategy.HUMAN_REVIEW
 
+    # Set True for rules that compare models across files (beyond the shared
+    # SMD/AMD). In --jobs mode such rules run once in the parent process on the
+    # merged context instead of per worker shard.
+    REQUIRES_FULL_CONTEXT: bool = False
+
+    # File extensions whose content this rule reads beyond the file it reports
+    # on. Incremental analysis re-runs the rule over every file when a file with
+    # one of these extensions changes. The default covers the shared SMD/AMD.
+    DEPENDS_ON: Tuple[str, ...] = ('.smd', '.amd')
+
     # Dictionary defining available custom settings.
     # If empty, the rule does not support custom configuration.
     AVAILABLE_SETTINGS: Dict[str, Any] = {}
@@ -118,7 +157,9 @@ class Rule(ABC):
     def find_script_fields(self, pmd_model: PMDModel, context=None) -> List[Tuple[str, str, str, int]]:
         """
         Recursively find all fields in a PMD model that contain script content (<% %>).
-        Uses context-level caching to avoid repeated expensive parsing operations.
+        
+        ModelParser collects this table while loading the page, so this is normally
+        a lookup. Models built some other way are walked here and the result cached.
         
         Args:
             pmd_model: The PMD model to search
@@ -131,6 +172,11 @@ class Rule(ABC):
             - field_name: Just the field name for display purposes
             - line_offset: Line number where the script starts in the original file
         """
+        # Table collected when the page was loaded
+        cached_fields = pmd_model.get_cached_script_fields()
+        if cached_fields is not None:
+            return cached_fields
+        
         # Use context-level caching if available
         if context is not None:
             cached_fields = context.get_cached_pmd_script_fields(pmd_model.pageId)
@@ -141,16 +187,10 @@ class Rule(ABC):
             script_fields = self._extract_script_fields(pmd_model)
             context.set_cached_pmd_script_fields(pmd_model.pageId, script_fields)
             return script_fields
-        else:
-            # Fallback to model-level caching for backward compatibility
-            cached_fields = pmd_model.get_cached_script_fields()
-            if cached_fields is not None:
-                return cached_fields
-            
-            # If not cached, extract and cache them
-            script_fields = self._extract_script_fields(pmd_model)
-            pmd_model.set_cached_script_fields(script_fields)
-            return script_fields
+        
+        script_fields = self._extract_script_fields(pmd_model)
+        pmd_model.set_cached_script_fields(script_fields)
+        return script_fields
     
     def get_cached_ast(self, script_content: str, context=None) -> Optional[Tree]:
         """
@@ -168,39 +208,67 @@ class Rule(ABC):
         if not content:
             return None
         
-        # Use context-level caching if available
+        return self._ast_intern(context)(content, self._parse_for_cache)
+    
+    def _ast_intern(self, context=None):
+        """
+        The interning parse every script parse goes through: the context's AST
+        table, or (without a context, for backward compatibility) this rule's own.
+        """
         if context is not None:
-            cache_key = hash(content)
-            cached_ast = context.get_cached_ast(cache_key)
-            if cached_ast is None:
-                try:
-                    from ..pmd_script_parser import parse_with_preprocessor
-                    parsed_ast = parse_with_preprocessor(content)
-                    context.set_cached_ast(cache_key, parsed_ast)
-                    return parsed_ast
-                except Exception as e:
-                    from utils.console import error
-                    error(f"Failed to parse script content: {e}")
-                    context.set_cached_ast(cache_key, None)
+            return context.intern_ast
+        return self._rule_ast_table().intern
+    
+    def _rule_ast_table(self):
+        """Per-rule AST cache, used when no ProjectContext is available."""
+        if not hasattr(self, '_script_ast_cache'):
+            from ..ast_cache import ASTInternTable
+            with _rule_ast_table_lock:
+                if not hasattr(self, '_script_ast_cache'):
+                    self._script_ast_cache = ASTInternTable()
+        return self._script_ast_cache
+    
+    @staticmethod
+    def _parse_template_for_cache(template: str, intern=None) -> Optional[Tree]:
+        """
+        Parse a template expression ("text <% expr %> text"); failures are logged and cached as None.
+
+        With `intern` (see _ast_intern), each <% %> block is interned as a
+        'template_block' source, so a block shared by many templates is parsed once.
+        A block repeated within one template gets a copy: lark's subtree walks and
+        the detectors' id()-keyed bookkeeping would otherwise visit it only once.
+        """
+        from .script.shared.template_expression_preprocessor import TemplateExpressionPreprocessor
+        parse_block = None
+        if intern is not None:
+            from ..pmd_script_parser import parse_with_preprocessor
+            used_blocks = set()
+
+            def parse_block(code: str) -> Optional[Tree]:
+                tree = intern(code, parse_with_preprocessor, kind='template_block')
+                if tree is None:
                     return None
-            else:
-                return cached_ast
-        else:
-            # Fallback to per-rule caching for backward compatibility
-            cache_key = hash(content)
-            if not hasattr(self, '_script_ast_cache'):
-                self._script_ast_cache = {}
-            
-            if cache_key not in self._script_ast_cache:
-                try:
-                    from ..pmd_script_parser import parse_with_preprocessor
-                    self._script_ast_cache[cache_key] = parse_with_preprocessor(content)
-                except Exception as e:
-                    from utils.console import error
-                    error(f"Failed to parse script content: {e}")
-                    self._script_ast_cache[cache_key] = None
-            
-            return self._script_ast_cache[cache_key]
+                if id(tree) in used_blocks:
+                    return copy.deepcopy(tree)
+                used_blocks.add(id(tree))
+                return tree
+        try:
+            return TemplateExpressionPreprocessor().preprocess_template_expression(template, parse_block)
+        except Exception as e:
+            from utils.console import warn
+            warn(f"Failed to parse template expression '{template[:50]}...': {e}")
+            return None
+    
+    @staticmethod
+    def _parse_for_cache(content: str) -> Optional[Tree]:
+        """Parse stripped script content; failures are logged and cached as None."""
+        try:
+            from ..pmd_script_parser import parse_with_preprocessor
+            return parse_with_preprocessor(content)
+        except Exception as e:
+            from utils.console import error
+            error(f"Failed to parse script content: {e}")
+            return None
     
     def _get_readable_identifier(self, item: Dict[str, Any], fallback_index: int) -> str:
         """
@@ -274,7 +342,6 @@ class Rule(ABC):
     def _extract_script_fields(self, pmd_model: PMDModel) -> List[Tuple[str, str, str, int]]:
         """Internal method to extract script fields without caching."""
         script_fields = []
-        script_pattern = r'<%.*?%>'
         
         # Track the last line found to search forward from there
         last_line_found = 0
@@ -287,7 +354,7 @@ class Rule(ABC):
             nonlocal last_line_found, used_hashes
             
             for key, value in data.items():
-                if isinstance(value, str) and re.search(script_pattern, value, re.DOTALL):
+                if isinstance(value, str) and contains_script_tag(value):
                     field_path = f"{prefix}.{key}" if prefix else key
                     # Use human-readable display name
                     display_name = f"{display_prefix}->{key}" if display_prefix else key
@@ -319,9 +386,8 @@ class Rule(ABC):
                     new_prefix = f"{prefix}.{key}" if prefix else key
                     new_display_prefix = f"{display_prefix}->{key}" if display_prefix else key
                     _search_dict(value, new_prefix, file_content, new_display_prefix)
-                elif hasattr(value, 'model_dump'):  # Handle Pydantic models
-                    # Convert Pydantic model to dictionary
-                    model_dict = value.model_dump()
+                elif isinstance(value, BaseModel):  # Nested models (presentation, includes)
+                    model_dict = _model_fields(value)
                     new_prefix = f"{prefix}.{key}" if prefix else key
                     new_display_prefix = f"{display_prefix}->{key}" if display_prefix else key
                     _search_dict(model_dict, new_prefix, file_content, new_display_prefix)
@@ -336,7 +402,7 @@ class Rule(ABC):
                             new_display_prefix = f"{display_prefix}->{key}[{i}]->{readable_id}" if display_prefix else f"{key}[{i}]->{readable_id}"
                             
                             _search_dict(item, new_prefix, file_content, new_display_prefix)
-                        elif isinstance(item, str) and re.search(script_pattern, item, re.DOTALL):
+                        elif isinstance(item, str) and contains_script_tag(item):
                             field_path = f"{prefix}.{key}.{i}" if prefix else f"{key}.{i}"
                             # Use human-readable display name
                             display_name = f"{display_prefix}->{key}[{i}]" if display_prefix else f"{key}[{i}]"
@@ -359,9 +425,8 @@ class Rule(ABC):
                             
                             last_line_found = line_offset
                             script_fields.append((field_path, item, display_name, line_offset))
-                        elif hasattr(item, 'model_dump'):  # Handle Pydantic models in lists
-                            # Convert Pydantic model to dictionary
-                            model_dict = item.model_dump()
+                        elif isinstance(item, BaseModel):  # Handle Pydantic models in lists
+                            model_dict = _model_fields(item)
                             new_prefix = f"{prefix}.{key}.{i}" if prefix else f"{key}.{i}"
                             
                             # Create human-readable path using priority: id -> label -> type -> name -> index
@@ -373,9 +438,7 @@ class Rule(ABC):
         # Get the source content from the PMD model
         source_content = getattr(pmd_model, 'source_content', '')
         
-        # Convert PMD model to dict for recursive search
-        pmd_dict = pmd_model.model_dump(exclude={'file_path', 'source_content'})
-        _search_dict(pmd_dict, file_content=source_content)
+        _search_dict(_model_fields(pmd_model), file_content=source_content)
         
         return script_fields
     
@@ -395,7 +458,7 @@ class Rule(ABC):
         if not file_content or not script_content:
             return 1
         
-        lines = file_content.split('\n')
+        index = source_index_for(file_content)
         start_index = max(0, search_start_line)
         
         # Strategy 1: For single-line scripts, search for exact match
@@ -408,24 +471,21 @@ class Rule(ABC):
             
             # Search from BEGINNING for exact matches (not from start_index)
             # because JSON field order doesn't match file order
-            matches_found = 0
-            for i in range(0, len(lines)):  # Search from beginning
-                if script_content in lines[i] or escaped_content in lines[i]:
-                    if matches_found == occurrence_index:
-                        # For single-line scripts, the exact match IS on the content line
-                        # Don't adjust - return i + 1 as-is
-                        return i + 1
-                    matches_found += 1
+            for matches_found, i in enumerate(index.lines_containing_any((script_content, escaped_content))):
+                if matches_found == occurrence_index:
+                    # For single-line scripts, the exact match IS on the content line
+                    # Don't adjust - return i + 1 as-is
+                    return i + 1
             
             # If exact match fails, find the next line with <% after start_index
             # This is reliable for sequential processing
-            for i in range(start_index, len(lines)):
-                if '<%' in lines[i]:
-                    # Check if content starts on same line or next line
-                    if self._is_multiline_script_block(script_content):
-                        return i + 2  # Content starts on next line
-                    else:
-                        return i + 1  # Content starts on same line
+            i = index.next_marker_line(start_index)
+            if i is not None:
+                # Check if content starts on same line or next line
+                if self._is_multiline_script_block(script_content):
+                    return i + 2  # Content starts on next line
+                else:
+                    return i + 1  # Content starts on same line
         
         # Strategy 2: For multi-line scripts, search for distinctive content
         # Search for unique code patterns that would appear in the file
@@ -452,34 +512,22 @@ class Rule(ABC):
                     # Re-escape for matching against JSON source
                     search_text_escaped = search_text.replace('\t', '\\t').replace('\n', '\\n')
                     
-                    # Search from start_index first (forward search for sequential fields)
-                    for i in range(start_index, len(lines)):
-                        if search_text in lines[i] or search_text_escaped in lines[i]:
-                            # Found the code - now find the opening <% before it (within reasonable distance)
-                            for j in range(i, max(0, i - 30), -1):  # Search backward from found line
-                                if '<%' in lines[j]:
-                                    # Verify this is likely the right <% by checking proximity
-                                    if i - j < 25:  # Should be within 25 lines
-                                        # Found the <%, now determine where AST line 1 starts
-                                        if self._is_multiline_script_block(script_content):
-                                            return j + 2  # Multiline: return line after <%
-                                        else:
-                                            return j + 1  # Single-line: return line with <%
-                            return i + 1
-                    
+                    # Search from start_index first (forward search for sequential fields).
                     # If not found forward, search from beginning (handles out-of-order presentation fields)
-                    for i in range(0, len(lines)):
-                        if search_text in lines[i] or search_text_escaped in lines[i]:
-                            # Found the code - now find the opening <% before it
-                            for j in range(i, max(0, i - 30), -1):  # Search backward from found line
-                                if '<%' in lines[j]:
-                                    if i - j < 25:
-                                        # Found the <%, now determine where AST line 1 starts
-                                        if self._is_multiline_script_block(script_content):
-                                            return j + 2  # Multiline: return line after <%
-                                        else:
-                                            return j + 1  # Single-line: return line with <%
-                            return i + 1
+                    i = index.find_line_any((search_text, search_text_escaped), start_index)
+                    if i is None:
+                        i = index.find_line_any((search_text, search_text_escaped), 0)
+                    if i is not None:
+                        # Found the code - now find the opening <% before it (within reasonable distance)
+                        j = index.last_marker_line(i, after_line=max(0, i - 30))
+                        # Verify this is likely the right <% by checking proximity
+                        if j is not None and i - j < 25:  # Should be within 25 lines
+                            # Found the <%, now determine where AST line 1 starts
+                            if self._is_multiline_script_block(script_content):
+                                return j + 2  # Multiline: return line after <%
+                            else:
+                                return j + 1  # Single-line: return line with <%
+                        return i + 1
         
         # Strategy 3: Search for distinctive content from within the script
         # Extract a unique part of the script that should appear in the file
@@ -495,23 +543,23 @@ class Rule(ABC):
                     for code_line in code_lines[:3]:  # Try first 3 lines
                         search_text = code_line[:50]
                         if len(search_text) > 15:
-                            for i in range(start_index, len(lines)):
-                                if search_text in lines[i]:
-                                    # Found it - now find the opening <% before this line
-                                    for j in range(max(0, i - 10), i + 1):
-                                        if '<%' in lines[j]:
-                                            return j + 1
-                                    return i + 1  # Fallback to line where code was found
+                            i = index.find_line(search_text, start_index)
+                            if i is not None:
+                                # Found it - now find the opening <% before this line
+                                j = index.next_marker_line(max(0, i - 10))
+                                if j is not None and j <= i:
+                                    return j + 1
+                                return i + 1  # Fallback to line where code was found
         
         # Strategy 4: Search for ANY <% tag from start position
-        for i in range(start_index, len(lines)):
-            if '<%' in lines[i]:
-                return i + 1
+        i = index.next_marker_line(start_index)
+        if i is not None:
+            return i + 1
         
         # Strategy 5: If nothing found forward, search from beginning for ANY <%
-        for i in range(0, len(lines)):
-            if '<%' in lines[i]:
-                return i + 1
+        i = index.next_marker_line(0)
+        if i is not None:
+            return i + 1
         
         # Fallback: return line 1 (should rarely happen)
         return 1
@@ -660,28 +708,12 @@ class Rule(ABC):
                     from .script.shared.template_expression_preprocessor import TemplateExpressionPreprocessor
                     preprocessor = TemplateExpressionPreprocessor()
                     if preprocessor.is_template_expression(stripped_content):
-                        try:
-                            return preprocessor.preprocess_template_expression(stripped_content)
-                        except Exception as e:
-                            from utils.console import warn
-                            warn(f"Failed to parse template expression '{stripped_content[:50]}...': {e}")
-                            return None
+                        intern = self._ast_intern(context)
+                        return intern(stripped_content, partial(self._parse_template_for_cache, intern=intern),
+                                      kind='template')
                 
             
-            # Use context-level caching if available
-            if context is not None:
-                return self.get_cached_ast(content, context)
-            else:
-                # Fallback to per-rule caching for backward compatibility
-                cache_key = hash(content)
-                if not hasattr(self, '_script_ast_cache'):
-                    self._script_ast_cache = {}
-                
-                if cache_key not in self._script_ast_cache:
-                    from ..pmd_script_parser import parse_with_preprocessor
-                    self._script_ast_cache[cache_key] = parse_with_preprocessor(content)
-                
-                return self._script_ast_cache[cache_key]
+            return self.get_cached_ast(content, context)
         except Exception as e:
             from utils.console import error
             error(f"Failed to parse script content: {e}")
@@ -706,8 +738,15 @@ class Rule(ABC):
             - display_name: Human-readable field name
             - line_offset: Line number where the script starts
         """
+        # Table collected when the pod was loaded
+        cached_fields = pod_model.get_cached_script_fields()
+        if cached_fields is not None:
+            return cached_fields
+        return self._extract_pod_script_fields(pod_model)
+    
+    def _extract_pod_script_fields(self, pod_model: PodModel) -> List[Tuple[str, str, str, int]]:
+        """Internal method to extract Pod script fields without caching."""
         script_fields = []
-        script_pattern = r'<%.*?%>'
         
         # Track which hashes we've used (for duplicates)
         used_hashes = {}
@@ -718,7 +757,7 @@ class Rule(ABC):
             for i, endpoint in enumerate(pod_model.seed.endPoints):
                 if isinstance(endpoint, dict):
                     for field_name, field_value in endpoint.items():
-                        if isinstance(field_value, str) and re.search(script_pattern, field_value, re.DOTALL):
+                        if isinstance(field_value, str) and contains_script_tag(field_value):
                             field_path = f"seed.endPoints[{i}].{field_name}"
                             endpoint_name = endpoint.get('name', f'endpoint_{i}')
                             display_name = f"endpoint->name: {endpoint_name}->{field_name}"
@@ -751,13 +790,12 @@ class Rule(ABC):
     def _find_template_script_fields(self, pod_model: PodModel, widget_data: Any, path_prefix: str, used_hashes: dict, last_line_found: int) -> List[Tuple[str, str, str, int]]:
         """Recursively search template widgets for script content."""
         script_fields = []
-        script_pattern = r'<%.*?%>'
         
         def _search_widget(widget: Dict[str, Any], widget_path: str):
             nonlocal last_line_found
             # Search all widget fields for script content (any field with <% %>)
             for field_name, field_value in widget.items():
-                if isinstance(field_value, str) and re.search(script_pattern, field_value, re.DOTALL):
+                if isinstance(field_value, str) and contains_script_tag(field_value):
                     field_path = f"{widget_path}.{field_name}"
                     widget_type = widget.get('type', 'unknown')
                     widget_id = widget.get('id', 'unnamed')
@@ -816,24 +854,22 @@ class Rule(ABC):
         if not file_content or not script_content:
             return 1
         
-        lines = file_content.split('\n')
+        index = source_index_for(file_content)
         start_index = max(0, search_start_line)
         
         # Strategy 1: For single-line scripts, search for exact match with re-escaped quotes
         if '\n' not in script_content:
             escaped_content = script_content.replace('"', '\\"')
             
-            matches_found = 0
-            for i in range(0, len(lines)):  # Search from beginning
-                if script_content in lines[i] or escaped_content in lines[i]:
-                    if matches_found == occurrence_index:
-                        return i + 1
-                    matches_found += 1
+            # Search from beginning
+            for matches_found, i in enumerate(index.lines_containing_any((script_content, escaped_content))):
+                if matches_found == occurrence_index:
+                    return i + 1
             
             # Fallback: find next <% tag
-            for i in range(start_index, len(lines)):
-                if '<%' in lines[i]:
-                    return i + 1
+            i = index.next_marker_line(start_index)
+            if i is not None:
+                return i + 1
         
         # Strategy 2: For multiline scripts, use same logic as PMD files
         # (This reuses the PMD calculation logic)
@@ -8,6 +8,8 @@ from ...common import Violation
 
 class ConsoleLogDetector(ScriptDetector):
     """Detects console method calls in script content."""
+
+    NODE_TYPES = ('member_dot_expression', 'arguments_expression')
     
     def __init__(self, file_path: str = "", line_offset: int = 1):
         super().__init__(file_path, line_offset)
@@ -16,7 +18,7 @@ class ConsoleLogDetector(ScriptDetector):
     def detect(self, ast: Tree, field_name: str) -> Generator[Violation, None, None]:
         """Detect console method calls in the AST."""
         # Find all member_dot_expression nodes (e.g., console.debug, console.info)
-        member_expressions = ast.find_data('member_dot_expression')
+        member_expressions = self.find_nodes(ast, 'member_dot_expression')
 
         for member_expr in member_expressions:
             if len(member_expr.children) >= 2:
@@ -82,7 +84,7 @@ class ConsoleLogDetector(ScriptDetector):
             return None
 
         best_span = None
-        for stmt in ast.find_data('arguments_expression'):
+        for stmt in self.find_nodes(ast, 'arguments_expression'):
             meta = getattr(stmt, 'meta', None)
             if meta is None or getattr(meta, 'empty', True):
                 continue
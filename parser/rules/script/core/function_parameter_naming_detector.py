@@ -9,6 +9,8 @@ from ...common_validations import validate_script_variable_camel_case
 
 class FunctionParameterNamingDetector(ScriptDetector):
     """Detects function parameters that don't follow lowerCamelCase naming convention."""
+
+    NODE_TYPES = ('function_expression', 'variable_statement')
     
     def __init__(self, file_path: str = "", line_offset: int = 1):
         super().__init__(file_path, line_offset)
@@ -16,7 +18,7 @@ class FunctionParameterNamingDetector(ScriptDetector):
     def detect(self, ast: Tree, field_name: str = "") -> Generator[Violation, None, None]:
         """Detect function parameters that don't follow naming conventions in the AST."""
         # Find all function expressions
-        function_expressions = ast.find_data('function_expression')
+        function_expressions = self.find_nodes(ast, 'function_expression')
         
         for func_expr in function_expressions:
             # Get the function name specific to THIS function expression
@@ -89,7 +91,7 @@ class FunctionParameterNamingDetector(ScriptDetector):
         func_line = self.get_line_from_tree_node(func_expr)
         
         # Find all variable statements and check which one contains this function expression
-        for var_stmt in ast.find_data('variable_statement'):
+        for var_stmt in self.find_nodes(ast, 'variable_statement'):
             if len(var_stmt.children) > 1:
                 var_declaration = var_stmt.children[1]
                 if hasattr(var_declaration, 'data') and var_declaration.data == 'variable_declaration':
@@ -8,6 +8,8 @@ from ...common import Violation
 
 class VarUsageDetector(ScriptDetector):
     """Detects use of 'var' instead of 'let' or 'const' in script content."""
+
+    NODE_TYPES = ('variable_statement', 'for_var_statement', 'for_var_in_statement')
     
     def __init__(self, file_path: str = "", line_offset: int = 1):
         super().__init__(file_path, line_offset)
@@ -15,7 +17,7 @@ class VarUsageDetector(ScriptDetector):
     def detect(self, ast: Tree, field_name: str = "") -> Generator[Violation, None, None]:
         """Detect use of 'var' declarations in the AST."""
         # Find all variable_statement nodes in the AST
-        var_statements = ast.find_data('variable_statement')
+        var_statements = self.find_nodes(ast, 'variable_statement')
         for var_stmt in var_statements:
             # Check if the variable statement uses VAR keyword
             if len(var_stmt.children) > 0 and hasattr(var_stmt.children[0], 'type') and var_stmt.children[0].type == 'VAR':
@@ -45,7 +47,7 @@ class VarUsageDetector(ScriptDetector):
                     )
 
         # Find all for_var_statement nodes (for loops with var declarations)
-        for_var_statements = ast.find_data('for_var_statement')
+        for_var_statements = self.find_nodes(ast, 'for_var_statement')
         for for_stmt in for_var_statements:
             # Get the variable declaration list (second child)
             var_declaration_list = for_stmt.children[1]
@@ -68,7 +70,7 @@ class VarUsageDetector(ScriptDetector):
                         )
 
         # Find all for_var_in_statement nodes (for-in loops with var declarations)
-        for_var_in_statements = ast.find_data('for_var_in_statement')
+        for_var_in_statements = self.find_nodes(ast, 'for_var_in_statement')
         for for_stmt in for_var_in_statements:
             var_token = for_stmt.children[0]
             name_token = for_stmt.children[1]
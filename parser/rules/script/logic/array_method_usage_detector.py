@@ -9,6 +9,8 @@ from ...common import Violation
 class ArrayMethodUsageDetector(ScriptDetector):
     """Detects manual loops that could be replaced with array higher-order methods."""
 
+    NODE_TYPES = ('for_statement', 'for_let_statement', 'for_var_statement')
+
     def __init__(self, file_path: str = "", line_offset: int = 1):
         super().__init__(file_path, line_offset)
 
@@ -24,15 +26,15 @@ class ArrayMethodUsageDetector(ScriptDetector):
         manual_for_types = {'for_statement', 'for_let_statement', 'for_var_statement'}
         
         # Use efficient traversal to find all manual for loops
-        for for_stmt in ast.find_data('for_statement'):
+        for for_stmt in self.find_nodes(ast, 'for_statement'):
             if self._is_counter_based_loop(for_stmt):
                 yield from self._create_violation(for_stmt, field_name, ast)
         
-        for for_stmt in ast.find_data('for_let_statement'):
+        for for_stmt in self.find_nodes(ast, 'for_let_statement'):
             if self._is_counter_based_loop(for_stmt):
                 yield from self._create_violation(for_stmt, field_name, ast)
         
-        for for_stmt in ast.find_data('for_var_statement'):
+        for for_stmt in self.find_nodes(ast, 'for_var_statement'):
             if self._is_counter_based_loop(for_stmt):
                 yield from self._create_violation(for_stmt, field_name, ast)
 
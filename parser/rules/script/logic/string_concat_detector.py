@@ -9,6 +9,8 @@ from ...base import Rule
 
 class StringConcatDetector(ScriptDetector):
     """Detects string concatenation using + operator in script content."""
+
+    NODE_TYPES = ('additive_expression',)
     
     def __init__(self, file_path: str = "", line_offset: int = 1):
         super().__init__(file_path, line_offset)
@@ -16,7 +18,7 @@ class StringConcatDetector(ScriptDetector):
     def detect(self, ast: Tree, field_name: str = "") -> Generator[Violation, None, None]:
         """Detect string concatenation using + operator in the AST."""
         # Find all addition expressions in the AST
-        addition_expressions = ast.find_data('additive_expression')
+        addition_expressions = self.find_nodes(ast, 'additive_expression')
         
         # Track reported lines to avoid duplicate violations for nested concatenations
         reported_lines = set()
@@ -8,6 +8,8 @@ from ...common import Violation
 
 class VerboseBooleanDetector(ScriptDetector):
     """Detects overly verbose boolean checks in script content."""
+
+    NODE_TYPES = ('if_statement', 'ternary_expression')
     
     def __init__(self, file_path: str = "", line_offset: int = 1):
         super().__init__(file_path, line_offset)
@@ -26,7 +28,7 @@ class VerboseBooleanDetector(ScriptDetector):
     def _find_verbose_if_statements(self, ast: Tree, field_name: str):
         """Find verbose boolean patterns in if statements."""
         # Find all if_statement nodes in the AST
-        if_statements = ast.find_data('if_statement')
+        if_statements = self.find_nodes(ast, 'if_statement')
         for if_stmt in if_statements:
             verbose_info = self._analyze_if_statement_for_verbosity(if_stmt)
             if verbose_info:
@@ -58,7 +60,7 @@ class VerboseBooleanDetector(ScriptDetector):
     def _find_verbose_ternary_expressions(self, ast: Tree, field_name: str):
         """Find verbose boolean patterns in ternary expressions."""
         # Find all ternary_expression nodes in the AST (including nested ones)
-        ternary_expressions = ast.find_data('ternary_expression')
+        ternary_expressions = self.find_nodes(ast, 'ternary_expression')
         for ternary_expr in ternary_expressions:
             verbose_info = self._analyze_ternary_expression_for_verbosity(ternary_expr)
             if verbose_info:
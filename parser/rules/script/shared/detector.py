@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from typing import Any, List
 from lark import Tree
 from .violation import Violation
+from .node_index import NodeIndex, get_node_index
 
 
 class ScriptDetector(ABC):
@@ -58,7 +59,16 @@ class ScriptDetector(ABC):
     
     # Debug flag for line number calculations
     DEBUG_LINE_NUMBERS = os.environ.get('DEBUG_LINE_NUMBERS', 'false').lower() == 'true'
-    
+
+    # Node types (Tree.data) this detector looks up with find_nodes(). Declaring
+    # them lets the rule share a single AST walk with other rules (see
+    # shared.dispatch); leave empty for detectors that traverse on their own.
+    NODE_TYPES: tuple = ()
+
+    # Populated by ASTDispatcher.walk() for the AST currently being dispatched.
+    _dispatch_root = None
+    _dispatched_nodes = None
+
     def __init__(self, file_path: str = "", line_offset: int = 1, source_text: str = ""):
         """Initialize detector with file context."""
         self.file_path = file_path
@@ -77,6 +87,26 @@ class ScriptDetector(ABC):
             if hasattr(self, 'file_path'):
                 info(f"   file: {self.file_path}")
     
+    def begin_dispatch(self, ast: Any) -> None:
+        """Reset the collected nodes before a dispatch walk over `ast`."""
+        self._dispatch_root = ast
+        self._dispatched_nodes = {node_type: [] for node_type in self.NODE_TYPES}
+
+    def visit(self, node: Tree) -> None:
+        """Receive a node of one of NODE_TYPES from the dispatch walk."""
+        self._dispatched_nodes[node.data].append(node)
+
+    def find_nodes(self, ast: Any, node_type: str):
+        """
+        Equivalent of ast.find_data(node_type).
+
+        When a dispatch walk already ran over `ast`, the nodes collected during
+        that walk are returned (in the same order) instead of traversing again.
+        """
+        if ast is self._dispatch_root and self._dispatched_nodes is not None and node_type in self._dispatched_nodes:
+            return iter(self._dispatched_nodes[node_type])
+        return ast.find_data(node_type)
+
     def detect(self, ast: Any) -> List[Violation]:
         """
         Analyze AST and return list of violations.
@@ -196,11 +226,17 @@ class ScriptDetector(ABC):
     
     def get_function_context_for_node(self, node: Any, ast: Any) -> str:
         """Get the function name that contains the given node, or None if not in a function."""
-        # Always rebuild function context map to avoid caching issues
+        index = self.node_index(ast)
+        if node in index:
+            return index.enclosing_function(node)
+
+        # Node from a different tree than `ast`: fall back to a structural search.
         function_contexts = self._build_function_context_map(ast)
-        
-        # Find the enclosing function name
         return self._get_enclosing_function_name(node, function_contexts)
+
+    def node_index(self, ast: Any) -> NodeIndex:
+        """Parent/depth/enclosing-function index for `ast`, shared by all detectors."""
+        return get_node_index(ast)
     
     def _build_function_context_map(self, ast: Any) -> dict:
         """Build a map of AST nodes to their enclosing function names."""
@@ -0,0 +1,171 @@
+"""
+Single-traversal dispatch of script ASTs to many detectors.
+
+Most script rules walk the whole AST of every script field on their own
+(ast.find_data(...) per node type), so the same tree is traversed once per
+rule. Detectors that declare the node types they care about (NODE_TYPES) can
+instead share one walk: ASTDispatcher visits every subtree once and fans each
+node out to the detectors interested in its type. The detector then runs its
+normal detect() logic against the collected nodes via find_nodes().
+
+MultiplexedScriptRunner does the same at the rule level: it enumerates the
+script fields once, parses each field once, dispatches the AST to the
+detectors of every eligible rule in a single walk, and converts the violations
+into Findings exactly like ScriptRuleBase._check. Rules that are not eligible
+(see ScriptRuleBase.supports_multiplexing) keep running through their own
+analyze(), which is also the path every rule takes when run on its own.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from lark import Tree
+
+from .detector import ScriptDetector
+from .rule_base import ScriptRuleBase
+from ...base import Finding
+from utils.console import error, warn
+
+
+class ASTDispatcher:
+    """Walks an AST once and hands each node to the detectors that want it."""
+
+    def __init__(self, detectors: Iterable[ScriptDetector]):
+        self.detectors = list(detectors)
+        self._interest: Dict[str, List[ScriptDetector]] = {}
+        for detector in self.detectors:
+            for node_type in detector.NODE_TYPES:
+                self._interest.setdefault(node_type, []).append(detector)
+
+    def walk(self, ast: Tree) -> Dict[ScriptDetector, Exception]:
+        """
+        Dispatch every subtree of `ast` to the interested detectors.
+
+        Nodes are visited in Tree.iter_subtrees() order, the order find_data()
+        yields them in, so detectors see their nodes exactly as they would on
+        their own.
+
+        Returns:
+            Detectors whose visit() raised, mapped to the exception. They are not
+            visited again for the rest of the walk.
+        """
+        failures: Dict[ScriptDetector, Exception] = {}
+        for detector in self.detectors:
+            detector.begin_dispatch(ast)
+
+        interest = {node_type: list(detectors) for node_type, detectors in self._interest.items()}
+        for node in ast.iter_subtrees():
+            interested = interest.get(node.data)
+            if not interested:
+                continue
+            for detector in tuple(interested):
+                try:
+                    detector.visit(node)
+                except Exception as e:
+                    failures[detector] = e
+                    for detectors in interest.values():
+                        if detector in detectors:
+                            detectors.remove(detector)
+        return failures
+
+
+class MultiplexedScriptRunner:
+    """Runs several script rules over one parse and one walk per script field."""
+
+    def __init__(self, rules: List[ScriptRuleBase]):
+        self.rules = list(rules)
+
+    def run(self, context) -> List[Finding]:
+        """
+        Analyze every script field in the project for all rules at once.
+
+        Failure handling mirrors running each rule on its own: an error in a PMD
+        or POD field fails that rule (its findings are dropped and the error is
+        reported like RulesEngine does), while errors in standalone scripts and
+        WQL queries are warned about and skipped.
+        """
+        self._findings: Dict[int, List[Finding]] = {id(rule): [] for rule in self.rules}
+        self._failed: Dict[int, Exception] = {}
+        lead = self.rules[0]
+
+        pmds = getattr(context, "pmds", None) or {}
+        pods = getattr(context, "pods", None) or {}
+        scripts = getattr(context, "scripts", None) or {}
+        wqlqueries = getattr(context, "wqlqueries", None) or {}
+
+        for pmd in pmds.values():
+            for field_path, field_value, field_name, line_offset in lead.find_script_fields(pmd, context):
+                if field_value and field_value.strip():
+                    self._check(field_value, field_name, pmd.file_path, line_offset, context, path=field_path)
+
+        for pod in pods.values():
+            for field_path, field_value, field_name, line_offset in lead.find_pod_script_fields(pod):
+                if field_value and field_value.strip():
+                    self._check(field_value, field_name, pod.file_path, line_offset, context, path=field_path)
+
+        for wql_model in wqlqueries.values():
+            for field in ("query", "offset", "limit"):
+                value = getattr(wql_model, field, None)
+                if isinstance(value, str) and "<%" in value and "%>" in value:
+                    self._check(
+                        value, f"wqlquery.{field}", wql_model.file_path, 1, context, path=field,
+                        failure_message=f"Failed to analyze wqlquery {wql_model.file_path} field {field}",
+                    )
+
+        for script in scripts.values():
+            self._check(
+                script.source, "script", script.file_path, 1, context,
+                failure_message=f"Failed to analyze script file {script.file_path}",
+            )
+
+        findings: List[Finding] = []
+        for rule in self.rules:
+            if id(rule) in self._failed:
+                error(f"Rule {rule.__class__.__name__} failed: {self._failed[id(rule)]}")
+                continue
+            findings.extend(self._findings[id(rule)])
+        return findings
+
+    def _check(self, script_content: str, field_name: str, file_path: str, line_offset: int, context,
+               path: Optional[str] = None, failure_message: Optional[str] = None) -> None:
+        """Parse one script field once and run every live rule's detector over it."""
+        rules = [rule for rule in self.rules if id(rule) not in self._failed]
+        if not rules:
+            return
+        lead = rules[0]
+        try:
+            clean_script_content = lead._strip_script_tags(script_content)
+            ast = lead._parse_script_content(clean_script_content, context)
+        except Exception as e:
+            for rule in rules:
+                self._fail(rule, e, failure_message)
+            return
+        if not ast:
+            return
+
+        detectors: Dict[int, Any] = {}
+        for rule in rules:
+            try:
+                detectors[id(rule)] = rule._create_detector(file_path, line_offset, clean_script_content)
+            except Exception as e:
+                self._fail(rule, e, failure_message)
+
+        visit_failures = ASTDispatcher(detectors.values()).walk(ast)
+
+        for rule in rules:
+            detector = detectors.get(id(rule))
+            if detector is None:
+                continue
+            if detector in visit_failures:
+                self._fail(rule, visit_failures[detector], failure_message)
+                continue
+            findings = self._findings[id(rule)]
+            try:
+                for finding in rule._violations_to_findings(detector.detect(ast, field_name), file_path, path):
+                    findings.append(finding)
+            except Exception as e:
+                self._fail(rule, e, failure_message)
+
+    def _fail(self, rule: ScriptRuleBase, exc: Exception, failure_message: Optional[str]) -> None:
+        if failure_message is not None:
+            warn(f"{failure_message}: {exc}")
+        else:
+            self._failed[id(rule)] = exc
@@ -0,0 +1,129 @@
+"""
+Per-AST structural index: parent links, depth and enclosing function/scope.
+
+Lark trees have no parent pointers, so questions like "which function contains
+this node?" used to be answered by rebuilding a node -> function map and then
+searching every function subtree for the node, once per violation. NodeIndex
+answers them from a single pre-order pass over the tree. The index is built on
+first use and stored on the root tree itself, so every detector that looks at
+the same (cached) AST shares it.
+
+Entries are keyed by id(); an index is only valid for the exact tree objects it
+was built from and is dropped when the tree is pickled (e.g. by the AST cache).
+"""
+from typing import Any, Dict, Iterator, Optional
+
+from lark import Tree
+
+FUNCTION_NODE_TYPES = ('function_expression', 'arrow_function_expression')
+
+_INDEX_ATTR = '_node_index'
+
+
+def _stale_index() -> None:
+    return None
+
+
+class NodeIndex:
+    """Parent, depth, enclosing function name and enclosing scope for every node."""
+
+    __slots__ = ('root', '_parent', '_depth', '_function', '_scope')
+
+    def __init__(self, root: Tree):
+        self.root = root
+        self._parent: Dict[int, Any] = {}
+        self._depth: Dict[int, int] = {}
+        self._function: Dict[int, Optional[str]] = {}
+        self._scope: Dict[int, Tree] = {}
+        self._build(root)
+
+    def __reduce__(self):
+        # ids mean nothing after unpickling; the tree rebuilds its index on demand.
+        return (_stale_index, ())
+
+    def _build(self, root: Tree) -> None:
+        # Functions named by `var/let/const name = function (...) {...}`, keyed by
+        # id of the function node. Filled in when the variable_statement is
+        # visited, which pre-order guarantees happens before its function.
+        named_functions: Dict[int, str] = {}
+        stack = [(root, None, 0, None, root)]
+        while stack:
+            node, parent, depth, function_name, scope = stack.pop()
+            node_id = id(node)
+            self._parent[node_id] = parent
+            self._depth[node_id] = depth
+            if not isinstance(node, Tree):
+                self._function[node_id] = function_name
+                self._scope[node_id] = scope
+                continue
+
+            if node.data in FUNCTION_NODE_TYPES:
+                scope = node
+                function_name = named_functions.get(node_id, function_name)
+            elif node.data == 'variable_statement':
+                self._register_named_function(node, named_functions)
+            self._function[node_id] = function_name
+            self._scope[node_id] = scope
+
+            for child in reversed(node.children):
+                stack.append((child, node, depth + 1, function_name, scope))
+
+    @staticmethod
+    def _register_named_function(var_stmt: Tree, named_functions: Dict[int, str]) -> None:
+        if len(var_stmt.children) <= 1:
+            return
+        var_declaration = var_stmt.children[1]
+        if not isinstance(var_declaration, Tree) or var_declaration.data != 'variable_declaration':
+            return
+        if not var_declaration.children or not hasattr(var_declaration.children[0], 'value'):
+            return
+        function_name = var_declaration.children[0].value
+        for child in var_declaration.children:
+            if isinstance(child, Tree) and child.data in FUNCTION_NODE_TYPES:
+                named_functions[id(child)] = function_name
+
+    def __contains__(self, node: Any) -> bool:
+        return id(node) in self._parent
+
+    def parent(self, node: Any) -> Optional[Tree]:
+        """Parent of `node`, or None for the root (or a node not in this tree)."""
+        return self._parent.get(id(node))
+
+    def depth(self, node: Any) -> int:
+        """Distance from the root (root = 0)."""
+        return self._depth[id(node)]
+
+    def ancestors(self, node: Any) -> Iterator[Tree]:
+        """Ancestors of `node`, nearest first."""
+        parent = self._parent.get(id(node))
+        while parent is not None:
+            yield parent
+            parent = self._parent.get(id(parent))
+
+    def is_descendant(self, node: Any, ancestor: Any) -> bool:
+        """True if `node` is `ancestor` or lies inside it."""
+        if node is ancestor:
+            return True
+        return any(parent is ancestor for parent in self.ancestors(node))
+
+    def enclosing_function(self, node: Any) -> Optional[str]:
+        """
+        Name of the innermost named function containing `node`.
+
+        Only functions assigned in a variable declaration have a name; anonymous
+        callbacks report the named function around them. None at top level.
+        """
+        return self._function.get(id(node))
+
+    def enclosing_scope(self, node: Any) -> Optional[Tree]:
+        """Innermost function node containing `node` (inclusive), else the root."""
+        return self._scope.get(id(node))
+
+
+def get_node_index(ast: Tree) -> NodeIndex:
+    """Return the NodeIndex for `ast`, building and caching it on first use."""
+    index = getattr(ast, _INDEX_ATTR, None)
+    if index is None or index.root is not ast:
+        index = NodeIndex(ast)
+        setattr(ast, _INDEX_ATTR, index)
+    return index
@@ -8,11 +8,24 @@ from .violation import Violation
 from .detector import ScriptDetector
 
 
+# Methods a rule must inherit unchanged to be run by MultiplexedScriptRunner,
+# which re-implements this class's analyze() flow for many rules at once.
+_MULTIPLEX_HOOKS = (
+    'analyze', '_analyze_pmd', '_analyze_pod', '_analyze_wqlquery', '_analyze_script',
+    '_analyze_fields', '_check', '_create_detector', '_violations_to_findings',
+    '_strip_script_tags', '_parse_script_content', 'get_cached_ast',
+    'find_script_fields', 'find_pod_script_fields',
+)
+
+
 class ScriptRuleBase(Rule, ABC):
     """Base class for script analysis rules with unified structure."""
 
     CATEGORY = Category.SCRIPT
 
+    # Script rules only look at the script fields of the file they report on.
+    DEPENDS_ON = ()
+
     # Subclasses must define these
     DETECTOR: type[ScriptDetector]
     
@@ -116,16 +129,22 @@ class ScriptRuleBase(Rule, ABC):
             return  # Return empty generator
         
         # Use detector to find violations
+        detector = self._create_detector(file_path, line_offset, clean_script_content)
+        violations = detector.detect(ast, field_name)
+        yield from self._violations_to_findings(violations, file_path, path)
+
+    def _create_detector(self, file_path: str, line_offset: int, source_text: str) -> ScriptDetector:
+        """Instantiate this rule's detector for one script field."""
         detector = self.DETECTOR(file_path, line_offset)
-        detector.source_text = clean_script_content
+        detector.source_text = source_text
         
         # Apply custom settings to detector if available
         if hasattr(self, '_custom_settings') and hasattr(detector, 'apply_settings'):
             detector.apply_settings(self._custom_settings)
-        
-        violations = detector.detect(ast, field_name)
-        
-        # Convert violations to findings
+        return detector
+
+    def _violations_to_findings(self, violations, file_path: str, path=None) -> Generator[Finding, None, None]:
+        """Convert detector violations into Findings for this rule."""
         # Handle both List[Violation] and Generator[Violation, None, None]
         if violations is not None and hasattr(violations, '__iter__') and not isinstance(violations, str):
             from utils.jsonpath import dotted_to_jsonpath
@@ -142,6 +161,19 @@ class ScriptRuleBase(Rule, ABC):
                     target_text=violation.target_text,
                     replacement_context=violation.replacement_context,
                 )
+
+    @classmethod
+    def supports_multiplexing(cls) -> bool:
+        """
+        Whether this rule can share a parse and AST walk with other rules
+        (see shared.dispatch.MultiplexedScriptRunner).
+
+        Requires a detector that declares NODE_TYPES and a rule that uses the
+        standard field enumeration, parsing and finding conversion unchanged.
+        """
+        if not getattr(cls.DETECTOR, 'NODE_TYPES', ()):
+            return False
+        return all(getattr(cls, name) is getattr(ScriptRuleBase, name) for name in _MULTIPLEX_HOOKS)
     
     def _extract_variable_from_empty_expression(self, node) -> str:
         """
@@ -6,7 +6,7 @@ script blocks (<% %>) mixed with literal text by parsing them into a structured
 """
 
 import re
-from typing import List, Dict, Any, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from lark import Tree, Token
 
 class TemplateExpressionPreprocessor:
@@ -16,12 +16,15 @@ class TemplateExpressionPreprocessor:
         # Pattern to match script blocks: <% ... %>
         self.script_block_pattern = re.compile(r'<%(.*?)%>', re.DOTALL)
     
-    def preprocess_template_expression(self, template_value: str) -> Tree:
+    def preprocess_template_expression(self, template_value: str,
+                                       parse_block: Optional[Callable[[str], Any]] = None) -> Tree:
         """
         Convert a template expression string into a structured template_expression tree.
         
         Args:
             template_value: The template expression string (e.g., "<% true %> foo <% false %>")
+            parse_block: Parses one script block (defaults to parse_with_preprocessor);
+                rules pass the context's interning parse so repeated blocks are parsed once
             
         Returns:
             Tree: A template_expression tree with parsed script blocks and text parts
@@ -50,8 +53,10 @@ class TemplateExpressionPreprocessor:
                         script_content += ';'
                     
                     # Parse the script content into an AST
-                    from ....pmd_script_parser import parse_with_preprocessor
-                    script_ast = parse_with_preprocessor(script_content)
+                    if parse_block is None:
+                        from ....pmd_script_parser import parse_with_preprocessor
+                        parse_block = parse_with_preprocessor
+                    script_ast = parse_block(script_content)
                     if script_ast:
                         # Create a script block tree with the parsed AST
                         children.append(Tree('template_script_block', [script_ast]))
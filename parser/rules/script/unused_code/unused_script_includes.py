@@ -15,6 +15,7 @@ class ScriptUnusedIncludesRule(ScriptRuleBase):
     FIX_STRATEGY = FixStrategy.ACTIONABLE
     DETECTOR = ScriptUnusedIncludesRuleDetector
     AVAILABLE_SETTINGS = {}  # This rule does not support custom configuration
+    DEPENDS_ON = ('.script',)  # Findings are about which script files a page includes
     
     DOCUMENTATION = {
         'why': '''Including unused script files forces the engine to parse and load code that's never executed, directly impacting page load time. Each unnecessary include adds to your application's bundle size and slows down the initial page render. Removing unused includes makes pages load faster and removes potential developer confusion as to why the script is being included in the first place.''',
@@ -0,0 +1,195 @@
+"""
+One-time walk index over an orchestration flow (OrchestrationModel.raw_value).
+
+The orchestration rules used to walk raw_value on their own: two generic JSON
+walks (script sources, Boolean expressions) that build a path tuple at every
+node, and two step traversals that unwrap the same node envelopes. For flows
+with thousands of steps that is several full walks per file.
+OrchestrationIndex walks the flow once and keeps:
+
+- steps: every flow step reachable through node lists (flow nodes, loop and
+  group nodes, Branch on Conditions branches), in pre-order, each with its
+  child step lists and parent step
+- expressions / sources: every Expr node with a source, and every script
+  source string (Expr sources and TextTemplate bodies) with its path, in the
+  order walk_orchestration_source_strings yields them
+- node_at() / parent_of(): the container at a path and its parent
+- ui_location(): resolve_ui_location() results, computed once per path
+
+OrchestrationModel.get_walk_index() builds it on first use and caches it on
+the model, so all orchestration rules (and incremental runs over an unchanged
+flow) share one walk.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .orchestration_error_handler_utils import unwrap_nodes_list
+from .orchestration_path_utils import (
+    _get_expression_source,
+    _is_expression_with_source,
+    _is_text_template_node,
+    resolve_ui_location,
+    unwrap,
+)
+
+BRANCH_ON_CONDITIONS_TYPE = "BranchOnConditions"
+
+Path = Tuple[Union[str, int], ...]
+
+
+def get_child_node_lists(node_value: dict) -> List[list]:
+    """Given a node's _value dict, return zero or more child node lists to traverse."""
+    if not isinstance(node_value, dict):
+        return []
+    out: List[list] = []
+
+    # Loop: group -> unwrap -> nodes -> unwrap
+    group = node_value.get("group")
+    if group is not None:
+        group_val = unwrap(group)
+        if isinstance(group_val, dict):
+            nodes = group_val.get("nodes")
+            lst = unwrap_nodes_list(nodes)
+            if lst:
+                out.append(lst)
+
+    # BranchOnConditions: ifBranches and elseBranch
+    if node_value.get("_type") == BRANCH_ON_CONDITIONS_TYPE or "ifBranches" in node_value:
+        if_branches = node_value.get("ifBranches")
+        if if_branches is not None:
+            branches_list = unwrap(if_branches)
+            if isinstance(branches_list, list):
+                for when_branch in branches_list:
+                    wb_val = unwrap(when_branch) if isinstance(when_branch, dict) else when_branch
+                    if isinstance(wb_val, dict):
+                        g = wb_val.get("group")
+                        g_val = unwrap(g) if g is not None else None
+                        if isinstance(g_val, dict):
+                            nlst = unwrap_nodes_list(g_val.get("nodes"))
+                            if nlst:
+                                out.append(nlst)
+        else_branch = node_value.get("elseBranch")
+        if else_branch is not None:
+            eb_val = unwrap(else_branch)
+            if isinstance(eb_val, dict):
+                nlst = unwrap_nodes_list(eb_val.get("nodes"))
+                if nlst:
+                    out.append(nlst)
+
+    # Any node_value with "nodes" (ImplicitGroup, Group, ErrorHandler)
+    if "nodes" in node_value:
+        nlst = unwrap_nodes_list(node_value["nodes"])
+        if nlst:
+            out.append(nlst)
+
+    return out
+
+
+class OrchestrationStep:
+    """A flow step: the node dict with its envelope unwrapped, and its place in the step tree."""
+
+    __slots__ = ('node', 'type', 'value', 'name', 'path', 'parent', 'child_lists')
+
+    def __init__(self, node: dict, path: Optional[Path], parent: Optional['OrchestrationStep']):
+        self.node = node
+        self.type = node.get("_type")
+        self.value: dict = node["_value"]
+        name = unwrap(self.value.get("name"))
+        self.name: str = name if isinstance(name, str) else ""
+        self.path = path
+        self.parent = parent
+        self.child_lists: Tuple[Tuple['OrchestrationStep', ...], ...] = ()
+
+
+class OrchestrationExpression(NamedTuple):
+    """An Expr node that has a source."""
+    path: Path
+    node: dict
+    source: Optional[str]     # _value.source unwrapped and stripped; None if not a string
+    is_boolean: bool          # Expr of type Boolean
+
+
+class OrchestrationSource(NamedTuple):
+    """A script source string: an Expr source or a TextTemplate body."""
+    source: str
+    path: Path
+    is_template_body: bool
+
+
+def _is_boolean_type(expr_obj: dict) -> bool:
+    """True if an Expr node (see _is_expression_with_source) is of type Boolean."""
+    type_val = expr_obj.get("_type")
+    if isinstance(type_val, list) and len(type_val) >= 2 and type_val[1] == "Boolean":
+        return True
+    type_node = expr_obj["_value"].get("type")
+    return unwrap(type_node) == "Boolean"
+
+
+class OrchestrationIndex:
+    """Steps, script sources, containers by path and UI locations of one orchestration flow."""
+
+    def __init__(self, raw_value: Any):
+        self.raw_value = raw_value
+        self._containers: Dict[Path, Any] = {}
+        self._paths: Dict[int, Path] = {}
+        expressions: List[OrchestrationExpression] = []
+        sources: List[OrchestrationSource] = []
+        self._walk(raw_value, (), expressions, sources)
+        self.expressions: Tuple[OrchestrationExpression, ...] = tuple(expressions)
+        self.sources: Tuple[OrchestrationSource, ...] = tuple(sources)
+
+        steps: List[OrchestrationStep] = []
+        top = raw_value.get("nodes") if isinstance(raw_value, dict) else None
+        self.top_steps = self._steps(unwrap_nodes_list(top), None, steps)
+        self.steps: Tuple[OrchestrationStep, ...] = tuple(steps)
+        self._locations: Dict[Path, str] = {}
+
+    def _walk(self, obj: Any, path: Path, expressions: list, sources: list) -> None:
+        # Only containers get a path tuple; scalars are skipped before recursing.
+        self._containers[path] = obj
+        self._paths[id(obj)] = path
+        if isinstance(obj, dict):
+            if _is_expression_with_source(obj):
+                source = _get_expression_source(obj)
+                expressions.append(OrchestrationExpression(path, obj, source, _is_boolean_type(obj)))
+                if source:
+                    sources.append(OrchestrationSource(source, path, False))
+            if _is_text_template_node(obj):
+                sources.append(OrchestrationSource(obj["_value"], path, True))
+            for key, value in obj.items():
+                if isinstance(value, (dict, list)):
+                    self._walk(value, path + (key,), expressions, sources)
+        else:
+            for i, item in enumerate(obj):
+                if isinstance(item, (dict, list)):
+                    self._walk(item, path + (i,), expressions, sources)
+
+    def _steps(self, nodes: list, parent: Optional[OrchestrationStep], out: List[OrchestrationStep]) -> Tuple[OrchestrationStep, ...]:
+        steps = []
+        for node in nodes:
+            if not isinstance(node, dict) or not isinstance(node.get("_value"), dict):
+                continue
+            step = OrchestrationStep(node, self._paths.get(id(node)), parent)
+            out.append(step)
+            steps.append(step)
+            step.child_lists = tuple(
+                self._steps(child_list, step, out) for child_list in get_child_node_lists(step.value)
+            )
+        return tuple(steps)
+
+    def node_at(self, path: Path) -> Any:
+        """The dict or list at `path` in the flow, or None."""
+        return self._containers.get(tuple(path))
+
+    def parent_of(self, path: Path) -> Any:
+        """The container holding the value at `path`, or None for the root."""
+        return self._containers.get(tuple(path[:-1])) if path else None
+
+    def ui_location(self, path: Path, template_line: Optional[int] = None) -> str:
+        """resolve_ui_location() for `path`, computed once per path."""
+        base = self._locations.get(path)
+        if base is None:
+            base = self._locations[path] = resolve_ui_location(self.raw_value, path)
+        if template_line is not None:
+            return f"{base} -> line {template_line}"
+        return base
@@ -8,6 +8,7 @@ from abc import ABC, abstractmethod
 from typing import Generator, List, Dict, Any, Optional
 from ...base import Rule, Finding
 from ....models import PMDModel, PodModel, ProjectContext, WQLQueryModel, OrchestrationModel
+from ....source_index import source_index_for
 
 
 class StructureRuleBase(Rule, ABC):
@@ -134,15 +135,11 @@ class StructureRuleBase(Rule, ABC):
             return 1
         
         try:
-            lines = model.source_content.split('\n')
-            for i, line in enumerate(lines):
-                if case_sensitive:
-                    if pattern in line:
-                        return i + 1
-                else:
-                    if pattern.lower() in line.lower():
-                        return i + 1
-            return 1
+            if hasattr(model, 'lines_for_substring'):
+                lines = model.lines_for_substring(pattern, case_sensitive)
+            else:
+                lines = source_index_for(model.source_content).lines_for_substring(pattern, case_sensitive)
+            return lines[0] if lines else 1
         except Exception:
             return 1
     
@@ -151,7 +148,7 @@ class StructureRuleBase(Rule, ABC):
         if not text or position < 0:
             return 1
         try:
-            return text[:position].count('\n') + 1
+            return source_index_for(text).line_for_offset(position)
         except Exception:
             return 1
     
@@ -12,6 +12,7 @@ from typing import Generator, Any
 
 from ...base import Finding
 from ....models import PMDModel, PodModel, ProjectContext
+from ....literal_scanner import scan_model
 from ..shared import StructureRuleBase
 
 
@@ -72,30 +73,16 @@ class EmbeddedImagesRule(StructureRuleBase):
     
     def _check_pmd_embedded_images(self, pmd_model: PMDModel, context: ProjectContext = None) -> Generator[Finding, None, None]:
         """Check PMD file for embedded images."""
-        # Convert PMD model to dictionary for recursive checking
-        pmd_dict = pmd_model.model_dump(exclude={'file_path', 'source_content'})
-        yield from self._check_string_values_for_embedded_images(pmd_dict, pmd_model.file_path, context)
+        yield from self._check_string_values_for_embedded_images(pmd_model, pmd_model.file_path, context)
     
     def _check_pod_embedded_images(self, pod_model: PodModel, context: ProjectContext = None) -> Generator[Finding, None, None]:
         """Check POD file for embedded images."""
-        # Convert POD model to dictionary for recursive checking
-        pod_dict = pod_model.model_dump(exclude={'file_path', 'source_content'})
-        yield from self._check_string_values_for_embedded_images(pod_dict, pod_model.file_path, context)
+        yield from self._check_string_values_for_embedded_images(pod_model, pod_model.file_path, context)
     
     def _check_string_values_for_embedded_images(self, model: Any, file_path: str, context: ProjectContext = None) -> Generator[Finding, None, None]:
-        """Recursively check string values for embedded images."""
-        if isinstance(model, dict):
-            for key, value in model.items():
-                if isinstance(value, str):
-                    yield from self._check_string_for_embedded_images(value, file_path, key, context)
-                elif isinstance(value, (dict, list)):
-                    yield from self._check_string_values_for_embedded_images(value, file_path, context)
-        elif isinstance(model, list):
-            for i, item in enumerate(model):
-                if isinstance(item, str):
-                    yield from self._check_string_for_embedded_images(item, file_path, f"[{i}]", context)
-                elif isinstance(item, (dict, list)):
-                    yield from self._check_string_values_for_embedded_images(item, file_path, context)
+        """Check the string values of the model that may hold an embedded image (see parser.literal_scanner)."""
+        for entry in scan_model(model, context).entries('embedded_image'):
+            yield from self._check_string_for_embedded_images(entry.value, file_path, entry.field, context)
     
     def _check_string_for_embedded_images(self, text: str, file_path: str, field_name: str, context: ProjectContext = None) -> Generator[Finding, None, None]:
         """Check a single string for embedded image data."""
@@ -16,6 +16,7 @@ from typing import Generator, List, Dict, Any, Optional
 
 from ...base import Finding, FixStrategy
 from ....models import PMDModel, PodModel, AMDModel, ProjectContext
+from ....literal_scanner import APPLICATION_ID, literal_scanner
 from ..shared import StructureRuleBase
 from utils.jsonpath import data_provider_jsonpath
 
@@ -37,6 +38,7 @@ class HardcodedApplicationIdRule(StructureRuleBase):
     SEVERITY = "ADVICE"
     FIX_STRATEGY = FixStrategy.ACTIONABLE
     AVAILABLE_SETTINGS = {}  # This rule does not support custom configuration
+    DEPENDS_ON = ('.smd',)  # applicationId comes from the SMD
     
     DOCUMENTATION = {
         'why': '''Hardcoded application IDs break when you deploy the same code to different customer environments, because each has a unique ID. Using `site.applicationId` makes your code environment-agnostic and prevents runtime failures.''',
@@ -91,17 +93,16 @@ const appId = site.applicationId; // ✅ Use site.applicationId
         """Check PMD file for hardcoded applicationId values."""
         # Use original source content for accurate line numbers
         if pmd_model.source_content:
-            yield from self._check_source_content_for_app_id(pmd_model.source_content, app_id, pmd_model.file_path)
+            if not pmd_model.get_literal_scan(literal_scanner(app_id)).source_has(APPLICATION_ID):
+                return
+            yield from self._check_source_content_for_app_id(pmd_model, app_id)
         else:
-            # Fallback to dictionary checking if no source content
-            pmd_dict = pmd_model.model_dump(exclude={'file_path', 'source_content'})
-            yield from self._check_string_values_for_app_id(pmd_dict, app_id, pmd_model.file_path, pmd_model=pmd_model)
+            # Fallback to checking the model's string values if no source content
+            yield from self._check_string_values_for_app_id(pmd_model, app_id, pmd_model.file_path, pmd_model=pmd_model)
     
     def _check_pod_hardcoded_app_id(self, pod_model: PodModel, app_id: str) -> Generator[Finding, None, None]:
         """Check POD file for hardcoded applicationId values."""
-        # Convert POD model to dictionary for recursive checking
-        pod_dict = pod_model.model_dump(exclude={'file_path', 'source_content'})
-        yield from self._check_string_values_for_app_id(pod_dict, app_id, pod_model.file_path, pod_model=pod_model)
+        yield from self._check_string_values_for_app_id(pod_model, app_id, pod_model.file_path, pod_model=pod_model)
     
     def _check_amd_hardcoded_app_id(self, amd_model: AMDModel, app_id: str) -> Generator[Finding, None, None]:
         """Check AMD file for hardcoded applicationId values in dataProviders."""
@@ -129,8 +130,9 @@ const appId = site.applicationId; // ✅ Use site.applicationId
                             replacement_context="substring",
                         )
     
-    def _check_source_content_for_app_id(self, source_content: str, app_id: str, file_path: str) -> Generator[Finding, None, None]:
-        """Check source content for hardcoded applicationId values."""
+    def _check_source_content_for_app_id(self, model: PMDModel, app_id: str) -> Generator[Finding, None, None]:
+        """Check the model's source content for hardcoded applicationId values."""
+        source_content = model.source_content
         if not source_content or not app_id:
             return
         
@@ -153,14 +155,13 @@ const appId = site.applicationId; // ✅ Use site.applicationId
             if 'site.applicationId' in context_before or 'site.applicationId' in context_after:
                 continue
             
-            # Calculate line number from position in source content
-            line_num = self.get_line_from_text_position(source_content, match.start())
+            line_num = model.line_for_offset(match.start())
 
             target_text, replacement_context = self._enrich_match(match.group(0))
 
             yield self._create_finding(
                 message=f"Hardcoded applicationId '{app_id}' found. Use site.applicationId instead.",
-                file_path=file_path,
+                file_path=model.file_path,
                 line=line_num,
                 suggested_replacement="site.applicationId",
                 path="$",
@@ -195,19 +196,9 @@ const appId = site.applicationId; // ✅ Use site.applicationId
         return match_text, "substring"
     
     def _check_string_values_for_app_id(self, model: Any, app_id: str, file_path: str, pmd_model: PMDModel = None, pod_model: PodModel = None) -> Generator[Finding, None, None]:
-        """Recursively check string values for hardcoded applicationId."""
-        if isinstance(model, dict):
-            for key, value in model.items():
-                if isinstance(value, str):
-                    yield from self._check_string_for_app_id(value, app_id, file_path, key, pmd_model, pod_model)
-                elif isinstance(value, (dict, list)):
-                    yield from self._check_string_values_for_app_id(value, app_id, file_path, pmd_model, pod_model)
-        elif isinstance(model, list):
-            for i, item in enumerate(model):
-                if isinstance(item, str):
-                    yield from self._check_string_for_app_id(item, app_id, file_path, f"[{i}]", pmd_model, pod_model)
-                elif isinstance(item, (dict, list)):
-                    yield from self._check_string_values_for_app_id(item, app_id, file_path, pmd_model, pod_model)
+        """Check the string values of the model that contain the applicationId (see parser.literal_scanner)."""
+        for entry in model.get_literal_scan(literal_scanner(app_id)).entries(APPLICATION_ID):
+            yield from self._check_string_for_app_id(entry.value, app_id, file_path, entry.field, pmd_model, pod_model)
     
     def _check_string_for_app_id(self, text: str, app_id: str, file_path: str, field_name: str, pmd_model: PMDModel = None, pod_model: PodModel = None) -> Generator[Finding, None, None]:
         """Check a single string for hardcoded applicationId values."""
@@ -11,6 +11,7 @@ import re
 from typing import Generator, Any
 from ...base import Finding, FixStrategy
 from ....models import PMDModel, PodModel, ProjectContext, WQLQueryModel
+from ....literal_scanner import scan_model
 from ..shared import StructureRuleBase
 
 
@@ -108,7 +109,7 @@ Supported `type` values: `string`, `numeric`, `boolean`.''',
     
     def visit_pod(self, pod_model: PodModel, context: ProjectContext) -> Generator[Finding, None, None]:
         """Analyze POD model for hardcoded WIDs."""
-        yield from self._check_pod_hardcoded_wids(pod_model)
+        yield from self._check_pod_hardcoded_wids(pod_model, context)
 
     def visit_wqlquery(self, wql_model: WQLQueryModel, context: ProjectContext) -> Generator[Finding, None, None]:
         """Analyze WQL query model for hardcoded WIDs."""
@@ -116,56 +117,36 @@ Supported `type` values: `string`, `numeric`, `boolean`.''',
 
     def _check_wqlquery_hardcoded_wids(self, wql_model: WQLQueryModel, context: ProjectContext) -> Generator[Finding, None, None]:
         """Check WQL query file for hardcoded WID values."""
-        wql_dict = wql_model.model_dump(exclude={'file_path', 'source_content'})
         yield from self._check_string_values_for_wids(
-            wql_dict, wql_model.file_path, pmd_model=None, pod_model=None, wql_model=wql_model, context=context
+            wql_model, wql_model.file_path, pmd_model=None, pod_model=None, wql_model=wql_model, context=context
         )
 
     def _check_pmd_hardcoded_wids(self, pmd_model: PMDModel, context: ProjectContext = None) -> Generator[Finding, None, None]:
         """Check PMD file for hardcoded WID values."""
-        # Convert PMD model to dictionary for recursive checking
-        pmd_dict = pmd_model.model_dump(exclude={'file_path', 'source_content'})
-        yield from self._check_string_values_for_wids(pmd_dict, pmd_model.file_path, pmd_model=pmd_model, context=context)
+        yield from self._check_string_values_for_wids(pmd_model, pmd_model.file_path, pmd_model=pmd_model, context=context)
     
-    def _check_pod_hardcoded_wids(self, pod_model: PodModel) -> Generator[Finding, None, None]:
+    def _check_pod_hardcoded_wids(self, pod_model: PodModel, context: ProjectContext = None) -> Generator[Finding, None, None]:
         """Check POD file for hardcoded WID values."""
-        # Convert POD model to dictionary for recursive checking
-        pod_dict = pod_model.model_dump(exclude={'file_path', 'source_content'})
-        yield from self._check_string_values_for_wids(pod_dict, pod_model.file_path, pod_model=pod_model)
+        yield from self._check_string_values_for_wids(pod_model, pod_model.file_path, pod_model=pod_model, context=context)
     
-    def _check_string_values_for_wids(self, model: Any, file_path: str, pmd_model: PMDModel = None, pod_model: PodModel = None, wql_model: WQLQueryModel = None, path: str = "", context: ProjectContext = None) -> Generator[Finding, None, None]:
-        """Recursively check string values for hardcoded WIDs."""
-        if isinstance(model, dict):
-            # Track widget ID for better context
-            widget_id = model.get('id') or model.get('widgetId')
-            widget_type = model.get('type')
-            
-            for key, value in model.items():
-                if isinstance(value, str):
-                    # Skip task/report link wid field when config allows it
-                    if key == 'wid' and getattr(self, 'allow_wid_in_task_report_link_fields', False):
-                        continue
-                    # Build descriptive path
-                    context_path = path
-                    if widget_id and widget_type:
-                        context_path = f"{widget_type} widget '{widget_id}' > {key}"
-                    elif widget_id:
-                        context_path = f"widget '{widget_id}' > {key}"
-                    elif key and not path:
-                        context_path = key
-                    else:
-                        context_path = f"{path}.{key}" if path else key
-                    
-                    yield from self._check_string_for_wids(value, file_path, context_path, pmd_model, pod_model, wql_model, context)
-                elif isinstance(value, (dict, list)):
-                    new_path = f"{path}.{key}" if path else key
-                    yield from self._check_string_values_for_wids(value, file_path, pmd_model, pod_model, wql_model, new_path, context)
-        elif isinstance(model, list):
-            for i, item in enumerate(model):
-                if isinstance(item, str):
-                    yield from self._check_string_for_wids(item, file_path, f"{path}[{i}]", pmd_model, pod_model, wql_model, context)
-                elif isinstance(item, (dict, list)):
-                    yield from self._check_string_values_for_wids(item, file_path, pmd_model, pod_model, wql_model, f"{path}[{i}]", context)
+    def _check_string_values_for_wids(self, model: Any, file_path: str, pmd_model: PMDModel = None, pod_model: PodModel = None, wql_model: WQLQueryModel = None, context: ProjectContext = None) -> Generator[Finding, None, None]:
+        """Check the string values of the model that may hold a WID (see parser.literal_scanner)."""
+        allow_wid_field = getattr(self, 'allow_wid_in_task_report_link_fields', False)
+        for entry in scan_model(model, context).entries('wid'):
+            if entry.key is not None:
+                # Skip task/report link wid field when config allows it
+                if entry.key == 'wid' and allow_wid_field:
+                    continue
+                # Describe the field by its widget when the value belongs to one
+                if entry.widget_id and entry.widget_type:
+                    context_path = f"{entry.widget_type} widget '{entry.widget_id}' > {entry.key}"
+                elif entry.widget_id:
+                    context_path = f"widget '{entry.widget_id}' > {entry.key}"
+                else:
+                    context_path = entry.path
+            else:
+                context_path = entry.path
+            yield from self._check_string_for_wids(entry.value, file_path, context_path, pmd_model, pod_model, wql_model, context)
 
     def _check_string_for_wids(self, text: str, file_path: str, field_name: str, pmd_model: PMDModel = None, pod_model: PodModel = None, wql_model: WQLQueryModel = None, context: ProjectContext = None) -> Generator[Finding, None, None]:
         """Check a single string for hardcoded WID values."""
@@ -6,6 +6,7 @@ from typing import Generator, List, Dict, Any
 from parser.rules.structure.shared.rule_base import StructureRuleBase
 from parser.rules.base import Finding, FixStrategy
 from parser.models import ProjectContext, PMDModel, PodModel, AMDModel
+from parser.literal_scanner import scan_model
 from utils.jsonpath import data_provider_jsonpath, endpoint_jsonpath
 
 
@@ -112,6 +113,9 @@ class HardcodedWorkdayAPIRule(StructureRuleBase):
 
     def visit_pmd(self, pmd_model, context: ProjectContext) -> Generator[Finding, None, None]:
         """Check PMD inbound and outbound endpoints for hardcoded *.workday.com URLs."""
+        if not scan_model(pmd_model, context).has('workday_url'):
+            return
+
         # Check inbound endpoints
         if pmd_model.inboundEndpoints:
             for i, endpoint in enumerate(pmd_model.inboundEndpoints):
@@ -127,6 +131,9 @@ class HardcodedWorkdayAPIRule(StructureRuleBase):
 
     def visit_pod(self, pod_model, context: ProjectContext) -> Generator[Finding, None, None]:
         """Check POD endpoints for hardcoded *.workday.com URLs."""
+        if not scan_model(pod_model, context).has('workday_url'):
+            return
+
         # Check POD endpoints for URL violations
         if pod_model.seed.endPoints:
             for i, endpoint in enumerate(pod_model.seed.endPoints):
@@ -146,7 +153,7 @@ class HardcodedWorkdayAPIRule(StructureRuleBase):
         """
         # Check if dataProviders exist in the AMD model
         data_providers = amd_model.dataProviders or []
-        if not data_providers:
+        if not data_providers or not scan_model(amd_model, context).has('workday_url'):
             return
         
         # Check each dataProvider
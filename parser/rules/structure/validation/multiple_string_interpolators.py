@@ -13,6 +13,7 @@ from typing import Generator
 
 from ...base import Finding, FixStrategy
 from ....models import PMDModel, PodModel, ProjectContext
+from ....literal_scanner import scan_model
 from ..shared import StructureRuleBase
 
 
@@ -59,26 +60,21 @@ class MultipleStringInterpolatorsRule(StructureRuleBase):
     
     def visit_pmd(self, pmd_model: PMDModel, context: ProjectContext) -> Generator[Finding, None, None]:
         """Analyze PMD model for multiple string interpolators."""
-        if not pmd_model.source_content:
+        if not pmd_model.source_content or not scan_model(pmd_model, context).source_has('multiple_interpolators'):
             return
         
-        yield from self._check_source_content_for_multiple_interpolators(
-            pmd_model.source_content, 
-            pmd_model.file_path
-        )
+        yield from self._check_source_content_for_multiple_interpolators(pmd_model)
     
     def visit_pod(self, pod_model: PodModel, context: ProjectContext) -> Generator[Finding, None, None]:
         """Analyze POD model for multiple string interpolators."""
-        if not pod_model.source_content:
+        if not pod_model.source_content or not scan_model(pod_model, context).source_has('multiple_interpolators'):
             return
         
-        yield from self._check_source_content_for_multiple_interpolators(
-            pod_model.source_content,
-            pod_model.file_path
-        )
+        yield from self._check_source_content_for_multiple_interpolators(pod_model)
     
-    def _check_source_content_for_multiple_interpolators(self, source_content: str, file_path: str) -> Generator[Finding, None, None]:
-        """Check source content for strings with multiple interpolators."""
+    def _check_source_content_for_multiple_interpolators(self, model) -> Generator[Finding, None, None]:
+        """Check the model's source content for strings with multiple interpolators."""
+        source_content, file_path = model.source_content, model.file_path
         if not source_content:
             return
         
@@ -105,7 +101,7 @@ class MultipleStringInterpolatorsRule(StructureRuleBase):
                     continue  # Already using template literal
 
                 # Calculate line number
-                line_num = self.get_line_from_text_position(source_content, match.start())
+                line_num = model.line_for_offset(match.start())
 
                 # Build replacement: each <% expr %> becomes {{expr}}; wrap the
                 # transformed string in backticks and a single <% %>.
@@ -7,11 +7,7 @@ from ...base import Finding, FixStrategy, Category
 from ....models import ProjectContext, PMDModel, PodModel, OrchestrationModel
 from ..shared import StructureRuleBase
 from utils.jsonpath import tuple_path_to_jsonpath
-from ..shared.orchestration_path_utils import (
-    get_template_line_number,
-    resolve_ui_location,
-    walk_orchestration_source_strings,
-)
+from ..shared.orchestration_path_utils import get_template_line_number
 
 # Unsafe function name -> tuple of preferred alternative(s). Only these exact names are flagged.
 UNSAFE_TO_ALTERNATIVES: List[Tuple[str, Tuple[str, ...]]] = [
@@ -68,9 +64,9 @@ class OrchestratePreferExplicitDefaultAccessor(StructureRuleBase):
     def visit_orchestration(
         self, orch_model: OrchestrationModel, context: ProjectContext
     ) -> Generator[Finding, None, None]:
-        raw = orch_model.raw_value
+        index = orch_model.get_walk_index()
         file_path = orch_model.file_path
-        for source, path, is_template_body in walk_orchestration_source_strings(raw):
+        for source, path, is_template_body in index.sources:
             for unsafe_name, alternatives in UNSAFE_TO_ALTERNATIVES:
                 pattern = re.compile(r"\b" + re.escape(unsafe_name) + r"\s*\(")
                 for match in pattern.finditer(source):
@@ -79,7 +75,7 @@ class OrchestratePreferExplicitDefaultAccessor(StructureRuleBase):
                         if is_template_body
                         else None
                     )
-                    location = resolve_ui_location(raw, path, template_line=template_line)
+                    location = index.ui_location(path, template_line=template_line)
                     location_suffix = f" Location: {location}. " if location else ""
                     message = location_suffix + _format_message(unsafe_name, alternatives)
                     finding_line = template_line if template_line is not None else 1
@@ -1,6 +1,6 @@
 """Rule to require a local error handler on every API step in orchestrations."""
 
-from typing import Generator, List, Any
+from typing import Generator
 from ...base import Finding, FixStrategy, Category
 from ....models import ProjectContext, PMDModel, PodModel, OrchestrationModel
 from ..shared import StructureRuleBase
@@ -10,7 +10,6 @@ from ..shared.orchestration_error_handler_utils import (
     handler_has_log_or_integration_step,
     handler_has_log_step,
     unwrap,
-    unwrap_nodes_list,
 )
 
 API_STEP_NODE_TYPES = frozenset({
@@ -23,54 +22,6 @@ API_STEP_NODE_TYPES = frozenset({
 })
 
 
-def _get_child_node_lists(node_value: dict) -> List[list]:
-    """Given a node's _value dict, return zero or more child node lists to traverse."""
-    if not isinstance(node_value, dict):
-        return []
-    out: List[list] = []
-
-    # Loop: group -> unwrap -> nodes -> unwrap
-    group = node_value.get("group")
-    if group is not None:
-        group_val = unwrap(group)
-        if isinstance(group_val, dict):
-            nodes = group_val.get("nodes")
-            lst = unwrap_nodes_list(nodes)
-            if lst:
-                out.append(lst)
-
-    # BranchOnConditions: ifBranches and elseBranch
-    if node_value.get("_type") == "BranchOnConditions" or "ifBranches" in node_value:
-        if_branches = node_value.get("ifBranches")
-        if if_branches is not None:
-            branches_list = unwrap(if_branches)
-            if isinstance(branches_list, list):
-                for when_branch in branches_list:
-                    wb_val = unwrap(when_branch) if isinstance(when_branch, dict) else when_branch
-                    if isinstance(wb_val, dict):
-                        g = wb_val.get("group")
-                        g_val = unwrap(g) if g is not None else None
-                        if isinstance(g_val, dict):
-                            nlst = unwrap_nodes_list(g_val.get("nodes"))
-                            if nlst:
-                                out.append(nlst)
-        else_branch = node_value.get("elseBranch")
-        if else_branch is not None:
-            eb_val = unwrap(else_branch)
-            if isinstance(eb_val, dict):
-                nlst = unwrap_nodes_list(eb_val.get("nodes"))
-                if nlst:
-                    out.append(nlst)
-
-    # Any node_value with "nodes" (ImplicitGroup, Group, ErrorHandler)
-    if "nodes" in node_value:
-        nlst = unwrap_nodes_list(node_value["nodes"])
-        if nlst:
-            out.append(nlst)
-
-    return out
-
-
 def _has_local_error_handler(node_value: dict) -> bool:
     """Return True if the node has a non-null local errorHandler."""
     err = node_value.get("errorHandler")
@@ -78,15 +29,6 @@ def _has_local_error_handler(node_value: dict) -> bool:
     return val is not None
 
 
-def _node_name(node_value: dict) -> str:
-    """Get display name from node _value (unwrap Identifier)."""
-    name_node = node_value.get("name")
-    val = unwrap(name_node)
-    if isinstance(val, str):
-        return val
-    return ""
-
-
 def _api_step_handler_has_required_step(node_value: dict, flow_type: str) -> bool:
     """Return True if the API step's error handler has a log step (or SendIntegrationMessage for Integration flows)."""
     err = node_value.get("errorHandler")
@@ -129,48 +71,29 @@ class OrchestrationApiStepErrorHandlerRule(StructureRuleBase):
     def visit_pod(self, pod_model: PodModel, context: ProjectContext) -> Generator[Finding, None, None]:
         yield from ()
 
-    # Traverse the node list and check each node for API step + local handler; recurse into child node lists.
-    def _visit_node_list(
-        self,
-        nodes: list,
-        file_path: str,
-        orch_name: str,
-        flow_type: str,
-    ) -> Generator[Finding, None, None]:
-        """Check each node for API step + local handler with log/integration step; recurse into child node lists."""
-        for node in nodes:
-            if not isinstance(node, dict):
-                continue
-            node_type = node.get("_type")
-            node_value = node.get("_value")
-            if not isinstance(node_value, dict):
-                continue
-            if node_type in API_STEP_NODE_TYPES:
-                step_name = _node_name(node_value) or node_type
-                if not _has_local_error_handler(node_value):
-                    yield Finding(
-                        rule=self,
-                        file_path=file_path,
-                        line=1,
-                        message=f"API step '{step_name}' must have a local error handler.",
-                        path=f"$..nodes[?(@.name=='{step_name}')]",
-                    )
-                elif not _api_step_handler_has_required_step(node_value, flow_type):
-                    yield Finding(
-                        rule=self,
-                        file_path=file_path,
-                        line=1,
-                        message=f"API step '{step_name}' error handler must contain a log step (or Add Integration Message step for Integration templates).",
-                        path=f"$..nodes[?(@.name=='{step_name}')].errorHandler",
-                    )
-            for child_list in _get_child_node_lists(node_value):
-                yield from self._visit_node_list(child_list, file_path, orch_name, flow_type)
-
     def visit_orchestration(
         self, orch_model: OrchestrationModel, context: ProjectContext
     ) -> Generator[Finding, None, None]:
-        raw = orch_model.raw_value
-        nodes_list = unwrap_nodes_list(raw.get("nodes"))
         file_path = orch_model.file_path
-        name = orch_model.name or orch_model.id or "orchestration"
-        yield from self._visit_node_list(nodes_list, file_path, name, orch_model.flow_type)
+        flow_type = orch_model.flow_type
+        # Steps of the shared walk index, in pre-order
+        for step in orch_model.get_walk_index().steps:
+            if step.type not in API_STEP_NODE_TYPES:
+                continue
+            step_name = step.name or step.type
+            if not _has_local_error_handler(step.value):
+                yield Finding(
+                    rule=self,
+                    file_path=file_path,
+                    line=1,
+                    message=f"API step '{step_name}' must have a local error handler.",
+                    path=f"$..nodes[?(@.name=='{step_name}')]",
+                )
+            elif not _api_step_handler_has_required_step(step.value, flow_type):
+                yield Finding(
+                    rule=self,
+                    file_path=file_path,
+                    line=1,
+                    message=f"API step '{step_name}' error handler must contain a log step (or Add Integration Message step for Integration templates).",
+                    path=f"$..nodes[?(@.name=='{step_name}')].errorHandler",
+                )
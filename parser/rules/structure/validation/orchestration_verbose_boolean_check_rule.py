@@ -1,46 +1,10 @@
 """Rule to flag redundant boolean wrapper expressions in orchestrations (if (X) true else false / if (X) false else true)."""
 
-from typing import Any, Generator, Optional, Tuple, Union
+from typing import Generator
 from ...base import Finding, FixStrategy, Category
 from ....models import ProjectContext, PMDModel, PodModel, OrchestrationModel
 from ..shared import StructureRuleBase
 from utils.jsonpath import tuple_path_to_jsonpath
-from ..shared.orchestration_path_utils import (
-    get_expression_source,
-    resolve_ui_location,
-    unwrap as _unwrap,
-)
-
-
-def _is_expression_object(d: Any) -> bool:
-    """True if d is a dict with _type indicating Expr, _value is a dict, and _value contains 'source'."""
-    if not isinstance(d, dict):
-        return False
-    type_val = d.get("_type")
-    value_val = d.get("_value")
-    if not isinstance(value_val, dict) or "source" not in value_val:
-        return False
-    if isinstance(type_val, list) and len(type_val) >= 1 and type_val[0] == "Expr":
-        return True
-    if isinstance(type_val, str) and type_val.startswith("Expr"):
-        return True
-    return False
-
-
-def _is_boolean_expression(d: Any) -> bool:
-    """True if d is an expression object and type is Boolean."""
-    if not _is_expression_object(d):
-        return False
-    type_val = d.get("_type")
-    if isinstance(type_val, list) and len(type_val) >= 2 and type_val[1] == "Boolean":
-        return True
-    value_val = d.get("_value")
-    if isinstance(value_val, dict):
-        type_node = value_val.get("type")
-        unwrapped = _unwrap(type_node)
-        if isinstance(unwrapped, str) and unwrapped == "Boolean":
-            return True
-    return False
 
 
 def _is_redundant_boolean_wrapper(source: str) -> bool:
@@ -78,18 +42,6 @@ def _is_redundant_boolean_wrapper(source: str) -> bool:
     return normalized in ("true else false", "false else true")
 
 
-def _walk_json(obj: Any, path: Tuple[Union[str, int], ...] = ()) -> Generator[Tuple[dict, Tuple[Union[str, int], ...]], None, None]:
-    """Generic recursive walk; yield (expr_dict, path) for each Boolean expression. Path is from root to the expression."""
-    if isinstance(obj, dict):
-        if _is_boolean_expression(obj):
-            yield (obj, path)
-        for k, v in obj.items():
-            yield from _walk_json(v, path + (k,))
-    elif isinstance(obj, list):
-        for idx, item in enumerate(obj):
-            yield from _walk_json(item, path + (idx,))
-
-
 class OrchestrationVerboseBooleanCheckRule(StructureRuleBase):
     """Flags boolean expressions that use the redundant pattern if (X) true else false or if (X) false else true."""
 
@@ -125,12 +77,14 @@ class OrchestrationVerboseBooleanCheckRule(StructureRuleBase):
     def visit_orchestration(
         self, orch_model: OrchestrationModel, context: ProjectContext
     ) -> Generator[Finding, None, None]:
-        raw = orch_model.raw_value
+        index = orch_model.get_walk_index()
         file_path = orch_model.file_path
-        for expr_obj, path in _walk_json(raw):
-            source = get_expression_source(expr_obj)
-            if source and _is_redundant_boolean_wrapper(source):
-                location = resolve_ui_location(raw, path)
+        for expression in index.expressions:
+            if not expression.is_boolean:
+                continue
+            path = expression.path
+            if expression.source and _is_redundant_boolean_wrapper(expression.source):
+                location = index.ui_location(path)
                 location_suffix = f" Location: {location}." if location else ""
                 yield Finding(
                     rule=self,
@@ -199,12 +199,12 @@ class PMDSectionOrderingRule(Rule):
         """Get the line number where a root-level key is defined."""
         try:
             if pmd_model.source_content:
-                lines = pmd_model.source_content.split('\n')
-                for i, line in enumerate(lines):
+                needle = f'"{key}":'
+                lines = pmd_model.get_source_index().lines
+                for line_num in pmd_model.lines_for_substring(needle):
                     # Look for the key at the start of a line (root level)
-                    stripped_line = line.strip()
-                    if stripped_line.startswith(f'"{key}":'):
-                        return i + 1  # Convert to 1-based line numbering
+                    if lines[line_num - 1].strip().startswith(needle):
+                        return line_num
             return 1  # Fallback to line 1
         except Exception:
             return 1
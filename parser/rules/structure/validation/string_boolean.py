@@ -1,6 +1,8 @@
+import re
 from typing import Generator
 from ...base import Finding, FixStrategy
 from ....models import PMDModel, PodModel, ProjectContext
+from ....literal_scanner import scan_model
 from ..shared import StructureRuleBase
 
 
@@ -45,7 +47,7 @@ class StringBooleanRule(StructureRuleBase):
     
     def visit_pmd(self, pmd_model: PMDModel, context: ProjectContext) -> Generator[Finding, None, None]:
         """Analyzes the PMD model for string boolean values."""
-        if not pmd_model.source_content:
+        if not pmd_model.source_content or not scan_model(pmd_model, context).source_has('string_boolean'):
             return
         
         # Check the raw source content for string boolean patterns
@@ -53,7 +55,7 @@ class StringBooleanRule(StructureRuleBase):
 
     def visit_pod(self, pod_model: PodModel, context: ProjectContext) -> Generator[Finding, None, None]:
         """Analyzes the POD model for string boolean values."""
-        if not pod_model.source_content:
+        if not pod_model.source_content or not scan_model(pod_model, context).source_has('string_boolean'):
             return
         
         # Check the raw source content for string boolean patterns
@@ -61,35 +63,31 @@ class StringBooleanRule(StructureRuleBase):
 
     def _check_source_content_for_string_booleans(self, model):
         """Check the source content for string boolean patterns."""
-        import re
-        
-        lines = model.source_content.split('\n')
-        
         # Pattern to match field: "true" or field: "false" or field:"true" or field:"false"
-        pattern = r'"([^"]+)"\s*:\s*"(true|false)"'
+        # on a single line (matched over the whole text, located with the model's line index)
+        pattern = r'"([^"\n]+)"[^\S\n]*:[^\S\n]*"(true|false)"'
         
-        for line_num, line in enumerate(lines, 1):
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                field_name = match.group(1)
-                string_value = match.group(2)
+        for match in re.finditer(pattern, model.source_content):
+            line_num = model.line_for_offset(match.start())
+            field_name = match.group(1)
+            string_value = match.group(2)
 
-                # Skip fields that start with underscore (commented out)
-                if field_name.startswith('_'):
-                    continue
+            # Skip fields that start with underscore (commented out)
+            if field_name.startswith('_'):
+                continue
 
-                # target_text is the exact source substring (e.g. '"visible": "true"');
-                # suggested_replacement strips the inner quotes around the bool.
-                target_text = match.group(0)
-                quoted_bool_len = len(string_value) + 2  # +2 for surrounding quotes
-                replacement = target_text[:-quoted_bool_len] + string_value
+            # target_text is the exact source substring (e.g. '"visible": "true"');
+            # suggested_replacement strips the inner quotes around the bool.
+            target_text = match.group(0)
+            quoted_bool_len = len(string_value) + 2  # +2 for surrounding quotes
+            replacement = target_text[:-quoted_bool_len] + string_value
 
-                yield self._create_finding(
-                    message=f"Field '{field_name}' has string value '{string_value}' instead of boolean {string_value}. Use boolean {string_value} instead of string '{string_value}'.",
-                    file_path=model.file_path,
-                    line=line_num,
-                    suggested_replacement=replacement,
-                    path=f"$..{field_name}",
-                    target_text=target_text,
-                    replacement_context="substring",
-                )
+            yield self._create_finding(
+                message=f"Field '{field_name}' has string value '{string_value}' instead of boolean {string_value}. Use boolean {string_value} instead of string '{string_value}'.",
+                file_path=model.file_path,
+                line=line_num,
+                suggested_replacement=replacement,
+                path=f"$..{field_name}",
+                target_text=target_text,
+                replacement_context="substring",
+            )
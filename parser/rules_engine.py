@@ -1,23 +1,34 @@
 import inspect
-import pkgutil
+import importlib
 import importlib.util
 import os
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- Local Imports ---
 from .models import ProjectContext
-from . import rules
 from .rules.base import Rule, Finding
+from .rules.script.shared.rule_base import ScriptRuleBase
+from .rules.script.shared.dispatch import MultiplexedScriptRunner
 from .config import ArcaneAuditorConfig
+from .profiling import AnalysisProfiler
+from .rule_manifest import collect_rule_manifest, is_concrete_rule, load_rule_manifest, save_user_rule_manifest
 from utils.arcane_paths import get_rule_dirs
-from utils.console import info, error
+from utils.console import info, warn, error
 
 class RulesEngine:
     """Discovers, loads, and runs all analysis rules."""
 
-    def __init__(self, config: Optional[ArcaneAuditorConfig] = None):
+    def __init__(self, config: Optional[ArcaneAuditorConfig] = None, rule_ids: Optional[Iterable[str]] = None):
+        """
+        Args:
+            config: Configuration (enabled rules, severities, settings).
+            rule_ids: Only load these rules (class names). Built-in rules are
+                imported from the rule manifest, so other rule modules are never
+                imported. Defaults to every enabled rule.
+        """
         self.config = config or ArcaneAuditorConfig()
+        self.rule_ids = set(rule_ids) if rule_ids is not None else None
         self.rules = self._discover_rules()
 
     def _discover_rules(self) -> List[Rule]:
@@ -39,14 +50,51 @@ class RulesEngine:
         return discovered_rules
 
     def _load_builtin_rules(self, discovered_rules: List[Rule]) -> None:
-        """Load built-in rules using the original pkgutil approach."""
-        # Use the original working approach for built-in rules
-        for _, name, _ in pkgutil.walk_packages(rules.__path__, f"{rules.__name__}."):
+        """Load built-in rules from the rule manifest, or by walking parser.rules without one."""
+        manifest = load_rule_manifest()
+        if manifest is not None and self._load_builtin_rules_from_manifest(manifest, discovered_rules):
+            return
+        self._load_builtin_rules_by_walking(discovered_rules)
+
+    def _load_builtin_rules_from_manifest(self, manifest: List[dict], discovered_rules: List[Rule]) -> bool:
+        """
+        Import only the modules of the wanted rules listed in the manifest.
+
+        Returns False (leaving discovered_rules untouched) if an entry no longer
+        matches its module, so the caller can fall back to a full walk.
+        """
+        rule_classes = []
+        for entry in manifest:
+            if self.rule_ids is not None and entry['rule_id'] not in self.rule_ids:
+                continue
             try:
-                module = __import__(name, fromlist="dummy")
-                self._extract_rules_from_module(module, discovered_rules, "built-in")
+                member_obj = getattr(importlib.import_module(entry['module']), entry['rule_id'], None)
             except Exception as e:
-                error(f"[RulesEngine] Error loading built-in rule {name}: {e}")
+                error(f"[RulesEngine] Error loading built-in rule {entry['module']}: {e}")
+                continue
+            if not is_concrete_rule(member_obj):
+                warn(f"[RulesEngine] Rule manifest is out of date ({entry['module']}.{entry['rule_id']}); discovering rules")
+                return False
+            rule_classes.append(member_obj)
+        for member_obj in rule_classes:
+            self._add_rule(member_obj, discovered_rules, "built-in")
+        return True
+
+    def _load_builtin_rules_by_walking(self, discovered_rules: List[Rule]) -> None:
+        """Import every module under parser.rules, then cache the manifest for later runs."""
+        failed = []
+
+        def on_error(name, exc):
+            failed.append(name)
+            error(f"[RulesEngine] Error loading built-in rule {name}: {exc}")
+
+        manifest = collect_rule_manifest(on_error)
+        for entry in manifest:
+            if self.rule_ids is None or entry['rule_id'] in self.rule_ids:
+                module = importlib.import_module(entry['module'])
+                self._add_rule(getattr(module, entry['rule_id']), discovered_rules, "built-in")
+        if not failed:
+            save_user_rule_manifest(manifest)
 
     def _load_user_rules(self, discovered_rules: List[Rule]) -> None:
         """Load user rules from custom directories."""
@@ -70,24 +118,21 @@ class RulesEngine:
 
     def _extract_rules_from_module(self, module, discovered_rules: List[Rule], rule_type: str) -> None:
         """Extract and instantiate rules from a module."""
-        for member_name, member_obj in inspect.getmembers(module, inspect.isclass):
-            if issubclass(member_obj, Rule) and member_obj is not Rule:
-                # Skip abstract classes
-                if hasattr(member_obj, '__abstractmethods__') and member_obj.__abstractmethods__:
-                    continue
-                
-                # Skip example rules (flagged with IS_EXAMPLE = True)
-                if hasattr(member_obj, 'IS_EXAMPLE') and member_obj.IS_EXAMPLE:
-                    continue
-                
-                # Check if rule is enabled in configuration using class name
-                if self.config.is_rule_enabled(member_obj.__name__):
-                    info(f"[RulesEngine] Discovered {rule_type} rule: {member_obj.__name__}")
-                    rule_instance = member_obj()
-                    self._apply_rule_config(rule_instance)
-                    discovered_rules.append(rule_instance)
-                else:
-                    info(f"[RulesEngine] Skipping disabled {rule_type} rule: {member_obj.__name__}")
+        # Abstract classes and example rules (IS_EXAMPLE = True) are skipped
+        for member_name, member_obj in inspect.getmembers(module, is_concrete_rule):
+            if self.rule_ids is None or member_name in self.rule_ids:
+                self._add_rule(member_obj, discovered_rules, rule_type)
+
+    def _add_rule(self, member_obj: type, discovered_rules: List[Rule], rule_type: str) -> None:
+        """Instantiate and configure a rule class if the configuration enables it."""
+        # Check if rule is enabled in configuration using class name
+        if self.config.is_rule_enabled(member_obj.__name__):
+            info(f"[RulesEngine] Discovered {rule_type} rule: {member_obj.__name__}")
+            rule_instance = member_obj()
+            self._apply_rule_config(rule_instance)
+            discovered_rules.append(rule_instance)
+        else:
+            info(f"[RulesEngine] Skipping disabled {rule_type} rule: {member_obj.__name__}")
     
     def _apply_rule_config(self, rule: Rule) -> None:
         """Apply configuration overrides to a rule instance."""
@@ -116,62 +161,111 @@ class RulesEngine:
         if custom_settings and hasattr(rule, 'apply_settings'):
             rule.apply_settings(custom_settings)
 
-    def run(self, context: ProjectContext) -> List[Finding]:
+    def run(self, context: ProjectContext, rules: Optional[List[Rule]] = None,
+            profiler: Optional[AnalysisProfiler] = None) -> List[Finding]:
         """
 
         Executes all discovered rules against the project context.
 
+        Runs keep no state on the engine or its rules, so one engine can serve
+        concurrent runs (the web server shares one per configuration).
+
         Args:
             context: The ProjectContext containing the entire application model.
+            rules: Optional subset of self.rules to run (defaults to all of them).
+            profiler: Optional AnalysisProfiler recording per-rule timings.
 
         Returns:
             A list of all findings from all rules.
         """
         all_findings = []
-        if not self.rules:
+        rules = self.rules if rules is None else list(rules)
+        if not rules:
             info("No rules were found to run.")
             return []
 
-        info(f"\nRunning {len(self.rules)} rule(s)...")
-
-        if len(self.rules) <= 5:
-            info("Using serial rule execution (small rule count)")
-            for rule in self.rules:
-                try:
-                    findings_from_rule = list(rule.analyze(context))
-                    if findings_from_rule:
-                        all_findings.extend(findings_from_rule)
-                except Exception as e:
-                    error(f"Rule {rule.__class__.__name__} failed: {e}")
+        info(f"\nRunning {len(rules)} rule(s)...")
+        # cProfile dumps are per rule and cProfile profiles one thread at a time,
+        # so while profiling every rule runs alone and serially.
+        profiling_rules = profiler is not None and profiler.profile_dir is not None
+        units = self._plan_execution_units(rules, multiplex=not profiling_rules)
+
+        if len(rules) <= 5 or profiling_rules:
+            info("Using serial rule execution (cProfile enabled)" if profiling_rules
+                 else "Using serial rule execution (small rule count)")
+            for unit in units:
+                all_findings.extend(self._run_unit_safe(unit, context, profiler))
         else:
             # Use parallel processing for larger rule sets
-            max_workers = min(8, len(self.rules))  # Cap at 8 workers for rules
+            max_workers = min(8, len(units))  # Cap at 8 workers for rules
             
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # Submit all rule execution tasks
-                future_to_rule = {
-                    executor.submit(self._run_rule_safe, rule, context): rule
-                    for rule in self.rules
+                future_to_unit = {
+                    executor.submit(self._run_unit_safe, unit, context, profiler): unit
+                    for unit in units
                 }
                 
                 # Collect results as they complete
-                for future in as_completed(future_to_rule):
-                    rule = future_to_rule[future]
+                for future in as_completed(future_to_unit):
+                    unit = future_to_unit[future]
                     try:
-                        findings_from_rule = future.result()
-                        if findings_from_rule:
-                            all_findings.extend(findings_from_rule)
+                        findings_from_unit = future.result()
+                        if findings_from_unit:
+                            all_findings.extend(findings_from_unit)
                     except Exception as e:
-                        error(f"Error running rule {rule.__class__.__name__}: {e}")
+                        names = ", ".join(rule.__class__.__name__ for rule in unit)
+                        error(f"Error running rule {names}: {e}")
 
         # Deterministic ordering: Sort by (file_path, line, rule_id, message) so two identical
         # runs produce byte-identical output regardless of serial/parallel execution.
         all_findings.sort(key=lambda f: (f.file_path, f.line, f.rule_id, f.message))
         return all_findings
     
-    def _run_rule_safe(self, rule: Rule, context: ProjectContext) -> List[Finding]:
+    def _plan_execution_units(self, rules: Optional[List[Rule]] = None, multiplex: bool = True) -> List[List[Rule]]:
+        """
+        Group rules into units of work.
+
+        Script rules that support multiplexing share one parse and AST walk per
+        script field, so they form a single unit; every other rule runs alone.
+        """
+        rules = self.rules if rules is None else rules
+        multiplexed = []
+        if multiplex and self.config.execution.multiplex_script_rules:
+            multiplexed = [
+                rule for rule in rules
+                if isinstance(rule, ScriptRuleBase) and rule.supports_multiplexing()
+            ]
+        if len(multiplexed) < 2:
+            return [[rule] for rule in rules]
+
+        multiplexed_ids = {id(rule) for rule in multiplexed}
+        units = [multiplexed]
+        units.extend([rule] for rule in rules if id(rule) not in multiplexed_ids)
+        return units
+
+    def _run_unit_safe(self, unit: List[Rule], context: ProjectContext,
+                       profiler: Optional[AnalysisProfiler] = None) -> List[Finding]:
+        """Run one unit from _plan_execution_units()."""
+        if len(unit) == 1:
+            return self._run_rule_safe(unit[0], context, profiler)
+        try:
+            if profiler is not None:
+                return profiler.run_multiplexed(
+                    (rule.__class__.__name__ for rule in unit), lambda: MultiplexedScriptRunner(unit).run(context)
+                )
+            return MultiplexedScriptRunner(unit).run(context)
+        except Exception as e:
+            names = ", ".join(rule.__class__.__name__ for rule in unit)
+            error(f"Multiplexed script rules failed ({names}): {e}")
+            return []
+
+    def _run_rule_safe(self, rule: Rule, context: ProjectContext,
+                       profiler: Optional[AnalysisProfiler] = None) -> List[Finding]:
         """Thread-safe wrapper for running a single rule."""
         try:
+            if profiler is not None:
+                return profiler.run_rule(rule.__class__.__name__, lambda: list(rule.analyze(context)))
             return list(rule.analyze(context))
         except Exception as e:
             error(f"Rule {rule.__class__.__name__} failed: {e}")
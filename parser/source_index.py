@@ -0,0 +1,171 @@
+"""
+Line-start index over a source file's text.
+
+Line lookups used to split the whole file into lines and scan them linearly,
+once per script field and once per strategy in the line offset heuristics.
+SourceIndex is built once per model (ModelParser does it when it creates the
+model) and answers the same questions with str.find and bisect:
+
+- line_for_offset(): character offset -> 1-based line number
+- find_line() / lines_containing(): first / every line containing a substring
+- lines_for_substring(): every line containing a substring, remembered per
+  substring, so rules that resolve many matches of the same value (one WID
+  used ten times) search the text once
+- marker lines: the lines containing a script opening tag (`<%`)
+
+Line numbers returned by the search helpers are 0-based line indices (matching
+the `lines[i]` loops they replace); line_for_offset() is 1-based.
+"""
+import weakref
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCRIPT_MARKER = '<%'
+
+
+class SourceIndex:
+    """Line starts, offset -> line lookup and `<%` marker lines for one text."""
+
+    __slots__ = ('text', 'line_starts', '_lines', '_marker_lines', '_casefolded', '_substring_lines', '__weakref__')
+
+    def __init__(self, text: str):
+        self.text = text or ''
+        starts = [0]
+        find = self.text.find
+        position = find('\n')
+        while position != -1:
+            starts.append(position + 1)
+            position = find('\n', position + 1)
+        self.line_starts: List[int] = starts
+        self._lines: Optional[List[str]] = None
+        self._marker_lines: Optional[List[int]] = None
+        self._casefolded: Optional['SourceIndex'] = None
+        self._substring_lines: Dict[Tuple[str, bool], Tuple[int, ...]] = {}
+        _registry[id(self.text)] = self
+
+    def __reduce__(self):
+        # Only the text is worth shipping (e.g. to --jobs workers); the rest is cheap to rebuild.
+        return (SourceIndex, (self.text,))
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    @property
+    def lines(self) -> List[str]:
+        """The text split on newlines (computed once)."""
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    def line_index_for_offset(self, offset: int) -> int:
+        """0-based index of the line containing character `offset`."""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def line_for_offset(self, offset: int) -> int:
+        """1-based line number of character `offset` (offsets past the end map to the last line)."""
+        if offset < 0:
+            return 1
+        return bisect_right(self.line_starts, offset)
+
+    def lines_containing(self, needle: str, start_line: int = 0) -> Iterator[int]:
+        """Ascending indices of the lines (from `start_line`) that contain `needle`."""
+        if '\n' in needle or start_line >= self.line_count:
+            return
+        text, starts = self.text, self.line_starts
+        position = starts[max(0, start_line)]
+        while True:
+            found = text.find(needle, position)
+            if found == -1:
+                return
+            line = self.line_index_for_offset(found)
+            yield line
+            if line + 1 >= len(starts):
+                return
+            position = starts[line + 1]
+
+    def lines_containing_any(self, needles: Iterable[str], start_line: int = 0) -> Iterator[int]:
+        """Ascending, de-duplicated indices of lines that contain any of `needles`."""
+        previous = None
+        for line in merge(*(self.lines_containing(needle, start_line) for needle in set(needles))):
+            if line != previous:
+                yield line
+                previous = line
+
+    def find_line(self, needle: str, start_line: int = 0) -> Optional[int]:
+        """Index of the first line at or after `start_line` containing `needle`."""
+        return next(self.lines_containing(needle, start_line), None)
+
+    def find_line_any(self, needles: Iterable[str], start_line: int = 0) -> Optional[int]:
+        """Index of the first line at or after `start_line` containing any of `needles`."""
+        return next(self.lines_containing_any(needles, start_line), None)
+
+    def find_line_casefold(self, needle: str, start_line: int = 0) -> Optional[int]:
+        """Like find_line(), comparing `needle.lower()` against lower-cased lines."""
+        return self._lowered().find_line(needle.lower(), start_line)
+
+    def _lowered(self) -> 'SourceIndex':
+        if self._casefolded is None:
+            self._casefolded = SourceIndex(self.text.lower())
+        return self._casefolded
+
+    def lines_for_substring(self, needle: str, case_sensitive: bool = True) -> Tuple[int, ...]:
+        """
+        1-based numbers of the lines containing `needle` (compared lower-cased
+        when not `case_sensitive`), computed once per needle.
+        """
+        key = (needle, case_sensitive)
+        lines = self._substring_lines.get(key)
+        if lines is None:
+            if case_sensitive:
+                found = self.lines_containing(needle)
+            else:
+                found = self._lowered().lines_containing(needle.lower())
+            lines = self._substring_lines[key] = tuple(line + 1 for line in found)
+        return lines
+
+    @property
+    def marker_lines(self) -> List[int]:
+        """Ascending indices of the lines that contain a `<%` script marker."""
+        if self._marker_lines is None:
+            self._marker_lines = list(self.lines_containing(SCRIPT_MARKER))
+        return self._marker_lines
+
+    def next_marker_line(self, start_line: int = 0) -> Optional[int]:
+        """First marker line at or after `start_line`."""
+        markers = self.marker_lines
+        position = bisect_left(markers, max(0, start_line))
+        return markers[position] if position < len(markers) else None
+
+    def last_marker_line(self, end_line: int, after_line: int = -1) -> Optional[int]:
+        """Last marker line `m` with `after_line < m <= end_line`."""
+        markers = self.marker_lines
+        position = bisect_right(markers, end_line)
+        if position and markers[position - 1] > after_line:
+            return markers[position - 1]
+        return None
+
+
+# Indexes by id() of the text they were built from. Models own their index, so
+# entries disappear with the model; the identity check guards against id reuse.
+_registry: 'weakref.WeakValueDictionary[int, SourceIndex]' = weakref.WeakValueDictionary()
+
+
+@lru_cache(maxsize=16)
+def _build_index(text: str) -> SourceIndex:
+    return SourceIndex(text)
+
+
+def source_index_for(text: str) -> SourceIndex:
+    """
+    Return a SourceIndex for `text`.
+
+    Reuses the index of the model that owns this exact string when there is one
+    (see SourceIndexedModel.get_source_index), otherwise a recently built index.
+    """
+    index = _registry.get(id(text))
+    if index is not None and index.text is text:
+        return index
+    return _build_index(text or '')
@@ -0,0 +1,74 @@
+"""
+Flattened index of a model's string values.
+
+Several structure rules (hardcoded WIDs, hardcoded application IDs, embedded
+images) look at every string in a page, pod or WQL query. Each used to call
+model_dump() and walk the resulting dict, so a large page was deep-copied and
+fully walked once per rule. build_string_index() walks the model once and
+records every string value in document order; SourceIndexedModel caches the
+result, so all rules (and later incremental runs over an unchanged model)
+share one walk.
+
+The walk visits exactly the values model_dump() would export: fields declared
+with exclude=True (file_path, source_content) are skipped, nested models are
+walked field by field in declaration order, and dict/list contents are walked
+as they are.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class StringValue(NamedTuple):
+    """One string value of a model and where it sits."""
+    path: str                # "presentation.body.children[0].label"
+    key: Optional[str]       # dict key holding the value; None for list items
+    field: str               # key, or "[i]" for list items
+    value: str
+    widget_id: Any           # 'id' (or 'widgetId') of the dict holding the value, if any
+    widget_type: Any         # 'type' of the dict holding the value, if any
+    is_script: bool          # holds both '<%' and '%>'
+
+
+def _exported_fields(model: BaseModel) -> Dict[str, Any]:
+    """The fields model_dump() exports, as a shallow dict in declaration order."""
+    return {
+        name: getattr(model, name)
+        for name, field in type(model).model_fields.items()
+        if not field.exclude
+    }
+
+
+def _walk(node: Any, path: str, out: List[StringValue]) -> None:
+    if isinstance(node, BaseModel):
+        node = _exported_fields(node)
+    if isinstance(node, dict):
+        items = node.items()
+        widget_id = node.get('id') or node.get('widgetId')
+        widget_type = node.get('type')
+    elif isinstance(node, list):
+        for i, item in enumerate(node):
+            item_path = f"{path}[{i}]"
+            if isinstance(item, str):
+                out.append(StringValue(item_path, None, f"[{i}]", item, None, None,
+                                       '<%' in item and '%>' in item))
+            elif isinstance(item, (dict, list, BaseModel)):
+                _walk(item, item_path, out)
+        return
+    else:
+        return
+
+    for key, value in items:
+        value_path = f"{path}.{key}" if path else key
+        if isinstance(value, str):
+            out.append(StringValue(value_path, key, key, value, widget_id, widget_type,
+                                   '<%' in value and '%>' in value))
+        elif isinstance(value, (dict, list, BaseModel)):
+            _walk(value, value_path, out)
+
+
+def build_string_index(model: BaseModel) -> Tuple[StringValue, ...]:
+    """Every string value of `model`, in document order."""
+    out: List[StringValue] = []
+    _walk(model, "", out)
+    return tuple(out)
@@ -0,0 +1,96 @@
+"""
+Watch mode: re-analyze an application whenever its files change.
+
+A WatchSession lives for the whole `review-app --watch` run, so the rules
+engine (rule discovery), the compiled script parser and the parsed models and
+ASTs of unchanged files stay in memory between iterations. Each iteration goes
+through an in-memory IncrementalAnalyzer and is reported as the findings that
+appeared or disappeared since the previous one.
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .incremental import IncrementalAnalyzer
+from .models import ProjectContext
+from .rules.base import Finding
+from .rules_engine import RulesEngine
+
+
+def diff_findings(previous: List[Finding], current: List[Finding]) -> Tuple[List[Finding], List[Finding]]:
+    """
+    Split two runs' findings into (new, resolved).
+
+    Findings are matched by finding_id, which leaves out the line number, so a
+    finding that only moved because lines were added above it is neither.
+    """
+    def unmatched(findings: List[Finding], others: List[Finding]) -> List[Finding]:
+        available = Counter(finding.finding_id for finding in others)
+        remaining = []
+        for finding in findings:
+            if available[finding.finding_id]:
+                available[finding.finding_id] -= 1
+            else:
+                remaining.append(finding)
+        return remaining
+
+    return unmatched(current, previous), unmatched(previous, current)
+
+
+@dataclass
+class WatchIteration:
+    """Outcome of one watch-mode analysis."""
+    findings: List[Finding]
+    new: List[Finding]
+    resolved: List[Finding]
+    context: ProjectContext
+    seconds: float
+    changed_paths: Set[str] = field(default_factory=set)
+
+
+class WatchSession:
+    """Keeps the analysis warm and re-runs it for each batch of changes."""
+
+    def __init__(self, rules_engine: RulesEngine, load_sources: Callable[[], Dict[str, Any]]):
+        """
+        Args:
+            rules_engine: Engine reused for every iteration
+            load_sources: Returns the current source files map (e.g. a
+                FileProcessor.process_directory call)
+        """
+        self.load_sources = load_sources
+        self.analyzer = IncrementalAnalyzer(rules_engine)
+        self.findings: List[Finding] = []
+
+    def analyze(self, changed_paths: Optional[Set[str]] = None) -> WatchIteration:
+        """Analyze the current sources and diff the findings against the previous run."""
+        start = time.perf_counter()
+        context, findings = self.analyzer.analyze(self.load_sources())
+        new, resolved = diff_findings(self.findings, findings)
+        self.findings = findings
+        return WatchIteration(
+            findings=findings, new=new, resolved=resolved, context=context,
+            seconds=time.perf_counter() - start, changed_paths=set(changed_paths or ()),
+        )
+
+    def run(self, watcher: Any, report: Callable[[WatchIteration], None],
+            on_error: Callable[[Exception], None], max_iterations: Optional[int] = None) -> None:
+        """
+        Report an initial analysis, then one per batch of changes from `watcher`.
+
+        Stops when the watcher returns no changes (it was interrupted) or after
+        `max_iterations` re-analyses. Errors in one iteration are passed to
+        `on_error` and watching continues.
+        """
+        report(self.analyze())
+        iterations = 0
+        while max_iterations is None or iterations < max_iterations:
+            changed_paths = watcher.wait()
+            if not changed_paths:
+                return
+            iterations += 1
+            try:
+                report(self.analyze(changed_paths))
+            except Exception as e:
+                on_error(e)
@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the test suite.
+"""
+import pytest
+
+from parser.ast_cache import configure_ast_cache
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache_dir(tmp_path_factory):
+    """
+    Keep the suite out of the developer's per-user cache directory.
+
+    The prebuilt LALR parser, the rule manifest, incremental state and the
+    default on-disk AST cache all live under get_cache_dir(); for the whole
+    session it points at a directory under pytest's temporary root.
+    """
+    cache_dir = tmp_path_factory.mktemp("arcane_cache")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("utils.arcane_paths.get_cache_dir", lambda: str(cache_dir))
+        yield cache_dir
+
+
+@pytest.fixture(autouse=True)
+def no_disk_ast_cache():
+    """review-app enables the on-disk AST cache by default; tests that want one enable their own."""
+    configure_ast_cache(enabled=False)
+    yield
+    configure_ast_cache(enabled=False)
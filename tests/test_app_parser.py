@@ -169,6 +169,57 @@ class TestModelParser:
         with pytest.raises(json.JSONDecodeError):
             self.parser._parse_pmd_file("test.pmd", mock_file, context)
     
+    def test_parse_pmd_file_collects_script_fields(self):
+        """Script fields are collected at load time, with model field paths and exact lines."""
+        pmd_content = json.dumps({
+            "id": "scripted",
+            "onLoad": "<% pageVariables.a = 1; %>",
+            "endPoints": [{"name": "getWorker", "onSend": "<% self.data %>", "url": "/w"}],
+            "presentation": {
+                "body": {"type": "section", "children": [
+                    {"type": "text", "id": "hello", "value": "<% 'Hi' %>", "_onClick": "<% x %>"},
+                ]},
+            },
+            "note": "<%% not a script",
+        }, indent=2)
+        context = ProjectContext()
+        self.parser._parse_pmd_file("scripted.pmd", Mock(content=pmd_content), context)
+        pmd_model = context.pmds["scripted.pmd"]
+        
+        fields = pmd_model.get_cached_script_fields()
+        assert [(path, display) for path, _value, display, _line in fields] == [
+            ("inboundEndpoints.0.onSend", "inboundEndpoints[0]->name: getWorker->onSend"),
+            ("presentation.body.children.0.value", "presentation->body->children[0]->id: hello->value"),
+            ("onLoad", "onLoad"),
+        ]
+        lines = pmd_content.split("\n")
+        for _path, value, _display, line in fields:
+            assert json.dumps(value) in lines[line - 1]
+        
+        from parser.rules.script.core.var_usage import ScriptVarUsageRule
+        assert ScriptVarUsageRule().find_script_fields(pmd_model, ProjectContext()) is fields
+    
+    def test_parse_pod_file_collects_script_fields(self):
+        """Pod script fields are collected at load time."""
+        pod_content = json.dumps({
+            "podId": "myPod",
+            "seed": {
+                "endPoints": [{"name": "getData", "onReceive": "<% self.data %>"}],
+                "template": {"type": "section", "id": "root", "children": [
+                    {"type": "button", "id": "go", "onClick": "<% go() %>"},
+                ]},
+            },
+        }, indent=2)
+        context = ProjectContext()
+        self.parser._parse_pod_file("my.pod", Mock(content=pod_content), context)
+        fields = context.pods["my.pod"].get_cached_script_fields()
+        assert [path for path, _value, _display, _line in fields] == [
+            "seed.endPoints[0].onReceive", "seed.template.children[0].onClick",
+        ]
+        lines = pod_content.split("\n")
+        for _path, value, _display, line in fields:
+            assert json.dumps(value) in lines[line - 1]
+    
     def test_parse_script_file(self):
         """Test script file parsing."""
         script_content = "var x = 1;\nfunction test() { return x; }"
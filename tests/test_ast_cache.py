@@ -0,0 +1,247 @@
+"""
+Tests for the persistent on-disk AST cache.
+"""
+import os
+import time
+
+import pytest
+
+from parser import ast_cache
+from parser.ast_cache import ASTInternTable, DiskASTCache, configure_ast_cache, get_ast_cache
+from parser.pmd_script_parser import parse_with_preprocessor
+
+
+@pytest.fixture
+def cache(tmp_path):
+    active = configure_ast_cache(str(tmp_path / "ast"))
+    yield active
+    configure_ast_cache(enabled=False)
+
+
+class TestDiskASTCache:
+
+    def test_round_trip(self, tmp_path):
+        disk = DiskASTCache(tmp_path)
+        tree = parse_with_preprocessor("var x = {\"a\": 1};")
+        key = disk.key_for("var x = {\"a\": 1};")
+        assert disk.get(key) is ast_cache._MISSING
+
+        disk.put(key, tree)
+        assert disk.get(key) == tree
+        assert disk.stats() == {"hits": 1, "misses": 1, "writes": 1}
+
+    def test_token_end_positions_survive(self, tmp_path):
+        disk = DiskASTCache(tmp_path)
+        tree = parse_with_preprocessor("var total = 0;\nvar f = function(a) { return a; };")
+        key = disk.key_for("positions")
+        disk.put(key, tree)
+        restored = disk.get(key)
+
+        def positions(t):
+            return [
+                (tok.type, str(tok), tok.line, tok.column, tok.end_line, tok.end_column, tok.start_pos, tok.end_pos)
+                for tok in t.scan_values(lambda v: True)
+            ]
+        assert positions(restored) == positions(tree)
+        assert restored.meta.end_line == tree.meta.end_line
+
+    def test_cached_none_is_a_hit(self, tmp_path):
+        disk = DiskASTCache(tmp_path)
+        key = disk.key_for("broken")
+        disk.put(key, None)
+        assert disk.get(key) is None
+
+    def test_key_depends_on_grammar_fingerprint(self, tmp_path, monkeypatch):
+        disk = DiskASTCache(tmp_path)
+        key = disk.key_for("var x = 1;")
+        monkeypatch.setattr(ast_cache, "grammar_fingerprint", lambda: "different-grammar")
+        assert DiskASTCache(tmp_path).key_for("var x = 1;") != key
+
+    def test_corrupt_entry_is_discarded(self, tmp_path):
+        disk = DiskASTCache(tmp_path)
+        key = disk.key_for("var x = 1;")
+        disk.put(key, parse_with_preprocessor("var x = 1;"))
+        entry = disk._entry_path(key)
+        entry.write_bytes(b"not a pickle")
+
+        assert disk.get(key) is ast_cache._MISSING
+        assert not entry.exists()
+
+    def test_lru_eviction(self, tmp_path):
+        tree = parse_with_preprocessor("var x = 1;")
+        disk = DiskASTCache(tmp_path)
+        keys = [disk.key_for(f"var x{i} = 1;") for i in range(4)]
+        for i, key in enumerate(keys):
+            disk.put(key, tree)
+            # Distinct mtimes so LRU order is well defined.
+            os.utime(disk._entry_path(key), (time.time() - 100 + i, time.time() - 100 + i))
+        entry_size = disk._entry_path(keys[0]).stat().st_size
+
+        # Touch the oldest entry so it becomes most recently used.
+        assert disk.get(keys[0]) == tree
+
+        disk.max_bytes = entry_size * 4
+        disk._total_bytes = None
+        disk.put(disk.key_for("var y = 1;"), tree)
+
+        assert disk._entry_path(keys[0]).exists()
+        assert not disk._entry_path(keys[1]).exists()
+        assert disk._scan_size() <= disk.max_bytes
+
+
+class TestASTInternTable:
+
+    def test_parses_once_and_counts(self):
+        table = ASTInternTable()
+        calls = []
+
+        def parse(code):
+            calls.append(code)
+            return parse_with_preprocessor(code)
+
+        first = table.intern("var x = 1;", parse)
+        assert table.intern("var x = 1;", parse) is first
+        assert calls == ["var x = 1;"]
+        assert table.stats() == {"scripts": 1, "hits": 1, "misses": 1}
+
+    def test_failed_parse_is_interned(self):
+        table = ASTInternTable()
+        calls = []
+        parse = lambda code: calls.append(code)
+        assert table.intern("not ( valid", parse) is None
+        assert table.intern("not ( valid", parse) is None
+        assert len(calls) == 1
+        assert "not ( valid" in table
+
+    def test_stats_per_kind(self):
+        table = ASTInternTable()
+        table.intern("var x = 1;", parse_with_preprocessor)
+        table.intern("var x = 1;", parse_with_preprocessor)
+        table.intern("x;", parse_with_preprocessor, kind='template_block')
+        kinds = table.kind_stats()
+        assert {kind: (entry["scripts"], entry["hits"], entry["misses"]) for kind, entry in kinds.items()} == {
+            "script": (1, 1, 1), "template_block": (1, 0, 1),
+        }
+        assert kinds["script"]["seconds"] > 0
+
+        copy = ASTInternTable()
+        copy.update(table)
+        assert copy.kind_stats()["template_block"]["scripts"] == 1
+
+    def test_template_blocks_are_interned(self):
+        from parser.rules.script.logic.verbose_boolean import ScriptVerboseBooleanCheckRule
+
+        rule = ScriptVerboseBooleanCheckRule()
+        first = rule._parse_script_content("A <% pageVariables.a %> B", None)
+        second = rule._parse_script_content("C <% pageVariables.a %>", None)
+        assert first.data == second.data == "template_expression"
+        assert first.children[1].children[0] is second.children[1].children[0]
+        assert rule._rule_ast_table().kind_stats()["template_block"]["hits"] == 1
+
+    def test_repeated_block_in_one_template_is_not_shared(self):
+        from parser.rules.script.logic.descriptive_parameters import ScriptDescriptiveParameterRule
+
+        block = "<% items.filter(x => x == 5).map(y => y * 999).size() %>"
+        template = f"A {block} and {block}"
+        rule = ScriptDescriptiveParameterRule()
+        tree = rule._parse_script_content(template, None)
+        first, second = tree.children[1].children[0], tree.children[3].children[0]
+        assert first is not second
+        assert first == second
+        assert len(list(rule._check(template, "value", "test.pmd", 1))) == 4
+
+    def test_concurrent_interns_parse_once(self):
+        import threading
+        import time
+
+        table = ASTInternTable()
+        calls = []
+
+        def slow_parse(code):
+            calls.append(code)
+            time.sleep(0.05)
+            return parse_with_preprocessor(code)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(table.intern("var x = 1;", slow_parse)))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(tree is results[0] for tree in results)
+        assert table.kind_stats()["script"]["misses"] == 1
+        assert table.kind_stats()["script"]["hits"] == 5
+
+    def test_failed_parse_releases_waiters(self):
+        table = ASTInternTable()
+
+        def broken(code):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            table.intern("var x = 1;", broken)
+        assert table.intern("var x = 1;", parse_with_preprocessor) is not None
+
+    def test_key_is_stable_digest(self):
+        assert ASTInternTable.key_for("var x = 1;") == ASTInternTable.key_for("var x = 1;")
+        assert ASTInternTable.key_for("var x = 1;") != ASTInternTable.key_for("var x = 2;")
+        assert len(ASTInternTable.key_for("")) == 64
+
+
+def test_shared_snippet_is_parsed_once_per_run():
+    import json
+    from unittest.mock import Mock
+    from parser.app_parser import ModelParser
+    from parser.config import ArcaneAuditorConfig
+    from parser.rules_engine import RulesEngine
+
+    configure_ast_cache(enabled=False)
+    snippet = "<%\n  var total = 0;\n  pageVariables.total = total;\n%>"
+    template = "Total: <% pageVariables.total %> of <% pageVariables.limit %>"
+    sources = {
+        f"page{i}.pmd": Mock(content=json.dumps({
+            "id": f"page{i}", "onLoad": snippet,
+            "presentation": {"body": {"type": "section", "children": [
+                {"type": "button", "id": f"b{j}", "onClick": snippet, "label": template} for j in range(3)
+            ]}},
+        }, indent=2))
+        for i in range(4)
+    }
+    context = ModelParser().parse_files(sources)
+    RulesEngine(ArcaneAuditorConfig()).run(context)
+    stats = context.get_ast_cache_stats()
+    assert stats["scripts"] == 4  # the script, the template expression and its two blocks
+    assert stats["misses"] == 4
+    assert stats["hits"] > 0
+    kinds = context.get_ast_kind_stats()
+    assert {kind: entry["scripts"] for kind, entry in kinds.items()} == {"script": 1, "template": 1, "template_block": 2}
+    assert all(entry["misses"] == entry["scripts"] for entry in kinds.values())
+
+
+class TestParseIntegration:
+
+    def test_parse_with_preprocessor_uses_cache(self, cache):
+        code = "var f = function() { return {\"a\": 1}; };"
+        first = parse_with_preprocessor(code)
+        assert cache.stats()["writes"] == 1
+
+        second = parse_with_preprocessor(code)
+        assert second == first
+        assert cache.stats()["hits"] == 1
+
+    def test_cache_survives_a_new_instance(self, cache):
+        code = "var y = [1, 2, 3];"
+        tree = parse_with_preprocessor(code)
+        fresh = configure_ast_cache(str(cache.cache_dir))
+        assert parse_with_preprocessor(code) == tree
+        assert fresh.stats()["hits"] == 1
+
+    def test_disabled_by_default(self):
+        configure_ast_cache(enabled=False)
+        assert get_ast_cache() is None
+        assert parse_with_preprocessor("var z = 1;") is not None
@@ -0,0 +1,48 @@
+"""
+Tests for the benchmark app generator and the baseline comparison.
+"""
+from benchmarks.app_generator import generate_app
+from benchmarks.suite import MIN_REGRESSION_SECONDS, compare_results, format_report, run_benchmark
+from parser.app_parser import ModelParser
+
+
+class TestAppGenerator:
+
+    def test_generated_app_is_deterministic(self):
+        first = generate_app(pages=3, pods=2, scripts=2, orchestrations=1)
+        second = generate_app(pages=3, pods=2, scripts=2, orchestrations=1)
+        assert {name: f.content for name, f in first.items()} == {name: f.content for name, f in second.items()}
+
+    def test_generated_app_parses(self):
+        context = ModelParser().parse_files(generate_app(pages=3, pods=2, scripts=2, orchestrations=1))
+        assert len(context.pmds) == 3
+        assert len(context.pods) == 2
+        assert len(context.scripts) == 3  # util.script plus two more
+        assert len(context.orchestrations) == 1
+        assert context.smd is not None and context.amd is not None
+
+
+class TestCompareResults:
+
+    def test_flags_only_slowdowns_over_threshold(self):
+        baseline = {'stages': {'parse_files': 0.100, 'rules': 0.200}, 'rules': {'A': 0.050}}
+        current = {'stages': {'parse_files': 0.130, 'rules': 0.210}, 'rules': {'A': 0.040}}
+        regressions = compare_results(current, baseline, threshold=0.15)
+        assert [r['metric'] for r in regressions] == ['stages.parse_files']
+        assert round(regressions[0]['change'], 2) == 0.30
+
+    def test_ignores_differences_within_timer_noise(self):
+        baseline = {'stages': {'output': 0.001}, 'rules': {}}
+        current = {'stages': {'output': 0.001 + MIN_REGRESSION_SECONDS / 2}, 'rules': {}}
+        assert compare_results(current, baseline) == []
+
+    def test_skips_metrics_missing_from_baseline(self):
+        assert compare_results({'stages': {}, 'rules': {'NewRule': 1.0}}, {'stages': {}, 'rules': {}}) == []
+
+
+def test_run_benchmark_reports_every_stage_and_rule():
+    results = run_benchmark(pages=2, pods=1, scripts=1, orchestrations=1, repeat=1)
+    assert set(results['stages']) >= {'file_processing', 'parse_files', 'precompute_asts', 'rules', 'output', 'total'}
+    assert results['rules'] and all(seconds >= 0 for seconds in results['rules'].values())
+    assert results['findings'] > 0
+    assert "Stages:" in format_report(results, baseline=results)
@@ -0,0 +1,84 @@
+"""
+Tests for the web server's EnginePool: reuse per configuration, rebuild when a
+config file changes, and concurrent runs sharing one engine.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.app_generator import generate_app
+from parser.app_parser import ModelParser
+from parser.ast_cache import configure_ast_cache
+from parser.config_manager import ConfigurationManager
+from web.services.engine_pool import EnginePool
+
+
+def _write_config(path, enabled):
+    path.write_text(json.dumps({"rules": {"ScriptVarUsageRule": {"enabled": enabled}}}), encoding="utf-8")
+
+
+@pytest.fixture
+def config_manager(tmp_path):
+    manager = ConfigurationManager()
+    manager.config_paths = [tmp_path / "personal", tmp_path / "teams", tmp_path / "presets"]
+    for directory in manager.config_paths:
+        directory.mkdir()
+    _write_config(tmp_path / "presets" / "team.json", True)
+    return manager
+
+
+class TestEnginePool:
+
+    def test_reuses_engine_for_unchanged_config(self, config_manager):
+        pool = EnginePool(config_manager)
+        _, first = pool.get("team")
+        _, second = pool.get("team")
+        assert first is second
+        assert pool.stats() == {"engines": 1, "hits": 1, "misses": 1}
+
+    def test_rebuilds_engine_when_config_changes(self, config_manager, tmp_path):
+        pool = EnginePool(config_manager)
+        _, first = pool.get("team")
+        assert "ScriptVarUsageRule" in {type(rule).__name__ for rule in first.rules}
+
+        _write_config(tmp_path / "presets" / "team.json", False)
+        config, second = pool.get("team")
+        assert second is not first
+        assert not config.rules.ScriptVarUsageRule.enabled
+        assert "ScriptVarUsageRule" not in {type(rule).__name__ for rule in second.rules}
+
+        # A higher-priority layer shadowing the preset also counts as a change.
+        _write_config(tmp_path / "personal" / "team.json", True)
+        _, third = pool.get("team")
+        assert third is not second
+        assert pool.stats()["engines"] == 1
+
+    def test_evicts_least_recently_used(self, config_manager, tmp_path):
+        for name in ("a", "b"):
+            _write_config(tmp_path / "presets" / f"{name}.json", True)
+        pool = EnginePool(config_manager, max_engines=2)
+        _, team = pool.get("team")
+        pool.get("a")
+        pool.get("team")
+        pool.get("b")
+        assert pool.get("team")[1] is team
+        assert pool.stats() == {"engines": 2, "hits": 2, "misses": 3}
+
+    def test_unknown_config_raises(self, config_manager):
+        with pytest.raises(FileNotFoundError):
+            EnginePool(config_manager).get("missing")
+
+    def test_concurrent_runs_share_engine(self, config_manager):
+        configure_ast_cache(enabled=False)
+        _, engine = EnginePool(config_manager).get("team")
+        apps = [generate_app(pages=3, pods=1, scripts=1, orchestrations=1, seed=seed) for seed in range(4)]
+
+        def analyze(files):
+            context = ModelParser().parse_files(files)
+            return [(f.rule_id, f.file_path, f.line, f.message) for f in engine.run(context)]
+
+        serial = [analyze(files) for files in apps]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent = list(executor.map(analyze, apps))
+        assert concurrent == serial
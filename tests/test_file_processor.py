@@ -190,6 +190,103 @@ def test_large_file_handling():
     finally:
         zip_path.unlink(missing_ok=True)
 
+def test_zip_matches_extracted_directory():
+    """Streaming members gives the same keys and contents as extracting the archive."""
+    print("\n=== Testing Streaming ZIP Reader ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = Path(tmp) / "app.zip"
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr('app/pages/home.pmd', '{\r\n  "id": "home"\r\n}')
+            zip_ref.writestr('app/scripts/util.script', 'var caf\u00e9 = 1;'.encode('latin-1'))
+            zip_ref.writestr('app/pages/', '')
+            zip_ref.writestr('../outside.pod', '{"podId": "p"}')
+            zip_ref.writestr('app/readme.txt', 'ignored')
+        
+        extracted = Path(tmp) / "extracted"
+        with zipfile.ZipFile(zip_path) as zip_ref:
+            zip_ref.extractall(extracted)
+        expected = FileProcessor().process_directory(extracted)
+        
+        original_extractall = zipfile.ZipFile.extractall
+        zipfile.ZipFile.extractall = lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("extractall called"))
+        try:
+            result = FileProcessor().process_zip_file(zip_path)
+        finally:
+            zipfile.ZipFile.extractall = original_extractall
+        
+        assert sorted(result) == sorted(expected)
+        for key, source_file in result.items():
+            assert source_file.content == expected[key].content
+        assert result[str(Path('app/pages/home.pmd'))].content == '{\n  "id": "home"\n}'
+        assert result[str(Path('app/scripts/util.script'))].size == len('var caf\u00e9 = 1;')
+        
+        print("✅ Streaming ZIP reader test passed")
+
+def test_zip_decompression_limits():
+    """Per-member and total decompressed sizes are capped (zip bomb protection)."""
+    print("\n=== Testing ZIP Decompression Limits ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = Path(tmp) / "bomb.zip"
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            for i in range(20):
+                zip_ref.writestr(f'page{i}.pmd', '{' + ' ' * (512 * 1024) + '}')
+        assert zip_path.stat().st_size < 1024 * 1024
+        
+        processor = FileProcessor(max_file_size=1024 * 1024, max_zip_size=4 * 1024 * 1024)
+        try:
+            processor.process_zip_file(zip_path)
+            assert False, "Should have raised ZipProcessingError"
+        except ZipProcessingError:
+            print("✅ Total decompressed size limit enforced")
+        
+        processor = FileProcessor(max_file_size=256 * 1024, max_zip_size=4 * 1024 * 1024)
+        assert processor.process_zip_file(zip_path) == {}
+        print("✅ Per-member size limit enforced")
+
+def test_bulk_read_detects_encodings():
+    """Directory and individual-file reads decode each buffer once, honouring BOMs."""
+    print("\n=== Testing Bulk Read Encoding Detection ===")
+    
+    raw_files = {
+        'ascii.pmd': b'{"id": "ascii"}',
+        'utf8.pmd': '{"label": "caf\u00e9"}'.encode('utf-8'),
+        'bom.pmd': b'\xef\xbb\xbf{"id": "bom"}',
+        'utf16.script': '\ufeffvar x = "\u00fc";'.encode('utf-16-le'),
+        'latin1.script': 'var x = "caf\u00e9";'.encode('latin-1'),
+        'crlf.pod': b'{\r\n  "podId": "p"\r\n}',
+    }
+    expected = {
+        'ascii.pmd': '{"id": "ascii"}',
+        'utf8.pmd': '{"label": "caf\u00e9"}',
+        'bom.pmd': '{"id": "bom"}',
+        'utf16.script': 'var x = "\u00fc";',
+        'latin1.script': 'var x = "caf\u00e9";',
+        'crlf.pod': '{\n  "podId": "p"\n}',
+    }
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'nested').mkdir()
+        for name, data in raw_files.items():
+            (root / 'nested' / name).write_bytes(data)
+        
+        processor = FileProcessor(config=FileProcessorConfig(max_concurrent_files=4))
+        result = processor.process_directory(root)
+        assert sorted(result) == sorted(str(Path('nested') / name) for name in raw_files)
+        for name, data in raw_files.items():
+            source_file = result[str(Path('nested') / name)]
+            assert source_file.content == expected[name], name
+            assert source_file.size == len(data), name
+        
+        paths = [root / 'nested' / name for name in sorted(raw_files)]
+        individual = processor.process_individual_files(paths)
+        assert list(individual) == [str(path) for path in paths]
+        assert [source.content for source in individual.values()] == [expected[path.name] for path in paths]
+        
+        print("✅ Bulk read encoding detection test passed")
+
 def main():
     """Run all tests."""
     print("🚀 Starting Simplified File Processor Tests")
@@ -199,6 +296,9 @@ def main():
         test_configuration()
         test_error_handling()
         test_large_file_handling()
+        test_zip_matches_extracted_directory()
+        test_zip_decompression_limits()
+        test_bulk_read_detects_encodings()
         
         print("\n🎉 All tests passed successfully!")
         
@@ -0,0 +1,167 @@
+"""
+Tests for incremental re-analysis (--incremental).
+
+After any sequence of edits, an incremental run must report exactly what a full
+ModelParser + RulesEngine run reports, while re-parsing only changed files.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from file_processing.models import SourceFile
+from parser.app_parser import ModelParser
+from parser.ast_cache import configure_ast_cache
+from parser.config import ArcaneAuditorConfig
+from parser.incremental import IncrementalAnalyzer, content_hash, state_path_for
+from parser.rules_engine import RulesEngine
+
+
+def _source(path: str, content: str) -> SourceFile:
+    return SourceFile(path=Path(path), content=content, size=len(content))
+
+
+def _pmd(page_id: str, script: str, app_id: str = "myApp_abcdef") -> str:
+    return json.dumps({
+        "id": page_id,
+        "securityDomains": ["domain1"],
+        "include": ["util.script"],
+        "script": script,
+        "presentation": {
+            "title": {"type": "title", "label": app_id},
+            "body": {"type": "section", "children": [{"type": "text", "id": "Bad_Id", "value": "hello"}]},
+        },
+    }, indent=2)
+
+
+def _smd(app_id: str) -> str:
+    return json.dumps({"id": "site1", "applicationId": app_id, "siteId": "site1", "errorPageConfigurations": []})
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache():
+    configure_ast_cache(enabled=False)
+    yield
+
+
+@pytest.fixture
+def source_files_map():
+    files = {
+        "app.smd": _source("app.smd", _smd("myApp_abcdef")),
+        "app.amd": _source("app.amd", '{"applicationId": "myApp_abcdef", "dataProviders": []}'),
+        "util.script": _source("util.script", "var helper = function(a) {\n  console.log(a);\n  return 42;\n};\n{ \"helper\": helper }"),
+    }
+    for i in range(4):
+        script = "<%\n  var total = 0;\n  for (let i = 0; i < 10; i++) { total = total + i; }\n  console.log(total);\n%>"
+        files[f"page{i}.pmd"] = _source(f"page{i}.pmd", _pmd(f"page{i}", script))
+    return files
+
+
+def _key(findings):
+    return [
+        (f.file_path, f.line, f.rule_id, f.message, f.path, f.snippet, f.suggested_replacement, f.target_text)
+        for f in findings
+    ]
+
+
+def _full(source_files_map, config):
+    context = ModelParser().parse_files(source_files_map)
+    return context, RulesEngine(config).run(context)
+
+
+def _incremental(source_files_map, config, state_path):
+    analyzer = IncrementalAnalyzer(RulesEngine(config), state_path)
+    context, findings = analyzer.analyze(source_files_map)
+    return analyzer, context, findings
+
+
+def _assert_matches_full(source_files_map, config, state_path):
+    analyzer, context, findings = _incremental(source_files_map, config, state_path)
+    full_context, full_findings = _full(source_files_map, config)
+    assert _key(findings) == _key(full_findings)
+    skipped = lambda ctx: sorted((c.rule_name, c.check_name) for c in ctx.analysis_context.skipped_checks)
+    assert skipped(context) == skipped(full_context)
+    return analyzer
+
+
+class TestIncrementalAnalyzer:
+
+    def test_first_run_is_a_full_run(self, source_files_map, tmp_path):
+        config = ArcaneAuditorConfig()
+        analyzer = _assert_matches_full(source_files_map, config, tmp_path / "state")
+        assert analyzer.changed_files == set(source_files_map)
+        assert not analyzer.partial_rules
+
+    def test_unchanged_run_reuses_everything(self, source_files_map, tmp_path):
+        config = ArcaneAuditorConfig()
+        _incremental(source_files_map, config, tmp_path / "state")
+        analyzer = _assert_matches_full(source_files_map, config, tmp_path / "state")
+        assert analyzer.changed_files == set()
+        assert analyzer.full_rules == []
+        assert analyzer.partial_rules == []
+
+    def test_edited_page_only_reruns_that_page(self, source_files_map, tmp_path):
+        config = ArcaneAuditorConfig()
+        _incremental(source_files_map, config, tmp_path / "state")
+        source_files_map["page1.pmd"] = _source("page1.pmd", _pmd("page1", "<%\n  var x = 1;\n  console.log('x' + x);\n%>"))
+        analyzer = _assert_matches_full(source_files_map, config, tmp_path / "state")
+        assert analyzer.changed_files == {"page1.pmd"}
+        assert analyzer.full_rules == []
+        assert analyzer.partial_rules
+
+    def test_smd_change_reruns_dependent_rules(self, source_files_map, tmp_path):
+        config = ArcaneAuditorConfig()
+        _incremental(source_files_map, config, tmp_path / "state")
+        source_files_map["app.smd"] = _source("app.smd", _smd("otherApp_123456"))
+        source_files_map["page2.pmd"] = _source("page2.pmd", _pmd("page2", "<% var y = 2; %>", app_id="otherApp_123456"))
+        analyzer = _assert_matches_full(source_files_map, config, tmp_path / "state")
+        assert "HardcodedApplicationIdRule" in analyzer.full_rules
+        assert "ScriptConsoleLogRule" in analyzer.partial_rules
+
+    def test_added_and_removed_files(self, source_files_map, tmp_path):
+        config = ArcaneAuditorConfig()
+        _incremental(source_files_map, config, tmp_path / "state")
+        del source_files_map["page3.pmd"]
+        source_files_map["extra.pmd"] = _source("extra.pmd", _pmd("extra", "<% var z = 3; %>"))
+        analyzer = _assert_matches_full(source_files_map, config, tmp_path / "state")
+        assert analyzer.changed_files == {"extra.pmd"}
+        assert analyzer.removed_files == {"page3.pmd"}
+
+    def test_edited_scripts_do_not_accumulate_asts(self, source_files_map, tmp_path):
+        config = ArcaneAuditorConfig()
+        analyzer = IncrementalAnalyzer(RulesEngine(config), tmp_path / "state")
+        analyzer.analyze(source_files_map)
+        for i in range(3):
+            script = f"<%\n  var x = {i};\n  console.log('x' + x);\n%>"
+            source_files_map["page1.pmd"] = _source("page1.pmd", _pmd("page1", script))
+            context, _ = analyzer.analyze(source_files_map)
+
+        full_context, _ = _full(source_files_map, config)
+        assert context.get_ast_cache_stats()["scripts"] == full_context.get_ast_cache_stats()["scripts"]
+        assert not context.has_cached_ast("var x = 1;\n  console.log('x' + x);")
+
+    def test_removed_smd_registers_skipped_check(self, source_files_map, tmp_path):
+        config = ArcaneAuditorConfig()
+        _incremental(source_files_map, config, tmp_path / "state")
+        del source_files_map["app.smd"]
+        _assert_matches_full(source_files_map, config, tmp_path / "state")
+
+    def test_configuration_change_discards_state(self, source_files_map, tmp_path):
+        _incremental(source_files_map, ArcaneAuditorConfig(), tmp_path / "state")
+        config = ArcaneAuditorConfig()
+        config.rules.ScriptConsoleLogRule.enabled = False
+        analyzer = _assert_matches_full(source_files_map, config, tmp_path / "state")
+        assert analyzer.changed_files == set(source_files_map)
+
+    def test_unreadable_state_falls_back_to_full_run(self, source_files_map, tmp_path):
+        state_path = tmp_path / "state"
+        state_path.write_bytes(b"not a pickle")
+        analyzer = _assert_matches_full(source_files_map, ArcaneAuditorConfig(), state_path)
+        assert analyzer.changed_files == set(source_files_map)
+
+
+def test_content_hash_and_state_path(tmp_path):
+    assert content_hash(_source("a.pmd", "{}")) == content_hash(_source("b.pmd", "{}"))
+    assert content_hash(_source("a.pmd", "{}")) != content_hash(_source("a.pmd", "{ }"))
+    assert state_path_for(tmp_path / "app", tmp_path) == state_path_for(tmp_path / "app", tmp_path)
+    assert state_path_for(tmp_path / "app", tmp_path) != state_path_for(tmp_path / "other", tmp_path)
@@ -0,0 +1,202 @@
+"""
+Tests for the web job queue: bounded FIFO with 429/Retry-After, queue
+positions, cancellation, and thread and process workers.
+"""
+import json
+import threading
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+import web.server as server
+from benchmarks.app_generator import generate_app, write_app
+from web.services import jobs
+from web.services.jobs import AnalysisJob, JobQueue, QueueFullError
+
+
+def _directory_job(app_dir):
+    job = AnalysisJob(str(uuid.uuid4()), None, "development")
+    job.is_zip = False
+    job.is_directory = True
+    job.directory_path = app_dir
+    return job
+
+
+def _wait(job, timeout=60):
+    deadline = time.time() + timeout
+    while job.status in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.02)
+    return job.status
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    directory = tmp_path / "app"
+    write_app(generate_app(pages=2, pods=1, scripts=1, orchestrations=1), directory)
+    return directory
+
+
+@pytest.fixture
+def blocked_runs(monkeypatch):
+    """Replace the analysis with one that waits for the returned event."""
+    release = threading.Event()
+
+    def run(job, run_in_process=None):
+        job.status = "running"
+        job.start_time = time.time()
+        release.wait(10)
+        job.status = "completed"
+        job.end_time = time.time()
+
+    monkeypatch.setattr(jobs, "run_analysis_background", run)
+    yield release
+    release.set()
+
+
+class TestJobQueue:
+
+    def test_queue_full_reports_retry_after(self, blocked_runs, tmp_path):
+        queue = JobQueue(workers=1, max_queued=2)
+        running, first, second = (_directory_job(tmp_path) for _ in range(3))
+        queue.submit(running)
+        while running.status != "running":
+            time.sleep(0.01)
+
+        assert queue.submit(first) == 1
+        assert queue.submit(second) == 2
+        assert queue.position(second.job_id) == 2
+        assert queue.position(running.job_id) is None
+        with pytest.raises(QueueFullError) as excinfo:
+            queue.submit(_directory_job(tmp_path))
+        assert excinfo.value.retry_after >= 1
+        assert queue.retry_after() == excinfo.value.retry_after
+
+        blocked_runs.set()
+        assert [_wait(job) for job in (running, first, second)] == ["completed"] * 3
+        assert queue.retry_after() is None
+
+    def test_zero_queue_size_accepts_jobs_for_idle_workers(self, blocked_runs, tmp_path):
+        queue = JobQueue(workers=2, max_queued=0)
+        first, second = _directory_job(tmp_path), _directory_job(tmp_path)
+        queue.submit(first)
+        queue.submit(second)
+        while "queued" in (first.status, second.status):
+            time.sleep(0.01)
+        assert queue.retry_after() is not None
+        with pytest.raises(QueueFullError):
+            queue.submit(_directory_job(tmp_path))
+
+        blocked_runs.set()
+        assert [_wait(job) for job in (first, second)] == ["completed"] * 2
+        assert queue.retry_after() is None
+
+    def test_cancel_queued_job(self, blocked_runs, tmp_path):
+        queue = JobQueue(workers=1, max_queued=4)
+        running, waiting, later = (_directory_job(tmp_path) for _ in range(3))
+        for job in (running, waiting, later):
+            queue.submit(job)
+        while running.status != "running":
+            time.sleep(0.01)
+
+        assert queue.cancel(waiting)
+        assert waiting.status == "cancelled"
+        assert queue.position(later.job_id) == 1
+
+        blocked_runs.set()
+        _wait(later)
+        assert waiting.start_time is None
+        assert not queue.cancel(later)
+
+    def test_cancel_running_job_stops_at_next_stage(self, app_dir):
+        job = _directory_job(app_dir)
+        job.cancel_event.set()
+        jobs.run_analysis_background(job)
+        assert job.status == "cancelled"
+        assert job.load_result() is None
+
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_workers_run_analysis(self, app_dir, mode):
+        queue = JobQueue(workers=1, max_queued=4, mode=mode)
+        job = _directory_job(app_dir)
+        queue.submit(job)
+        assert _wait(job) == "completed", job.error
+        result = job.load_result()
+        assert result["summary"]["total_findings"] == len(result["findings"])
+        assert result["config_name"] == "development"
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            JobQueue(mode="fiber")
+
+    def test_process_mode_refused_in_packaged_builds(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(jobs, "is_frozen", lambda: True)
+        with pytest.raises(ValueError):
+            JobQueue(mode="process")
+
+        user_cfg = tmp_path / "config" / "web" / "web_service_config.json"
+        user_cfg.parent.mkdir(parents=True)
+        user_cfg.write_text(json.dumps({"analysis_worker_mode": "process"}))
+        monkeypatch.setattr(server, "is_frozen", lambda: True)
+        monkeypatch.setattr(server, "user_root", lambda: str(tmp_path))
+        assert server.load_web_config()["analysis_worker_mode"] == "thread"
+
+    def test_process_workers_are_spawned(self, monkeypatch):
+        contexts = []
+
+        class _Executor:
+            def __init__(self, max_workers, mp_context):
+                contexts.append(mp_context.get_start_method())
+
+        monkeypatch.setattr(jobs, "ProcessPoolExecutor", _Executor)
+        queue = JobQueue(mode="process")
+        with pytest.raises(AttributeError):
+            queue._run_in_process({})
+        assert contexts == ["spawn"]
+
+
+@pytest.fixture
+def configure_queue():
+    """Install a server job queue for the test and restore the default afterwards."""
+    yield jobs.configure_job_queue
+    jobs.configure_job_queue()
+
+
+class TestAnalysisRoutes:
+
+    def test_upload_returns_429_when_queue_full(self, monkeypatch, blocked_runs, configure_queue, tmp_path):
+        queue = configure_queue(workers=1, max_queued=0)
+        running = _directory_job(tmp_path)
+        queue.submit(running)
+        while running.status != "running":
+            time.sleep(0.01)
+        monkeypatch.setattr(queue, "_retry_after", lambda: 7)
+        client = TestClient(server.app)
+        response = client.post("/api/upload", files={"files": ("a.pmd", b"{}")}, data={"config": "development"})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+
+    def test_job_status_and_cancel(self, blocked_runs, configure_queue, tmp_path):
+        queue = configure_queue(workers=1, max_queued=4)
+        client = TestClient(server.app)
+        running, waiting = _directory_job(tmp_path), _directory_job(tmp_path)
+        for job in (running, waiting):
+            with jobs.job_lock:
+                jobs.analysis_jobs[job.job_id] = job
+            queue.submit(job)
+        while running.status != "running":
+            time.sleep(0.01)
+
+        status = client.get(f"/api/job/{waiting.job_id}").json()
+        assert status["status"] == "queued"
+        assert status["queue_position"] == 1
+
+        response = client.post(f"/api/job/{waiting.job_id}/cancel")
+        assert response.status_code == 200
+        assert client.get(f"/api/job/{waiting.job_id}").json()["status"] == "cancelled"
+        assert client.post(f"/api/job/{waiting.job_id}/cancel").status_code == 409
+        assert client.post("/api/job/missing/cancel").status_code == 404
+
+        blocked_runs.set()
+        _wait(running)
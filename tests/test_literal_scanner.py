@@ -0,0 +1,81 @@
+"""
+Tests for the combined literal prefilter shared by the hardcoded-value rules.
+"""
+import re
+
+from parser.literal_scanner import APPLICATION_ID, LITERAL_PATTERNS, WID_PATTERN, literal_scanner, scan_model
+from parser.models import PMDModel, ProjectContext
+
+
+WID = "d9e41a8c446c11de98360015c5e6da00"
+
+TEXTS = [
+    "",
+    "Hello world",
+    f"worker {WID}",
+    f"<% var wid = '{WID.upper()}'; %>",
+    "data:image/png;base64,AAAA",
+    "https://api.workday.com/common/v1",
+    '{"visible": "true"}',
+    "<% a %> and <% b %>",
+    f"myApp_abcdef data:image/gif {WID}",
+    # The application ID overlaps the end of a WID-like run
+    "abc123abc123abc123abc123abc123aMYAPP",
+    "<% a %> 'b' <% c %>",
+]
+
+
+class TestLiteralScanner:
+
+    def test_kinds_match_individual_patterns(self):
+        scanner = literal_scanner("myapp")
+        patterns = dict(LITERAL_PATTERNS, wid=WID_PATTERN, **{APPLICATION_ID: "myapp"})
+        for text in TEXTS:
+            expected = {kind for kind, pattern in patterns.items() if re.search(pattern, text, re.IGNORECASE)}
+            assert scanner.kinds_in(text) == expected, text
+
+    def test_plain_strings_are_rejected(self):
+        scanner = literal_scanner()
+        assert scanner.kinds_in("Submit") == frozenset()
+        assert scanner.kinds_in("<% pageVariables.visible %>") == frozenset()
+        assert APPLICATION_ID not in scanner.kinds
+
+    def test_scanners_are_shared_per_application_id(self):
+        assert literal_scanner("myapp") is literal_scanner("myapp")
+        assert literal_scanner("myapp") is not literal_scanner("other")
+
+
+class TestLiteralScan:
+
+    def _page(self):
+        return PMDModel(
+            pageId="p",
+            file_path="p.pmd",
+            source_content='{"visible": "true"}',
+            presentation={"body": {"type": "section", "children": [
+                {"type": "text", "id": "t1", "value": WID},
+                {"type": "image", "id": "i1", "url": "data:image/png;base64,AAAA"},
+                {"type": "text", "id": "t2", "value": "Plain"},
+            ]}},
+        )
+
+    def test_entries_by_kind(self):
+        model = self._page()
+        scan = scan_model(model, ProjectContext())
+        assert [entry.widget_id for entry in scan.entries('wid')] == ["t1"]
+        assert [entry.widget_id for entry in scan.entries('embedded_image')] == ["i1"]
+        assert not scan.has('workday_url')
+        assert scan.entries(APPLICATION_ID) == ()
+        assert scan.source_has('string_boolean')
+        assert not scan.source_has('multiple_interpolators')
+
+    def test_scan_is_cached_per_scanner(self):
+        model = self._page()
+        context = ProjectContext()
+        scan = scan_model(model, context)
+        assert scan_model(model, context) is scan
+
+        app_scan = model.get_literal_scan(literal_scanner("otherApp"))
+        assert app_scan is not scan
+        assert app_scan.entries(APPLICATION_ID) == ()
+        assert model.get_literal_scan(literal_scanner("plain")).has(APPLICATION_ID)
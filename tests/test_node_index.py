@@ -0,0 +1,83 @@
+"""
+Tests for the per-AST parent / enclosing-function index used by script detectors.
+"""
+import pickle
+
+from lark import Tree
+
+from parser.pmd_script_parser import parse_with_preprocessor
+from parser.rules.script.shared.node_index import NodeIndex, get_node_index
+from parser.rules.script.core.console_log_detector import ConsoleLogDetector
+
+
+SCRIPT = """var total = 0;
+var outer = function(items) {
+  var inner = function(x) { console.debug(x); };
+  items.forEach(function(item) { console.info(item); });
+  return inner;
+};
+const arrow = (a) => { console.warn(a); };
+console.error(total);"""
+
+
+def _console_calls(ast):
+    return [node for node in ast.find_data('member_dot_expression') if node.children[0].children[0] == 'console']
+
+
+def _legacy_function_context(detector, node, ast):
+    return detector._get_enclosing_function_name(node, detector._build_function_context_map(ast))
+
+
+class TestNodeIndex:
+
+    def test_parents_and_depth(self):
+        ast = parse_with_preprocessor(SCRIPT)
+        index = NodeIndex(ast)
+        assert index.parent(ast) is None
+        assert index.depth(ast) == 0
+        for node in ast.iter_subtrees():
+            for child in node.children:
+                assert index.parent(child) is node
+                assert index.depth(child) == index.depth(node) + 1
+
+    def test_enclosing_function_matches_structural_search(self):
+        ast = parse_with_preprocessor(SCRIPT)
+        detector = ConsoleLogDetector()
+        index = get_node_index(ast)
+        names = [index.enclosing_function(node) for node in _console_calls(ast)]
+        assert names == ['inner', 'outer', 'arrow', None]
+        assert names == [_legacy_function_context(detector, node, ast) for node in _console_calls(ast)]
+
+    def test_enclosing_scope_is_innermost_function(self):
+        ast = parse_with_preprocessor(SCRIPT)
+        index = get_node_index(ast)
+        callback_call = _console_calls(ast)[1]
+        scope = index.enclosing_scope(callback_call)
+        assert scope.data == 'function_expression'
+        assert index.is_descendant(callback_call, scope)
+        assert index.enclosing_scope(_console_calls(ast)[3]) is ast
+
+    def test_identical_code_in_different_functions(self):
+        ast = parse_with_preprocessor(
+            "var a = function() { console.debug(1); };\nvar b = function() { console.debug(1); };"
+        )
+        detector = ConsoleLogDetector()
+        assert [detector.get_function_context_for_node(node, ast) for node in _console_calls(ast)] == ['a', 'b']
+
+    def test_index_is_cached_on_the_tree(self):
+        ast = parse_with_preprocessor(SCRIPT)
+        assert get_node_index(ast) is get_node_index(ast)
+
+    def test_index_is_not_pickled(self):
+        ast = parse_with_preprocessor(SCRIPT)
+        get_node_index(ast)
+        restored = pickle.loads(pickle.dumps(ast))
+        assert restored == ast
+        assert getattr(restored, '_node_index') is None
+        assert get_node_index(restored).root is restored
+
+    def test_foreign_node_falls_back(self):
+        ast = parse_with_preprocessor(SCRIPT)
+        detector = ConsoleLogDetector()
+        foreign = Tree('member_dot_expression', [])
+        assert detector.get_function_context_for_node(foreign, ast) is None
@@ -0,0 +1,102 @@
+"""
+Tests for the one-time walk index shared by the orchestration rules.
+"""
+from parser.models import OrchestrationModel
+from parser.rules.structure.shared.orchestration_index import OrchestrationIndex
+from parser.rules.structure.shared.orchestration_path_utils import (
+    navigate,
+    resolve_ui_location,
+    walk_orchestration_source_strings,
+)
+
+
+def _expr(source, type_name):
+    return {
+        "_type": ["Expr", type_name],
+        "_value": {
+            "type": {"_type": "Type", "_value": type_name},
+            "source": {"_type": "String", "_value": source},
+        },
+    }
+
+
+def _step(step_type, name, **value):
+    return {"_type": step_type, "_value": {"name": {"_type": "Identifier", "_value": name}, **value}}
+
+
+def _group(*nodes):
+    return {"_type": "Group", "_value": {"nodes": {"_type": ["List", "Node"], "_value": list(nodes)}}}
+
+
+RAW = {
+    "nodes": {
+        "_type": ["List", "Node"],
+        "_value": [
+            _step("SendHttpRequest", "GetWorker"),
+            _step(
+                "BranchOnConditions", "Branch",
+                ifBranches={"_type": "List", "_value": [
+                    {"_type": "When", "_value": {
+                        "condition": _expr("if (a) true else false", "Boolean"),
+                        "group": _group(_step("Log", "InIf", value=_expr("stringAtJsonPath(x, '$.a')", "String"))),
+                    }},
+                ]},
+                elseBranch=_group(_step("Loop", "Loop", group=_group(_step("SendHttpRequest", "InLoop")))),
+            ),
+            _step("CreateTextTemplate", "Message",
+                  message={"_type": "TextTemplate", "_value": "Hi\n<% xmlString(b) %>"}),
+        ],
+    },
+}
+
+
+class TestOrchestrationIndex:
+
+    def test_sources_match_reference_walk(self):
+        index = OrchestrationIndex(RAW)
+        assert [tuple(s) for s in index.sources] == list(walk_orchestration_source_strings(RAW))
+        assert [s.is_template_body for s in index.sources] == [False, False, True]
+
+    def test_expressions_flag_boolean(self):
+        index = OrchestrationIndex(RAW)
+        assert [(e.source, e.is_boolean) for e in index.expressions] == [
+            ("if (a) true else false", True),
+            ("stringAtJsonPath(x, '$.a')", False),
+        ]
+
+    def test_steps_in_pre_order_with_parents(self):
+        index = OrchestrationIndex(RAW)
+        assert [step.name for step in index.steps] == [
+            "GetWorker", "Branch", "InIf", "Loop", "InLoop", "Message",
+        ]
+        assert [step.name for step in index.top_steps] == ["GetWorker", "Branch", "Message"]
+        by_name = {step.name: step for step in index.steps}
+        branch = by_name["Branch"]
+        assert [[child.name for child in lst] for lst in branch.child_lists] == [["InIf"], ["Loop"]]
+        assert by_name["InLoop"].parent is by_name["Loop"]
+        assert by_name["Loop"].parent is branch
+        assert branch.parent is None
+        for step in index.steps:
+            assert navigate(RAW, step.path) is step.node
+
+    def test_containers_by_path(self):
+        index = OrchestrationIndex(RAW)
+        for expression in index.expressions:
+            assert index.node_at(expression.path) is navigate(RAW, expression.path)
+            assert index.parent_of(expression.path) is navigate(RAW, expression.path[:-1])
+        assert index.node_at(()) is RAW
+        assert index.parent_of(()) is None
+        assert index.node_at(("missing",)) is None
+
+    def test_ui_location_matches_resolver(self):
+        index = OrchestrationIndex(RAW)
+        for source in index.sources:
+            assert index.ui_location(source.path) == resolve_ui_location(RAW, source.path)
+        path = index.sources[-1].path
+        assert index.ui_location(path, template_line=2) == f"{resolve_ui_location(RAW, path)} -> line 2"
+
+    def test_model_caches_index(self):
+        model = OrchestrationModel(flow_type=".maya.FlowSync", id="f", name="f", file_path="f.orchestration", raw_value=RAW)
+        index = model.get_walk_index()
+        assert model.get_walk_index() is index
+        assert [step.name for step in index.top_steps] == ["GetWorker", "Branch", "Message"]
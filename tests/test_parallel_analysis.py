@@ -0,0 +1,165 @@
+"""
+Tests for the multiprocess (--jobs) execution mode.
+
+The process-pool path must produce the same findings, in the same order, as the
+in-process ModelParser + RulesEngine path.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from file_processing.models import SourceFile
+from output.formatter import OutputFormatter, OutputFormat
+from parser.app_parser import ModelParser
+from parser.config import ArcaneAuditorConfig
+from parser import parallel_analysis
+from parser.parallel_analysis import ProcessPoolAnalyzer, resolve_jobs, shard_files
+from parser.rules_engine import RulesEngine
+
+
+def _source(path: str, content: str) -> SourceFile:
+    return SourceFile(path=Path(path), content=content, size=len(content))
+
+
+def _pmd(page_id: str, script: str) -> str:
+    return json.dumps({
+        "id": page_id,
+        "securityDomains": ["domain1"],
+        "include": ["util.script"],
+        "script": script,
+        "presentation": {
+            "title": {"type": "title", "label": "myApp_abcdef"},
+            "body": {"type": "section", "children": [{"type": "text", "id": "Bad_Id", "value": "hello"}]},
+        },
+    }, indent=2)
+
+
+@pytest.fixture
+def source_files_map():
+    files = {
+        "app.smd": _source("app.smd", '{"id": "site1", "applicationId": "myApp_abcdef", "siteId": "site1", "errorPageConfigurations": []}'),
+        "app.amd": _source("app.amd", '{"applicationId": "myApp_abcdef", "dataProviders": []}'),
+        "util.script": _source("util.script", "var helper = function(a) {\n  console.log(a);\n  return 42;\n};\n{ \"helper\": helper }"),
+    }
+    for i in range(6):
+        script = "<%\n  var total = 0;\n  for (let i = 0; i < 10; i++) { total = total + i; }\n  console.log(total);\n%>"
+        files[f"page{i}.pmd"] = _source(f"page{i}.pmd", _pmd(f"page{i}", script))
+    return files
+
+
+def _serial(source_files_map, config):
+    context = ModelParser().parse_files(source_files_map)
+    engine = RulesEngine(config)
+    return context, engine, engine.run(context)
+
+
+def _failing_shard(shard, shared, owns_shared, *args):
+    """Worker stand-in that fails for the shard holding page0.pmd and for shard 0."""
+    if "page0.pmd" in shard or owns_shared:
+        raise MemoryError("worker ran out of memory")
+    return _analyze_shard(shard, shared, owns_shared, *args)
+
+
+_analyze_shard = parallel_analysis._analyze_shard
+
+
+def _key(findings):
+    return [(f.file_path, f.line, f.rule_id, f.message, f.path) for f in findings]
+
+
+class TestResolveJobs:
+
+    def test_defaults_to_serial(self):
+        assert resolve_jobs(None) == 1
+        assert resolve_jobs(-3) == 1
+        assert resolve_jobs(1) == 1
+
+    def test_zero_means_cpu_count(self):
+        assert resolve_jobs(0) >= 1
+
+    def test_explicit_count(self):
+        assert resolve_jobs(4) == 4
+
+
+class TestShardFiles:
+
+    def test_shared_context_files_are_not_sharded(self, source_files_map):
+        shards = shard_files(source_files_map, 3)
+        sharded = [path for shard in shards for path in shard]
+        assert "app.smd" not in sharded
+        assert "app.amd" not in sharded
+        assert sorted(sharded) == sorted(p for p in source_files_map if not p.endswith((".smd", ".amd")))
+
+    def test_shard_count_capped_by_file_count(self, source_files_map):
+        assert len(shard_files(source_files_map, 64)) == 7
+
+    def test_sharding_is_deterministic(self, source_files_map):
+        assert shard_files(source_files_map, 3) == shard_files(dict(reversed(list(source_files_map.items()))), 3)
+
+
+class TestProcessPoolAnalyzer:
+
+    def test_findings_match_serial_mode(self, source_files_map):
+        config = ArcaneAuditorConfig()
+        _, engine, serial_findings = _serial(source_files_map, config)
+        assert serial_findings, "fixture should produce findings"
+
+        _, parallel_findings = ProcessPoolAnalyzer(RulesEngine(config), 3).analyze(source_files_map)
+
+        assert _key(parallel_findings) == _key(serial_findings)
+        assert [f.finding_id for f in parallel_findings] == [f.finding_id for f in serial_findings]
+
+    def test_json_output_is_identical(self, source_files_map):
+        config = ArcaneAuditorConfig()
+        serial_context, engine, serial_findings = _serial(source_files_map, config)
+        parallel_context, parallel_findings = ProcessPoolAnalyzer(RulesEngine(config), 2).analyze(source_files_map)
+
+        formatter = OutputFormatter(OutputFormat.JSON)
+        serial_output = formatter.format_results(serial_findings, 8, len(engine.rules), serial_context)
+        parallel_output = formatter.format_results(parallel_findings, 8, len(engine.rules), parallel_context)
+        assert parallel_output == serial_output
+
+    def test_shared_files_reported_once(self, source_files_map):
+        config = ArcaneAuditorConfig()
+        _, parallel_findings = ProcessPoolAnalyzer(RulesEngine(config), 3).analyze(source_files_map)
+        smd_findings = [f for f in parallel_findings if f.file_path == "app.smd"]
+        _, _, serial_findings = _serial(source_files_map, config)
+        assert len(smd_findings) == len([f for f in serial_findings if f.file_path == "app.smd"])
+
+    def test_skipped_checks_are_deduplicated(self, source_files_map):
+        del source_files_map["app.smd"]
+        config = ArcaneAuditorConfig()
+        serial_context, _, _ = _serial(source_files_map, config)
+        parallel_context, _ = ProcessPoolAnalyzer(RulesEngine(config), 3).analyze(source_files_map)
+        assert parallel_context.analysis_context.to_dict() == serial_context.analysis_context.to_dict()
+
+    def test_rule_selection_is_respected(self, source_files_map):
+        engine = RulesEngine(ArcaneAuditorConfig())
+        engine.rules = [r for r in engine.rules if r.__class__.__name__ == "ScriptVarUsageRule"]
+        _, findings = ProcessPoolAnalyzer(engine, 2).analyze(source_files_map)
+        assert findings
+        assert {f.rule_id for f in findings} == {"ScriptVarUsageRule"}
+
+    def test_failed_shard_is_rerun_in_parent(self, source_files_map, monkeypatch):
+        config = ArcaneAuditorConfig()
+        serial_context, _, serial_findings = _serial(source_files_map, config)
+        monkeypatch.setattr(parallel_analysis, "_analyze_shard", _failing_shard)
+
+        context, findings = ProcessPoolAnalyzer(RulesEngine(config), 3).analyze(source_files_map)
+
+        assert _key(findings) == _key(serial_findings)
+        assert sorted(context.pmds) == sorted(serial_context.pmds)
+        assert context.smd is not None and context.amd is not None
+
+    def test_context_contains_all_models(self, source_files_map):
+        context, _ = ProcessPoolAnalyzer(RulesEngine(ArcaneAuditorConfig()), 3).analyze(source_files_map)
+        assert len(context.pmds) == 6
+        assert "util.script" in context.scripts
+        assert context.smd is not None
+        assert context.amd is not None
+
+
+def test_execution_jobs_config_default():
+    assert ArcaneAuditorConfig().execution.jobs == 1
+    assert ArcaneAuditorConfig(execution={"jobs": 4}).execution.jobs == 4
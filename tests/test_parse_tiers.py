@@ -0,0 +1,98 @@
+"""
+Tests for the parser fallback tiers: reused Earley/minimal parsers, the
+per-content known-fallback cache and the tier statistics.
+"""
+import pytest
+
+from parser import pmd_script_parser as psp
+from parser.ast_cache import configure_ast_cache
+from parser.pmd_script_parser import ParseTierStats, get_parse_stats, parse_with_preprocessor
+
+
+# Parses with the PMD grammar under Earley but not LALR is hard to construct
+# reliably, so these tests use a script no PMD grammar tier accepts; it falls
+# through LALR and Earley to the minimal grammar.
+MINIMAL_ONLY = "hello"
+UNPARSEABLE = "function broken( {"
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    # Disk cache hits bypass the tiers entirely; CLI tests may have enabled it.
+    configure_ast_cache(enabled=False)
+    get_parse_stats().reset()
+    psp._known_fallback_tier.clear()
+    yield
+    get_parse_stats().reset()
+    psp._known_fallback_tier.clear()
+
+
+class TestParseTiers:
+
+    def test_lalr_success_is_counted(self):
+        assert parse_with_preprocessor("var x = 1;") is not None
+        stats = get_parse_stats().snapshot()
+        assert stats["counts"]["lalr"] == 1
+        assert stats["counts"]["earley"] == 0
+        assert stats["seconds"]["lalr"] > 0
+
+    def test_fallback_parsers_are_reused(self):
+        assert psp.get_earley_parser() is psp.get_earley_parser()
+        psp.get_minimal_parser()
+        assert psp._minimal_parser is not None
+        assert psp.get_minimal_parser() is psp.get_minimal_parser()
+
+    def test_failed_script_is_remembered(self, monkeypatch):
+        first = parse_with_preprocessor(UNPARSEABLE)
+        stats = get_parse_stats().snapshot()
+        assert sum(stats["lalr_failure_reasons"].values()) == 1
+
+        # A repeat parse must not retry LALR or Earley.
+        lalr_calls = []
+        monkeypatch.setattr(psp, "get_pmd_script_parser", lambda: lalr_calls.append(1))
+        monkeypatch.setattr(psp, "get_earley_parser", lambda: lalr_calls.append(1))
+        second = parse_with_preprocessor(UNPARSEABLE)
+
+        assert second == first
+        assert lalr_calls == []
+        assert get_parse_stats().snapshot()["negative_cache_hits"] == 1
+
+    def test_known_fallbacks_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(psp, "KNOWN_FALLBACK_LIMIT", 2)
+        for i in range(3):
+            parse_with_preprocessor(f"function broken{i}( {{")
+        assert len(psp._known_fallback_tier) == 2
+        # The oldest entry was evicted, so it goes through the tiers again.
+        parse_with_preprocessor("function broken0( {")
+        assert get_parse_stats().snapshot()["negative_cache_hits"] == 0
+        parse_with_preprocessor("function broken2( {")
+        assert get_parse_stats().snapshot()["negative_cache_hits"] == 1
+
+    def test_minimal_tier_counted(self):
+        parse_with_preprocessor(MINIMAL_ONLY)
+        counts = get_parse_stats().snapshot()["counts"]
+        assert counts["lalr"] + counts["earley"] + counts["minimal"] + counts["failed"] == 1
+
+    def test_failure_reason_is_position_independent(self):
+        parse_with_preprocessor("var x = ;")
+        parse_with_preprocessor("var yy = ;")
+        reasons = get_parse_stats().snapshot()["lalr_failure_reasons"]
+        assert list(reasons.values()) == [2]
+
+
+class TestParseTierStats:
+
+    def test_merge_adds_snapshots(self):
+        stats = ParseTierStats()
+        stats.record("lalr", 0.5)
+        other = ParseTierStats()
+        other.record("lalr", 0.25)
+        other.record("earley", 1.0)
+        other.record_negative_cache_hit()
+
+        stats.merge(other.snapshot())
+        snapshot = stats.snapshot()
+        assert snapshot["counts"]["lalr"] == 2
+        assert snapshot["counts"]["earley"] == 1
+        assert snapshot["seconds"]["lalr"] == pytest.approx(0.75)
+        assert snapshot["negative_cache_hits"] == 1
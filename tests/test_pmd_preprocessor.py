@@ -254,6 +254,43 @@ class TestPMDPreprocessor(unittest.TestCase):
         self.assertEqual(result, code)
         self.assertEqual(len(self.preprocessor.warnings), 0)
 
+    def test_braces_inside_strings_and_template_literals(self):
+        """Braces inside quoted strings and template literals are kept as-is"""
+        code = 'const a = "{}"; const b = \'{}\'; const c = `${x} {}`; const d = {};'
+        result = self.preprocessor.preprocess(code)
+        self.assertEqual(result, 'const a = "{}"; const b = \'{}\'; const c = `${x} {}`; const d = #{};')
+        self.assertEqual(len(self.preprocessor.warnings), 0)
+
+    def test_braces_inside_comments(self):
+        """Braces inside line and block comments are kept as-is"""
+        code = """// const x = {}
+/* const y = {}; */
+const z = {};"""
+        result = self.preprocessor.preprocess(code)
+        self.assertEqual(result, """// const x = {}
+/* const y = {}; */
+const z = #{};""")
+        self.assertEqual(len(self.preprocessor.warnings), 0)
+
+    def test_escaped_quote_does_not_leak_string_state(self):
+        """An escaped quote inside a string does not swallow later braces"""
+        code = 'const s = "say \\"hi\\"";\nconst x = {};'
+        result = self.preprocessor.preprocess(code)
+        self.assertEqual(result, 'const s = "say \\"hi\\"";\nconst x = #{};')
+
+    def test_apostrophe_in_comment_does_not_leak_string_state(self):
+        """A quote character inside a comment does not open a string"""
+        code = "// don't touch\nconst x = {};"
+        result = self.preprocessor.preprocess(code)
+        self.assertEqual(result, "// don't touch\nconst x = #{};")
+
+    def test_ambiguous_brace_warning_line_number(self):
+        """Ambiguous brace warnings report the line the brace is on"""
+        preprocessor = PMDPreprocessor(warn_ambiguous=True)
+        preprocessor.preprocess('const s = "a\nb";\nsomeWeirdCase {}')
+        self.assertEqual(len(preprocessor.warnings), 1)
+        self.assertTrue(preprocessor.warnings[0].startswith("Line 3:"))
+
 
 class TestPreprocessWqlqueryContent(unittest.TestCase):
     """Tests for preprocess_wqlquery_content (multi-line query/offset/limit)."""
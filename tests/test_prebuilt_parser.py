@@ -0,0 +1,62 @@
+"""
+Tests for the prebuilt (serialized) LALR parser used at startup.
+"""
+from lark import Lark, Token
+
+from parser import pmd_script_parser as psp
+
+
+CODE = 'var total = 0;\nvar f = function(a) {\n  if (a > 1) { return {"x": `v ${a}`}; }\n  return [1, 2];\n};'
+
+
+def _positions(tree):
+    return [
+        (tok.type, str(tok), tok.line, tok.column, tok.end_line, tok.end_column)
+        for tok in tree.scan_values(lambda v: isinstance(v, Token))
+    ]
+
+
+class TestPrebuiltParser:
+
+    def test_round_trip_matches_compiled_parser(self, tmp_path):
+        grammar = psp.load_grammar()
+        path = psp.build_prebuilt_parser(tmp_path / "parser.lalr")
+        loaded = psp.load_prebuilt_parser(path, psp.parser_fingerprint(grammar))
+        assert loaded is not None
+
+        compiled = Lark(grammar, **psp.LALR_OPTIONS)
+        assert loaded.parse(CODE) == compiled.parse(CODE)
+        assert _positions(loaded.parse(CODE)) == _positions(compiled.parse(CODE))
+
+    def test_stale_fingerprint_is_rejected(self, tmp_path):
+        path = psp.build_prebuilt_parser(tmp_path / "parser.lalr")
+        changed_grammar = psp.load_grammar() + "\n// edited\n"
+        assert psp.load_prebuilt_parser(path, psp.parser_fingerprint(changed_grammar)) is None
+
+    def test_missing_or_corrupt_file_is_rejected(self, tmp_path):
+        fingerprint = psp.parser_fingerprint(psp.load_grammar())
+        assert psp.load_prebuilt_parser(tmp_path / "missing.lalr", fingerprint) is None
+
+        corrupt = tmp_path / "corrupt.lalr"
+        corrupt.write_bytes(fingerprint.encode("ascii") + b"\ngarbage")
+        assert psp.load_prebuilt_parser(corrupt, fingerprint) is None
+
+    def test_build_falls_back_and_writes_user_cache(self, tmp_path, monkeypatch):
+        user_path = tmp_path / "user" / "parser.lalr"
+        monkeypatch.setattr(psp, "_bundled_parser_path", lambda: tmp_path / "absent.lalr")
+        monkeypatch.setattr(psp, "_user_parser_path", lambda: user_path)
+
+        grammar = psp.load_grammar()
+        parser = psp._load_or_build_lalr_parser(grammar)
+        assert parser.parse("var x = 1;") is not None
+        assert user_path.exists()
+        assert psp.load_prebuilt_parser(user_path, psp.parser_fingerprint(grammar)) is not None
+
+    def test_bundled_parser_is_preferred(self, tmp_path, monkeypatch):
+        bundled = psp.build_prebuilt_parser(tmp_path / "bundled.lalr")
+        user_path = tmp_path / "user.lalr"
+        monkeypatch.setattr(psp, "_bundled_parser_path", lambda: bundled)
+        monkeypatch.setattr(psp, "_user_parser_path", lambda: user_path)
+
+        psp._load_or_build_lalr_parser(psp.load_grammar())
+        assert not user_path.exists()
@@ -0,0 +1,77 @@
+"""
+Tests for AnalysisProfiler: per-rule and per-file timings, the timing block in
+the v2 JSON output, and per-rule cProfile dumps.
+"""
+import json
+import pstats
+
+from benchmarks.app_generator import generate_app
+from output.formatter import OutputFormat, OutputFormatter
+from parser.app_parser import ModelParser
+from parser.ast_cache import configure_ast_cache
+from parser.profiling import AnalysisProfiler
+from parser.rules_engine import RulesEngine
+
+
+def _profiled_run(profiler):
+    configure_ast_cache(enabled=False)
+    context = ModelParser().parse_files(generate_app(pages=3, pods=1, scripts=1, orchestrations=1), profiler)
+    engine = RulesEngine()
+    findings = engine.run(context, profiler=profiler)
+    return engine, context, findings
+
+
+class TestAnalysisProfiler:
+
+    def test_records_rules_files_and_findings(self):
+        profiler = AnalysisProfiler()
+        engine, context, findings = _profiled_run(profiler)
+        report = profiler.timing_report(context, findings)
+
+        multiplexed = set(report['multiplexed']['rules']) if report['multiplexed'] else set()
+        timed = set(report['rules']) | multiplexed
+        assert timed == {rule.__class__.__name__ for rule in engine.rules}
+        assert all(entry['wall'] >= 0 and entry['cpu'] >= 0 for entry in report['rules'].values())
+        assert sum(report['findings_by_rule'].values()) == len(findings)
+        assert set(report['files']) == {'app.smd', 'app.amd', 'util.script', 'page0.pmd', 'page1.pmd',
+                                        'page2.pmd', 'pod0.pod', 'script1.script', 'flow0.orchestration'}
+        assert 'precompute_asts' in report['stages']
+        assert report['caches']['ast_intern']['hit_ratio'] > 0
+        assert report['caches']['ast_intern']['kinds']['script']['misses'] > 0
+        walls = [entry['wall'] for entry in report['rules'].values()]
+        assert walls == sorted(walls, reverse=True)
+
+    def test_parser_tier_counts_are_per_run(self):
+        _profiled_run(AnalysisProfiler())
+        profiler = AnalysisProfiler()
+        report = profiler.timing_report()
+        assert report['parser_tiers']['lalr']['count'] == 0
+
+    def test_profile_dir_writes_pstats_per_rule(self, tmp_path):
+        profiler = AnalysisProfiler(str(tmp_path))
+        engine, context, findings = _profiled_run(profiler)
+        report = profiler.timing_report(context, findings)
+
+        # Every rule runs alone while profiling, so none are multiplexed.
+        assert report['multiplexed'] is None
+        assert {path.stem for path in tmp_path.glob('*.pstats')} == set(report['rules'])
+        stats = pstats.Stats(str(tmp_path / 'ScriptVarUsageRule.pstats'))
+        assert stats.total_calls > 0
+
+    def test_profiling_does_not_change_findings(self, tmp_path):
+        _, _, plain = _profiled_run(None)
+        _, _, profiled = _profiled_run(AnalysisProfiler(str(tmp_path)))
+        assert [f.finding_id for f in plain] == [f.finding_id for f in profiled]
+
+
+def test_json_output_includes_timing_block():
+    profiler = AnalysisProfiler()
+    _, context, findings = _profiled_run(profiler)
+    formatter = OutputFormatter(OutputFormat.JSON)
+
+    with_timing = json.loads(formatter.format_results(findings, 9, 10, context,
+                                                      timing=profiler.timing_report(context, findings)))
+    without_timing = json.loads(formatter.format_results(findings, 9, 10, context))
+
+    assert set(with_timing['timing']) >= {'stages', 'rules', 'files', 'findings_by_rule', 'parser_tiers', 'caches'}
+    assert 'timing' not in without_timing
@@ -0,0 +1,107 @@
+"""
+Tests for the web ResultStore: compressed results with an in-memory LRU,
+artifacts built once, and byte-bounded eviction through cleanup_old_jobs.
+"""
+import time
+
+from fastapi.testclient import TestClient
+
+import web.server as server
+from web.services import jobs
+from web.services.jobs import AnalysisJob
+from web.services.result_store import ResultStore, get_result_store
+
+
+def _result(findings=3):
+    return {
+        "findings": [
+            {"rule_id": "ScriptVarUsageRule", "severity": "ADVICE", "message": f"Finding {n}",
+             "file_path": "page.pmd", "line": n}
+            for n in range(findings)
+        ],
+        "summary": {"total_findings": findings, "rules_executed": 1, "by_severity": {"action": 0, "advice": findings}},
+        "config_name": "development",
+        "config_source": "presets",
+    }
+
+
+class TestResultStore:
+
+    def test_round_trip_through_disk(self, tmp_path):
+        store = ResultStore(tmp_path, memory_items=1)
+        size = store.put("a", _result())
+        store.put("b", _result(5))
+        assert size == (tmp_path / "a.result.json.gz").stat().st_size
+        assert store.stats()["in_memory"] == 1
+        assert store.get("a") == _result()  # decoded again from disk
+        assert store.get("missing") is None
+
+    def test_artifact_built_once(self, tmp_path):
+        store = ResultStore(tmp_path)
+        store.put("a", _result())
+        builds = []
+
+        def build(result, path):
+            builds.append(result["summary"]["total_findings"])
+            path.write_text("report", encoding="utf-8")
+
+        first = store.artifact("a", "report.txt", build)
+        assert store.artifact("a", "report.txt", build) == first
+        assert builds == [3]
+        assert store.artifact("missing", "report.txt", build) is None
+
+        store.remove("a")
+        assert not first.exists()
+        assert "a" not in store
+
+    def test_evicts_oldest_beyond_budget(self, tmp_path):
+        store = ResultStore(tmp_path)
+        for job_id in ("a", "b", "c"):
+            store.put(job_id, _result(200))
+        per_job = store.job_bytes("a")
+        assert store.evict(max_bytes=per_job * 2) == ["a"]
+        # The newest result is kept even when it alone exceeds the budget.
+        assert store.evict(max_bytes=0) == ["b"]
+        assert "c" in store
+
+
+class TestCompletedJobs:
+
+    def _completed_job(self, result):
+        job = AnalysisJob(f"job-{time.time_ns()}", None, "development")
+        job.result_bytes = get_result_store().put(job.job_id, result)
+        job.status = "completed"
+        job.end_time = time.time()
+        with jobs.job_lock:
+            jobs.analysis_jobs[job.job_id] = job
+        return job
+
+    def test_cleanup_evicts_by_bytes(self, monkeypatch):
+        store = get_result_store()
+        old, new = self._completed_job(_result(100)), self._completed_job(_result(100))
+        monkeypatch.setattr(store, "max_bytes", store.job_bytes(new.job_id))
+        jobs.cleanup_old_jobs()
+        assert old.job_id not in jobs.analysis_jobs and old.job_id not in store
+        assert jobs.analysis_jobs[new.job_id].load_result() == _result(100)
+        store.remove(new.job_id)
+
+    def test_downloads_are_cached(self, monkeypatch):
+        job = self._completed_job(_result())
+        monkeypatch.setattr("utils.preferences_manager.get_excel_single_tab", lambda: False)
+        client = TestClient(server.app)
+
+        status = client.get(f"/api/job/{job.job_id}").json()
+        assert status["result"]["summary"]["total_findings"] == 3
+
+        excel = client.get(f"/api/download/{job.job_id}")
+        assert excel.status_code == 200
+        assert excel.content[:2] == b"PK"
+        path = get_result_store().directory / f"{job.job_id}.results.xlsx"
+        built_at = path.stat().st_mtime_ns
+        assert client.get(f"/api/download/{job.job_id}").content == excel.content
+        assert path.stat().st_mtime_ns == built_at
+
+        as_json = client.get(f"/api/download/{job.job_id}?format=json")
+        assert as_json.json() == _result()
+        assert client.get(f"/api/download/{job.job_id}?format=csv").status_code == 400
+        get_result_store().remove(job.job_id)
@@ -0,0 +1,80 @@
+"""
+Tests for the prebuilt rule manifest and manifest-driven rule loading.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from parser import rule_manifest as rm
+from parser.rules_engine import RulesEngine
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _names(engine):
+    return [rule.__class__.__name__ for rule in engine.rules]
+
+
+def _use_manifest(monkeypatch, tmp_path, entries=None):
+    """Point manifest loading at tmp_path; returns the user manifest path."""
+    user_path = tmp_path / "user" / rm.MANIFEST_NAME
+    monkeypatch.setattr(rm, "_bundled_manifest_path", lambda: tmp_path / "bundled" / rm.MANIFEST_NAME)
+    monkeypatch.setattr(rm, "_user_manifest_path", lambda: user_path)
+    if entries is not None:
+        rm.write_rule_manifest(entries, user_path, rm.rules_fingerprint())
+    return user_path
+
+
+class TestRuleManifest:
+
+    def test_build_and_read_round_trip(self, tmp_path):
+        path = rm.build_rule_manifest(tmp_path / rm.MANIFEST_NAME)
+        entries = rm.read_rule_manifest(path, rm.rules_fingerprint())
+        assert entries
+        var_usage = next(entry for entry in entries if entry['rule_id'] == 'ScriptVarUsageRule')
+        assert var_usage['module'] == 'parser.rules.script.core.var_usage'
+        assert var_usage['category'] == 'script'
+        assert all(set(entry) == {'rule_id', 'module', 'category', 'config_keys'} for entry in entries)
+
+    def test_stale_or_corrupt_manifest_is_rejected(self, tmp_path):
+        path = rm.build_rule_manifest(tmp_path / rm.MANIFEST_NAME)
+        assert rm.read_rule_manifest(path, "0" * 64) is None
+        assert rm.read_rule_manifest(tmp_path / "missing.json", rm.rules_fingerprint()) is None
+        path.write_text("{not json", encoding="utf-8")
+        assert rm.read_rule_manifest(path, rm.rules_fingerprint()) is None
+
+    def test_manifest_loading_matches_full_walk(self, tmp_path, monkeypatch):
+        user_path = _use_manifest(monkeypatch, tmp_path)
+        walked = RulesEngine()
+        assert user_path.exists()  # The walk cached the manifest for the next run
+
+        from_manifest = RulesEngine()
+        assert _names(from_manifest) == _names(walked)
+
+    def test_rule_ids_limit_loaded_rules(self, tmp_path, monkeypatch):
+        _use_manifest(monkeypatch, tmp_path, rm.collect_rule_manifest())
+        engine = RulesEngine(rule_ids=['ScriptVarUsageRule', 'HardcodedWidRule'])
+        assert sorted(_names(engine)) == ['HardcodedWidRule', 'ScriptVarUsageRule']
+
+    def test_out_of_date_entry_falls_back_to_walking(self, tmp_path, monkeypatch):
+        entries = rm.collect_rule_manifest()
+        entries[0] = dict(entries[0], module='parser.rules.base')  # Rule class moved away
+        _use_manifest(monkeypatch, tmp_path, entries)
+        engine = RulesEngine()
+        assert entries[0]['rule_id'] in _names(engine)
+
+
+def test_single_rule_run_imports_only_its_module(tmp_path):
+    manifest_path = rm.build_rule_manifest(tmp_path / rm.MANIFEST_NAME)
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from parser import rule_manifest, rules_engine\n"
+        f"rule_manifest._bundled_manifest_path = lambda: Path({str(manifest_path)!r})\n"
+        f"rule_manifest._user_manifest_path = lambda: Path({str(tmp_path / 'user' / rm.MANIFEST_NAME)!r})\n"
+        "engine = rules_engine.RulesEngine(rule_ids=['ScriptVarUsageRule'])\n"
+        "print(len(engine.rules), 'parser.rules.structure.widgets.widget_id_required' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "1 False"
@@ -0,0 +1,142 @@
+"""
+Tests for single-walk AST dispatch shared by multiplexed script rules.
+
+Multiplexed execution must produce exactly the findings each rule produces when
+run on its own through analyze().
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from file_processing.models import SourceFile
+from parser.app_parser import ModelParser
+from parser.config import ArcaneAuditorConfig
+from parser.pmd_script_parser import parse_with_preprocessor
+from parser.rules.script.core.console_log import ScriptConsoleLogRule
+from parser.rules.script.core.console_log_detector import ConsoleLogDetector
+from parser.rules.script.core.var_usage import ScriptVarUsageRule
+from parser.rules.script.core.var_usage_detector import VarUsageDetector
+from parser.rules.script.logic.string_concat import ScriptStringConcatRule
+from parser.rules.script.shared.dispatch import ASTDispatcher, MultiplexedScriptRunner
+from parser.rules.script.unused_code.unused_functions import ScriptUnusedFunctionRule
+from parser.rules_engine import RulesEngine
+
+
+SCRIPT = """<%
+  var total = 0;
+  var label = 'Total: ' + total;
+  var check = function(flag) {
+    console.debug(label);
+    if (flag == true) { return true; } else { return false; }
+  };
+  for (var i = 0; i < items.length; i++) { total = total + items[i]; }
+  var isBig = total > 10 ? true : false;
+  console.info(isBig);
+%>"""
+
+
+def _source(path: str, content: str) -> SourceFile:
+    return SourceFile(path=Path(path), content=content, size=len(content))
+
+
+@pytest.fixture
+def context():
+    pmd = json.dumps({
+        "id": "page1",
+        "securityDomains": ["domain1"],
+        "script": SCRIPT,
+        "onLoad": "<% var x = 'a' + 'b'; console.warn(x); %>",
+        "presentation": {"body": {"type": "text", "id": "t1", "value": "<% 'Hi ' + name %>"}},
+    }, indent=2)
+    pod = json.dumps({
+        "podId": "pod1",
+        "seed": {
+            "endPoints": [{"name": "ep", "onReceive": "<% var r = 1; console.debug(r); %>"}],
+            "template": {"type": "text", "value": "<% var t = 'x' + r; %>"},
+        },
+    }, indent=2)
+    files = {
+        "page1.pmd": _source("page1.pmd", pmd),
+        "pod1.pod": _source("pod1.pod", pod),
+        "util.script": _source("util.script", "var helper = function(a) {\n  console.error(a);\n  return 'v' + a;\n};\n{ \"helper\": helper }"),
+    }
+    return ModelParser().parse_files(files)
+
+
+def _key(findings):
+    return [
+        (f.file_path, f.line, f.rule_id, f.message, f.path, f.suggested_replacement, f.target_text)
+        for f in findings
+    ]
+
+
+def _engine(multiplex: bool) -> RulesEngine:
+    config = ArcaneAuditorConfig()
+    config.execution.multiplex_script_rules = multiplex
+    return RulesEngine(config)
+
+
+class TestASTDispatcher:
+
+    def test_collected_nodes_match_find_data(self):
+        ast = parse_with_preprocessor(SCRIPT.strip("<%>"))
+        detectors = [ConsoleLogDetector(), VarUsageDetector()]
+        assert ASTDispatcher(detectors).walk(ast) == {}
+
+        for detector in detectors:
+            for node_type in detector.NODE_TYPES:
+                assert list(detector.find_nodes(ast, node_type)) == list(ast.find_data(node_type))
+
+    def test_undispatched_ast_falls_back_to_find_data(self):
+        ast = parse_with_preprocessor("var a = 1;")
+        other = parse_with_preprocessor("var b = 2;")
+        detector = VarUsageDetector()
+        ASTDispatcher([detector]).walk(other)
+        assert list(detector.find_nodes(ast, 'variable_statement')) == list(ast.find_data('variable_statement'))
+
+    def test_failing_visit_is_isolated(self):
+        class BrokenDetector(VarUsageDetector):
+            def visit(self, node):
+                raise ValueError("boom")
+
+        ast = parse_with_preprocessor("var a = 1; console.debug(a);")
+        broken, healthy = BrokenDetector(), ConsoleLogDetector()
+        failures = ASTDispatcher([broken, healthy]).walk(ast)
+        assert list(failures) == [broken]
+        assert len(list(healthy.find_nodes(ast, 'member_dot_expression'))) == 1
+
+
+class TestMultiplexedScriptRunner:
+
+    def test_eligibility(self):
+        assert ScriptConsoleLogRule.supports_multiplexing()
+        assert ScriptVarUsageRule.supports_multiplexing()
+        # Overrides _analyze_fields/_check, so it keeps its own traversal.
+        assert not ScriptUnusedFunctionRule.supports_multiplexing()
+
+    def test_matches_individual_rules(self, context):
+        rules = [ScriptConsoleLogRule(), ScriptVarUsageRule(), ScriptStringConcatRule()]
+        expected = [finding for rule in rules for finding in rule.analyze(context)]
+        multiplexed = MultiplexedScriptRunner(rules).run(context)
+        assert {f.rule_id for f in expected} == {rule.__class__.__name__ for rule in rules}
+        assert sorted(_key(multiplexed)) == sorted(_key(expected))
+
+    def test_failing_rule_does_not_affect_others(self, context, monkeypatch):
+        def explode(self, ast, field_name):
+            raise RuntimeError("detector bug")
+
+        monkeypatch.setattr(VarUsageDetector, "detect", explode)
+        console = ScriptConsoleLogRule()
+        expected = list(console.analyze(context))
+        findings = MultiplexedScriptRunner([console, ScriptVarUsageRule()]).run(context)
+        assert _key(findings) == _key(expected)
+
+
+class TestRulesEngineMultiplexing:
+
+    def test_engine_findings_identical_to_legacy_path(self, context):
+        legacy = _engine(multiplex=False)
+        multiplexed = _engine(multiplex=True)
+        assert len(multiplexed._plan_execution_units()) < len(multiplexed.rules)
+        assert _key(multiplexed.run(context)) == _key(legacy.run(context))
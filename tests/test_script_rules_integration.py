@@ -15,6 +15,7 @@ from parser.rules.script.logic.magic_numbers import ScriptMagicNumberRule
 from parser.rules.script.logic.verbose_boolean import ScriptVerboseBooleanCheckRule
 from parser.rules.script.logic.return_consistency import ScriptFunctionReturnConsistencyRule
 from parser.rules.base import Finding
+from parser.rules.script.shared.dispatch import MultiplexedScriptRunner
 from parser.models import ProjectContext, PMDModel
 
 
@@ -87,6 +88,24 @@ class TestAllScriptRulesIntegration:
             except Exception as e:
                 pytest.fail(f"Rule {rule.ID} failed to analyze: {e}")
 
+    def test_multiplexed_findings_match_individual_rules(self):
+        """Rules sharing one AST walk report exactly what they report on their own."""
+        rules = [
+            ScriptVarUsageRule(),
+            ScriptConsoleLogRule(),
+            ScriptVerboseBooleanCheckRule(),
+        ]
+        eligible = [rule for rule in rules if rule.supports_multiplexing()]
+        assert eligible == rules
+
+        def key(findings):
+            return [(f.rule_id, f.line, f.message, f.path, f.suggested_replacement) for f in findings]
+
+        individual = [finding for rule in rules for finding in rule.analyze(self.context)]
+        multiplexed = MultiplexedScriptRunner(rules).run(self.context)
+        assert individual
+        assert key(multiplexed) == key(individual)
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,91 @@
+"""
+Tests for SourceIndex, the per-model line-start index used for line lookups.
+"""
+import json
+from pathlib import Path
+
+from file_processing.models import SourceFile
+from parser.app_parser import ModelParser
+from parser.models import PMDModel
+from parser.source_index import SourceIndex, source_index_for
+from parser.rules.structure.validation.hardcoded_wid import HardcodedWidRule
+
+
+TEXT = 'first\n  "script": "<% var a = 1; %>",\n\n  "onLoad": "<%\n    var b = 2;\n  %>"\nLAST İ line'
+
+
+class TestSourceIndex:
+
+    def test_line_for_offset_matches_counting_newlines(self):
+        index = SourceIndex(TEXT)
+        for offset in range(len(TEXT) + 3):
+            assert index.line_for_offset(offset) == TEXT[:offset].count('\n') + 1
+        assert index.line_for_offset(-1) == 1
+        assert index.line_count == len(TEXT.split('\n'))
+
+    def test_line_searches_match_linear_scans(self):
+        index = SourceIndex(TEXT)
+        lines = TEXT.split('\n')
+        for needle in ('var', '<%', '"', '', 'missing', 'a\nb'):
+            for start in range(len(lines) + 1):
+                expected = [i for i in range(start, len(lines)) if needle in lines[i]]
+                assert list(index.lines_containing(needle, start)) == expected
+        assert list(index.lines_containing_any(('var a', 'var b', 'var'))) == [1, 4]
+        assert index.marker_lines == [i for i, line in enumerate(lines) if '<%' in line]
+
+    def test_marker_neighbours(self):
+        index = SourceIndex(TEXT)
+        assert index.next_marker_line(0) == 1
+        assert index.next_marker_line(2) == 3
+        assert index.next_marker_line(4) is None
+        assert index.last_marker_line(5) == 3
+        assert index.last_marker_line(5, after_line=3) is None
+
+    def test_casefold_search(self):
+        index = SourceIndex(TEXT)
+        lines = TEXT.split('\n')
+        for needle in ('last', 'SCRIPT', 'i̇ line'):
+            expected = next((i for i, line in enumerate(lines) if needle.lower() in line.lower()), None)
+            assert index.find_line_casefold(needle) == expected
+
+    def test_lines_for_substring(self):
+        index = SourceIndex(TEXT)
+        lines = TEXT.split('\n')
+        for needle in ('var', '<%', 'missing', 'VAR'):
+            assert index.lines_for_substring(needle) == tuple(i + 1 for i, line in enumerate(lines) if needle in line)
+            assert index.lines_for_substring(needle, case_sensitive=False) == tuple(
+                i + 1 for i, line in enumerate(lines) if needle.lower() in line.lower())
+        assert index.lines_for_substring('var') is index.lines_for_substring('var')
+
+    def test_model_line_api(self):
+        model = PMDModel(pageId="p", file_path="p.pmd", source_content=TEXT)
+        offset = TEXT.index('var b')
+        assert model.line_for_offset(offset) == TEXT[:offset].count('\n') + 1
+        assert model.lines_for_substring('SCRIPT', case_sensitive=False) == (2,)
+        assert model.lines_for_substring('"') == (2, 4, 6)
+
+    def test_model_index_is_shared(self):
+        model = PMDModel(pageId="p", file_path="p.pmd", source_content=TEXT)
+        index = model.get_source_index()
+        assert model.get_source_index() is index
+        assert source_index_for(model.source_content) is index
+
+        model.source_content = TEXT + "\nmore"
+        assert model.get_source_index() is not index
+
+
+class TestModelParserIndexes:
+
+    def test_models_are_indexed_and_used_by_line_helpers(self):
+        content = json.dumps({
+            "id": "page1",
+            "presentation": {"body": {"type": "text", "id": "t1", "value": "<% 'WID' %>", "wid": "ABCDEF0123456789ABCDEF0123456789"}},
+        }, indent=2)
+        context = ModelParser().parse_files({"page1.pmd": SourceFile(path=Path("page1.pmd"), content=content, size=len(content))})
+        pmd = context.pmds["page1.pmd"]
+        assert pmd._source_index is not None
+
+        rule = HardcodedWidRule()
+        expected = next(i for i, line in enumerate(content.split('\n')) if 'abcdef0123' in line.lower()) + 1
+        assert rule.find_pattern_line_number(pmd, "abcdef0123456789", case_sensitive=False) == expected
+        assert rule.get_line_from_text_position(content, content.index('"wid"')) == expected
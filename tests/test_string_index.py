@@ -0,0 +1,70 @@
+"""
+Tests for the flattened string-value index shared by the structure rules.
+"""
+from parser.models import PMDModel, PodModel, WQLQueryModel
+from parser.string_index import build_string_index
+
+
+def _dump_walk(node, path="", out=None):
+    """Reference walk over model_dump(), as the rules used to do it."""
+    out = [] if out is None else out
+    if isinstance(node, dict):
+        for key, value in node.items():
+            value_path = f"{path}.{key}" if path else key
+            if isinstance(value, str):
+                out.append((value_path, key, value, node.get('id') or node.get('widgetId')))
+            elif isinstance(value, (dict, list)):
+                _dump_walk(value, value_path, out)
+    elif isinstance(node, list):
+        for i, item in enumerate(node):
+            if isinstance(item, str):
+                out.append((f"{path}[{i}]", f"[{i}]", item, None))
+            elif isinstance(item, (dict, list)):
+                _dump_walk(item, f"{path}[{i}]", out)
+    return out
+
+
+PMD = PMDModel(
+    pageId="home",
+    file_path="home.pmd",
+    source_content="{}",
+    securityDomains=["domainA", "domainB"],
+    presentation={
+        "title": {"type": "title", "label": "Home"},
+        "body": {
+            "type": "section",
+            "children": [
+                {"type": "text", "id": "t1", "value": "<% 'x' %>", "wid": "abc"},
+                {"type": "image", "widgetId": "img", "url": "data:image/png;base64,AAAA"},
+                ["nested", 1, None],
+            ],
+        },
+    },
+)
+
+
+class TestStringIndex:
+
+    def test_matches_model_dump_walk(self):
+        for model in (PMD, PodModel(podId="p", file_path="p.pod", source_content="{}", seed={"template": {"type": "text", "value": "v"}})):
+            entries = build_string_index(model)
+            expected = _dump_walk(model.model_dump(exclude={'file_path', 'source_content'}))
+            assert [(e.path, e.field, e.value, e.widget_id) for e in entries] == expected
+
+    def test_entry_details(self):
+        by_path = {entry.path: entry for entry in build_string_index(PMD)}
+        text = by_path["presentation.body.children[0].value"]
+        assert (text.key, text.widget_type, text.widget_id, text.is_script) == ("value", "text", "t1", True)
+        assert by_path["presentation.body.children[2][0]"].key is None
+        assert by_path["securityDomains[1]"].field == "[1]"
+        assert "file_path" not in by_path and "source_content" not in by_path
+
+    def test_top_level_id_is_widget_id(self):
+        query = WQLQueryModel(id="q1", file_path="q.wql", source_content="", query="SELECT worker FROM allWorkers")
+        entry = next(e for e in build_string_index(query) if e.key == "query")
+        assert entry.widget_id == "q1"
+
+    def test_model_caches_index(self):
+        model = PMD.model_copy()
+        values = model.get_string_values()
+        assert model.get_string_values() is values
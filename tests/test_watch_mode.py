@@ -0,0 +1,147 @@
+"""
+Tests for review-app --watch: change detection, debouncing and finding diffs.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from file_processing.models import SourceFile
+from file_processing.watcher import DirectoryWatcher, diff_snapshots, snapshot_directory
+from parser.ast_cache import configure_ast_cache
+from parser.config import ArcaneAuditorConfig
+from parser.rules_engine import RulesEngine
+from parser.watch import WatchSession, diff_findings
+
+
+def _source(path: str, content: str) -> SourceFile:
+    return SourceFile(path=Path(path), content=content, size=len(content))
+
+
+def _pmd(page_id: str, script: str) -> str:
+    return json.dumps({
+        "id": page_id,
+        "securityDomains": ["domain1"],
+        "script": script,
+        "presentation": {"body": {"type": "section", "id": "body", "children": []}},
+    }, indent=2)
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache():
+    configure_ast_cache(enabled=False)
+    yield
+
+
+class TestSnapshots:
+
+    def test_detects_added_modified_and_removed_files(self, tmp_path):
+        (tmp_path / "a.pmd").write_text("{}")
+        (tmp_path / "b.script").write_text("var x = 1;")
+        (tmp_path / "notes.txt").write_text("ignored")
+        extensions = (".pmd", ".script")
+        before = snapshot_directory(tmp_path, extensions)
+        assert set(before) == {str(tmp_path / "a.pmd"), str(tmp_path / "b.script")}
+
+        (tmp_path / "a.pmd").write_text('{"id": "a"}')
+        (tmp_path / "b.script").unlink()
+        (tmp_path / "c.pmd").write_text("{}")
+        after = snapshot_directory(tmp_path, extensions)
+        assert diff_snapshots(before, after) == {
+            str(tmp_path / "a.pmd"), str(tmp_path / "b.script"), str(tmp_path / "c.pmd"),
+        }
+
+
+class TestPollingWatcher:
+
+    def test_burst_of_saves_is_one_batch(self, tmp_path):
+        watcher = DirectoryWatcher(tmp_path, (".pmd",), debounce=0.2, poll_interval=0.05, use_native=False)
+        assert watcher.backend == "polling"
+
+        def save_burst():
+            for i in range(3):
+                (tmp_path / f"page{i}.pmd").write_text("{}")
+                time.sleep(0.05)
+
+        writer = threading.Thread(target=save_burst)
+        writer.start()
+        changed = watcher.wait()
+        writer.join()
+        assert changed == {str(tmp_path / f"page{i}.pmd") for i in range(3)}
+
+    def test_irrelevant_files_are_ignored(self, tmp_path):
+        watcher = DirectoryWatcher(tmp_path, (".pmd",), debounce=0.1, poll_interval=0.05, use_native=False)
+
+        def save():
+            (tmp_path / "readme.md").write_text("x")
+            time.sleep(0.2)
+            (tmp_path / "page.pmd").write_text("{}")
+
+        writer = threading.Thread(target=save)
+        writer.start()
+        changed = watcher.wait()
+        writer.join()
+        assert changed == {str(tmp_path / "page.pmd")}
+
+
+class TestDiffFindings:
+
+    def _findings(self, sources):
+        from parser.app_parser import ModelParser
+        context = ModelParser().parse_files(sources)
+        return RulesEngine(ArcaneAuditorConfig()).run(context)
+
+    def test_moved_findings_are_neither_new_nor_resolved(self):
+        before = self._findings({"p.pmd": _source("p.pmd", _pmd("p", "<%\n  var total = 0;\n  pageVariables.total = total;\n%>"))})
+        after = self._findings({"p.pmd": _source("p.pmd", _pmd("p", "<%\n  pageVariables.x = 1;\n\n\n  var total = 0;\n  pageVariables.total = total;\n%>"))})
+        assert before
+        assert [f.line for f in before] != [f.line for f in after]
+        assert diff_findings(before, after) == ([], [])
+
+    def test_new_and_resolved(self):
+        before = self._findings({"p.pmd": _source("p.pmd", _pmd("p", "<%\n  var total = 0;\n  pageVariables.total = total;\n%>"))})
+        after = self._findings({"p.pmd": _source("p.pmd", _pmd("p", "<%\n  let total = 0;\n  pageVariables.total = total;\n%>"))})
+        new, resolved = diff_findings(before, after)
+        assert {f.rule_id for f in resolved} == {"ScriptVarUsageRule"}
+        assert new == []
+        assert diff_findings(after, before) == (before, [])
+
+
+class _ScriptedWatcher:
+    """Stands in for DirectoryWatcher: applies one edit per wait()."""
+
+    def __init__(self, sources, edits):
+        self.sources = sources
+        self.edits = list(edits)
+
+    def wait(self):
+        if not self.edits:
+            return set()
+        path, content = self.edits.pop(0)
+        self.sources[path] = _source(path, content)
+        return {path}
+
+
+def test_watch_session_reports_only_changes():
+    sources = {
+        "a.pmd": _source("a.pmd", _pmd("a", "<%\n  var total = 0;\n  pageVariables.total = total;\n%>")),
+        "b.pmd": _source("b.pmd", _pmd("b", "<%\n  let total = 0;\n  pageVariables.total = total;\n%>")),
+    }
+    watcher = _ScriptedWatcher(sources, [
+        ("a.pmd", _pmd("a", "<%\n  let total = 0;\n  pageVariables.total = total;\n%>")),
+        ("b.pmd", _pmd("b", "<%\n  var total = 0;\n  pageVariables.total = total;\n%>")),
+    ])
+    iterations, errors = [], []
+    session = WatchSession(RulesEngine(ArcaneAuditorConfig()), lambda: dict(sources))
+    session.run(watcher, iterations.append, errors.append)
+
+    assert not errors
+    assert len(iterations) == 3
+    initial, fixed, broken = iterations
+    assert initial.new == initial.findings and not initial.resolved
+    assert any(f.rule_id == "ScriptVarUsageRule" and f.file_path == "a.pmd" for f in fixed.resolved)
+    assert fixed.changed_paths == {"a.pmd"}
+    assert any(f.rule_id == "ScriptVarUsageRule" and f.file_path == "b.pmd" for f in broken.new)
+    assert not broken.resolved
@@ -175,3 +175,16 @@ def get_output_dir() -> str:
     out_dir = os.path.join(user_root(), "output")
     os.makedirs(out_dir, exist_ok=True)
     return out_dir
+
+
+
+def get_cache_dir() -> str:
+    """
+    Return the per-user cache directory (e.g. the on-disk AST cache).
+    
+    Returns:
+        str: Normalized absolute path to the cache directory
+    """
+    cache_dir = os.path.join(user_root(), "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
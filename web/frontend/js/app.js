@@ -1036,9 +1036,15 @@ class ArcaneAuditorApp {
                         return;
                     } else if (jobData.status === 'failed') {
                         throw new Error(jobData.error || 'Analysis failed');
+                    } else if (jobData.status === 'cancelled') {
+                        throw new Error('Analysis cancelled');
                     } else if (jobData.status === 'running' || jobData.status === 'queued') {
                         // Update loading message with status
-                        this.updateLoadingMessage(`Analysis ${jobData.status}...`);
+                        if (jobData.queue_position) {
+                            this.updateLoadingMessage(`Analysis queued (position ${jobData.queue_position})...`);
+                        } else {
+                            this.updateLoadingMessage(`Analysis ${jobData.status}...`);
+                        }
                         
                         // Continue polling
                         attempts++;
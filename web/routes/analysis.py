@@ -4,8 +4,10 @@ Analysis routes for Arcane Auditor.
 Handles file uploads, job status, and result downloads.
 """
 
-import threading
+import json
+import shutil
 import uuid
+from datetime import datetime
 from pathlib import Path
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
@@ -14,7 +16,16 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional
 
-from web.services.jobs import AnalysisJob, analysis_jobs, job_lock, run_analysis_background, cleanup_old_jobs
+from web.services.jobs import (
+    AnalysisJob,
+    QueueFullError,
+    analysis_jobs,
+    cleanup_old_jobs,
+    get_job_queue,
+    job_lock,
+    remove_job_files,
+)
+from web.services.result_store import get_result_store
 from web.services.config_loader import get_dynamic_config_info
 
 router = APIRouter()
@@ -33,6 +44,32 @@ class JobStatusResponse(BaseModel):
     start_time: Optional[float] = None
     end_time: Optional[float] = None
     config: Optional[str] = None
+    queue_position: Optional[int] = None
+
+
+def _queue_full(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Too many analyses in progress. Please retry in {retry_after} seconds.",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def _submit_job(job: AnalysisJob) -> dict:
+    """Register and queue a job; raises 429 (and removes its files) when the queue is full."""
+    with job_lock:
+        analysis_jobs[job.job_id] = job
+    try:
+        position = get_job_queue().submit(job)
+    except QueueFullError as e:
+        with job_lock:
+            analysis_jobs.pop(job.job_id, None)
+        remove_job_files(job)
+        raise _queue_full(e.retry_after)
+
+    cleanup_old_jobs()
+
+    return {"job_id": job.job_id, "status": "queued", "config": job.config, "queue_position": position}
 
 
 class AnalyzeDirectoryRequest(BaseModel):
@@ -77,16 +114,7 @@ async def analyze_directory(request: Request, body: AnalyzeDirectoryRequest):
     job.directory_path = dir_path
     job.individual_files = []
 
-    with job_lock:
-        analysis_jobs[job_id] = job
-
-    job.thread = threading.Thread(target=run_analysis_background, args=(job,))
-    job.thread.daemon = True
-    job.thread.start()
-
-    cleanup_old_jobs()
-
-    return {"job_id": job_id, "status": "queued", "config": actual_config_path}
+    return _submit_job(job)
 
 
 @router.post("/api/upload")
@@ -105,6 +133,11 @@ async def upload_file(
     # Validate we have files
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
+
+    # Refuse before storing the upload when the queue is already full
+    retry_after = get_job_queue().retry_after()
+    if retry_after is not None:
+        raise _queue_full(retry_after)
     
     # Determine if this is a ZIP upload or individual files
     is_zip_upload = len(files) == 1 and files[0].filename.lower().endswith('.zip')
@@ -173,18 +206,8 @@ async def upload_file(
             job.is_zip = False
             job.individual_files = saved_files
         
-        with job_lock:
-            analysis_jobs[job_id] = job
-        
-        # Start background analysis
-        job.thread = threading.Thread(target=run_analysis_background, args=(job,))
-        job.thread.daemon = True
-        job.thread.start()
-        
-        # Cleanup old jobs
-        cleanup_old_jobs()
-        
-        return {"job_id": job_id, "status": "queued", "config": actual_config_path}
+        # Queue background analysis
+        return _submit_job(job)
             
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -208,81 +231,113 @@ async def get_job_status(job_id: str):
             raise HTTPException(status_code=404, detail="Job not found")
         
         job = analysis_jobs[job_id]
-        return JobStatusResponse(**job.to_dict())
+    return JobStatusResponse(**job.to_dict(), queue_position=get_job_queue().position(job_id))
+
+
+@router.post("/api/job/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running analysis job."""
+    with job_lock:
+        if job_id not in analysis_jobs:
+            raise HTTPException(status_code=404, detail="Job not found")
+        job = analysis_jobs[job_id]
+
+    if not get_job_queue().cancel(job):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+
+    # A running job reports "cancelled" once it reaches its next stage
+    return {"job_id": job_id, "status": job.status, "cancel_requested": True}
+
+
+class WebFinding:
+    """Finding-like view of a stored web result finding, for OutputFormatter."""
+    def __init__(self, data):
+        self.rule_id = data["rule_id"]
+        self.severity = data["severity"]
+        self.line = data["line"]
+        self.message = data["message"]
+        self.file_path = data["file_path"]
+
+
+class MockProjectContext:
+    """ProjectContext stand-in carrying the stored analysis context, if any."""
+    def __init__(self, context_data):
+        self.analysis_context = None
+        if context_data:
+            # Recreate AnalysisContext from stored data
+            from file_processing.context_tracker import AnalysisContext
+            self.analysis_context = AnalysisContext(
+                analysis_type=context_data.get("analysis_type", "unknown"),
+                files_analyzed=context_data.get("files_analyzed", []),
+                files_present=set(context_data.get("files_present", []))
+            )
+
+
+def _write_excel(result: dict, path: Path, single_tab: bool):
+    """Build the Excel workbook of a stored result at `path`."""
+    # Use shared OutputFormatter logic for Excel generation
+    from output.formatter import OutputFormatter, OutputFormat
+
+    # Convert web service findings to CLI format for compatibility
+    findings = [WebFinding(finding_data) for finding_data in result["findings"]]
+
+    # Use OutputFormatter to generate Excel with context tab
+    formatter = OutputFormatter(OutputFormat.EXCEL)
+    total_files = len(set(finding.file_path for finding in findings if finding.file_path))
+    total_rules = result["summary"]["rules_executed"]
+    context = MockProjectContext(result.get("context"))
+    excel_file_path = formatter.format_results(
+        findings, total_files, total_rules, context,
+        result.get("config_name"), result.get("config_source"), single_tab
+    )
+    shutil.move(excel_file_path, path)
+
+
+def _write_json(result: dict, path: Path):
+    """Write a stored result as the downloadable JSON document."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
 
 
 @router.get("/api/download/{job_id}")
-async def download_excel(job_id: str):
-    """Download analysis results as Excel file."""
+async def download_excel(job_id: str, format: str = "excel"):
+    """
+    Download analysis results as an Excel file (or JSON with ?format=json).
+
+    Each download format is generated once per job and served from the
+    result store afterwards.
+    """
+    if format not in ("excel", "json"):
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
     with job_lock:
         if job_id not in analysis_jobs:
             raise HTTPException(status_code=404, detail="Job not found")
         
         job = analysis_jobs[job_id]
         
-        if job.status != "completed":
-            raise HTTPException(status_code=400, detail="Analysis not completed")
-        
-        if not job.result:
-            raise HTTPException(status_code=500, detail="No results available")
-        
-        try:
-            # Use shared OutputFormatter logic for Excel generation
-            from output.formatter import OutputFormatter, OutputFormat
-            from datetime import datetime
-            
-            # Convert web service findings to CLI format for compatibility
-            findings = []
-            for finding_data in job.result["findings"]:
-                # Create a simple Finding-like object for compatibility
-                class WebFinding:
-                    def __init__(self, data):
-                        self.rule_id = data["rule_id"]
-                        self.severity = data["severity"]
-                        self.line = data["line"]
-                        self.message = data["message"]
-                        self.file_path = data["file_path"]
-                
-                findings.append(WebFinding(finding_data))
-            
-            # Create a mock ProjectContext with context information if available
-            class MockProjectContext:
-                def __init__(self, context_data):
-                    self.analysis_context = None
-                    if context_data:
-                        # Recreate AnalysisContext from stored data
-                        from file_processing.context_tracker import AnalysisContext
-                        self.analysis_context = AnalysisContext(
-                            analysis_type=context_data.get("analysis_type", "unknown"),
-                            files_analyzed=context_data.get("files_analyzed", []),
-                            files_present=set(context_data.get("files_present", []))
-                        )
-            
-            # Use OutputFormatter to generate Excel with context tab
-            formatter = OutputFormatter(OutputFormat.EXCEL)
-            total_files = len(set(finding.file_path for finding in findings if finding.file_path))
-            total_rules = job.result["summary"]["rules_executed"]
-            context = MockProjectContext(job.result.get("context"))
-            config_name = job.result.get("config_name")
-            config_source = job.result.get("config_source")
-            
+    if job.status != "completed":
+        raise HTTPException(status_code=400, detail="Analysis not completed")
+
+    store = get_result_store()
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    try:
+        if format == "json":
+            path = store.artifact(job_id, "results.json", _write_json)
+            filename = f"arcane-auditor-results-{timestamp}.json"
+            media_type = "application/json"
+        else:
             # Read the single tab export preference
             from utils.preferences_manager import get_excel_single_tab
             single_tab = get_excel_single_tab()
-            
-            excel_file_path = formatter.format_results(findings, total_files, total_rules, context, config_name, config_source, single_tab)
-            
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y-%m-%d")
+            name = "results-single-tab.xlsx" if single_tab else "results.xlsx"
+            path = store.artifact(job_id, name, lambda result, target: _write_excel(result, target, single_tab))
             filename = f"arcane-auditor-results-{timestamp}.xlsx"
-            
-            return FileResponse(
-                path=excel_file_path,
-                filename=filename,
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-            
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Excel generation failed: {str(e)}")
+            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{'JSON' if format == 'json' else 'Excel'} generation failed: {str(e)}")
 
+    if path is None:
+        raise HTTPException(status_code=500, detail="No results available")
 
+    return FileResponse(path=path, filename=filename, media_type=media_type)
@@ -5,6 +5,7 @@ This serves the simple HTML/JavaScript interface with FastAPI backend.
 """
 
 from contextlib import asynccontextmanager
+import multiprocessing
 import sys
 import threading
 import time
@@ -40,7 +41,16 @@ from utils.arcane_paths import (
 from web.routes import configs, analysis, health, preferences
 
 # Import services
-from web.services.jobs import cleanup_orphaned_files, cleanup_old_jobs
+from web.services.jobs import (
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_WORKERS,
+    WORKER_MODES,
+    cleanup_orphaned_files,
+    cleanup_old_jobs,
+    configure_job_queue,
+)
+from web.services.result_store import DEFAULT_MAX_BYTES, configure_result_store
+from web.services.engine_pool import get_engine_pool
 
 # Import version from centralized module
 from __version__ import __version__
@@ -48,14 +58,23 @@ from __version__ import __version__
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Clean up orphaned files on server startup."""
+    """Clean up orphaned files and warm the rules engine on server startup."""
     cleanup_orphaned_files()
+    threading.Thread(target=warm_engine_pool, daemon=True).start()
     
     # Start periodic cleanup task
     asyncio.create_task(periodic_cleanup())
     yield
 
 
+def warm_engine_pool():
+    """Build the default engine in the background so the first job skips it."""
+    try:
+        get_engine_pool().warm()
+    except Exception as e:
+        print(f"Engine warm-up skipped: {e}")
+
+
 async def periodic_cleanup():
     """Run cleanup every 5 minutes."""
     while True:
@@ -158,7 +177,11 @@ def load_web_config(cli_args=None):
         "host": "127.0.0.1",
         "port": 8080,
         "open_browser": True,
-        "log_level": "info"
+        "log_level": "info",
+        "analysis_workers": DEFAULT_WORKERS,
+        "analysis_queue_size": DEFAULT_QUEUE_SIZE,
+        "analysis_worker_mode": "thread",
+        "result_store_max_mb": DEFAULT_MAX_BYTES // (1024 * 1024)
     }
 
     # Determine config path based on mode
@@ -202,10 +225,30 @@ def load_web_config(cli_args=None):
             config["open_browser"] = False
         if cli_args.log_level:
             config["log_level"] = cli_args.log_level
+        if getattr(cli_args, "workers", None):
+            config["analysis_workers"] = cli_args.workers
+
+    # Fall back to defaults for unusable job queue settings
+    for key, minimum in (("analysis_workers", 1), ("analysis_queue_size", 0), ("result_store_max_mb", 1)):
+        if not isinstance(config[key], int) or isinstance(config[key], bool) or config[key] < minimum:
+            print(f"Invalid {key} {config[key]!r}; using {defaults[key]}.")
+            config[key] = defaults[key]
+    if config["analysis_worker_mode"] not in WORKER_MODES:
+        print(f"Invalid analysis_worker_mode {config['analysis_worker_mode']!r}; using thread.")
+        config["analysis_worker_mode"] = "thread"
+    elif config["analysis_worker_mode"] == "process" and is_frozen():
+        print("analysis_worker_mode 'process' is not supported in packaged builds; using thread.")
+        config["analysis_worker_mode"] = "thread"
 
     return config
 
 
+def apply_web_config(config):
+    """Apply the server-side settings of a web config (analysis job queue and result store)."""
+    configure_job_queue(config["analysis_workers"], config["analysis_queue_size"], config["analysis_worker_mode"])
+    configure_result_store(config["result_store_max_mb"] * 1024 * 1024)
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Arcane Auditor Web Service")
 
@@ -214,6 +257,7 @@ def parse_args():
     parser.add_argument("--open-browser", action="store_true", help="Open browser automatically on startup")
     parser.add_argument("--no-browser", action="store_true", help="Do not open browser automatically on startup")
     parser.add_argument("--log-level", type=str, choices=["info", "debug", "warning", "error"], help="Set logging verbosity")
+    parser.add_argument("--workers", type=int, help=f"Concurrent analyses (default from config or {DEFAULT_WORKERS})")
 
     return parser.parse_args()
 
@@ -222,6 +266,7 @@ def main():
     """Main function to run the server."""
     args = parse_args()
     cfg = load_web_config(args)
+    apply_web_config(cfg)
 
     host = cfg.get("host", "127.0.0.1")
     port = cfg.get("port", 8080)
@@ -250,4 +295,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
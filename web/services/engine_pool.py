@@ -0,0 +1,104 @@
+"""
+Warm rules engines for the web server.
+
+Building a RulesEngine loads the configuration, imports the rule modules and
+instantiates and configures every rule. The pool keeps one engine per
+configuration so jobs after the first skip that work.
+
+Entries are keyed on the configuration name and a digest of the files
+ConfigurationManager.load_config() reads for it (paths and contents). Every
+lookup recomputes the digest, so editing, adding or removing a config layer
+builds a fresh engine on the next job and replaces the stale one.
+
+Engines are shared by concurrent jobs: RulesEngine.run() and the rules keep
+no per-run state (everything a run needs travels in its ProjectContext).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from parser.config import ArcaneAuditorConfig
+from parser.config_manager import ConfigurationManager
+from parser.rules_engine import RulesEngine
+
+# Configurations kept warm; the least recently used engine is dropped beyond this.
+DEFAULT_MAX_ENGINES = 8
+
+
+class EnginePool:
+    """Configured RulesEngines keyed on configuration content."""
+
+    def __init__(self, config_manager: Optional[ConfigurationManager] = None,
+                 max_engines: int = DEFAULT_MAX_ENGINES):
+        self.config_manager = config_manager or ConfigurationManager()
+        self.max_engines = max(1, max_engines)
+        self._lock = threading.Lock()
+        self._engines: "OrderedDict[str, Tuple[str, ArcaneAuditorConfig, RulesEngine]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def config_key(self, config_name: Optional[str]) -> str:
+        """Digest of the configuration name and the files load_config() would read."""
+        digest = hashlib.sha256((config_name or "").encode("utf-8"))
+        for config_file in self.config_manager.config_files_for(config_name):
+            digest.update(b"\0" + Path(config_file).as_posix().encode("utf-8") + b"\0")
+            digest.update(hashlib.sha256(Path(config_file).read_bytes()).digest())
+        return digest.hexdigest()
+
+    def get(self, config_name: Optional[str] = None) -> Tuple[ArcaneAuditorConfig, RulesEngine]:
+        """
+        The configuration and a ready engine for `config_name`.
+
+        Raises FileNotFoundError like ConfigurationManager.load_config() for
+        unknown configurations.
+        """
+        name = config_name or ""
+        key = self.config_key(config_name)
+        with self._lock:
+            entry = self._engines.get(name)
+            if entry is not None and entry[0] == key:
+                self._engines.move_to_end(name)
+                self.hits += 1
+                return entry[1], entry[2]
+            self.misses += 1
+
+        # Built outside the lock so other configurations are not held up;
+        # two jobs racing on the same new config both build, the last one is kept.
+        config = self.config_manager.load_config(config_name)
+        engine = RulesEngine(config)
+        with self._lock:
+            self._engines[name] = (key, config, engine)
+            self._engines.move_to_end(name)
+            while len(self._engines) > self.max_engines:
+                self._engines.popitem(last=False)
+        return config, engine
+
+    def warm(self, config_name: Optional[str] = None) -> None:
+        """Load the script grammar and build the engine for `config_name` ahead of the first job."""
+        from parser.pmd_script_parser import get_pmd_script_parser
+        get_pmd_script_parser()
+        self.get(config_name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._engines.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"engines": len(self._engines), "hits": self.hits, "misses": self.misses}
+
+
+_engine_pool: Optional[EnginePool] = None
+_engine_pool_lock = threading.Lock()
+
+
+def get_engine_pool() -> EnginePool:
+    """The process-wide engine pool used by analysis jobs."""
+    global _engine_pool
+    with _engine_pool_lock:
+        if _engine_pool is None:
+            _engine_pool = EnginePool()
+        return _engine_pool
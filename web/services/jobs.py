@@ -2,18 +2,53 @@
 Job management service for Arcane Auditor.
 
 Handles analysis job creation, execution, and cleanup.
+
+Jobs run on a JobQueue: a fixed pool of workers (threads, or threads feeding
+a process pool) pulling from a bounded FIFO queue. When the queue is full,
+submit() raises QueueFullError with a Retry-After estimate instead of starting
+yet another CPU-bound analysis.
+
+Completed results go to the ResultStore (web.services.result_store), not to
+the job; AnalysisJob.load_result() reads them back.
 """
 
+import math
+import multiprocessing
 import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional
+
+from utils.arcane_paths import is_frozen
+from web.services.result_store import get_result_store
 
 # Global job management for async analysis
 analysis_jobs: Dict[str, 'AnalysisJob'] = {}
 job_lock = threading.Lock()
 
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 16
+WORKER_MODES = ("thread", "process")
+
+# Assumed job duration for Retry-After until a job has finished.
+DEFAULT_JOB_SECONDS = 5.0
+
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit() when the queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Analysis queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancellation was requested."""
+
 
 class AnalysisJob:
     """Represents an analysis job with status tracking."""
@@ -22,8 +57,8 @@ class AnalysisJob:
         self.zip_path = zip_path
         self.config = config
         self.config_source = config_source  # Track if config is built-in, personal, or team
-        self.status = "queued"  # queued, running, completed, failed
-        self.result = None
+        self.status = "queued"  # queued, running, completed, failed, cancelled
+        self.result_bytes = 0  # Size of the stored result once completed
         self.error = None
         self.start_time = None
         self.end_time = None
@@ -32,19 +67,53 @@ class AnalysisJob:
         self.is_directory = False  # True when analyzing a local folder (desktop)
         self.directory_path: Optional[Path] = None
         self.individual_files = []  # List of Path objects for individual files
-    
+        self.cancel_event = threading.Event()
+
+    def load_result(self) -> Optional[Dict[str, Any]]:
+        """The job's result from the result store (None until it has completed)."""
+        if self.status != "completed":
+            return None
+        return get_result_store().get(self.job_id)
+
     def to_dict(self):
         """Convert job to dictionary for JSON serialization."""
         return {
             "job_id": self.job_id,
             "status": self.status,
-            "result": self.result,
+            "result": self.load_result(),
             "error": self.error,
             "start_time": self.start_time,
             "end_time": self.end_time,
             "config": self.config
         }
 
+    def to_spec(self) -> Dict[str, Any]:
+        """The picklable inputs of analyze_job()."""
+        return {
+            "job_id": self.job_id,
+            "config": self.config,
+            "config_source": self.config_source,
+            "is_zip": self.is_zip,
+            "zip_path": self.zip_path,
+            "is_directory": self.is_directory,
+            "directory_path": self.directory_path,
+            "individual_files": list(self.individual_files),
+        }
+
+
+def remove_job_files(job: AnalysisJob):
+    """Delete the uploaded files of a job (never a user directory)."""
+    if getattr(job, "is_directory", False):
+        return
+    if job.is_zip and job.zip_path and job.zip_path.exists():
+        job.zip_path.unlink()
+        print(f"Cleaned up remaining ZIP file: {job.zip_path.name}")
+    elif not job.is_zip and job.individual_files:
+        for file_path in job.individual_files:
+            if file_path.exists():
+                file_path.unlink()
+                print(f"Cleaned up remaining file: {file_path.name}")
+
 
 def cleanup_orphaned_files():
     """Clean up orphaned files from previous server runs."""
@@ -53,7 +122,7 @@ def cleanup_orphaned_files():
         current_time = time.time()
         files_found = 0
         files_deleted = 0
-        
+
         for file_path in uploads_dir.glob("*.zip"):
             files_found += 1
             file_age = current_time - file_path.stat().st_mtime
@@ -67,143 +136,325 @@ def cleanup_orphaned_files():
                     print(f"Failed to clean up {file_path.name}: {e}")
             else:
                 print(f"Keeping file: {file_path.name} (age: {file_age/60:.1f} minutes)")
-        
+
         print(f"Cleanup summary: {files_found} files found, {files_deleted} files deleted")
 
 
 def cleanup_old_jobs():
-    """Remove completed/failed jobs older than 1 hour."""
+    """
+    Remove completed/failed/cancelled jobs older than 1 hour, then the oldest
+    completed jobs while stored results exceed the result store's byte budget.
+    """
     current_time = time.time()
+    store = get_result_store()
     with job_lock:
         jobs_to_remove = []
         for job_id, job in analysis_jobs.items():
-            if job.status in ["completed", "failed"] and job.end_time:
+            if job.status in ["completed", "failed", "cancelled"] and job.end_time:
                 if current_time - job.end_time > 3600:  # 1 hour
                     jobs_to_remove.append(job_id)
-        
+
         for job_id in jobs_to_remove:
-            job = analysis_jobs.pop(job_id)
-            # Clean up any remaining temporary files (never delete user directory sources)
-            if getattr(job, "is_directory", False):
-                continue
-            if job.is_zip and job.zip_path and job.zip_path.exists():
-                job.zip_path.unlink()
-                print(f"Cleaned up remaining ZIP file: {job.zip_path.name}")
-            elif not job.is_zip and job.individual_files:
-                for file_path in job.individual_files:
-                    if file_path.exists():
-                        file_path.unlink()
-                        print(f"Cleaned up remaining file: {file_path.name}")
-
-
-def run_analysis_background(job: AnalysisJob):
-    """Run analysis in background thread."""
+            # Clean up any remaining temporary files
+            remove_job_files(analysis_jobs.pop(job_id))
+            store.remove(job_id)
+
+        for job_id in store.evict():
+            analysis_jobs.pop(job_id, None)
+            print(f"Evicted results of job {job_id} (result store over {store.max_bytes // (1024 * 1024)}MB)")
+
+
+def analyze_job(spec: Dict[str, Any], cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """
+    Process, parse and analyze the files of a job; returns the job result.
+
+    `spec` is AnalysisJob.to_spec(), so this also runs in a worker process.
+    `cancelled` is checked between stages; JobCancelled is raised once it
+    returns True.
+    """
+    # Import analysis modules here to avoid import issues
+    from file_processing.processor import FileProcessor
+    from parser.app_parser import ModelParser
+    from parser.profiling import AnalysisProfiler
+    from web.services.engine_pool import get_engine_pool
+
+    def check_cancelled():
+        if cancelled is not None and cancelled():
+            raise JobCancelled()
+
+    start_time = time.time()
+    profiler = AnalysisProfiler()
+
+    # Process files based on job type
+    file_processing_start = time.time()
+    processor = FileProcessor()
+
+    if spec["is_directory"] and spec["directory_path"]:
+        source_files_map = processor.process_directory(spec["directory_path"])
+    elif spec["is_zip"]:
+        # ZIP file mode
+        zip_path = spec["zip_path"]
+        source_files_map = processor.process_zip_file(zip_path)
+
+        # Delete ZIP file immediately after successful processing
+        if zip_path and zip_path.exists():
+            zip_path.unlink()
+            print(f"Deleted processed ZIP file: {zip_path.name}")
+    else:
+        # Individual files mode
+        source_files_map = processor.process_individual_files(spec["individual_files"])
+
+        # Delete individual files immediately after successful processing
+        for file_path in spec["individual_files"]:
+            if file_path.exists():
+                file_path.unlink()
+                print(f"Deleted processed file: {file_path.name}")
+
+    file_processing_time = time.time() - file_processing_start
+
+    if not source_files_map:
+        raise ValueError("No valid source files found")
+    check_cancelled()
+
+    # Create project context
+    parsing_start = time.time()
+    parser = ModelParser()
+    context = parser.parse_files(source_files_map, profiler)
+    parsing_time = time.time() - parsing_start
+    check_cancelled()
+
+    # Run analysis with specified configuration
+    config_start = time.time()
+    # Engines are shared across jobs and rebuilt when the config files change
+    _, rules_engine = get_engine_pool().get(spec["config"])
+    config_time = time.time() - config_start
+
+    analysis_start = time.time()
+    findings = rules_engine.run(context, profiler=profiler)
+    analysis_time = time.time() - analysis_start
+
+    # Log performance metrics
+    total_time = time.time() - start_time
+    print(f"Performance metrics for job {spec['job_id']}:")
+    print(f"  File processing: {file_processing_time:.2f}s")
+    print(f"  Parsing: {parsing_time:.2f}s")
+    print(f"  Config loading: {config_time:.2f}s")
+    print(f"  Analysis: {analysis_time:.2f}s")
+    print(f"  Total: {total_time:.2f}s")
+    for stage, seconds in (('file_processing', file_processing_time), ('parsing', parsing_time),
+                           ('config', config_time), ('analysis', analysis_time)):
+        profiler.record_stage(stage, seconds)
+
+    # Convert findings to serializable format
+    result = {
+        "findings": [
+            {
+                "rule_id": finding.rule_id,
+                "severity": finding.severity,
+                "message": finding.message,
+                "file_path": finding.file_path,
+                "line": finding.line
+                }
+                for finding in findings
+        ],
+        "summary": {
+            "total_findings": len(findings),
+            "rules_executed": len(rules_engine.rules),
+            "by_severity": {
+                "action": len([f for f in findings if f.severity == "ACTION"]),
+                "advice": len([f for f in findings if f.severity == "ADVICE"])
+            }
+        },
+        "config_name": spec["config"],  # Add config name to result
+        "config_source": spec["config_source"],  # Add config source to result
+        "timing": profiler.timing_report(context, findings)
+    }
+
+    # Add context awareness information if available
+    if context.analysis_context:
+        result["context"] = context.analysis_context.to_dict()
+
+    return result
+
+
+def run_analysis_background(job: AnalysisJob, run_in_process: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+    """Run a job to completion, in this thread or through `run_in_process`."""
     try:
         job.status = "running"
         job.start_time = time.time()
-        
-        # Import analysis modules here to avoid import issues
-        from file_processing.processor import FileProcessor
-        from parser.app_parser import ModelParser
-        from parser.rules_engine import RulesEngine
-        from parser.config_manager import ConfigurationManager
-            
-        # Process files based on job type
-        file_processing_start = time.time()
-        processor = FileProcessor()
-        
-        if getattr(job, "is_directory", False) and job.directory_path:
-            source_files_map = processor.process_directory(job.directory_path)
-        elif job.is_zip:
-            # ZIP file mode
-            source_files_map = processor.process_zip_file(job.zip_path)
-            
-            # Delete ZIP file immediately after successful processing
-            if job.zip_path and job.zip_path.exists():
-                job.zip_path.unlink()
-                print(f"Deleted processed ZIP file: {job.zip_path.name}")
+
+        if run_in_process is not None:
+            # A worker process cannot be interrupted; a cancelled job's result is dropped.
+            result = run_in_process(job.to_spec())
+            if job.cancel_event.is_set():
+                raise JobCancelled()
         else:
-            # Individual files mode
-            source_files_map = processor.process_individual_files(job.individual_files)
-            
-            # Delete individual files immediately after successful processing
-            for file_path in job.individual_files:
-                if file_path.exists():
-                    file_path.unlink()
-                    print(f"Deleted processed file: {file_path.name}")
-        
-        file_processing_time = time.time() - file_processing_start
-        
-        if not source_files_map:
-            job.error = "No valid source files found"
-            job.status = "failed"
-            job.end_time = time.time()
-            return
-            
-        # Create project context
-        parsing_start = time.time()
-        parser = ModelParser()
-        context = parser.parse_files(source_files_map)
-        parsing_time = time.time() - parsing_start
-        
-        # Run analysis with specified configuration
-        config_start = time.time()
-        # Use project root as base path for configuration loading
-        # __file__ is in web/services/, so go up 2 levels to get project root
-        project_root = Path(__file__).parent.parent.parent
-        config_manager = ConfigurationManager(project_root)
-        config = config_manager.load_config(job.config)
-        rules_engine = RulesEngine(config)
-        config_time = time.time() - config_start
-        
-        analysis_start = time.time()
-        findings = rules_engine.run(context)
-        analysis_time = time.time() - analysis_start
-        
-        # Log performance metrics
-        total_time = time.time() - job.start_time
-        print(f"Performance metrics for job {job.job_id}:")
-        print(f"  File processing: {file_processing_time:.2f}s")
-        print(f"  Parsing: {parsing_time:.2f}s")
-        print(f"  Config loading: {config_time:.2f}s")
-        print(f"  Analysis: {analysis_time:.2f}s")
-        print(f"  Total: {total_time:.2f}s")
-            
-        # Convert findings to serializable format
-        result = {
-            "findings": [
-                {
-                    "rule_id": finding.rule_id,
-                    "severity": finding.severity,
-                    "message": finding.message,
-                    "file_path": finding.file_path,
-                    "line": finding.line
-                    }
-                    for finding in findings
-            ],
-            "summary": {
-                "total_findings": len(findings),
-                "rules_executed": len(rules_engine.rules),
-                "by_severity": {
-                    "action": len([f for f in findings if f.severity == "ACTION"]),
-                    "advice": len([f for f in findings if f.severity == "ADVICE"])
-                }
-            },
-            "config_name": job.config,  # Add config name to result
-            "config_source": job.config_source  # Add config source to result
-        }
-        
-        # Add context awareness information if available
-        if context.analysis_context:
-            result["context"] = context.analysis_context.to_dict()
-        
-        job.result = result
+            result = analyze_job(job.to_spec(), job.cancel_event.is_set)
+
+        job.result_bytes = get_result_store().put(job.job_id, result)
         job.status = "completed"
         job.end_time = time.time()
-        
+
+    except JobCancelled:
+        remove_job_files(job)
+        job.status = "cancelled"
+        job.end_time = time.time()
+        print(f"Analysis cancelled: {job.job_id}")
     except Exception as e:
         job.error = str(e)
         job.status = "failed"
         job.end_time = time.time()
         print(f"Analysis failed: {e}", file=sys.stderr)
 
+
+class JobQueue:
+    """Bounded FIFO of analysis jobs served by a fixed pool of workers."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queued: int = DEFAULT_QUEUE_SIZE,
+                 mode: str = "thread"):
+        if mode not in WORKER_MODES:
+            raise ValueError(f"Unknown worker mode '{mode}' (expected one of: {', '.join(WORKER_MODES)})")
+        if mode == "process" and is_frozen():
+            raise ValueError("Process workers are not supported in packaged builds; use thread mode")
+        self.workers = max(1, int(workers))
+        self.max_queued = max(0, int(max_queued))
+        self.mode = mode
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._running: Dict[str, AnalysisJob] = {}
+        self._threads = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._job_seconds = DEFAULT_JOB_SECONDS
+
+    def submit(self, job: AnalysisJob) -> int:
+        """
+        Queue `job` and return its position (1 = next to start).
+
+        Raises QueueFullError when every worker is busy and `max_queued` jobs
+        are already waiting.
+        """
+        with self._cond:
+            if self._is_full():
+                raise QueueFullError(self._retry_after())
+            self._start_workers()
+            job.status = "queued"
+            self._queue.append(job)
+            self._cond.notify()
+            return len(self._queue)
+
+    def retry_after(self) -> Optional[int]:
+        """Seconds until a slot is likely to free up, or None if the queue has room."""
+        with self._cond:
+            return self._retry_after() if self._is_full() else None
+
+    def _is_full(self) -> bool:
+        """Whether a new job would exceed the limit (caller holds the lock)."""
+        # Idle workers take queued jobs at once, so they count as capacity on top
+        # of max_queued (with max_queued=0, jobs are accepted only when a worker is free).
+        idle_workers = max(0, self.workers - len(self._running))
+        return len(self._queue) >= self.max_queued + idle_workers
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._job_seconds * (len(self._queue) + 1) / self.workers))
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued job; None once it has started (or is unknown)."""
+        with self._cond:
+            for index, job in enumerate(self._queue):
+                if job.job_id == job_id:
+                    return index + 1
+        return None
+
+    def cancel(self, job: AnalysisJob) -> bool:
+        """
+        Cancel a queued or running job; False if it has already finished.
+
+        A queued job is dropped at once. A running job stops at its next
+        stage boundary (thread workers) or has its result discarded (process
+        workers).
+        """
+        with self._cond:
+            if job in self._queue:
+                self._queue.remove(job)
+                job.status = "cancelled"
+                job.end_time = time.time()
+                remove_job_files(job)
+                return True
+            if job.job_id in self._running:
+                job.cancel_event.set()
+                return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "mode": self.mode, "workers": self.workers, "max_queued": self.max_queued,
+                "queued": len(self._queue), "running": len(self._running),
+            }
+
+    def _start_workers(self):
+        """Start the worker threads on first use (caller holds the lock)."""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"analysis-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run_in_process(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        with self._cond:
+            if self._executor is None:
+                # The server is multithreaded (uvicorn, these workers), so a forked
+                # child could inherit a lock held by another thread; spawn starts clean.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                )
+            executor = self._executor
+        try:
+            return executor.submit(analyze_job, spec).result()
+        except BrokenProcessPool:
+            # A crashed worker process breaks the pool; start a fresh one for the next job.
+            with self._cond:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+
+    def _work(self):
+        run_in_process = self._run_in_process if self.mode == "process" else None
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                job = self._queue.popleft()
+                self._running[job.job_id] = job
+            job.thread = threading.current_thread()
+            try:
+                run_analysis_background(job, run_in_process)
+            finally:
+                with self._cond:
+                    self._running.pop(job.job_id, None)
+                    if job.status == "completed":
+                        # Smoothed job duration for Retry-After.
+                        self._job_seconds = 0.7 * self._job_seconds + 0.3 * (job.end_time - job.start_time)
+            if job.status == "completed":
+                # Keep stored results within their byte budget
+                cleanup_old_jobs()
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def configure_job_queue(workers: int = DEFAULT_WORKERS, max_queued: int = DEFAULT_QUEUE_SIZE,
+                        mode: str = "thread") -> JobQueue:
+    """Replace the job queue (at server startup, before jobs are submitted)."""
+    global _job_queue
+    _job_queue = JobQueue(workers, max_queued, mode)
+    return _job_queue
+
+
+def get_job_queue() -> JobQueue:
+    """The queue analysis jobs are submitted to."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
@@ -0,0 +1,215 @@
+"""
+Result store for completed web jobs.
+
+A finished job's result (findings, summary, timing, context) is written to a
+gzip-compressed JSON file instead of staying on the AnalysisJob for an hour.
+The last few results read or written stay decoded in a small in-memory LRU,
+which covers the usual pattern of a client polling a job and then showing
+its results.
+
+Downloads (the Excel workbook, or the result as JSON) are artifacts: built
+once per job and variant, stored next to the result and served from disk
+afterwards.
+
+Everything lives in a private temporary directory of the server process.
+Jobs do not survive a restart, so neither do their files: the directory is
+removed at exit. cleanup_old_jobs() calls evict() to keep the files of all
+jobs under a byte budget.
+"""
+
+import atexit
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Results kept decoded in memory.
+DEFAULT_MEMORY_ITEMS = 4
+
+# Total size of stored results and artifacts before the oldest jobs are dropped.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+RESULT_SUFFIX = ".json.gz"
+
+
+class ResultStore:
+    """Compressed on-disk job results with an in-memory LRU and cached artifacts."""
+
+    def __init__(self, directory: Optional[Path] = None, memory_items: int = DEFAULT_MEMORY_ITEMS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self._directory = Path(directory) if directory else None
+        self.memory_items = max(0, memory_items)
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # job_id -> {artifact name -> path}, in completion order (oldest first)
+        self._files: "OrderedDict[str, Dict[str, Path]]" = OrderedDict()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def directory(self) -> Path:
+        with self._lock:
+            if self._directory is None:
+                self._directory = Path(tempfile.mkdtemp(prefix="arcane_results_"))
+                atexit.register(shutil.rmtree, self._directory, True)
+            self._directory.mkdir(parents=True, exist_ok=True)
+            return self._directory
+
+    def _path(self, job_id: str, name: str) -> Path:
+        return self.directory / f"{job_id}.{name}"
+
+    def _remember(self, job_id: str, result: Dict[str, Any]) -> None:
+        if not self.memory_items:
+            return
+        self._recent[job_id] = result
+        self._recent.move_to_end(job_id)
+        while len(self._recent) > self.memory_items:
+            self._recent.popitem(last=False)
+
+    def put(self, job_id: str, result: Dict[str, Any]) -> int:
+        """Store a job result; returns its size on disk in bytes."""
+        path = self._path(job_id, "result" + RESULT_SUFFIX)
+        data = gzip.compress(json.dumps(result, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._files.setdefault(job_id, {})["result"] = path
+            self._remember(job_id, result)
+        return len(data)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The stored result of a job, or None if there is none."""
+        with self._lock:
+            result = self._recent.get(job_id)
+            if result is not None:
+                self._recent.move_to_end(job_id)
+                return result
+            path = self._files.get(job_id, {}).get("result")
+        if path is None:
+            return None
+        try:
+            with gzip.open(path, "rb") as f:
+                result = json.loads(f.read().decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if job_id in self._files:
+                self._remember(job_id, result)
+        return result
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return "result" in self._files.get(job_id, {})
+
+    def artifact(self, job_id: str, name: str, build: Callable[[Dict[str, Any], Path], None]) -> Optional[Path]:
+        """
+        Path of the `name` artifact of a job (e.g. "results.xlsx"), building it on first use.
+
+        `build(result, path)` writes the artifact to `path`. Returns None if
+        the job has no stored result.
+        """
+        with self._lock:
+            if job_id not in self:
+                return None
+            build_lock = self._build_locks.setdefault(job_id, threading.Lock())
+        # One build per job at a time, so concurrent downloads build an artifact once.
+        with build_lock:
+            with self._lock:
+                path = self._files.get(job_id, {}).get(name)
+            if path is not None and path.exists():
+                return path
+            result = self.get(job_id)
+            if result is None:
+                return None
+            path = self._path(job_id, name)
+            build(result, path)
+            with self._lock:
+                files = self._files.get(job_id)
+                if files is None:
+                    # Removed while building
+                    path.unlink(missing_ok=True)
+                    return None
+                files[name] = path
+            return path
+
+    def remove(self, job_id: str) -> None:
+        """Forget a job and delete its files."""
+        with self._lock:
+            self._recent.pop(job_id, None)
+            self._build_locks.pop(job_id, None)
+            files = self._files.pop(job_id, {})
+        for path in files.values():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def job_bytes(self, job_id: str) -> int:
+        with self._lock:
+            paths = list(self._files.get(job_id, {}).values())
+        return sum(path.stat().st_size for path in paths if path.exists())
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            job_ids = list(self._files)
+        return sum(self.job_bytes(job_id) for job_id in job_ids)
+
+    def evict(self, max_bytes: Optional[int] = None) -> List[str]:
+        """
+        Drop the oldest jobs until the store holds at most `max_bytes`
+        (default: the store's max_bytes).
+
+        The newest job is always kept, so a result larger than the budget can
+        still be fetched. Returns the removed job IDs.
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            sizes = OrderedDict((job_id, self.job_bytes(job_id)) for job_id in self._files)
+        total = sum(sizes.values())
+        removed = []
+        for job_id, size in list(sizes.items())[:-1]:
+            if total <= budget:
+                break
+            self.remove(job_id)
+            total -= size
+            removed.append(job_id)
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            jobs, in_memory = len(self._files), len(self._recent)
+        return {"jobs": jobs, "in_memory": in_memory, "bytes": self.total_bytes()}
+
+
+_result_store: Optional[ResultStore] = None
+_result_store_lock = threading.Lock()
+
+
+def configure_result_store(max_bytes: int = DEFAULT_MAX_BYTES, memory_items: int = DEFAULT_MEMORY_ITEMS) -> ResultStore:
+    """Set the limits of the job result store (at server startup)."""
+    store = get_result_store()
+    with store._lock:
+        store.max_bytes = max_bytes
+        store.memory_items = max(0, memory_items)
+    return store
+
+
+def get_result_store() -> ResultStore:
+    """The store completed job results are written to."""
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            _result_store = ResultStore()
+        return _result_store